@@ -0,0 +1,251 @@
+"""
+근사 최근접 이웃(ANN) 인덱스 모듈
+코디 벡터에서 가장 유사한 코디를 찾을 때 전체 행렬을 스캔하지 않도록 IVF 인덱스를 사용합니다.
+
+IVF (Inverted File):
+    - 학습 시 구면 k-means로 코디 벡터를 nlist개 클러스터로 나눔 (coarse quantizer)
+    - 검색 시 쿼리와 가장 가까운 nprobe개 클러스터의 벡터만 비교
+    - nprobe가 클수록 정확도(recall)가 높고 느려짐 (nprobe == nlist면 전체 스캔과 같은 결과)
+
+클러스터별 벡터는 연속된 행으로 재배치해 저장하므로 메모리 매핑된 상태에서도 슬라이스로 읽습니다.
+NumPy만 사용합니다.
+"""
+
+import os
+import numpy as np
+from typing import Optional, Tuple
+
+# 검색 시 기본으로 확인할 클러스터 수
+DEFAULT_NPROBE = 16
+
+# k-means 반복 횟수
+KMEANS_ITERATIONS = 20
+
+# 평균 클러스터 크기의 1/N보다 작은 클러스터는 학습 중에 다시 배치
+MIN_CLUSTER_SIZE_RATIO = 8
+
+# k-means 할당 계산 시 한 번에 처리할 행 수 (메모리 사용량 제한)
+ASSIGN_CHUNK_SIZE = 65536
+
+# 번들 안의 인덱스 파일 이름
+CENTROIDS_FILE = "ivf_centroids.npy"
+OFFSETS_FILE = "ivf_offsets.npy"
+IDS_FILE = "ivf_ids.npy"
+VECTORS_FILE = "ivf_vectors.npy"
+
+
+def default_nlist(num_vectors: int) -> int:
+    """
+    벡터 수에 맞는 기본 클러스터 수 (약 4 * sqrt(n))
+
+    Args:
+        num_vectors: 인덱싱할 벡터 수
+
+    Returns:
+        int: 클러스터 수
+    """
+    return int(max(1, min(num_vectors, round(4 * np.sqrt(num_vectors)))))
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (float32, norm이 0인 행은 그대로)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    각 벡터를 내적이 가장 큰 centroid에 할당합니다. (청크 단위로 계산)
+
+    Returns:
+        np.ndarray: 벡터별 클러스터 번호
+    """
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_SIZE):
+        scores = vectors[start:start + ASSIGN_CHUNK_SIZE] @ centroids.T
+        labels[start:start + len(scores)] = np.argmax(scores, axis=1)
+    return labels
+
+
+class IVFIndex:
+    """
+    코사인 유사도(정규화된 벡터의 내적) 기반 IVF 인덱스
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        offsets: np.ndarray,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+        default_nprobe: int = DEFAULT_NPROBE
+    ):
+        """
+        Args:
+            centroids: (nlist, dim) 정규화된 클러스터 중심
+            offsets: (nlist + 1,) 클러스터 i의 벡터는 vectors[offsets[i]:offsets[i + 1]]
+            ids: (n,) 재배치된 벡터의 원래 행 번호
+            vectors: (n, dim) 클러스터 순서로 재배치된 정규화 벡터
+            default_nprobe: 검색 시 기본으로 확인할 클러스터 수
+        """
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.vectors = vectors
+        self.default_nprobe = default_nprobe
+
+    @property
+    def nlist(self) -> int:
+        """클러스터 수"""
+        return len(self.centroids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: np.ndarray, k: int = 1, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        쿼리와 내적이 가장 큰 k개의 벡터를 찾습니다.
+
+        Args:
+            query: (dim,) 쿼리 벡터 (내부에서 정규화)
+            k: 반환할 개수
+            nprobe: 확인할 클러스터 수 (None이면 default_nprobe)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (원래 행 번호, 유사도) - 유사도 내림차순, 동점이면 앞 행 우선
+        """
+        nprobe = min(self.nlist, max(1, nprobe or self.default_nprobe))
+        query = _normalize(query)
+
+        centroid_scores = self.centroids @ query
+        if nprobe < self.nlist:
+            probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        else:
+            probes = np.arange(self.nlist)
+
+        candidate_ids = []
+        candidate_scores = []
+        for cluster in probes:
+            start, end = self.offsets[cluster], self.offsets[cluster + 1]
+            if start == end:
+                continue
+            candidate_ids.append(self.ids[start:end])
+            candidate_scores.append(self.vectors[start:end] @ query)
+
+        if not candidate_ids:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        ids = np.concatenate(candidate_ids)
+        scores = np.concatenate(candidate_scores)
+        order = np.lexsort((ids, -scores))[:k]
+        return ids[order], scores[order]
+
+    def save(self, index_dir: str) -> None:
+        """인덱스를 .npy 파일로 저장합니다."""
+        os.makedirs(index_dir, exist_ok=True)
+        np.save(os.path.join(index_dir, CENTROIDS_FILE), np.asarray(self.centroids, dtype=np.float32))
+        np.save(os.path.join(index_dir, OFFSETS_FILE), np.asarray(self.offsets, dtype=np.int64))
+        np.save(os.path.join(index_dir, IDS_FILE), np.asarray(self.ids, dtype=np.int64))
+        np.save(os.path.join(index_dir, VECTORS_FILE), np.asarray(self.vectors, dtype=np.float32))
+
+    @classmethod
+    def load(cls, index_dir: str, default_nprobe: int = DEFAULT_NPROBE, mmap_mode: Optional[str] = 'r') -> "IVFIndex":
+        """
+        저장된 인덱스를 읽습니다. (기본적으로 메모리 매핑)
+
+        Raises:
+            FileNotFoundError: 인덱스 파일이 없는 경우
+        """
+        def load_array(name: str) -> np.ndarray:
+            return np.load(os.path.join(index_dir, name), mmap_mode=mmap_mode)
+
+        return cls(
+            centroids=np.asarray(load_array(CENTROIDS_FILE)),
+            offsets=np.asarray(load_array(OFFSETS_FILE)),
+            ids=load_array(IDS_FILE),
+            vectors=load_array(VECTORS_FILE),
+            default_nprobe=default_nprobe
+        )
+
+
+def index_exists(index_dir: str) -> bool:
+    """인덱스 파일이 모두 있는지 확인합니다."""
+    return all(
+        os.path.exists(os.path.join(index_dir, name))
+        for name in (CENTROIDS_FILE, OFFSETS_FILE, IDS_FILE, VECTORS_FILE)
+    )
+
+
+def build_ivf_index(
+    vectors: np.ndarray,
+    nlist: Optional[int] = None,
+    default_nprobe: int = DEFAULT_NPROBE,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0
+) -> IVFIndex:
+    """
+    구면 k-means로 IVF 인덱스를 만듭니다. (학습 시 사용)
+
+    Args:
+        vectors: (n, dim) L2 정규화된 벡터 (코디 행렬 그대로 사용, 검색 결과가 전체 스캔과 같은 값이 되도록)
+        nlist: 클러스터 수 (None이면 default_nlist)
+        default_nprobe: 검색 시 기본으로 확인할 클러스터 수
+        iterations: k-means 반복 횟수
+        seed: 초기 centroid 선택용 시드
+
+    Returns:
+        IVFIndex: 생성된 인덱스
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    n = len(vectors)
+    if n == 0:
+        raise ValueError("인덱싱할 벡터가 없습니다.")
+
+    nlist = min(nlist or default_nlist(n), n)
+
+    # 초기 centroid는 데이터 행에서 무작위로 선택 (데이터가 많은 영역에 centroid가 많이 생김)
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(n, nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = _assign(vectors, centroids)
+
+        # 클러스터 순서로 정렬한 뒤 구간 합으로 클러스터별 벡터 합 계산
+        order = np.argsort(labels, kind='stable')
+        counts = np.bincount(labels, minlength=nlist)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.zeros_like(centroids)
+        non_empty = counts > 0
+        sums[non_empty] = np.add.reduceat(vectors[order], starts[non_empty], axis=0)
+        new_centroids = _normalize(sums)
+
+        # 비었거나 평균보다 훨씬 작은 클러스터는 가장 큰 클러스터를 둘로 나눠 채움
+        # (고차원에서는 잡음이 섞인 한 점이 초기 centroid가 되면 자기 자신만 남고 나머지 클러스터가 커짐)
+        min_size = max(1, n // (nlist * MIN_CLUSTER_SIZE_RATIO))
+        for empty in np.flatnonzero(counts < min_size):
+            largest = int(np.argmax(counts))
+            noise = rng.normal(scale=1e-3, size=centroids.shape[1]).astype(np.float32)
+            new_centroids[empty] = _normalize(new_centroids[largest] + noise)
+            new_centroids[largest] = _normalize(new_centroids[largest] - noise)
+            counts[empty] = counts[largest] // 2
+            counts[largest] -= counts[empty]
+
+        if np.allclose(new_centroids, centroids, atol=1e-6):
+            centroids = new_centroids
+            break
+        centroids = new_centroids
+
+    labels = _assign(vectors, centroids)
+    ids = np.argsort(labels, kind='stable')
+    offsets = np.zeros(nlist + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(labels, minlength=nlist))
+
+    return IVFIndex(
+        centroids=centroids,
+        offsets=offsets,
+        ids=ids.astype(np.int64),
+        vectors=np.ascontiguousarray(vectors[ids]),
+        default_nprobe=default_nprobe
+    )
@@ -0,0 +1,257 @@
+"""
+카테고리 간 속성 궁합 테이블 모듈
+학습 코디 문장에서 서로 다른 카테고리 아이템의 속성 값이 함께 나온 횟수를 세어
+(예: 상의 색상 x 하의 색상, 상의 상세정보 x 신발 상세정보) 궁합 점수 테이블을 만듭니다.
+
+궁합 점수 = 스무딩한 PMI (pointwise mutual information)
+    log( P(a, b) / (P(a) * P(b)) )   (a: 카테고리 A 아이템의 속성 값, b: 카테고리 B 아이템의 속성 값)
+    0보다 크면 코디 데이터에서 우연보다 자주 함께 나온 조합
+
+아이템을 (카테고리 코드, 속성별 값 번호) 정수 배열로 바꿔 두면 아이템 쌍의 궁합은
+속성마다 테이블 조회 한 번으로 계산됩니다. (벡터 계산 없음)
+알 수 없는 카테고리/값은 마지막 번호(0으로 채운 행/열)에 대응하므로 점수에 영향을 주지 않습니다.
+NumPy만 사용합니다.
+"""
+
+import os
+import re
+import json
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+from .feature_space import CATEGORIES, COLORS, MATERIALS, CATEGORY_DETAILS, SEASONS, STYLES, FEATURE_PART_COUNT
+
+# 궁합을 계산하는 속성: (feature 문자열의 부분 번호, 값 목록)
+COMPATIBILITY_ATTRIBUTES: Dict[str, tuple] = {
+    'color': (1, COLORS),
+    'fabric': (2, MATERIALS),
+    'detail': (3, CATEGORY_DETAILS),
+    'season': (5, SEASONS),
+    'style': (6, STYLES),
+}
+
+# 학습 코디 데이터의 상세정보 표기 -> Gemini 분석 결과(feature_space)의 표기
+DETAIL_ALIASES: Dict[str, str] = {
+    '부츠/워커': '부츠/워크',
+    '숏팬츠': '숏 팬츠',
+    '플리스/뽀글이': '폴리스/뽀글이',
+}
+
+# PMI 계산 시 모든 (a, b) 칸에 더하는 횟수 (한두 번 나온 조합의 점수가 과도하게 커지지 않도록)
+COMPATIBILITY_SMOOTHING = 1.0
+
+# 번들 안의 테이블 파일 이름
+VOCAB_FILE = "compat_vocab.json"
+
+# 코디 문장에서 아이템 경계 (다음 토큰이 카테고리로 시작하는 공백, 상세정보에는 공백이 있을 수 있음)
+_ITEM_BOUNDARY = re.compile(r" (?=(?:%s)_)" % "|".join(CATEGORIES))
+
+
+def _scores_file(attribute: str) -> str:
+    return f"compat_{attribute}_scores.npy"
+
+
+def _counts_file(attribute: str) -> str:
+    return f"compat_{attribute}_counts.npy"
+
+
+def split_sentence(sentence: str) -> List[str]:
+    """
+    코디 문장을 아이템 feature 문자열 리스트로 나눕니다.
+
+    Args:
+        sentence: 코디 문장 (feature 문자열을 공백으로 이은 것)
+
+    Returns:
+        List[str]: feature 문자열 리스트
+    """
+    sentence = sentence.strip()
+    return _ITEM_BOUNDARY.split(sentence) if sentence else []
+
+
+class CompatibilityTables:
+    """
+    속성별 궁합 점수 테이블
+
+    scores[attribute]는 (카테고리 수 + 1, 카테고리 수 + 1, 값 수 + 1, 값 수 + 1) float32 배열이며
+    scores[attribute][카테고리 A, 카테고리 B, A의 값, B의 값]이 두 아이템의 해당 속성 궁합입니다.
+    (같은 카테고리끼리와 마지막 번호(알 수 없음)는 0)
+    """
+
+    def __init__(
+        self,
+        vocabularies: Dict[str, List[str]],
+        scores: Dict[str, np.ndarray],
+        counts: Optional[Dict[str, np.ndarray]] = None
+    ):
+        """
+        Args:
+            vocabularies: 속성 -> 값 목록 (테이블의 값 번호 순서)
+            scores: 속성 -> 궁합 점수 테이블
+            counts: 속성 -> (카테고리 수, 카테고리 수, 값 수, 값 수) 함께 나온 횟수 (진단용, 없어도 됨)
+        """
+        self.vocabularies = vocabularies
+        self.scores = scores
+        self.counts = counts or {}
+        self.attributes = list(vocabularies)
+        self._category_index = {category: i for i, category in enumerate(CATEGORIES)}
+        self._value_index = {
+            attribute: {value: i for i, value in enumerate(values)}
+            for attribute, values in vocabularies.items()
+        }
+
+    def encode(self, features: Iterable[str]) -> np.ndarray:
+        """
+        feature 문자열을 (카테고리 코드, 속성별 값 번호) 정수 배열로 바꿉니다.
+
+        Args:
+            features: feature 문자열 (카테고리_색상_재질_상세정보_성별_계절_스타일)
+
+        Returns:
+            np.ndarray: (n, 1 + 속성 수) int64 배열 (알 수 없는 카테고리/값은 각 테이블의 마지막 번호)
+        """
+        unknown_category = len(CATEGORIES)
+        rows = []
+        for feature in features:
+            parts = feature.split('_') if feature else []
+            if len(parts) != FEATURE_PART_COUNT:
+                parts = [''] * FEATURE_PART_COUNT
+            row = [self._category_index.get(parts[0], unknown_category)]
+            for attribute in self.attributes:
+                value = parts[COMPATIBILITY_ATTRIBUTES[attribute][0]]
+                if attribute == 'detail':
+                    value = DETAIL_ALIASES.get(value, value)
+                value_index = self._value_index[attribute]
+                row.append(value_index.get(value, len(value_index)))
+            rows.append(row)
+        return np.asarray(rows, dtype=np.int64).reshape(-1, 1 + len(self.attributes))
+
+    def pair_scores(self, codes_a: np.ndarray, codes_b: np.ndarray) -> np.ndarray:
+        """
+        두 아이템 집합 사이의 모든 쌍의 궁합 점수 (속성별 PMI의 합)를 계산합니다.
+
+        Args:
+            codes_a: (n, 1 + 속성 수) encode 결과
+            codes_b: (m, 1 + 속성 수) encode 결과
+
+        Returns:
+            np.ndarray: (n, m) float64 궁합 점수
+        """
+        categories_a = codes_a[:, 0][:, np.newaxis]
+        categories_b = codes_b[:, 0][np.newaxis, :]
+        total = np.zeros((len(codes_a), len(codes_b)), dtype=np.float64)
+        for column, attribute in enumerate(self.attributes, start=1):
+            total += self.scores[attribute][
+                categories_a, categories_b, codes_a[:, column][:, np.newaxis], codes_b[:, column][np.newaxis, :]
+            ]
+        return total
+
+    def outfit_score(self, codes: np.ndarray) -> float:
+        """
+        코디 한 벌의 궁합 점수 (서로 다른 카테고리 아이템 쌍의 궁합 합)를 계산합니다.
+
+        Args:
+            codes: (아이템 수, 1 + 속성 수) encode 결과
+
+        Returns:
+            float: 궁합 점수
+        """
+        return float(np.triu(self.pair_scores(codes, codes), k=1).sum())
+
+    def save(self, table_dir: str) -> None:
+        """테이블을 .npy 파일과 값 목록(JSON)으로 저장합니다."""
+        os.makedirs(table_dir, exist_ok=True)
+        for attribute in self.attributes:
+            np.save(os.path.join(table_dir, _scores_file(attribute)), np.asarray(self.scores[attribute], dtype=np.float32))
+            if attribute in self.counts:
+                np.save(os.path.join(table_dir, _counts_file(attribute)), np.asarray(self.counts[attribute], dtype=np.int32))
+        with open(os.path.join(table_dir, VOCAB_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.vocabularies, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, table_dir: str, mmap_mode: Optional[str] = 'r') -> "CompatibilityTables":
+        """
+        저장된 테이블을 읽습니다. (기본적으로 메모리 매핑, 횟수 테이블은 읽지 않음)
+
+        Raises:
+            FileNotFoundError: 테이블 파일이 없는 경우
+        """
+        with open(os.path.join(table_dir, VOCAB_FILE), 'r', encoding='utf-8') as f:
+            vocabularies = json.load(f)
+        scores = {
+            attribute: np.load(os.path.join(table_dir, _scores_file(attribute)), mmap_mode=mmap_mode)
+            for attribute in vocabularies
+        }
+        return cls(vocabularies, scores)
+
+
+def tables_exist(table_dir: str) -> bool:
+    """값 목록 파일과 속성별 점수 테이블이 모두 있는지 확인합니다."""
+    vocab_path = os.path.join(table_dir, VOCAB_FILE)
+    if not os.path.exists(vocab_path):
+        return False
+    with open(vocab_path, 'r', encoding='utf-8') as f:
+        attributes = list(json.load(f))
+    return all(os.path.exists(os.path.join(table_dir, _scores_file(attribute))) for attribute in attributes)
+
+
+def build_compatibility_tables(
+    sentences: Iterable[str],
+    smoothing: float = COMPATIBILITY_SMOOTHING
+) -> CompatibilityTables:
+    """
+    코디 문장에서 속성 궁합 테이블을 만듭니다. (학습 시 사용)
+
+    코디 하나에 들어 있는 서로 다른 카테고리 아이템 쌍마다 속성 값 쌍의 횟수를 세고,
+    카테고리 쌍마다 스무딩한 PMI로 바꿉니다.
+
+    Args:
+        sentences: 코디 문장 (코디당 한 번씩, 같은 코디를 여러 번 넣으면 그만큼 가중됨)
+        smoothing: 모든 (a, b) 칸에 더하는 횟수
+
+    Returns:
+        CompatibilityTables: 생성된 테이블
+    """
+    vocabularies = {attribute: list(values) for attribute, (_, values) in COMPATIBILITY_ATTRIBUTES.items()}
+    encoder = CompatibilityTables(vocabularies, scores={})
+    num_categories = len(CATEGORIES)
+
+    # 코디별 서로 다른 카테고리 아이템 쌍 (양방향)
+    pair_rows_a = []
+    pair_rows_b = []
+    for sentence in sentences:
+        codes = encoder.encode(split_sentence(sentence))
+        codes = codes[codes[:, 0] < num_categories]
+        left, right = np.nonzero(codes[:, 0][:, np.newaxis] != codes[:, 0][np.newaxis, :])
+        pair_rows_a.append(codes[left])
+        pair_rows_b.append(codes[right])
+
+    width = 1 + len(vocabularies)
+    pairs_a = np.concatenate(pair_rows_a) if pair_rows_a else np.zeros((0, width), dtype=np.int64)
+    pairs_b = np.concatenate(pair_rows_b) if pair_rows_b else np.zeros((0, width), dtype=np.int64)
+
+    scores: Dict[str, np.ndarray] = {}
+    counts: Dict[str, np.ndarray] = {}
+    for column, attribute in enumerate(vocabularies, start=1):
+        num_values = len(vocabularies[attribute])
+        known = (pairs_a[:, column] < num_values) & (pairs_b[:, column] < num_values)
+        attribute_counts = np.zeros((num_categories, num_categories, num_values, num_values), dtype=np.int64)
+        np.add.at(
+            attribute_counts,
+            (pairs_a[known, 0], pairs_b[known, 0], pairs_a[known, column], pairs_b[known, column]),
+            1
+        )
+
+        # 카테고리 쌍마다 PMI (같은 카테고리끼리와 알 수 없는 값의 행/열은 0)
+        smoothed = attribute_counts + smoothing
+        joint = smoothed / smoothed.sum(axis=(2, 3), keepdims=True)
+        marginal_a = joint.sum(axis=3, keepdims=True)
+        marginal_b = joint.sum(axis=2, keepdims=True)
+        pmi = np.log(joint / (marginal_a * marginal_b))
+        pmi[np.arange(num_categories), np.arange(num_categories)] = 0.0
+
+        attribute_scores = np.zeros((num_categories + 1, num_categories + 1, num_values + 1, num_values + 1), dtype=np.float32)
+        attribute_scores[:num_categories, :num_categories, :num_values, :num_values] = pmi
+        scores[attribute] = attribute_scores
+        counts[attribute] = attribute_counts.astype(np.int32)
+
+    return CompatibilityTables(vocabularies, scores, counts)
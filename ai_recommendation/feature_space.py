@@ -0,0 +1,70 @@
+"""
+Feature 공간 정의 모듈
+Gemini 분석 결과로 만들어지는 feature 문자열의 속성 값 목록입니다.
+
+형식: 카테고리_색상_재질_상세정보_성별_계절_스타일
+(app/services/gemini_service.py의 GEMINI_PROMPT, _format_feature_string과 같은 값 목록)
+"""
+
+from typing import Dict, List
+
+# 카테고리 (한글)
+CATEGORIES: List[str] = ['상의', '하의', '신발', '아우터']
+
+# 카테고리 영문 -> 한글 (코디 문장 토큰의 접두어)
+CATEGORY_KR_MAP: Dict[str, str] = {
+    'top': '상의',
+    'bottom': '하의',
+    'shoes': '신발',
+    'outer': '아우터'
+}
+
+# 색상
+COLORS: List[str] = [
+    'white', 'black', 'gray', 'navy', 'blue', 'brown', 'beige',
+    'green', 'yellow', 'orange', 'red', 'pink', 'purple'
+]
+
+# 재질
+MATERIALS: List[str] = ['cotton', 'polyester', 'silk', 'wool', 'leather', 'denim']
+
+# 상세 카테고리 (category_detail)
+CATEGORY_DETAILS: List[str] = [
+    # 상의
+    '맨투맨/스웨트', '후드 티셔츠', '셔츠/블라우스', '긴소매 티셔츠', '반소매 티셔츠',
+    '피케/카라 티셔츠', '니트/스웨터', '민소매 티셔츠', '기타 상의',
+    # 아우터
+    '후드 집업', '블루종/MA-1', '레더/라이더스 재킷', '카디건', '트리커 재킷',
+    '슈트/블레이저 재킷', '스타디움 재킷', '나일론/코치 재킷', '아노락 재킷', '트레이닝 재킷',
+    '환절기 코트', '사파리/헌팅 재킷', '베스트', '숏패딩/헤비 아우터', '무스탕/퍼',
+    '폴리스/뽀글이', '겨울 싱글 코트', '겨울 더블 코트', '겨울 기타 코트', '롱패딩/헤비 아우터',
+    '패딩 베스트', '기타 아우터',
+    # 하의
+    '데님 팬츠', '트레이닝/조거 팬츠', '코튼 팬츠', '슈트 팬츠/슬랙스', '숏 팬츠',
+    '레깅스', '점프 슈트/오버올', '기타 하의',
+    # 신발
+    '스니커즈', '패딩/퍼 신발', '부츠/워크', '구두', '샌들/슬리퍼', '스포츠화', '신발용품'
+]
+
+# 성별
+GENDERS: List[str] = ['남성', '여성']
+
+# 계절
+SEASONS: List[str] = ['봄', '여름', '가을', '겨울']
+
+# 스타일
+STYLES: List[str] = ['casual', 'minimal', 'street', 'sporty']
+
+# feature 문자열을 '_'로 나눈 부분(part)의 개수
+FEATURE_PART_COUNT = 7
+
+
+def all_feature_values() -> List[str]:
+    """
+    feature 문자열의 각 부분에 올 수 있는 모든 값을 반환합니다. (중복 제거, 순서 유지)
+
+    Returns:
+        List[str]: 속성 값 목록
+    """
+    values = CATEGORIES + COLORS + MATERIALS + CATEGORY_DETAILS + GENDERS + SEASONS + STYLES
+    return list(dict.fromkeys(values))
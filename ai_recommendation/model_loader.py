@@ -1,81 +1,104 @@
 """
 모델 로더 모듈
 저장된 모델과 데이터를 로드하여 서버에서 사용할 수 있도록 제공합니다.
+
+서빙 번들을 사용할 때는 NumPy만 필요합니다.
+gensim/pandas는 번들이 없을 때의 pickle 로드 경로에서만 import합니다. (학습 환경용)
 """
 
 import os
 import pickle
 import json
+import hashlib
+import threading
+import time
 import numpy as np
-from gensim.models import Word2Vec
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from .feature_space import COLORS, MATERIALS, FEATURE_PART_COUNT, CATEGORY_KR_MAP, all_feature_values
+from .ann_index import IVFIndex
+from .compatibility import CompatibilityTables, build_compatibility_tables
+from .serving_bundle import bundle_exists, load_serving_bundle, read_current_version, resolve_bundle_dir
+
+# 기본 모델 디렉토리 (현재 파일 기준 models/)
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
 
 class ModelLoader:
     """학습된 모델과 데이터를 로드하는 클래스"""
     
-    def __init__(self, model_dir: Optional[str] = None):
+    def __init__(
+        self,
+        model_dir: Optional[str] = None,
+        version: Optional[str] = None,
+        bundle_dir: Optional[str] = None
+    ):
         """
         Args:
             model_dir: 모델이 저장된 디렉토리 경로 (None이면 기본값 사용)
+            version: 로드할 번들 버전 (models/versions/{version}, None이면 CURRENT가 가리키는 버전)
+            bundle_dir: 로드할 번들 디렉토리 (지정하면 model_dir/version 대신 이 디렉토리를 로드)
         """
         if model_dir is None:
-            # 현재 파일 기준으로 models 디렉토리 찾기
-            BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-            model_dir = os.path.join(BASE_DIR, "models")
+            model_dir = DEFAULT_MODEL_DIR
         
         self.model_dir = model_dir
-        self.w2v_model: Optional[Word2Vec] = None
-        self.color_fabric_model: Optional[Word2Vec] = None
-        self.merged_df = None
+        self.version = version
+        self.bundle_dir: Optional[str] = bundle_dir
+        self.w2v_model = None  # gensim Word2Vec (pickle 로드 경로에서만 사용)
+        self.color_fabric_model = None
+        self.merged_df = None  # pandas DataFrame (pickle 로드 경로에서만 사용)
         self.filtered_df = None
         self.params: Dict[str, Any] = {}
+        self.model_version: Optional[str] = None
+        self.source: Optional[str] = None  # 'bundle' (서빙 번들) 또는 'pickle'
+        self.w2v_vectors = None  # 토큰 -> 벡터 (gensim KeyedVectors 또는 KeyedVectorTable)
+        self.cf_vectors = None  # 색상/재질 -> 벡터
+        self.coord_ids: List[Any] = []
+        self.coord_sentences: List[str] = []
+        self.coord_matrix: Optional[np.ndarray] = None
+        self.coord_mean_vector: Optional[np.ndarray] = None
+        self.category_row_indices: Dict[str, np.ndarray] = {}
+        self.category_coord_matrices: Dict[str, np.ndarray] = {}
+        self.ann_index: Optional[IVFIndex] = None  # 코디 검색용 IVF 인덱스 (서빙 번들에 있을 때만)
+        self.compatibility_tables: Optional[CompatibilityTables] = None  # 카테고리 간 속성 궁합 테이블
+        self.token_postings: Dict[str, np.ndarray] = {}  # 토큰 -> 해당 토큰이 있는 코디 행 번호 (정렬됨)
+        self.coord_centroid: Optional[np.ndarray] = None
+        self.category_centroids: Dict[str, np.ndarray] = {}
+        self.feature_part_table: Dict[str, Tuple[np.ndarray, int]] = {}
+        self.color_table: Dict[str, np.ndarray] = {}
+        self.fabric_table: Dict[str, np.ndarray] = {}
         self._is_loaded = False
     
     def load(self) -> bool:
         """
         저장된 모델과 데이터를 모두 로드합니다.
         
+        서빙 번들(models/versions/{버전} 또는 models/serving/)이 있으면 메모리 매핑으로 열고,
+        없거나 읽을 수 없으면 pickle 파일(merged_df.pkl 등)과 Word2Vec 모델을 로드합니다.
+        버전이나 번들 디렉토리를 지정한 경우에는 pickle 파일로 대체하지 않고 실패합니다.
+        
         Returns:
             bool: 로드 성공 여부
         """
         try:
-            # 파라미터 로드
-            params_path = os.path.join(self.model_dir, "params.json")
-            if not os.path.exists(params_path):
-                raise FileNotFoundError(f"파라미터 파일을 찾을 수 없습니다: {params_path}")
-            
-            with open(params_path, 'r', encoding='utf-8') as f:
-                self.params = json.load(f)
-            
-            # Word2Vec 모델 로드
-            w2v_model_path = os.path.join(self.model_dir, "w2v_model.model")
-            if not os.path.exists(w2v_model_path):
-                raise FileNotFoundError(f"Word2Vec 모델 파일을 찾을 수 없습니다: {w2v_model_path}")
-            
-            self.w2v_model = Word2Vec.load(w2v_model_path)
-            
-            # Color/Fabric 모델 로드
-            color_fabric_model_path = os.path.join(self.model_dir, "color_fabric_model.model")
-            if not os.path.exists(color_fabric_model_path):
-                raise FileNotFoundError(f"Color/Fabric 모델 파일을 찾을 수 없습니다: {color_fabric_model_path}")
-            
-            self.color_fabric_model = Word2Vec.load(color_fabric_model_path)
-            
-            # 병합 데이터 로드
-            merged_df_path = os.path.join(self.model_dir, "merged_df.pkl")
-            if not os.path.exists(merged_df_path):
-                raise FileNotFoundError(f"병합 데이터 파일을 찾을 수 없습니다: {merged_df_path}")
+            bundle_dir = self.bundle_dir or resolve_bundle_dir(self.model_dir, self.version)
+            if self.bundle_dir is not None or self.version is not None:
+                if not bundle_exists(bundle_dir):
+                    raise FileNotFoundError(f"모델 번들을 찾을 수 없습니다: {bundle_dir}")
+                self._load_serving_bundle(bundle_dir)
+            elif bundle_exists(bundle_dir):
+                try:
+                    self._load_serving_bundle(bundle_dir)
+                except Exception as e:
+                    print(f"⚠️ 서빙 번들 로드 실패, pickle 파일로 로드합니다: {e}")
+                    self._load_pickle_artifacts()
+            else:
+                self._load_pickle_artifacts()
             
-            with open(merged_df_path, 'rb') as f:
-                self.merged_df = pickle.load(f)
-            
-            # 필터링 데이터 로드
-            filtered_df_path = os.path.join(self.model_dir, "filtered_df.pkl")
-            if not os.path.exists(filtered_df_path):
-                raise FileNotFoundError(f"필터링 데이터 파일을 찾을 수 없습니다: {filtered_df_path}")
-            
-            with open(filtered_df_path, 'rb') as f:
-                self.filtered_df = pickle.load(f)
+            # feature 속성 값별 임베딩 테이블 및 centroid 사전 계산
+            self._build_feature_tables()
+            self._build_centroids()
+            self._build_token_index()
+            self._build_compatibility_tables()
             
             self._is_loaded = True
             return True
@@ -85,6 +108,234 @@ class ModelLoader:
             self._is_loaded = False
             return False
     
+    def _load_serving_bundle(self, bundle_dir: str) -> None:
+        """
+        서빙 번들(.npy + 메타데이터)을 메모리 매핑으로 로드합니다.
+        
+        Args:
+            bundle_dir: 번들 디렉토리 경로
+        """
+        bundle = load_serving_bundle(bundle_dir)
+        self.bundle_dir = bundle_dir
+        
+        self.params = bundle['params']
+        self.model_version = bundle['model_version']
+        self.w2v_vectors = bundle['w2v_vectors']
+        self.cf_vectors = bundle['cf_vectors']
+        self.coord_matrix = bundle['coord_matrix']
+        self.coord_mean_vector = bundle['coord_mean_vector'] if len(self.coord_matrix) > 0 else None
+        self.coord_ids = bundle['coord_ids']
+        self.coord_sentences = bundle['coord_sentences']
+        self.category_row_indices = bundle['category_row_indices']
+        self.category_coord_matrices = bundle['category_coord_matrices']
+        self.ann_index = bundle['ann_index']
+        self.compatibility_tables = bundle['compatibility_tables']
+        self.source = 'bundle'
+    
+    def _load_pickle_artifacts(self) -> None:
+        """
+        pickle로 저장된 DataFrame과 Word2Vec 모델을 로드합니다. (서빙 번들이 없을 때 사용)
+        
+        gensim과 pandas(pickle 복원 시)가 설치되어 있어야 합니다.
+        
+        Raises:
+            FileNotFoundError: 필요한 파일이 없는 경우
+            ImportError: gensim/pandas가 설치되어 있지 않은 경우
+        """
+        from gensim.models import Word2Vec
+        
+        # 파라미터 로드
+        params_path = os.path.join(self.model_dir, "params.json")
+        if not os.path.exists(params_path):
+            raise FileNotFoundError(f"파라미터 파일을 찾을 수 없습니다: {params_path}")
+        
+        with open(params_path, 'r', encoding='utf-8') as f:
+            self.params = json.load(f)
+        
+        # Word2Vec 모델 로드
+        w2v_model_path = os.path.join(self.model_dir, "w2v_model.model")
+        if not os.path.exists(w2v_model_path):
+            raise FileNotFoundError(f"Word2Vec 모델 파일을 찾을 수 없습니다: {w2v_model_path}")
+        
+        self.w2v_model = Word2Vec.load(w2v_model_path)
+        self.w2v_vectors = self.w2v_model.wv
+        
+        # Color/Fabric 모델 로드
+        color_fabric_model_path = os.path.join(self.model_dir, "color_fabric_model.model")
+        if not os.path.exists(color_fabric_model_path):
+            raise FileNotFoundError(f"Color/Fabric 모델 파일을 찾을 수 없습니다: {color_fabric_model_path}")
+        
+        self.color_fabric_model = Word2Vec.load(color_fabric_model_path)
+        self.cf_vectors = self.color_fabric_model.wv
+        
+        # 모델 버전 (학습 시 저장된 값, 없으면 아이템 벡터에 영향을 주는 파일로 계산)
+        self.model_version = self.params.get('model_version') or self._compute_model_version(
+            [params_path, w2v_model_path, color_fabric_model_path]
+        )
+        
+        # 병합 데이터 로드
+        merged_df_path = os.path.join(self.model_dir, "merged_df.pkl")
+        if not os.path.exists(merged_df_path):
+            raise FileNotFoundError(f"병합 데이터 파일을 찾을 수 없습니다: {merged_df_path}")
+        
+        with open(merged_df_path, 'rb') as f:
+            self.merged_df = pickle.load(f)
+        
+        # 필터링 데이터 로드
+        filtered_df_path = os.path.join(self.model_dir, "filtered_df.pkl")
+        if not os.path.exists(filtered_df_path):
+            raise FileNotFoundError(f"필터링 데이터 파일을 찾을 수 없습니다: {filtered_df_path}")
+        
+        with open(filtered_df_path, 'rb') as f:
+            self.filtered_df = pickle.load(f)
+        
+        if self.merged_df is not None and len(self.merged_df) > 0:
+            self.coord_ids = self.merged_df['coord_id'].tolist()
+            self.coord_sentences = self.merged_df['w2v_sentence'].fillna('').tolist()
+        
+        # 코디 벡터 행렬 사전 계산 (요청마다 DataFrame에서 다시 만들지 않도록)
+        self._build_coord_matrix()
+        self._build_category_index()
+        self.source = 'pickle'
+    
+    @staticmethod
+    def _compute_model_version(paths: List[str]) -> str:
+        """
+        파일 내용의 해시로 모델 버전 문자열을 만듭니다.
+        
+        DB에 저장된 아이템 임베딩이 현재 모델로 만든 것인지 확인하는 데 사용합니다.
+        
+        Args:
+            paths: 해시할 파일 경로 리스트
+            
+        Returns:
+            str: 모델 버전 (SHA-256 앞 16자리)
+        """
+        digest = hashlib.sha256()
+        for path in paths:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()[:16]
+    
+    def _build_feature_tables(self) -> None:
+        """
+        feature 문자열에 올 수 있는 속성 값(feature_space)마다 임베딩을 미리 계산합니다.
+        
+        - feature_part_table: 값 -> (값의 토큰 중 어휘에 있는 토큰 벡터 합, 토큰 수)
+        - color_table / fabric_table: 값 -> 가중치가 곱해진 색상/재질 벡터
+        
+        요청 시 item_to_vector가 Word2Vec 어휘를 조회하지 않고 테이블 조회와 합만으로 벡터를 만듭니다.
+        """
+        w2v_size = self.params['w2v_vector_size']
+        cf_size = self.params['cf_vector_size']
+        wv = self.w2v_vectors
+        cf_wv = self.cf_vectors
+        
+        self.feature_part_table = {}
+        for value in all_feature_values():
+            vectors = [wv[token] for token in value.split() if token in wv]
+            vector_sum = np.sum(vectors, axis=0, dtype=np.float64) if vectors else np.zeros(w2v_size)
+            self.feature_part_table[value] = (vector_sum, len(vectors))
+        
+        def weighted_vector(value: str, weight: float) -> np.ndarray:
+            if value in cf_wv:
+                return (cf_wv[value] * weight).astype(np.float32)
+            return np.zeros(cf_size, dtype=np.float32)
+        
+        self.color_table = {color: weighted_vector(color, self.params['color_weight']) for color in COLORS}
+        self.fabric_table = {fabric: weighted_vector(fabric, self.params['fabric_weight']) for fabric in MATERIALS}
+    
+    def _build_coord_matrix(self) -> None:
+        """
+        merged_df의 final_vector로 L2 정규화된 float32 코디 행렬과 전체 평균 벡터를 만듭니다.
+        
+        정규화된 행렬을 쓰면 코사인 유사도를 행렬 곱 한 번으로 계산할 수 있습니다.
+        (norm이 0인 행은 0 벡터로 남겨 유사도가 0이 되도록 합니다)
+        """
+        if self.merged_df is None or len(self.merged_df) == 0:
+            vector_size = self.params['w2v_vector_size'] + 2 * self.params['cf_vector_size']
+            self.coord_matrix = np.zeros((0, vector_size), dtype=np.float32)
+            self.coord_mean_vector = None
+            return
+        
+        raw_vectors = np.array(self.merged_df['final_vector'].tolist(), dtype=np.float64)
+        
+        # 선택된 아이템이 없을 때 타겟으로 쓰는 평균 벡터 (정규화 전 원본 벡터 기준)
+        self.coord_mean_vector = raw_vectors.mean(axis=0).astype(np.float32)
+        
+        norms = np.linalg.norm(raw_vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.coord_matrix = np.ascontiguousarray(raw_vectors / norms, dtype=np.float32)
+    
+    def _build_category_index(self) -> None:
+        """
+        카테고리별로 해당 카테고리가 포함된 코디의 행 인덱스와 부분 행렬을 만듭니다.
+        
+        요청마다 w2v_sentence 전체를 문자열 검색하지 않고 바로 슬라이스를 사용하기 위함입니다.
+        """
+        self.category_row_indices = {}
+        self.category_coord_matrices = {}
+        
+        if self.merged_df is None or len(self.merged_df) == 0:
+            return
+        
+        sentences = self.merged_df['w2v_sentence']
+        for category, category_kr in CATEGORY_KR_MAP.items():
+            mask = sentences.str.contains(category_kr, na=False).to_numpy()
+            row_indices = np.flatnonzero(mask)
+            self.category_row_indices[category] = row_indices
+            self.category_coord_matrices[category] = np.ascontiguousarray(self.coord_matrix[row_indices])
+    
+    def _build_centroids(self) -> None:
+        """
+        정규화된 코디 벡터들의 평균(centroid)을 전체/카테고리별로 계산합니다.
+        
+        고정된 코디 집합과의 코사인 유사도 평균은 centroid와의 내적과 같으므로,
+        아이템마다 코디 전체와 비교하지 않고 벡터 하나와의 내적으로 계산할 수 있습니다.
+        (정확도를 위해 float64로 합산합니다)
+        """
+        self.category_centroids = {}
+        
+        if len(self.coord_matrix) == 0:
+            self.coord_centroid = None
+            return
+        
+        self.coord_centroid = self.coord_matrix.mean(axis=0, dtype=np.float64)
+        for category, category_matrix in self.category_coord_matrices.items():
+            if len(category_matrix) > 0:
+                self.category_centroids[category] = category_matrix.mean(axis=0, dtype=np.float64)
+    
+    def _build_token_index(self) -> None:
+        """
+        코디 문장의 토큰별로 해당 토큰이 포함된 코디 행 번호 배열(역색인)을 만듭니다.
+        
+        선택된 아이템과 토큰을 공유하는 코디를 벡터 계산 없이 정렬된 배열의 교집합으로 찾기 위함입니다.
+        (토큰화는 feature_to_tokens와 같은 규칙: '_'와 공백으로 분리)
+        """
+        postings: Dict[str, List[int]] = {}
+        for row, sentence in enumerate(self.coord_sentences):
+            for token in set(sentence.replace('_', ' ').split()):
+                postings.setdefault(token, []).append(row)
+        
+        # 행 순서대로 추가했으므로 이미 정렬되어 있음
+        self.token_postings = {
+            token: np.asarray(rows, dtype=np.int64)
+            for token, rows in postings.items()
+        }
+    
+    def _build_compatibility_tables(self) -> None:
+        """
+        서빙 번들에 속성 궁합 테이블이 없으면 (pickle 로드, 이전 번들) 코디 문장으로 계산합니다.
+        
+        코디 행은 아이템 수만큼 반복되므로 코디 ID마다 한 번씩 셉니다. (학습 시 만든 테이블과 같은 값)
+        """
+        if self.compatibility_tables is not None:
+            return
+        self.compatibility_tables = build_compatibility_tables(
+            dict(zip(self.coord_ids, self.coord_sentences)).values()
+        )
+    
     def is_loaded(self) -> bool:
         """모델이 로드되었는지 확인"""
         return self._is_loaded
@@ -103,8 +354,8 @@ class ModelLoader:
             raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
         
         vector_size = self.params['w2v_vector_size']
-        if token in self.w2v_model.wv:
-            return self.w2v_model.wv[token]
+        if token in self.w2v_vectors:
+            return self.w2v_vectors[token]
         else:
             return np.zeros(vector_size)
     
@@ -122,8 +373,8 @@ class ModelLoader:
             raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
         
         vector_size = self.params['cf_vector_size']
-        if isinstance(color, str) and color.lower() in self.color_fabric_model.wv:
-            return self.color_fabric_model.wv[color.lower()]
+        if isinstance(color, str) and color.lower() in self.cf_vectors:
+            return self.cf_vectors[color.lower()]
         else:
             return np.zeros(vector_size)
     
@@ -141,8 +392,8 @@ class ModelLoader:
             raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
         
         vector_size = self.params['cf_vector_size']
-        if isinstance(fabric, str) and fabric.lower() in self.color_fabric_model.wv:
-            return self.color_fabric_model.wv[fabric.lower()]
+        if isinstance(fabric, str) and fabric.lower() in self.cf_vectors:
+            return self.cf_vectors[fabric.lower()]
         else:
             return np.zeros(vector_size)
     
@@ -160,46 +411,475 @@ class ModelLoader:
             raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
         
         vector_size = self.params['w2v_vector_size']
-        vectors = [self.w2v_model.wv[word] for word in tokens if word in self.w2v_model.wv]
+        vectors = [self.w2v_vectors[word] for word in tokens if word in self.w2v_vectors]
         return np.mean(vectors, axis=0) if vectors else np.zeros(vector_size)
     
+    def lookup_feature_vector(self, feature: str) -> Optional[np.ndarray]:
+        """
+        사전 계산된 테이블로 feature의 최종 벡터(w2v + color + fabric)를 만듭니다.
+        
+        Args:
+            feature: Feature 문자열 (카테고리_색상_재질_상세정보_성별_계절_스타일)
+            
+        Returns:
+            Optional[np.ndarray]: 최종 벡터 (테이블에 없는 값이 있으면 None)
+        """
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        
+        parts = feature.split('_')
+        if len(parts) != FEATURE_PART_COUNT:
+            return None
+        
+        try:
+            entries = [self.feature_part_table[part] for part in parts]
+            color_vector = self.color_table[parts[1]]
+            fabric_vector = self.fabric_table[parts[2]]
+        except KeyError:
+            return None
+        
+        token_count = sum(count for _, count in entries)
+        if token_count > 0:
+            w2v_vector = (sum(vector_sum for vector_sum, _ in entries) / token_count).astype(np.float32)
+        else:
+            w2v_vector = np.zeros(self.params['w2v_vector_size'], dtype=np.float32)
+        
+        return np.concatenate([w2v_vector, color_vector, fabric_vector])
+    
+    def get_model_version(self) -> Optional[str]:
+        """모델 버전을 반환합니다. (로드 전이면 None)"""
+        return self.model_version
+    
     def get_params(self) -> Dict[str, Any]:
         """파라미터를 반환합니다."""
         return self.params.copy()
     
+    def get_coord_info(self, index: int) -> Dict[str, Any]:
+        """
+        코디 행렬의 행 번호에 해당하는 코디 정보를 반환합니다.
+        
+        Args:
+            index: 코디 행 번호 (coord_matrix 행 순서)
+            
+        Returns:
+            Dict: {"coord_id": ..., "w2v_sentence": ...}
+        """
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        return {
+            'coord_id': self.coord_ids[index],
+            'w2v_sentence': self.coord_sentences[index]
+        }
+    
+    def get_ann_index(self) -> Optional[IVFIndex]:
+        """코디 검색용 IVF 인덱스를 반환합니다. (pickle로 로드했거나 인덱스가 없는 번들이면 None)"""
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        return self.ann_index
+    
+    def get_compatibility_tables(self) -> CompatibilityTables:
+        """카테고리 간 속성 궁합 테이블을 반환합니다."""
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        return self.compatibility_tables
+    
+    def get_token_postings(self, token: str) -> Optional[np.ndarray]:
+        """
+        토큰이 포함된 코디 행 번호 배열을 반환합니다.
+        
+        Args:
+            token: feature 토큰 (예: '상의', 'white', 'cotton')
+            
+        Returns:
+            Optional[np.ndarray]: 정렬된 코디 행 번호 (코디 데이터에 없는 토큰이면 None)
+        """
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        return self.token_postings.get(token)
+    
     def get_merged_df(self):
-        """병합된 데이터프레임을 반환합니다."""
+        """병합된 데이터프레임을 반환합니다. (서빙 번들로 로드한 경우 None)"""
         if not self._is_loaded:
             raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
         return self.merged_df
     
+    def get_coord_matrix(self) -> np.ndarray:
+        """L2 정규화된 코디 벡터 행렬 (merged_df / coords.csv 행 순서와 동일)을 반환합니다."""
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        return self.coord_matrix
+    
+    def get_category_coord_matrix(self, category: str) -> np.ndarray:
+        """
+        해당 카테고리가 포함된 코디들의 정규화된 벡터 행렬을 반환합니다.
+        
+        Args:
+            category: 카테고리 이름 ('top', 'bottom', 'shoes', 'outer')
+            
+        Returns:
+            np.ndarray: 부분 행렬 (알 수 없는 카테고리이거나 해당 코디가 없으면 전체 행렬)
+        """
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        
+        category_matrix = self.category_coord_matrices.get(category)
+        if category_matrix is None or len(category_matrix) == 0:
+            return self.coord_matrix
+        return category_matrix
+    
+    def get_category_centroid(self, category: str) -> Optional[np.ndarray]:
+        """
+        해당 카테고리 코디들의 정규화된 벡터 평균을 반환합니다.
+        
+        Args:
+            category: 카테고리 이름 ('top', 'bottom', 'shoes', 'outer')
+            
+        Returns:
+            Optional[np.ndarray]: centroid (해당 코디가 없으면 전체 centroid, 코디 데이터가 없으면 None)
+        """
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        return self.category_centroids.get(category, self.coord_centroid)
+    
+    def get_category_row_indices(self, category: str) -> Optional[np.ndarray]:
+        """해당 카테고리가 포함된 코디의 행 인덱스를 반환합니다. (없으면 None)"""
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        return self.category_row_indices.get(category)
+    
+    def get_coord_mean_vector(self) -> Optional[np.ndarray]:
+        """전체 코디 벡터의 평균 벡터를 반환합니다. (코디 데이터가 없으면 None)"""
+        if not self._is_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
+        return self.coord_mean_vector
+    
     def get_filtered_df(self):
-        """필터링된 데이터프레임을 반환합니다."""
+        """필터링된 데이터프레임을 반환합니다. (서빙 번들로 로드한 경우 None)"""
         if not self._is_loaded:
             raise RuntimeError("모델이 로드되지 않았습니다. load()를 먼저 호출하세요.")
         return self.filtered_df
 
 
+# 모델 로드 상태 (get_model_load_status에서 반환)
+MODEL_STATE_NOT_LOADED = "not_loaded"
+MODEL_STATE_LOADING = "loading"
+MODEL_STATE_READY = "ready"
+MODEL_STATE_FAILED = "failed"
+
 # 싱글톤 인스턴스 (서버에서 한 번만 로드)
 _model_loader_instance: Optional[ModelLoader] = None
 
+# 동시에 여러 요청이 와도 모델은 한 번만 로드 (single-flight)
+_model_loader_lock = threading.Lock()
+_model_loading = False
+_model_load_error: Optional[str] = None
+_model_load_thread: Optional[threading.Thread] = None
+_model_dir: Optional[str] = None
+
+# 재학습된 모델을 재시작 없이 교체 (백그라운드 로드 후 인스턴스 참조만 교체)
+_model_reloading = False
+_model_reload_error: Optional[str] = None
+_model_reload_failed_version: Optional[str] = None
+_model_reload_thread: Optional[threading.Thread] = None
+_model_watcher_thread: Optional[threading.Thread] = None
+
+def get_loaded_model_loader() -> Optional[ModelLoader]:
+    """
+    이미 로드된 ModelLoader 인스턴스를 반환합니다.
+    로드되지 않았으면 새로 로드하지 않고 None을 반환합니다.
+    
+    Returns:
+        Optional[ModelLoader]: 로드된 모델 로더 (없으면 None)
+    """
+    if _model_loader_instance is not None and _model_loader_instance.is_loaded():
+        return _model_loader_instance
+    return None
+
+
 def get_model_loader(model_dir: Optional[str] = None) -> ModelLoader:
     """
     싱글톤 패턴으로 ModelLoader 인스턴스를 반환합니다.
     서버 시작 시 한 번만 로드하여 재사용합니다.
     
+    여러 스레드가 동시에 호출해도 로드는 한 번만 실행되고, 나머지는 로드가 끝날 때까지 기다립니다.
+    로드에 실패하면 인스턴스를 저장하지 않으므로 다음 호출에서 다시 시도합니다.
+    
     Args:
         model_dir: 모델 디렉토리 경로 (None이면 기본값 사용)
         
     Returns:
         ModelLoader: 모델 로더 인스턴스
+        
+    Raises:
+        RuntimeError: 모델 로드에 실패한 경우
     """
-    global _model_loader_instance
+    global _model_loader_instance, _model_loading, _model_load_error, _model_dir
+    
+    if _model_loader_instance is not None:
+        return _model_loader_instance
     
-    if _model_loader_instance is None:
-        _model_loader_instance = ModelLoader(model_dir)
-        if not _model_loader_instance.load():
-            raise RuntimeError("모델 로드에 실패했습니다.")
+    with _model_loader_lock:
+        if _model_loader_instance is None:
+            _model_loading = True
+            _model_dir = model_dir
+            try:
+                loader = ModelLoader(model_dir)
+                if not loader.load():
+                    _model_load_error = "모델 로드에 실패했습니다."
+                    raise RuntimeError(_model_load_error)
+                _model_loader_instance = loader
+                _model_load_error = None
+            except Exception as e:
+                # load()가 예외를 던진 경우도 실패 상태로 보고 (요청 경로에서 다시 로드하지 않도록)
+                _model_load_error = str(e) or "모델 로드에 실패했습니다."
+                raise
+            finally:
+                _model_loading = False
     
     return _model_loader_instance
 
+
+def start_model_loading(model_dir: Optional[str] = None) -> bool:
+    """
+    백그라운드 스레드에서 모델 로드를 시작합니다. (서버 시작을 막지 않도록)
+    
+    이미 로드되었거나 로드 중이면 새로 시작하지 않습니다.
+    
+    Args:
+        model_dir: 모델 디렉토리 경로 (None이면 기본값 사용)
+        
+    Returns:
+        bool: 새로 로드를 시작했으면 True
+    """
+    global _model_loading, _model_load_thread
+    
+    with _model_loader_lock:
+        if _model_loader_instance is not None or _model_loading:
+            return False
+        # 스레드가 lock을 잡기 전에도 /ready에서 로드 중으로 보이도록 미리 표시
+        _model_loading = True
+    
+    def load_in_background():
+        global _model_loading
+        try:
+            get_model_loader(model_dir)
+        except Exception as e:
+            print(f"❌ 백그라운드 모델 로드 실패: {e}")
+        finally:
+            _model_loading = False
+    
+    _model_load_thread = threading.Thread(target=load_in_background, name="model-loader", daemon=True)
+    _model_load_thread.start()
+    return True
+
+
+def wait_for_model_loader(timeout: Optional[float] = None) -> Optional[ModelLoader]:
+    """
+    백그라운드 모델 로드가 끝날 때까지 기다립니다.
+    
+    Args:
+        timeout: 최대 대기 시간(초) (None이면 끝날 때까지 대기)
+        
+    Returns:
+        Optional[ModelLoader]: 로드된 모델 로더 (로드 실패/시간 초과 시 None)
+    """
+    thread = _model_load_thread
+    if thread is not None:
+        thread.join(timeout)
+    return get_loaded_model_loader()
+
+
+def is_model_loading() -> bool:
+    """모델을 로드하는 중인지 확인합니다."""
+    return _model_loading or (_model_load_thread is not None and _model_load_thread.is_alive())
+
+
+def get_model_load_state() -> str:
+    """
+    모델 로드 상태만 반환합니다. (파일을 읽지 않으므로 요청 경로에서 사용)
+    
+    Returns:
+        str: not_loaded, loading, ready, failed
+    """
+    if get_loaded_model_loader() is not None:
+        return MODEL_STATE_READY
+    if is_model_loading():
+        return MODEL_STATE_LOADING
+    if _model_load_error is not None:
+        return MODEL_STATE_FAILED
+    return MODEL_STATE_NOT_LOADED
+
+
+def get_available_model_version() -> Optional[str]:
+    """
+    models/CURRENT가 가리키는 (다음에 로드될) 모델 버전을 반환합니다. (파일을 읽으므로 요청마다 호출하지 않음)
+    
+    Returns:
+        Optional[str]: 버전 이름 (CURRENT가 없으면 None)
+    """
+    return read_current_version(_model_dir or DEFAULT_MODEL_DIR)
+
+
+def get_model_load_status() -> Dict[str, Any]:
+    """
+    모델 로드 상태를 반환합니다. (/ready 엔드포인트용)
+    
+    Returns:
+        Dict: state (not_loaded/loading/ready/failed), model_version, source, error
+    """
+    loader = get_loaded_model_loader()
+    state = MODEL_STATE_READY if loader is not None else get_model_load_state()
+    
+    return {
+        "state": state,
+        "model_version": loader.get_model_version() if loader else None,
+        "source": loader.source if loader else None,
+        "error": _model_load_error if state == MODEL_STATE_FAILED else None,
+        "available_version": get_available_model_version(),
+        "reloading": is_model_reloading(),
+        "reload_error": _model_reload_error
+    }
+
+
+def _reload_model(version: Optional[str]) -> None:
+    """
+    새 ModelLoader를 로드한 뒤 싱글톤 참조를 교체합니다. (start_model_reload의 스레드에서 실행)
+    
+    진행 중인 요청은 이미 받아 둔 이전 ModelLoader로 끝까지 처리되고,
+    이전 로더는 참조가 모두 사라지면 해제됩니다.
+    """
+    global _model_loader_instance, _model_load_error, _model_reloading
+    global _model_reload_error, _model_reload_failed_version
+    
+    try:
+        loader = ModelLoader(_model_dir, version)
+        if not loader.load():
+            _model_reload_error = f"모델 재로드에 실패했습니다: {version or 'CURRENT'}"
+            _model_reload_failed_version = version
+            print(f"❌ {_model_reload_error}")
+            return
+        
+        with _model_loader_lock:
+            previous = _model_loader_instance
+            _model_loader_instance = loader
+            _model_load_error = None
+            _model_reload_error = None
+            _model_reload_failed_version = None
+        print(
+            f"✅ 모델 교체 완료: {previous.get_model_version() if previous else None} "
+            f"-> {loader.get_model_version()}"
+        )
+    finally:
+        _model_reloading = False
+
+
+def start_model_reload(version: Optional[str] = None) -> bool:
+    """
+    백그라운드 스레드에서 모델을 다시 로드하고, 로드가 끝나면 사용 중인 모델을 교체합니다.
+    
+    로드하는 동안에는 기존 모델로 계속 추천하며, 재로드는 한 번에 하나만 실행합니다.
+    
+    Args:
+        version: 로드할 번들 버전 (None이면 models/CURRENT가 가리키는 버전)
+        
+    Returns:
+        bool: 새로 재로드를 시작했으면 True (이미 재로드 중이면 False)
+    """
+    global _model_reloading, _model_reload_thread
+    
+    with _model_loader_lock:
+        if _model_reloading:
+            return False
+        _model_reloading = True
+    
+    _model_reload_thread = threading.Thread(
+        target=_reload_model, args=(version,), name="model-reloader", daemon=True
+    )
+    _model_reload_thread.start()
+    return True
+
+
+def wait_for_model_reload(timeout: Optional[float] = None) -> Optional[ModelLoader]:
+    """
+    진행 중인 모델 재로드가 끝날 때까지 기다립니다.
+    
+    Args:
+        timeout: 최대 대기 시간(초) (None이면 끝날 때까지 대기)
+        
+    Returns:
+        Optional[ModelLoader]: 현재 사용 중인 모델 로더
+    """
+    thread = _model_reload_thread
+    if thread is not None:
+        thread.join(timeout)
+    return get_loaded_model_loader()
+
+
+def is_model_reloading() -> bool:
+    """모델을 다시 로드하는 중인지 확인합니다."""
+    return _model_reloading
+
+
+def has_model_version(version: str) -> bool:
+    """
+    models/versions/{version}에 서빙 번들이 있는지 확인합니다.
+    
+    Args:
+        version: 버전 이름 (디렉토리 이름만 허용)
+        
+    Returns:
+        bool: 번들이 있으면 True
+    """
+    if not version or version.startswith('.') or os.path.basename(version) != version:
+        return False
+    return bundle_exists(resolve_bundle_dir(_model_dir or DEFAULT_MODEL_DIR, version))
+
+
+def check_for_model_update() -> bool:
+    """
+    models/CURRENT가 가리키는 버전이 사용 중인 모델과 다르면 재로드를 시작합니다.
+    
+    Returns:
+        bool: 재로드를 시작했으면 True
+    """
+    loader = get_loaded_model_loader()
+    if loader is None:
+        return False
+    
+    available_version = read_current_version(_model_dir or DEFAULT_MODEL_DIR)
+    if available_version is None or available_version == loader.get_model_version():
+        return False
+    
+    # 같은 버전을 로드하다 실패했으면 CURRENT가 바뀔 때까지 다시 시도하지 않음
+    if available_version == _model_reload_failed_version:
+        return False
+    
+    return start_model_reload(available_version)
+
+
+def start_model_watcher(interval: float) -> bool:
+    """
+    models/CURRENT를 주기적으로 확인해 새 버전이 배포되면 자동으로 재로드하는 스레드를 시작합니다.
+    
+    Args:
+        interval: 확인 주기(초)
+        
+    Returns:
+        bool: 새로 시작했으면 True (이미 실행 중이면 False)
+    """
+    global _model_watcher_thread
+    
+    if _model_watcher_thread is not None and _model_watcher_thread.is_alive():
+        return False
+    
+    def watch():
+        while True:
+            time.sleep(interval)
+            try:
+                check_for_model_update()
+            except Exception as e:
+                print(f"⚠️ 모델 버전 확인 실패: {e}")
+    
+    _model_watcher_thread = threading.Thread(target=watch, name="model-watcher", daemon=True)
+    _model_watcher_thread.start()
+    return True
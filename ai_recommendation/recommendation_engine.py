@@ -3,11 +3,31 @@
 API 요청 시 추천 로직을 실행하여 코디를 추천합니다.
 """
 
+import time
 import numpy as np
-from typing import Dict, List, Optional, Any
-from sklearn.metrics.pairwise import cosine_similarity
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from .model_loader import ModelLoader
 
+# 추천 대상 카테고리와 필수 카테고리
+OUTFIT_CATEGORIES = ['top', 'bottom', 'shoes', 'outer']
+REQUIRED_CATEGORIES = ['top', 'bottom', 'shoes']
+
+# 코디 조합 탐색 시 서로 다른 카테고리 아이템 쌍의 코사인 유사도(궁합) 가중치
+OUTFIT_PAIR_WEIGHT = 0.3
+
+# 코디 조합 탐색 시 카테고리를 하나 채울 때마다 유지할 부분 코디 수
+DEFAULT_BEAM_WIDTH = 64
+
+# 속성 기반 추천(모델 없이 사용하는 대체 추천)의 속성별 가중치와 무채색 목록
+ATTRIBUTE_SEASON_WEIGHT = 1.0
+ATTRIBUTE_STYLE_WEIGHT = 1.0
+ATTRIBUTE_COLOR_WEIGHT = 0.5
+NEUTRAL_COLORS = {'white', 'black', 'gray', 'navy', 'beige'}
+ALL_SEASON = '사계절'
+# 환절기 계절끼리는 절반만 맞는 것으로 계산
+TRANSITIONAL_SEASONS = {'봄', '가을'}
+
 
 def parse_feature(feature: str) -> Dict[str, str]:
     """
@@ -70,6 +90,12 @@ def item_to_vector(feature: str, model_loader: ModelLoader) -> np.ndarray:
     Returns:
         np.ndarray: 최종 벡터
     """
+    # 알려진 속성 값으로만 이루어진 feature는 사전 계산된 테이블로 바로 변환
+    final_vector = model_loader.lookup_feature_vector(feature)
+    if final_vector is not None:
+        return final_vector
+    
+    # 테이블에 없는 값(이전 형식 등)이 있으면 Word2Vec 어휘를 직접 조회
     parsed = parse_feature(feature)
     params = model_loader.get_params()
     
@@ -91,6 +117,44 @@ def item_to_vector(feature: str, model_loader: ModelLoader) -> np.ndarray:
     return final_vector
 
 
+def get_item_vector(item: Dict[str, Any], model_loader: ModelLoader) -> np.ndarray:
+    """
+    아이템 딕셔너리의 벡터를 반환합니다.
+    미리 계산된 'vector'가 있으면 그대로 사용하고, 없으면 feature로 계산합니다.
+    
+    Args:
+        item: 아이템 정보 (예: {"id": 1, "feature": "...", "vector": np.ndarray})
+        model_loader: 모델 로더 인스턴스
+        
+    Returns:
+        np.ndarray: 아이템 벡터
+    """
+    vector = item.get('vector')
+    if vector is not None:
+        return vector
+    return item_to_vector(item.get('feature', ''), model_loader)
+
+
+def normalize_vector(vector: np.ndarray) -> np.ndarray:
+    """
+    벡터를 L2 정규화합니다. (float32)
+    
+    정규화된 벡터끼리의 내적은 코사인 유사도와 같습니다.
+    norm이 0이면 0 벡터를 그대로 반환합니다.
+    
+    Args:
+        vector: 입력 벡터
+        
+    Returns:
+        np.ndarray: 정규화된 벡터
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        return vector
+    return vector / norm
+
+
 def category_mapping(category: str) -> str:
     """
     카테고리 이름을 매핑합니다.
@@ -114,50 +178,247 @@ def category_mapping(category: str) -> str:
     return mapping.get(category, category)
 
 
+def intersect_sorted(small: np.ndarray, large: np.ndarray) -> np.ndarray:
+    """
+    정렬된 두 배열의 교집합을 구합니다.
+    
+    작은 배열의 각 값을 큰 배열에서 이진 탐색하므로 O(len(small) * log(len(large)))입니다.
+    (자주 나오는 토큰의 긴 배열을 전부 읽지 않음)
+    
+    Args:
+        small: 정렬된 배열 (짧은 쪽)
+        large: 정렬된 배열 (긴 쪽)
+        
+    Returns:
+        np.ndarray: 정렬된 교집합
+    """
+    if len(small) == 0 or len(large) == 0:
+        return small[:0]
+    positions = np.searchsorted(large, small)
+    positions[positions == len(large)] = len(large) - 1
+    return small[large[positions] == small]
+
+
+def find_candidate_coords(
+    tokens: List[str],
+    model_loader: ModelLoader,
+    min_candidates: int = 1
+) -> Optional[np.ndarray]:
+    """
+    토큰 역색인으로 주어진 토큰을 공유하는 코디 행 번호를 찾습니다. (벡터 계산 없음)
+    
+    드문 토큰부터 교집합을 구하고, 어떤 토큰까지 요구하면 후보가 min_candidates보다
+    적어지는 경우 그 토큰은 건너뜁니다. (모든 토큰을 가진 코디가 없어도 후보가 남도록)
+    
+    Args:
+        tokens: feature 토큰 리스트 (예: feature_to_tokens(feature))
+        model_loader: 모델 로더 인스턴스
+        min_candidates: 최소 후보 수
+        
+    Returns:
+        Optional[np.ndarray]: 정렬된 코디 행 번호 (코디 데이터에 있는 토큰이 하나도 없으면 None)
+    """
+    postings = [
+        posting for posting in (model_loader.get_token_postings(token) for token in set(tokens))
+        if posting is not None
+    ]
+    if not postings:
+        return None
+    
+    postings.sort(key=len)
+    candidates = postings[0]
+    for posting in postings[1:]:
+        narrowed = intersect_sorted(candidates, posting)
+        if len(narrowed) >= min_candidates:
+            candidates = narrowed
+    return candidates
+
+
 def find_best_match(
     target_vector: np.ndarray,
     merged_df,
     selected_categories: List[str],
-    model_loader: ModelLoader
+    model_loader: ModelLoader,
+    nprobe: Optional[int] = None,
+    candidate_tokens: Optional[List[str]] = None
 ) -> Optional[Dict[str, Any]]:
     """
-    merged_df에서 가장 유사한 코디를 찾습니다.
+    코디 데이터에서 가장 유사한 코디를 찾습니다.
+    
+    candidate_tokens가 있으면 토큰 역색인으로 고른 후보 코디만 비교합니다.
+    그렇지 않으면 서빙 번들에 IVF 인덱스가 있을 때 가까운 클러스터만 검색하고(근사 검색),
+    없으면 전체 코디 행렬을 스캔합니다.
     
     Args:
         target_vector: 타겟 벡터
-        merged_df: 병합된 데이터프레임
+        merged_df: 병합된 데이터프레임 (사용하지 않음, 호환성을 위해 유지)
         selected_categories: 이미 선택된 카테고리 리스트
         model_loader: 모델 로더 인스턴스
+        nprobe: IVF 인덱스에서 확인할 클러스터 수 (None이면 인덱스 기본값, 클수록 정확하고 느림)
+        candidate_tokens: 후보 코디가 공유해야 할 토큰 (예: 선택된 아이템의 feature 토큰)
         
     Returns:
         Optional[Dict]: 가장 유사한 코디 정보 (없으면 None)
     """
-    if merged_df is None or len(merged_df) == 0:
+    # 사전 정규화된 코디 행렬과의 내적 = 코사인 유사도
+    coord_matrix = model_loader.get_coord_matrix()
+    if coord_matrix is None or len(coord_matrix) == 0:
         return None
     
-    # 코디 벡터들 추출
-    coord_vectors = np.array(merged_df['final_vector'].tolist())
-    
-    # 코사인 유사도 계산
-    similarities = cosine_similarity([target_vector], coord_vectors)[0]
+    candidate_rows = None
+    if candidate_tokens:
+        candidate_rows = find_candidate_coords(candidate_tokens, model_loader)
     
-    # 가장 유사한 코디 찾기
-    best_idx = np.argmax(similarities)
-    best_similarity = similarities[best_idx]
+    ann_index = model_loader.get_ann_index()
+    if candidate_rows is not None and len(candidate_rows) > 0:
+        # 후보 코디만 비교 (행 번호가 정렬되어 있으므로 동점이면 앞 행 우선)
+        similarities = coord_matrix[candidate_rows] @ normalize_vector(target_vector)
+        best = int(np.argmax(similarities))
+        best_idx, best_similarity = int(candidate_rows[best]), similarities[best]
+    elif ann_index is not None:
+        indices, scores = ann_index.search(target_vector, k=1, nprobe=nprobe)
+        if len(indices) == 0:
+            return None
+        best_idx, best_similarity = int(indices[0]), scores[0]
+    else:
+        similarities = coord_matrix @ normalize_vector(target_vector)
+        
+        # 가장 유사한 코디 찾기
+        best_idx = int(np.argmax(similarities))
+        best_similarity = similarities[best_idx]
     
     # 유사도가 너무 낮으면 None 반환
     if best_similarity < 0.3:
         return None
     
-    best_coord = merged_df.iloc[best_idx]
+    best_coord = model_loader.get_coord_info(best_idx)
     
     return {
-        'coord_id': best_coord.get('coord_id', None),
-        'w2v_sentence': best_coord.get('w2v_sentence', ''),
+        'coord_id': best_coord['coord_id'],
+        'w2v_sentence': best_coord['w2v_sentence'],
         'similarity': float(best_similarity)
     }
 
 
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    행렬의 각 행을 L2 정규화합니다. (float32, norm이 0인 행은 0으로 유지)
+    
+    Args:
+        matrix: (n, dim) 행렬
+        
+    Returns:
+        np.ndarray: 행 정규화된 행렬
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def items_to_matrix(
+    items: List[Dict[str, Any]],
+    model_loader: ModelLoader
+) -> Tuple[List[Any], np.ndarray]:
+    """
+    아이템 리스트를 (id 리스트, 벡터 행렬)로 변환합니다.
+    feature가 없거나 벡터 변환에 실패한 아이템은 제외합니다.
+    
+    Args:
+        items: 아이템 리스트 (예: [{"id": 1, "feature": "..."}, ...])
+        model_loader: 모델 로더 인스턴스
+        
+    Returns:
+        Tuple[List, np.ndarray]: (아이템 ID 리스트, (n, dim) float32 벡터 행렬)
+    """
+    item_ids = []
+    vectors = []
+    for item in items:
+        feature = item.get('feature', '')
+        if not feature:
+            continue
+        
+        try:
+            vectors.append(get_item_vector(item, model_loader))
+            item_ids.append(item.get('id'))
+        except Exception as e:
+            print(f"⚠️ 벡터 변환 실패 (item_id={item.get('id')}): {e}")
+            continue
+    
+    if not vectors:
+        return [], np.zeros((0, 0), dtype=np.float32)
+    
+    return item_ids, np.asarray(vectors, dtype=np.float32)
+
+
+def score_items(
+    category: str,
+    item_matrix: np.ndarray,
+    target_vector: np.ndarray,
+    model_loader: ModelLoader
+) -> np.ndarray:
+    """
+    카테고리 후보 아이템 전체의 종합 점수를 한 번의 행렬 곱으로 계산합니다.
+    
+    종합 점수 = 카테고리 코디 유사도 평균 * 0.7 + 타겟 유사도 * 0.3
+    
+    Args:
+        category: 카테고리 이름 ('top', 'bottom', 'shoes', 'outer')
+        item_matrix: 후보 아이템 벡터 행렬 (n, dim)
+        target_vector: 타겟 벡터
+        model_loader: 모델 로더 인스턴스
+        
+    Returns:
+        np.ndarray: 아이템별 종합 점수 (n,)
+    """
+    # 해당 카테고리 코디들의 정규화된 벡터 평균 (로드 시 사전 계산)
+    # mean(cos(item, coord_i)) == centroid · item_unit 이므로 코디 수와 무관하게 계산됨
+    centroid = model_loader.get_category_centroid(category)
+    if centroid is None:
+        centroid = np.zeros(item_matrix.shape[1], dtype=np.float32)
+    
+    # 같은 벡터를 가진 아이템은 한 번만 계산 (BLAS 반올림 차이로 동점 순서가 바뀌지 않도록)
+    unique_rows, inverse = np.unique(item_matrix, axis=0, return_inverse=True)
+    
+    # [centroid, target] 두 기준 벡터와의 유사도를 한 번에 계산
+    references = np.stack([
+        np.asarray(centroid, dtype=np.float32),
+        normalize_vector(target_vector)
+    ], axis=1)
+    similarities = normalize_rows(unique_rows) @ references
+    
+    scores = similarities[:, 0] * 0.7 + similarities[:, 1] * 0.3
+    return scores[inverse.reshape(-1)]
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    점수가 높은 상위 k개의 인덱스를 내림차순으로 반환합니다.
+    (np.argpartition으로 전체 정렬 없이 상위 k개만 고름)
+    
+    Args:
+        scores: 점수 배열
+        k: 반환할 개수
+        
+    Returns:
+        np.ndarray: 상위 k개 인덱스 (점수 내림차순, 동점이면 앞 인덱스 우선)
+    """
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    if k < n:
+        # k번째 점수와 동점인 항목까지 포함해야 앞 인덱스 우선 규칙이 유지됨
+        kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        candidates = np.flatnonzero(scores >= kth_score)
+    else:
+        candidates = np.arange(n)
+    
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:k]
+
+
 def recommend_category(
     category: str,
     available_items: List[Dict[str, Any]],
@@ -172,7 +433,7 @@ def recommend_category(
         category: 카테고리 이름 ('top', 'bottom', 'shoes', 'outer')
         available_items: 선택 가능한 아이템 리스트
         target_vector: 타겟 벡터
-        merged_df: 병합된 데이터프레임
+        merged_df: 병합된 데이터프레임 (사용하지 않음, 호환성을 위해 유지)
         model_loader: 모델 로더 인스턴스
         
     Returns:
@@ -181,121 +442,269 @@ def recommend_category(
     if not available_items:
         return None
     
-    # 각 아이템의 벡터 계산
-    item_vectors = []
-    for item in available_items:
-        feature = item.get('feature', '')
-        if not feature:
-            continue
+    # 후보 아이템 벡터를 하나의 행렬로 쌓기
+    item_ids, item_matrix = items_to_matrix(available_items, model_loader)
+    if not item_ids:
+        return None
+    
+    # 모든 후보의 종합 점수를 한 번에 계산하고 최고점 아이템 선택
+    scores = score_items(category, item_matrix, target_vector, model_loader)
+    best_idx = top_k_indices(scores, 1)[0]
+    
+    return item_ids[best_idx]
+
+
+def build_target_vector(
+    selected_items: Dict[str, Optional[Dict[str, Any]]],
+    model_loader: ModelLoader
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    선택된 아이템들로 추천 기준이 되는 타겟 벡터를 만듭니다.
+    
+    Args:
+        selected_items: 이미 선택된 아이템 (예: {"top": {"id": 1, "feature": "..."}, "bottom": None, ...})
+        model_loader: 모델 로더 인스턴스
         
-        try:
-            vector = item_to_vector(feature, model_loader)
-            item_vectors.append({
-                'id': item.get('id'),
-                'vector': vector,
-                'feature': feature
-            })
-        except Exception as e:
-            print(f"⚠️ 벡터 변환 실패 (item_id={item.get('id')}): {e}")
-            continue
+    Returns:
+        Tuple[np.ndarray, List[np.ndarray]]: (타겟 벡터, feature가 있는 선택 아이템 벡터 리스트)
+        
+    Raises:
+        ValueError: 선택된 아이템이 없고 코디 데이터도 비어있는 경우
+    """
+    # 선택된 아이템들의 feature를 벡터로 변환
+    selected_vectors = []
     
-    if not item_vectors:
-        return None
+    for category, item in selected_items.items():
+        if item is not None:
+            feature = item.get('feature', '')
+            if feature:
+                selected_vectors.append(get_item_vector(item, model_loader))
     
-    # merged_df에서 해당 카테고리가 포함된 코디 찾기
-    category_kr = {'top': '상의', 'bottom': '하의', 'shoes': '신발', 'outer': '아우터'}.get(category, '')
+    # 타겟 벡터 생성 (선택된 아이템들의 평균 벡터)
+    if selected_vectors:
+        target_vector = np.mean(selected_vectors, axis=0)
+    else:
+        # 선택된 아이템이 없으면 전체 코디의 평균 벡터 사용 (로드 시 사전 계산)
+        target_vector = model_loader.get_coord_mean_vector()
+        if target_vector is None:
+            raise ValueError("선택된 아이템이 없고 코디 데이터도 비어있습니다.")
     
-    if category_kr:
-        # 해당 카테고리가 포함된 코디만 필터링
-        filtered_df = merged_df[
-            merged_df['w2v_sentence'].str.contains(category_kr, na=False)
-        ]
+    return target_vector, selected_vectors
+
+
+def deadline_passed(deadline: Optional[float]) -> bool:
+    """
+    시간 예산이 끝났는지 확인합니다.
+    
+    Args:
+        deadline: time.monotonic() 기준 마감 시각 (None이면 제한 없음)
+        
+    Returns:
+        bool: 마감 시각이 지났으면 True
+    """
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def attribute_match_score(candidate: Dict[str, str], reference: Dict[str, str]) -> float:
+    """
+    두 아이템의 파싱된 속성(계절, 스타일, 색상)이 얼마나 어울리는지 점수를 계산합니다.
+    
+    - 계절: 같거나 한쪽이 사계절이면 1, 봄/가을끼리는 0.5
+    - 스타일: 같으면 1
+    - 색상: 한쪽이 무채색이면 1, 같은 유채색이면 0.5
+    
+    Args:
+        candidate: 후보 아이템 속성 (parse_feature 결과)
+        reference: 기준 아이템 속성 (parse_feature 결과)
+        
+    Returns:
+        float: 가중치를 적용한 점수
+    """
+    season_a, season_b = candidate.get('season', ''), reference.get('season', '')
+    if season_a and season_b and (season_a == season_b or ALL_SEASON in (season_a, season_b)):
+        season_score = 1.0
+    elif {season_a, season_b} <= TRANSITIONAL_SEASONS:
+        season_score = 0.5
     else:
-        filtered_df = merged_df
+        season_score = 0.0
     
-    if len(filtered_df) == 0:
-        # 필터링된 코디가 없으면 전체에서 찾기
-        filtered_df = merged_df
+    style_a, style_b = candidate.get('style', ''), reference.get('style', '')
+    style_score = 1.0 if style_a and style_a == style_b else 0.0
     
-    # 각 아이템과 코디의 유사도 계산
-    best_item = None
-    best_score = -1
+    color_a, color_b = candidate.get('color', ''), reference.get('color', '')
+    if color_a in NEUTRAL_COLORS or color_b in NEUTRAL_COLORS:
+        color_score = 1.0
+    elif color_a and color_a == color_b:
+        color_score = 0.5
+    else:
+        color_score = 0.0
+    
+    return (
+        ATTRIBUTE_SEASON_WEIGHT * season_score
+        + ATTRIBUTE_STYLE_WEIGHT * style_score
+        + ATTRIBUTE_COLOR_WEIGHT * color_score
+    )
+
+
+def closet_attribute_profile(available_items: Dict[str, List[Dict[str, Any]]]) -> Dict[str, str]:
+    """
+    선택된 아이템이 없을 때 기준으로 사용할 옷장의 대표 속성(가장 많은 계절, 스타일)을 구합니다.
+    
+    Args:
+        available_items: 선택 가능한 아이템 (recommend_outfit과 같은 형식)
+        
+    Returns:
+        Dict[str, str]: {"season": ..., "style": ..., "color": ""} (개수가 같으면 먼저 나온 값)
+    """
+    seasons: Counter = Counter()
+    styles: Counter = Counter()
+    for category in OUTFIT_CATEGORIES:
+        for item in available_items.get(category, []):
+            if item.get('feature'):
+                parsed = parse_feature(item['feature'])
+                if parsed['season'] and parsed['season'] != ALL_SEASON:
+                    seasons[parsed['season']] += 1
+                if parsed['style']:
+                    styles[parsed['style']] += 1
+    return {
+        'season': seasons.most_common(1)[0][0] if seasons else '',
+        'style': styles.most_common(1)[0][0] if styles else '',
+        'color': ''
+    }
+
+
+def recommend_category_by_attributes(
+    available_items: List[Dict[str, Any]],
+    references: List[Dict[str, str]]
+) -> Tuple[Optional[Any], float]:
+    """
+    기준 아이템들과 속성이 가장 잘 어울리는 아이템을 고릅니다. (모델과 벡터 계산 없음)
     
-    for item_info in item_vectors:
-        item_vector = item_info['vector']
+    Args:
+        available_items: 선택 가능한 아이템 리스트
+        references: 기준 아이템 속성 리스트 (parse_feature 결과)
         
-        # 코디 벡터들과의 유사도 계산
-        coord_vectors = np.array(filtered_df['final_vector'].tolist())
-        similarities = cosine_similarity([item_vector], coord_vectors)[0]
+    Returns:
+        Tuple: (추천된 아이템 ID, 기준 아이템과의 평균 점수) (후보가 없으면 (None, 0.0), 동점이면 앞 아이템)
+    """
+    best_id, best_score = None, -1.0
+    for item in available_items:
+        feature = item.get('feature', '')
+        if not feature:
+            continue
+        parsed = parse_feature(feature)
+        score = (
+            sum(attribute_match_score(parsed, reference) for reference in references) / len(references)
+            if references else 0.0
+        )
+        if score > best_score:
+            best_id, best_score = item.get('id'), score
+    return best_id, max(best_score, 0.0)
+
+
+def recommend_outfit_by_attributes(
+    selected_items: Dict[str, Optional[Dict[str, Any]]],
+    available_items: Dict[str, List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    모델 없이 feature의 색상/계절/스타일 속성만으로 코디를 추천합니다.
+    
+    모델을 사용할 수 없거나 시간 예산이 부족할 때 사용하는 대체 추천입니다.
+    선택된 아이템(없으면 옷장의 대표 속성)을 기준으로 카테고리를 순서대로 채우며,
+    앞에서 고른 아이템도 다음 카테고리의 기준에 포함합니다.
+    
+    Args:
+        selected_items: 이미 선택된 아이템 (recommend_outfit과 같은 형식, vector는 사용하지 않음)
+        available_items: 선택 가능한 아이템 (recommend_outfit과 같은 형식)
         
-        # 타겟 벡터와의 유사도도 고려
-        target_sim = cosine_similarity([item_vector], [target_vector])[0][0]
+    Returns:
+        Dict: 추천 결과
+            예: {"recommended_outfit": {"top": 1, ...}, "score": 5.5} (score는 추천 아이템 점수의 합)
         
-        # 종합 점수 (코디 유사도 평균 + 타겟 유사도)
-        coord_avg_sim = np.mean(similarities) if len(similarities) > 0 else 0
-        combined_score = (coord_avg_sim * 0.7) + (target_sim * 0.3)
+    Raises:
+        ValueError: 필수 카테고리를 채울 수 없는 경우
+    """
+    references = [
+        parse_feature(item['feature'])
+        for item in selected_items.values()
+        if item is not None and item.get('feature')
+    ]
+    if not references:
+        references = [closet_attribute_profile(available_items)]
+    
+    recommended_outfit: Dict[str, Optional[Any]] = {}
+    total_score = 0.0
+    for category in OUTFIT_CATEGORIES:
+        selected = selected_items.get(category)
+        if selected is not None:
+            recommended_outfit[category] = selected.get('id')
+            continue
         
-        if combined_score > best_score:
-            best_score = combined_score
-            best_item = item_info
+        available = available_items.get(category, [])
+        recommended_id, score = recommend_category_by_attributes(available, references)
+        recommended_outfit[category] = recommended_id
+        if recommended_id is not None:
+            total_score += score
+            chosen = next(item for item in available if item.get('id') == recommended_id)
+            references.append(parse_feature(chosen['feature']))
+    
+    for category in REQUIRED_CATEGORIES:
+        if recommended_outfit.get(category) is None:
+            raise ValueError(f"필수 카테고리 '{category}'에 대한 추천이 실패했습니다.")
     
-    return best_item['id'] if best_item else None
+    return {
+        "recommended_outfit": recommended_outfit,
+        "score": total_score
+    }
 
 
 def recommend_outfit(
     selected_items: Dict[str, Optional[Dict[str, Any]]],
     available_items: Dict[str, List[Dict[str, Any]]],
-    model_loader: ModelLoader
+    model_loader: ModelLoader,
+    deadline: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     코디를 추천합니다.
     
+    deadline이 지나면 남은 카테고리는 모델 대신 속성 기반 추천(recommend_category_by_attributes)으로
+    채워 지금까지의 결과를 바로 반환합니다.
+    
     Args:
         selected_items: 이미 선택된 아이템
             예: {"top": {"id": 1, "feature": "..."}, "bottom": None, ...}
         available_items: 선택 가능한 아이템
             예: {"bottom": [{"id": 2, "feature": "..."}, ...], ...}
+            (아이템에 미리 계산된 "vector"가 있으면 feature 대신 사용)
         model_loader: 모델 로더 인스턴스
+        deadline: time.monotonic() 기준 마감 시각 (None이면 제한 없음)
         
     Returns:
         Dict: 추천 결과
             예: {"recommended_outfit": {"top": 1, "bottom": 2, "shoes": 4, "outer": 5}}
+            (deadline을 지정하면 속성 기반으로 채운 카테고리 목록 "fallback_categories" 포함)
     """
     if not model_loader.is_loaded():
         raise RuntimeError("모델이 로드되지 않았습니다.")
     
-    # 선택된 아이템들의 feature를 벡터로 변환
-    selected_features = []
-    selected_categories = []
-    
-    for category, item in selected_items.items():
-        if item is not None:
-            feature = item.get('feature', '')
-            if feature:
-                selected_features.append(feature)
-                selected_categories.append(category_mapping(category))
-    
-    # 타겟 벡터 생성 (선택된 아이템들의 평균 벡터)
-    if selected_features:
-        target_vectors = [item_to_vector(f, model_loader) for f in selected_features]
-        target_vector = np.mean(target_vectors, axis=0)
-    else:
-        # 선택된 아이템이 없으면 merged_df의 평균 벡터 사용
-        merged_df = model_loader.get_merged_df()
-        if merged_df is not None and len(merged_df) > 0:
-            all_vectors = np.array(merged_df['final_vector'].tolist())
-            target_vector = np.mean(all_vectors, axis=0)
-        else:
-            raise ValueError("선택된 아이템이 없고 merged_df도 비어있습니다.")
+    target_vector, _ = build_target_vector(selected_items, model_loader)
     
-    # merged_df 가져오기
+    # 코디 데이터 확인
+    coord_matrix = model_loader.get_coord_matrix()
+    if coord_matrix is None or len(coord_matrix) == 0:
+        raise ValueError("코디 데이터가 비어있습니다.")
     merged_df = model_loader.get_merged_df()
-    if merged_df is None or len(merged_df) == 0:
-        raise ValueError("merged_df가 비어있습니다.")
     
     # 추천 결과 생성
     recommended_outfit: Dict[str, Optional[int]] = {}
     
+    # 시간 예산 초과 시 속성 기반 추천의 기준 (선택된 아이템 + 지금까지 추천한 아이템)
+    reference_features = [
+        item['feature'] for item in selected_items.values()
+        if item is not None and item.get('feature')
+    ]
+    fallback_categories: List[str] = []
+    
     categories = ['top', 'bottom', 'shoes', 'outer']
     
     for category in categories:
@@ -305,7 +714,14 @@ def recommend_outfit(
         else:
             # 추천 필요
             available = available_items.get(category, [])
-            if available:
+            if available and deadline_passed(deadline):
+                references = (
+                    [parse_feature(feature) for feature in reference_features]
+                    or [closet_attribute_profile(available_items)]
+                )
+                recommended_id, _ = recommend_category_by_attributes(available, references)
+                fallback_categories.append(category)
+            elif available:
                 recommended_id = recommend_category(
                     category=category,
                     available_items=available,
@@ -313,9 +729,14 @@ def recommend_outfit(
                     merged_df=merged_df,
                     model_loader=model_loader
                 )
-                recommended_outfit[category] = recommended_id
             else:
-                recommended_outfit[category] = None
+                recommended_id = None
+            
+            recommended_outfit[category] = recommended_id
+            if deadline is not None and recommended_id is not None:
+                reference_features.extend(
+                    item['feature'] for item in available if item.get('id') == recommended_id
+                )
     
     # 필수 카테고리 확인 (top, bottom, shoes는 필수)
     required_categories = ['top', 'bottom', 'shoes']
@@ -323,7 +744,514 @@ def recommend_outfit(
         if recommended_outfit.get(category) is None:
             raise ValueError(f"필수 카테고리 '{category}'에 대한 추천이 실패했습니다.")
     
-    return {
+    result: Dict[str, Any] = {
         "recommended_outfit": recommended_outfit
     }
+    if deadline is not None:
+        result["fallback_categories"] = fallback_categories
+    return result
+
+
+def recommend_outfits(
+    selected_items: Dict[str, Optional[Dict[str, Any]]],
+    available_items: Dict[str, List[Dict[str, Any]]],
+    model_loader: ModelLoader,
+    k: int = 1,
+    beam_width: Optional[int] = None,
+    deadline: Optional[float] = None,
+    max_candidates: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    코디 조합 전체를 평가해 점수가 높은 상위 k개의 서로 다른 코디를 추천합니다.
+    
+    recommend_outfit은 카테고리마다 따로 최고점 아이템을 고르지만, 여기서는 아이템끼리의 궁합을 포함한
+    코디 점수로 조합을 탐색합니다. 카테고리를 하나씩 채우면서 (부분 코디 수 x 후보 수) 점수를
+    행렬 연산으로 한 번에 계산하고, 점수 상위 beam_width개의 부분 코디만 남깁니다. (빔 탐색)
+    
+    코디 점수 = Σ 추천 아이템의 종합 점수(score_items)
+              + OUTFIT_PAIR_WEIGHT * Σ 서로 다른 카테고리 아이템 쌍의 코사인 유사도
+    (선택된 아이템과의 쌍은 포함, 선택된 아이템끼리의 쌍은 모든 조합에 같으므로 제외)
+    
+    deadline이 지나면 남은 단계는 빔 폭을 k로 줄여 지금까지의 부분 코디만 이어서 완성합니다.
+    
+    Args:
+        selected_items: 이미 선택된 아이템 (recommend_outfit과 같은 형식)
+        available_items: 선택 가능한 아이템 (recommend_outfit과 같은 형식)
+        model_loader: 모델 로더 인스턴스
+        k: 반환할 코디 수
+        beam_width: 단계마다 유지할 부분 코디 수 (None이면 DEFAULT_BEAM_WIDTH, k보다 작으면 k)
+            후보 조합 수보다 크거나 같으면 전체 조합을 탐색한 결과와 같습니다.
+        deadline: time.monotonic() 기준 마감 시각 (None이면 제한 없음)
+        max_candidates: 지정하면 벡터 점수를 계산하기 전에 카테고리별 후보를 속성 궁합 상위
+            max_candidates개로 줄임 (prune_candidates)
+        
+    Returns:
+        Dict: 추천 결과 (점수 내림차순, 가능한 조합이 k개보다 적으면 그만큼만)
+            예: {"outfits": [{"recommended_outfit": {"top": 1, ...}, "score": 1.23}, ...]}
+            (deadline을 지정하면 빔 폭을 줄였는지 여부 "timed_out" 포함)
+        
+    Raises:
+        RuntimeError: 모델이 로드되지 않은 경우
+        ValueError: k가 1보다 작거나 필수 카테고리를 채울 수 없는 경우
+    """
+    if not model_loader.is_loaded():
+        raise RuntimeError("모델이 로드되지 않았습니다.")
+    if k < 1:
+        raise ValueError("k는 1 이상이어야 합니다.")
+    
+    if max_candidates is not None:
+        available_items = prune_candidates(selected_items, available_items, model_loader, max_candidates)
+    
+    target_vector, selected_vectors = build_target_vector(selected_items, model_loader)
+    selected_matrix = normalize_rows(np.asarray(selected_vectors)) if selected_vectors else None
+    
+    fixed_items = {
+        category: item.get('id')
+        for category, item in selected_items.items()
+        if item is not None
+    }
+    
+    # 채워야 할 카테고리별 후보: (카테고리, 아이템 ID, 정규화 벡터, 궁합을 제외한 아이템별 점수)
+    search_steps = []
+    for category in OUTFIT_CATEGORIES:
+        if category in fixed_items:
+            continue
+        item_ids, item_matrix = items_to_matrix(available_items.get(category, []), model_loader)
+        if not item_ids:
+            continue
+        
+        unit_matrix = normalize_rows(item_matrix)
+        item_scores = score_items(category, item_matrix, target_vector, model_loader).astype(np.float64)
+        if selected_matrix is not None:
+            item_scores += OUTFIT_PAIR_WEIGHT * (unit_matrix @ selected_matrix.T).sum(axis=1)
+        search_steps.append((category, item_ids, unit_matrix, item_scores))
+    
+    # 필수 카테고리 확인 (top, bottom, shoes는 필수)
+    searched_categories = {step[0] for step in search_steps}
+    for category in REQUIRED_CATEGORIES:
+        if fixed_items.get(category) is None and category not in searched_categories:
+            raise ValueError(f"필수 카테고리 '{category}'에 대한 추천이 실패했습니다.")
+    
+    # 후보가 적은 카테고리부터 채움 (앞 단계에서 빔 밖으로 밀려나는 조합을 줄임)
+    search_steps.sort(key=lambda step: len(step[1]))
+    
+    def pair_scores(prev_index: int, prev_choices: np.ndarray, step_index: int) -> np.ndarray:
+        prev_units = search_steps[prev_index][2][prev_choices]
+        return OUTFIT_PAIR_WEIGHT * (prev_units @ search_steps[step_index][2].T)
+    
+    beam_scores, beam_choices, timed_out = beam_search_outfits(
+        [step[3] for step in search_steps], pair_scores, k, beam_width, deadline
+    )
+    
+    result: Dict[str, Any] = {
+        "outfits": beam_to_outfits(beam_scores, beam_choices, search_steps, fixed_items, k)
+    }
+    if deadline is not None:
+        result["timed_out"] = timed_out
+    return result
+
+
+def beam_search_outfits(
+    step_item_scores: List[np.ndarray],
+    pair_scores: Callable[[int, np.ndarray, int], np.ndarray],
+    k: int,
+    beam_width: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """
+    카테고리를 하나씩 채우면서 점수 상위 beam_width개의 부분 코디만 남기는 빔 탐색입니다.
+    
+    Args:
+        step_item_scores: 단계(카테고리)별 후보 아이템 점수 배열
+        pair_scores: (이전 단계 번호, 부분 코디별 이전 단계 후보 번호, 현재 단계 번호) ->
+            (부분 코디 수, 현재 단계 후보 수) 아이템 쌍 점수 행렬
+        k: 반환할 코디 수
+        beam_width: 단계마다 유지할 부분 코디 수 (None이면 DEFAULT_BEAM_WIDTH, k보다 작으면 k)
+        deadline: time.monotonic() 기준 마감 시각 (지나면 남은 단계는 빔 폭을 k로 줄임)
+        
+    Returns:
+        Tuple: (점수 내림차순 코디 점수, (코디 수, 단계 수) 단계별 후보 번호, 빔 폭을 줄였는지 여부)
+    """
+    width = max(beam_width or DEFAULT_BEAM_WIDTH, k)
+    
+    beam_scores = np.zeros(1, dtype=np.float64)
+    beam_choices = np.zeros((1, 0), dtype=np.int64)
+    timed_out = False
+    for step_index, item_scores in enumerate(step_item_scores):
+        if not timed_out and deadline_passed(deadline):
+            # 시간 예산 초과: 상위 k개 부분 코디만 남기고 남은 단계도 k개씩만 유지
+            timed_out = True
+            width = k
+            beam_scores, beam_choices = beam_scores[:width], beam_choices[:width]
+        
+        # (부분 코디 수, 후보 수) 점수 행렬
+        scores = beam_scores[:, np.newaxis] + item_scores[np.newaxis, :]
+        for prev_index in range(step_index):
+            scores += pair_scores(prev_index, beam_choices[:, prev_index], step_index)
+        
+        flat_scores = scores.ravel()
+        best = top_k_indices(flat_scores, width)
+        parents, choices = np.divmod(best, len(item_scores))
+        beam_scores = flat_scores[best]
+        beam_choices = np.column_stack([beam_choices[parents], choices])
+    
+    return beam_scores, beam_choices, timed_out
+
 
+def beam_to_outfits(
+    beam_scores: np.ndarray,
+    beam_choices: np.ndarray,
+    search_steps: List[tuple],
+    fixed_items: Dict[str, Any],
+    k: int
+) -> List[Dict[str, Any]]:
+    """
+    빔 탐색 결과를 추천 결과 형식으로 바꿉니다.
+    
+    Args:
+        beam_scores: 코디 점수 (내림차순)
+        beam_choices: (코디 수, 단계 수) 단계별 후보 번호
+        search_steps: 단계별 (카테고리, 아이템 ID 리스트, ...)
+        fixed_items: 선택된 카테고리 -> 아이템 ID
+        k: 반환할 코디 수
+        
+    Returns:
+        List[Dict]: [{"recommended_outfit": {"top": 1, ...}, "score": 1.23}, ...]
+    """
+    outfits = []
+    for row in range(min(k, len(beam_scores))):
+        recommended_outfit = {category: fixed_items.get(category) for category in OUTFIT_CATEGORIES}
+        for step_index, step in enumerate(search_steps):
+            category, item_ids = step[0], step[1]
+            recommended_outfit[category] = item_ids[beam_choices[row, step_index]]
+        outfits.append({
+            'recommended_outfit': recommended_outfit,
+            'score': float(beam_scores[row])
+        })
+    return outfits
+
+
+def encode_items(
+    items: List[Dict[str, Any]],
+    model_loader: ModelLoader
+) -> Tuple[List[Any], np.ndarray]:
+    """
+    아이템 리스트를 (id 리스트, 속성 궁합 테이블의 코드 배열)로 변환합니다.
+    feature가 없는 아이템은 제외합니다. (items_to_matrix와 같은 기준)
+    
+    Args:
+        items: 아이템 리스트 (예: [{"id": 1, "feature": "..."}, ...])
+        model_loader: 모델 로더 인스턴스
+        
+    Returns:
+        Tuple[List, np.ndarray]: (아이템 ID 리스트, (n, 1 + 속성 수) 코드 배열)
+    """
+    items = [item for item in items if item.get('feature')]
+    codes = model_loader.get_compatibility_tables().encode(item['feature'] for item in items)
+    return [item.get('id') for item in items], codes
+
+
+def compatibility_score(features: List[str], model_loader: ModelLoader) -> float:
+    """
+    코디 한 벌의 속성 궁합 점수를 계산합니다. (벡터 계산 없이 테이블 조회만 사용)
+    
+    Args:
+        features: 코디 아이템들의 feature 문자열
+        model_loader: 모델 로더 인스턴스
+        
+    Returns:
+        float: 서로 다른 카테고리 아이템 쌍의 궁합(속성별 PMI 합)의 합 (높을수록 코디 데이터에서 자주 보인 조합)
+    """
+    tables = model_loader.get_compatibility_tables()
+    return tables.outfit_score(tables.encode(features))
+
+
+def prune_candidates(
+    selected_items: Dict[str, Optional[Dict[str, Any]]],
+    available_items: Dict[str, List[Dict[str, Any]]],
+    model_loader: ModelLoader,
+    max_candidates: int
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    카테고리별 후보가 max_candidates개보다 많으면 속성 궁합이 높은 max_candidates개만 남깁니다.
+    
+    후보의 궁합 점수는 선택된 아이템과의 궁합 평균이며, 선택된 아이템이 없으면
+    다른 카테고리 후보 전체와의 궁합 평균(옷장 안에서 잘 어울리는 정도)입니다.
+    
+    Args:
+        selected_items: 이미 선택된 아이템 (recommend_outfit과 같은 형식)
+        available_items: 선택 가능한 아이템 (recommend_outfit과 같은 형식)
+        model_loader: 모델 로더 인스턴스
+        max_candidates: 카테고리별로 남길 후보 수
+        
+    Returns:
+        Dict[str, List]: 줄인 후보 (남은 아이템은 원래 순서 유지)
+    """
+    tables = model_loader.get_compatibility_tables()
+    selected_features = [
+        item['feature'] for item in selected_items.values()
+        if item is not None and item.get('feature')
+    ]
+    selected_codes = tables.encode(selected_features)
+    
+    pruned = dict(available_items)
+    for category, items in available_items.items():
+        if len(items) <= max_candidates:
+            continue
+        if selected_features:
+            reference_codes = selected_codes
+        else:
+            reference_codes = tables.encode(
+                item['feature']
+                for other, other_items in available_items.items() if other != category
+                for item in other_items if item.get('feature')
+            )
+        codes = tables.encode(item.get('feature', '') for item in items)
+        if len(reference_codes) > 0:
+            scores = tables.pair_scores(codes, reference_codes).mean(axis=1)
+        else:
+            scores = np.zeros(len(items))
+        keep = np.sort(top_k_indices(scores, max_candidates))
+        pruned[category] = [items[index] for index in keep]
+    return pruned
+
+
+def recommend_outfits_by_compatibility(
+    selected_items: Dict[str, Optional[Dict[str, Any]]],
+    available_items: Dict[str, List[Dict[str, Any]]],
+    model_loader: ModelLoader,
+    k: int = 1,
+    beam_width: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    속성 궁합 테이블만으로 상위 k개 코디를 추천합니다. (recommend_outfits와 같은 빔 탐색, 벡터 계산 없음)
+    
+    코디 점수 = Σ 서로 다른 카테고리 아이템 쌍의 궁합 (선택된 아이템과의 쌍 포함, 선택된 아이템끼리의 쌍 제외)
+    
+    Args:
+        selected_items: 이미 선택된 아이템 (recommend_outfit과 같은 형식)
+        available_items: 선택 가능한 아이템 (recommend_outfit과 같은 형식)
+        model_loader: 모델 로더 인스턴스
+        k: 반환할 코디 수
+        beam_width: 단계마다 유지할 부분 코디 수 (None이면 DEFAULT_BEAM_WIDTH, k보다 작으면 k)
+        deadline: time.monotonic() 기준 마감 시각 (None이면 제한 없음)
+        
+    Returns:
+        Dict: recommend_outfits와 같은 형식
+        
+    Raises:
+        RuntimeError: 모델이 로드되지 않은 경우
+        ValueError: k가 1보다 작거나 필수 카테고리를 채울 수 없는 경우
+    """
+    if not model_loader.is_loaded():
+        raise RuntimeError("모델이 로드되지 않았습니다.")
+    if k < 1:
+        raise ValueError("k는 1 이상이어야 합니다.")
+    
+    tables = model_loader.get_compatibility_tables()
+    fixed_items = {
+        category: item.get('id')
+        for category, item in selected_items.items()
+        if item is not None
+    }
+    selected_codes = tables.encode(
+        item['feature'] for item in selected_items.values()
+        if item is not None and item.get('feature')
+    )
+    
+    # 채워야 할 카테고리별 후보: (카테고리, 아이템 ID, 코드 배열, 선택된 아이템과의 궁합)
+    search_steps = []
+    for category in OUTFIT_CATEGORIES:
+        if category in fixed_items:
+            continue
+        item_ids, codes = encode_items(available_items.get(category, []), model_loader)
+        if not item_ids:
+            continue
+        item_scores = tables.pair_scores(codes, selected_codes).sum(axis=1)
+        search_steps.append((category, item_ids, codes, item_scores))
+    
+    searched_categories = {step[0] for step in search_steps}
+    for category in REQUIRED_CATEGORIES:
+        if fixed_items.get(category) is None and category not in searched_categories:
+            raise ValueError(f"필수 카테고리 '{category}'에 대한 추천이 실패했습니다.")
+    
+    search_steps.sort(key=lambda step: len(step[1]))
+    
+    def pair_scores(prev_index: int, prev_choices: np.ndarray, step_index: int) -> np.ndarray:
+        return tables.pair_scores(search_steps[prev_index][2][prev_choices], search_steps[step_index][2])
+    
+    beam_scores, beam_choices, timed_out = beam_search_outfits(
+        [step[3] for step in search_steps], pair_scores, k, beam_width, deadline
+    )
+    
+    result: Dict[str, Any] = {
+        "outfits": beam_to_outfits(beam_scores, beam_choices, search_steps, fixed_items, k)
+    }
+    if deadline is not None:
+        result["timed_out"] = timed_out
+    return result
+
+
+def unique_rows_by_bytes(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    행렬에서 중복 행을 제거합니다. (행의 바이트를 키로 사용)
+    
+    행이 많을 때 np.unique(axis=0)의 행 단위 정렬보다 훨씬 빠릅니다.
+    
+    Args:
+        matrix: (n, dim) 행렬
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (처음 나온 순서의 고유 행, 각 행의 고유 행 번호)
+    """
+    matrix = np.ascontiguousarray(matrix)
+    first_rows: Dict[bytes, int] = {}
+    inverse = np.empty(len(matrix), dtype=np.int64)
+    for row, key in enumerate(map(bytes, matrix)):
+        inverse[row] = first_rows.setdefault(key, len(first_rows))
+    # 고유 행 번호는 처음 나온 순서로 매겨지므로 각 번호의 첫 위치가 곧 고유 행
+    first_positions = np.unique(inverse, return_index=True)[1]
+    return matrix[first_positions], inverse
+
+
+def recommend_outfit_batch(
+    requests: List[Dict[str, Any]],
+    model_loader: ModelLoader
+) -> List[Dict[str, Any]]:
+    """
+    여러 사용자의 코디를 한 번에 추천합니다. (recommend_outfit의 일괄 처리 버전)
+    
+    모든 사용자의 후보 아이템을 카테고리별 하나의 행렬로 쌓아 점수를 한 번에 계산하고,
+    사용자별 최고점 아이템은 (사용자, 점수) 정렬 한 번으로 고릅니다.
+    사용자마다 recommend_outfit을 호출한 것과 같은 결과를 반환합니다. (동점이면 앞 아이템 우선)
+    
+    Args:
+        requests: 사용자별 추천 입력 리스트
+            예: [{"selected_items": {...}, "available_items": {...}}, ...] (recommend_outfit과 같은 형식)
+        model_loader: 모델 로더 인스턴스
+        
+    Returns:
+        List[Dict]: requests와 같은 순서의 결과 리스트
+            성공: {"recommended_outfit": {"top": 1, "bottom": 2, "shoes": 4, "outer": None}}
+            실패: {"error": "실패 사유"} (한 사용자의 실패가 다른 사용자의 추천에 영향을 주지 않음)
+        
+    Raises:
+        RuntimeError: 모델이 로드되지 않은 경우
+    """
+    if not model_loader.is_loaded():
+        raise RuntimeError("모델이 로드되지 않았습니다.")
+    
+    results: List[Dict[str, Any]] = [{} for _ in requests]
+    outfits: List[Dict[str, Any]] = []
+    targets = []
+    active = []  # 타겟 벡터를 만들 수 있는 요청 번호
+    
+    for index, request in enumerate(requests):
+        selected_items = request.get('selected_items') or {}
+        try:
+            target_vector, _ = build_target_vector(selected_items, model_loader)
+        except Exception as e:
+            results[index] = {'error': str(e)}
+            continue
+        
+        active.append(index)
+        targets.append(normalize_vector(target_vector))
+        outfits.append({
+            category: (selected_items[category].get('id') if selected_items.get(category) is not None else None)
+            for category in OUTFIT_CATEGORIES
+        })
+    
+    if active:
+        target_matrix = np.asarray(targets, dtype=np.float32)
+        
+        for category in OUTFIT_CATEGORIES:
+            # 이 카테고리를 추천해야 하는 모든 사용자의 후보 아이템을 하나로 쌓기
+            owners = []
+            item_ids = []
+            vectors = []
+            for position, index in enumerate(active):
+                request = requests[index]
+                if (request.get('selected_items') or {}).get(category) is not None:
+                    continue
+                ids, matrix = items_to_matrix(request.get('available_items', {}).get(category, []), model_loader)
+                if not ids:
+                    continue
+                owners.append(np.full(len(ids), position, dtype=np.int64))
+                item_ids.extend(ids)
+                vectors.append(matrix)
+            
+            if not vectors:
+                continue
+            
+            owners = np.concatenate(owners)
+            item_matrix = np.concatenate(vectors)
+            
+            # 같은 벡터는 한 번만 정규화/계산 (score_items와 같은 이유)
+            unique_rows, inverse = unique_rows_by_bytes(item_matrix)
+            unit_rows = normalize_rows(unique_rows)
+            
+            centroid = model_loader.get_category_centroid(category)
+            if centroid is None:
+                centroid = np.zeros(item_matrix.shape[1], dtype=np.float32)
+            centroid_similarities = (unit_rows @ np.asarray(centroid, dtype=np.float32))[inverse]
+            target_similarities = np.einsum('ij,ij->i', unit_rows[inverse], target_matrix[owners])
+            scores = centroid_similarities * 0.7 + target_similarities * 0.3
+            
+            # 사용자별 최고점 아이템 (사용자 오름차순, 점수 내림차순, 동점이면 앞 아이템)
+            order = np.lexsort((np.arange(len(scores)), -scores, owners))
+            sorted_owners = owners[order]
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = sorted_owners[1:] != sorted_owners[:-1]
+            for row in order[first]:
+                outfits[owners[row]][category] = item_ids[row]
+        
+        for position, index in enumerate(active):
+            missing = [c for c in REQUIRED_CATEGORIES if outfits[position].get(c) is None]
+            if missing:
+                results[index] = {'error': f"필수 카테고리 '{missing[0]}'에 대한 추천이 실패했습니다."}
+            else:
+                results[index] = {'recommended_outfit': outfits[position]}
+    
+    return results
+
+
+# 워커 프로세스에서 사용하는 모델 로더 ((번들 디렉토리, 모델 버전) -> ModelLoader, 가장 최근 버전 하나만 유지)
+_worker_model_loaders: Dict[Tuple[str, Optional[str]], ModelLoader] = {}
+
+
+def run_with_model_version(
+    func: Callable[..., Any],
+    bundle_dir: str,
+    model_version: Optional[str],
+    kwargs: Dict[str, Any]
+) -> Any:
+    """
+    지정한 서빙 번들로 추천 엔진 함수를 실행합니다. (별도 프로세스에서 실행하기 위한 진입점)
+    
+    모델 로더는 프로세스마다 한 번만 로드하며(메모리 매핑이므로 프로세스 간 페이지 캐시를 공유),
+    요청한 번들이나 모델 버전이 바뀌면 새로 로드합니다.
+    
+    Args:
+        func: 이 모듈의 추천 함수 (예: recommend_outfit, 프로세스 간에는 모듈 경로로 pickle됨)
+        bundle_dir: 요청 프로세스의 모델 로더가 로드한 번들 디렉토리
+            (models/versions/{버전} 또는 CURRENT가 없을 때의 models/serving/)
+        model_version: 요청 프로세스의 모델 버전 (같은 디렉토리의 번들이 교체되었는지 구분)
+        kwargs: model_loader를 제외한 함수 인자
+        
+    Returns:
+        Any: 추천 함수의 반환값
+        
+    Raises:
+        RuntimeError: 모델 번들을 로드할 수 없는 경우
+    """
+    key = (bundle_dir, model_version)
+    model_loader = _worker_model_loaders.get(key)
+    if model_loader is None:
+        model_loader = ModelLoader(bundle_dir=bundle_dir)
+        if not model_loader.load():
+            raise RuntimeError(f"모델 번들 {bundle_dir}을 로드할 수 없습니다.")
+        _worker_model_loaders.clear()
+        _worker_model_loaders[key] = model_loader
+    
+    return func(model_loader=model_loader, **kwargs)
@@ -0,0 +1,317 @@
+"""
+서빙 번들 모듈
+학습 결과를 서버용 형식(.npy 행렬 + JSON/CSV 메타데이터)으로 저장하고 읽습니다.
+
+pickle로 저장된 DataFrame/Word2Vec 모델 대신 .npy 파일을 np.load(mmap_mode='r')로 열기 때문에
+여러 uvicorn 워커가 OS 페이지 캐시를 통해 같은 메모리를 공유합니다.
+
+버전별 디렉토리 (모델을 재학습해도 서버를 재시작하지 않고 교체하기 위함):
+    models/versions/{model_version}/    # 번들 (아래 구성)
+    models/CURRENT                      # 서버가 사용할 버전 이름
+    (CURRENT가 없으면 이전 형식인 models/serving/ 번들을 사용)
+
+번들 구성:
+    bundle.json                 # 파라미터, 모델 버전, 어휘 목록
+    coords.csv                  # 코디 메타데이터 (coord_id, w2v_sentence) - coord_matrix 행 순서
+    w2v_vectors.npy             # 문장 Word2Vec 임베딩 (vocab, w2v_vector_size)
+    cf_vectors.npy              # Color/Fabric Word2Vec 임베딩 (vocab, cf_vector_size)
+    coord_matrix.npy            # L2 정규화된 코디 벡터 (float32)
+    coord_mean_vector.npy       # 정규화 전 코디 벡터 평균
+    category_{category}_rows.npy    # 카테고리가 포함된 코디 행 인덱스
+    category_{category}_matrix.npy  # 카테고리 코디의 정규화된 벡터 (부분 행렬)
+    ivf_*.npy                   # 코디 검색용 IVF 인덱스 (ann_index.py)
+    compat_*.npy, compat_vocab.json # 카테고리 간 속성 궁합 테이블 (compatibility.py)
+"""
+
+import os
+import csv
+import json
+import shutil
+import hashlib
+import numpy as np
+from typing import Dict, Any, List, Optional
+from .feature_space import CATEGORY_KR_MAP
+from .ann_index import DEFAULT_NPROBE, IVFIndex, build_ivf_index, index_exists
+from .compatibility import CompatibilityTables, build_compatibility_tables, tables_exist
+
+# 번들 형식 버전 (형식이 바뀌면 증가)
+BUNDLE_FORMAT_VERSION = 1
+
+# models/ 아래의 버전 없는 번들 디렉토리 이름 (CURRENT가 없을 때 사용하는 이전 형식)
+BUNDLE_DIR_NAME = "serving"
+
+# models/ 아래의 버전별 번들 디렉토리 이름과 현재 버전 포인터 파일
+VERSIONS_DIR_NAME = "versions"
+CURRENT_VERSION_FILE = "CURRENT"
+
+BUNDLE_META_FILE = "bundle.json"
+COORDS_FILE = "coords.csv"
+
+
+class KeyedVectorTable:
+    """
+    토큰 -> 벡터 조회 테이블 (gensim KeyedVectors의 `in`, `[]` 사용법과 호환)
+    """
+
+    def __init__(self, keys: List[str], vectors: np.ndarray):
+        """
+        Args:
+            keys: 토큰 리스트 (vectors 행 순서)
+            vectors: (len(keys), dim) 벡터 행렬
+        """
+        self.key_to_index: Dict[str, int] = {key: i for i, key in enumerate(keys)}
+        self.vectors = vectors
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.key_to_index
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.vectors[self.key_to_index[key]]
+
+    def __len__(self) -> int:
+        return len(self.key_to_index)
+
+
+def compute_model_version(
+    params: Dict[str, Any],
+    w2v_keys: List[str],
+    w2v_vectors: np.ndarray,
+    cf_keys: List[str],
+    cf_vectors: np.ndarray
+) -> str:
+    """
+    아이템 벡터를 결정하는 값(파라미터, 임베딩)으로 모델 버전을 계산합니다.
+
+    Returns:
+        str: 모델 버전 (SHA-256 앞 16자리)
+    """
+    digest = hashlib.sha256()
+    version_params = {key: value for key, value in params.items() if key != 'model_version'}
+    digest.update(json.dumps(version_params, sort_keys=True).encode('utf-8'))
+    for keys, vectors in ((w2v_keys, w2v_vectors), (cf_keys, cf_vectors)):
+        digest.update("\n".join(keys).encode('utf-8'))
+        digest.update(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def export_serving_bundle(
+    bundle_dir: str,
+    params: Dict[str, Any],
+    w2v_keys: List[str],
+    w2v_vectors: np.ndarray,
+    cf_keys: List[str],
+    cf_vectors: np.ndarray,
+    final_vectors: np.ndarray,
+    coord_ids: List[Any],
+    sentences: List[str],
+    ann_nlist: Optional[int] = None,
+    ann_nprobe: int = DEFAULT_NPROBE
+) -> None:
+    """
+    학습 결과를 서빙 번들로 저장합니다.
+
+    Args:
+        bundle_dir: 번들 디렉토리 경로
+        params: 파라미터 (model_version 포함)
+        w2v_keys: 문장 Word2Vec 어휘
+        w2v_vectors: 문장 Word2Vec 임베딩
+        cf_keys: Color/Fabric Word2Vec 어휘
+        cf_vectors: Color/Fabric Word2Vec 임베딩
+        final_vectors: 코디별 최종 벡터 (merged_df['final_vector'] 행 순서)
+        coord_ids: 코디 ID 리스트
+        sentences: 코디 문장 리스트
+        ann_nlist: IVF 인덱스 클러스터 수 (None이면 코디 수에 맞춰 결정, 0이면 인덱스를 만들지 않음)
+        ann_nprobe: 검색 시 기본으로 확인할 클러스터 수
+    """
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    final_vectors = np.asarray(final_vectors, dtype=np.float64)
+    norms = np.linalg.norm(final_vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    coord_matrix = np.ascontiguousarray(final_vectors / norms, dtype=np.float32)
+
+    np.save(os.path.join(bundle_dir, "w2v_vectors.npy"), np.asarray(w2v_vectors, dtype=np.float32))
+    np.save(os.path.join(bundle_dir, "cf_vectors.npy"), np.asarray(cf_vectors, dtype=np.float32))
+    np.save(os.path.join(bundle_dir, "coord_matrix.npy"), coord_matrix)
+    np.save(os.path.join(bundle_dir, "coord_mean_vector.npy"), final_vectors.mean(axis=0).astype(np.float32))
+
+    for category, category_kr in CATEGORY_KR_MAP.items():
+        rows = np.array([i for i, sentence in enumerate(sentences) if category_kr in sentence], dtype=np.int64)
+        np.save(os.path.join(bundle_dir, f"category_{category}_rows.npy"), rows)
+        np.save(os.path.join(bundle_dir, f"category_{category}_matrix.npy"), coord_matrix[rows])
+
+    ann_meta = None
+    if ann_nlist != 0 and len(coord_matrix) > 0:
+        ann_index = build_ivf_index(coord_matrix, nlist=ann_nlist, default_nprobe=ann_nprobe)
+        ann_index.save(bundle_dir)
+        ann_meta = {'type': 'ivf', 'nlist': ann_index.nlist, 'default_nprobe': ann_nprobe}
+
+    # 속성 궁합 테이블 (같은 코디가 아이템 수만큼 반복되므로 코디당 한 번씩 셈)
+    compatibility_tables = build_compatibility_tables(dict(zip(coord_ids, sentences)).values())
+    compatibility_tables.save(bundle_dir)
+
+    with open(os.path.join(bundle_dir, COORDS_FILE), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['coord_id', 'w2v_sentence'])
+        writer.writerows(zip(coord_ids, sentences))
+
+    meta = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'model_version': params.get('model_version'),
+        'params': params,
+        'num_coords': len(coord_matrix),
+        'ann_index': ann_meta,
+        'compatibility': {'attributes': compatibility_tables.attributes},
+        'w2v_vocab': list(w2v_keys),
+        'cf_vocab': list(cf_keys)
+    }
+    # 메타데이터는 마지막에 저장 (메타데이터가 있으면 번들이 완성된 것으로 간주)
+    with open(os.path.join(bundle_dir, BUNDLE_META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def bundle_exists(bundle_dir: str) -> bool:
+    """번들 메타데이터 파일이 있는지 확인합니다."""
+    return os.path.exists(os.path.join(bundle_dir, BUNDLE_META_FILE))
+
+
+def read_current_version(model_dir: str) -> Optional[str]:
+    """
+    models/CURRENT에 기록된 현재 버전 이름을 읽습니다.
+
+    Returns:
+        Optional[str]: 버전 이름 (파일이 없거나 비어 있으면 None)
+    """
+    current_path = os.path.join(model_dir, CURRENT_VERSION_FILE)
+    if not os.path.exists(current_path):
+        return None
+    with open(current_path, 'r', encoding='utf-8') as f:
+        version = f.read().strip()
+    return version or None
+
+
+def resolve_bundle_dir(model_dir: str, version: Optional[str] = None) -> str:
+    """
+    로드할 번들 디렉토리를 결정합니다.
+
+    Args:
+        model_dir: 모델 디렉토리 경로
+        version: 버전 이름 (None이면 CURRENT가 가리키는 버전, CURRENT가 없으면 serving/)
+
+    Returns:
+        str: 번들 디렉토리 경로
+    """
+    version = version or read_current_version(model_dir)
+    if version is None:
+        return os.path.join(model_dir, BUNDLE_DIR_NAME)
+    return os.path.join(model_dir, VERSIONS_DIR_NAME, version)
+
+
+def publish_serving_bundle(model_dir: str, params: Dict[str, Any], **bundle_data: Any) -> str:
+    """
+    서빙 번들을 models/versions/{model_version}/에 저장하고 CURRENT를 새 버전으로 바꿉니다.
+
+    임시 디렉토리에 저장한 뒤 이름을 바꾸고, CURRENT도 임시 파일을 os.replace로 교체하므로
+    실행 중인 서버(파일 감시/재로드)가 저장 중인 번들을 읽는 일이 없습니다.
+
+    Args:
+        model_dir: 모델 디렉토리 경로
+        params: 파라미터 (model_version 포함)
+        **bundle_data: export_serving_bundle의 나머지 인자
+
+    Returns:
+        str: 저장된 번들 디렉토리 경로
+    """
+    version = params['model_version']
+    versions_dir = os.path.join(model_dir, VERSIONS_DIR_NAME)
+    bundle_dir = os.path.join(versions_dir, version)
+    os.makedirs(versions_dir, exist_ok=True)
+
+    # 같은 버전(같은 파라미터/임베딩)이 이미 있으면 다시 저장하지 않음
+    if not bundle_exists(bundle_dir):
+        tmp_dir = os.path.join(versions_dir, f".{version}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        export_serving_bundle(bundle_dir=tmp_dir, params=params, **bundle_data)
+        shutil.rmtree(bundle_dir, ignore_errors=True)
+        os.replace(tmp_dir, bundle_dir)
+
+    tmp_current = os.path.join(model_dir, f".{CURRENT_VERSION_FILE}.tmp")
+    with open(tmp_current, 'w', encoding='utf-8') as f:
+        f.write(version + "\n")
+    os.replace(tmp_current, os.path.join(model_dir, CURRENT_VERSION_FILE))
+    return bundle_dir
+
+
+def load_serving_bundle(bundle_dir: str, mmap_mode: Optional[str] = 'r') -> Dict[str, Any]:
+    """
+    서빙 번들을 읽습니다. 행렬은 기본적으로 메모리 매핑(읽기 전용)으로 엽니다.
+
+    Args:
+        bundle_dir: 번들 디렉토리 경로
+        mmap_mode: np.load의 mmap_mode (None이면 메모리로 전부 읽음)
+
+    Returns:
+        Dict: params, model_version, w2v_vectors, cf_vectors (KeyedVectorTable),
+              coord_matrix, coord_mean_vector, coord_ids, coord_sentences,
+              category_row_indices, category_coord_matrices, ann_index (없으면 None),
+              compatibility_tables (없으면 None)
+
+    Raises:
+        FileNotFoundError: 번들 파일이 없는 경우
+        ValueError: 지원하지 않는 번들 형식인 경우
+    """
+    meta_path = os.path.join(bundle_dir, BUNDLE_META_FILE)
+    if not os.path.exists(meta_path):
+        raise FileNotFoundError(f"서빙 번들 파일을 찾을 수 없습니다: {meta_path}")
+
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+
+    if meta.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 서빙 번들 형식입니다: {meta.get('format_version')}")
+
+    def load_array(name: str) -> np.ndarray:
+        return np.load(os.path.join(bundle_dir, name), mmap_mode=mmap_mode)
+
+    coord_ids: List[Any] = []
+    coord_sentences: List[str] = []
+    with open(os.path.join(bundle_dir, COORDS_FILE), 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for coord_id, sentence in reader:
+            coord_ids.append(int(coord_id) if coord_id.lstrip('-').isdigit() else coord_id)
+            coord_sentences.append(sentence)
+
+    coord_matrix = load_array("coord_matrix.npy")
+    if len(coord_matrix) != meta['num_coords'] or len(coord_ids) != meta['num_coords']:
+        raise ValueError("서빙 번들의 코디 개수가 일치하지 않습니다.")
+
+    # IVF 인덱스 (인덱스 없이 만든 번들이면 None - 전체 스캔으로 검색)
+    ann_index = None
+    ann_meta = meta.get('ann_index')
+    if ann_meta and index_exists(bundle_dir):
+        ann_index = IVFIndex.load(bundle_dir, default_nprobe=ann_meta['default_nprobe'], mmap_mode=mmap_mode)
+
+    # 속성 궁합 테이블 (테이블 없이 만든 이전 번들이면 None - 로드 시 코디 문장으로 계산)
+    compatibility_tables = None
+    if meta.get('compatibility') and tables_exist(bundle_dir):
+        compatibility_tables = CompatibilityTables.load(bundle_dir, mmap_mode=mmap_mode)
+
+    return {
+        'params': meta['params'],
+        'model_version': meta.get('model_version'),
+        'w2v_vectors': KeyedVectorTable(meta['w2v_vocab'], load_array("w2v_vectors.npy")),
+        'cf_vectors': KeyedVectorTable(meta['cf_vocab'], load_array("cf_vectors.npy")),
+        'coord_matrix': coord_matrix,
+        'coord_mean_vector': np.asarray(load_array("coord_mean_vector.npy")),
+        'coord_ids': coord_ids,
+        'coord_sentences': coord_sentences,
+        'category_row_indices': {
+            category: load_array(f"category_{category}_rows.npy") for category in CATEGORY_KR_MAP
+        },
+        'category_coord_matrices': {
+            category: load_array(f"category_{category}_matrix.npy") for category in CATEGORY_KR_MAP
+        },
+        'ann_index': ann_index,
+        'compatibility_tables': compatibility_tables
+    }
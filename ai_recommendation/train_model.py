@@ -7,9 +7,19 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+import time
 import pickle
 import json
+import argparse
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
 from gensim.models import Word2Vec
+from gensim.models import KeyedVectors
+
+# `python train_model.py`로 실행해도 ai_recommendation 패키지를 import할 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ai_recommendation.serving_bundle import VERSIONS_DIR_NAME, CURRENT_VERSION_FILE, compute_model_version, publish_serving_bundle
 
 # ===================================
 # 파라미터 설정
@@ -19,47 +29,136 @@ cf_vector_size = 20       # color/fabric 임베딩 차원 수
 color_weight = 0.8        # 색상 벡터 가중치
 fabric_weight = 0.2       # 재질 벡터 가중치
 
+# 학습 실행 설정 (명령행 인자로 변경 가능)
+DEFAULT_WORKERS = 4       # Word2Vec 학습 스레드 수 (--workers)
+CSV_CHUNK_SIZE = 50000    # CSV를 나눠 읽는 행 수 (--chunk-size)
+
+# 필수 카테고리 (코디 문장에 모두 있어야 학습에 사용)
+REQUIRED_CATEGORIES = ("상의", "하의", "신발")
+
 # 경로 설정
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 MODEL_DIR = os.path.join(BASE_DIR, "models")
-os.makedirs(MODEL_DIR, exist_ok=True)
-
-def has_all_required_categories(tokens):
-    """필수 카테고리(상의, 하의, 신발)가 모두 있는지 확인"""
-    categories = {"상의": False, "하의": False, "신발": False}
-    for token in tokens:
-        for category in categories:
-            if token.startswith(category):
-                categories[category] = True
-    return all(categories.values())
-
-def sentence_to_vector(tokens, w2v_model, vector_size):
-    """문장을 벡터로 변환"""
-    vectors = [w2v_model.wv[word] for word in tokens if word in w2v_model.wv]
-    return np.mean(vectors, axis=0) if vectors else np.zeros(vector_size)
-
-def get_color_vector(color, color_fabric_model, vector_size):
-    """색상 벡터 추출"""
-    if isinstance(color, str) and color.lower() in color_fabric_model.wv:
-        return color_fabric_model.wv[color.lower()]
-    else:
-        return np.zeros(vector_size)
-
-def get_fabric_vector(fabric, color_fabric_model, vector_size):
-    """재질 벡터 추출"""
-    if isinstance(fabric, str) and fabric.lower() in color_fabric_model.wv:
-        return color_fabric_model.wv[fabric.lower()]
-    else:
-        return np.zeros(vector_size)
-
-def main():
+
+
+@contextmanager
+def timed_stage(name: str, timings: List[Tuple[str, float]]):
+    """단계 실행 시간을 측정해 출력하고 timings에 (단계 이름, 초)를 추가"""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    timings.append((name, elapsed))
+    print(f"  ⏱ {name}: {elapsed:.2f}초")
+
+
+def read_csv_chunked(
+    path: str,
+    chunk_size: int,
+    usecols: Optional[List[str]] = None,
+    row_filter: Optional[Callable[[pd.DataFrame], pd.Series]] = None
+) -> pd.DataFrame:
+    """
+    CSV를 chunk_size 행씩 나눠 읽고 (row_filter가 있으면 청크마다 필터링) 하나로 합칩니다.
+    필요한 열/행만 메모리에 남기므로 전체 파일을 한 번에 읽을 때보다 최대 메모리가 작습니다.
+
+    Args:
+        path: CSV 파일 경로
+        chunk_size: 한 번에 읽을 행 수
+        usecols: 읽을 열 (None이면 전체)
+        row_filter: 청크 -> 남길 행 여부(bool Series)
+
+    Returns:
+        pd.DataFrame: 합친 데이터 (인덱스는 0부터 다시 매김)
+    """
+    chunks = []
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_size):
+        if row_filter is not None:
+            chunk = chunk[row_filter(chunk)]
+        chunks.append(chunk)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def has_all_required_categories(sentences: pd.Series) -> pd.Series:
+    """필수 카테고리(상의, 하의, 신발)로 시작하는 토큰이 모두 있는 문장인지 확인 (문장 단위 벡터 연산)"""
+    mask = pd.Series(True, index=sentences.index)
+    for category in REQUIRED_CATEGORIES:
+        mask &= sentences.str.contains(rf"(?:^|\s){category}", regex=True, na=False)
+    return mask
+
+
+def sentence_vectors(sentences: pd.Series, keyed_vectors: KeyedVectors) -> np.ndarray:
+    """
+    문장별 토큰 벡터 평균을 계산합니다. (vocab에 없는 토큰은 제외, 토큰이 없으면 0 벡터)
+    같은 문장은 한 번만 계산하고, 토큰 벡터 합은 np.add.reduceat으로 한 번에 구합니다.
+
+    Args:
+        sentences: 공백으로 구분된 코디 문장
+        keyed_vectors: Word2Vec 모델의 wv
+
+    Returns:
+        np.ndarray: (문장 수, vector_size) float32 배열
+    """
+    codes, uniques = pd.factorize(sentences)
+    tokens = pd.Series(uniques).str.split().explode()
+    word_index = tokens.map(keyed_vectors.key_to_index)
+    known = word_index.notna().to_numpy()
+    owners = tokens.index.to_numpy()[known]
+    rows = word_index.to_numpy()[known].astype(np.int64)
+
+    counts = np.bincount(owners, minlength=len(uniques))
+    unique_vectors = np.zeros((len(uniques), keyed_vectors.vector_size), dtype=np.float32)
+    has_tokens = counts > 0
+    if rows.size:
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[has_tokens]
+        sums = np.add.reduceat(keyed_vectors.vectors[rows].astype(np.float64), starts, axis=0)
+        unique_vectors[has_tokens] = sums / counts[has_tokens, np.newaxis]
+    return unique_vectors[codes]
+
+
+def attribute_vectors(values: pd.Series, keyed_vectors: KeyedVectors) -> np.ndarray:
+    """
+    색상/재질 값의 벡터를 조회합니다. (소문자로 조회, 문자열이 아니거나 vocab에 없으면 0 벡터)
+
+    Args:
+        values: 색상 또는 재질 값
+        keyed_vectors: Color/Fabric Word2Vec 모델의 wv
+
+    Returns:
+        np.ndarray: (값 수, vector_size) float32 배열
+    """
+    vectors = np.zeros((len(values), keyed_vectors.vector_size), dtype=np.float32)
+    if not (pd.api.types.is_string_dtype(values) or pd.api.types.is_object_dtype(values)):
+        return vectors
+    word_index = values.str.lower().map(keyed_vectors.key_to_index)
+    known = word_index.notna().to_numpy()
+    vectors[known] = keyed_vectors.vectors[word_index.to_numpy()[known].astype(np.int64)]
+    return vectors
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Word2Vec 모델 학습 및 서빙 번들 저장")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Word2Vec 학습 스레드 수 (기본 {DEFAULT_WORKERS})")
+    parser.add_argument("--chunk-size", type=int, default=CSV_CHUNK_SIZE,
+                        help=f"CSV를 나눠 읽는 행 수 (기본 {CSV_CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers와 --chunk-size는 1 이상이어야 합니다.")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    timings: List[Tuple[str, float]] = []
+    os.makedirs(MODEL_DIR, exist_ok=True)
+
     print("=" * 50)
-    print("모델 학습 시작")
+    print(f"모델 학습 시작 (workers={args.workers}, chunk_size={args.chunk_size})")
     print("=" * 50)
     
     # ===================================
-    # 1. 데이터 로드 및 필터링
+    # 1. 데이터 로드 및 필터링 (청크 단위)
     # ===================================
     print("\n[1/6] 데이터 로드 중...")
     sentence_file = os.path.join(DATA_DIR, "sentence_comb_fin.csv")
@@ -70,93 +169,93 @@ def main():
     if not os.path.exists(category_file):
         raise FileNotFoundError(f"데이터 파일을 찾을 수 없습니다: {category_file}")
     
-    df = pd.read_csv(sentence_file)
-    df['tokens'] = df['w2v_sentence'].apply(lambda x: x.split())
-    
-    filtered_df = df[df['tokens'].apply(has_all_required_categories)].reset_index(drop=True)
-    filtered_df = filtered_df.drop(columns=['tokens'])
-    print(f"  ✓ 필터링된 데이터: {len(filtered_df)}개")
-    
-    category_df = pd.read_csv(category_file)
-    print(f"  ✓ 카테고리 데이터: {len(category_df)}개")
+    with timed_stage("데이터 로드", timings):
+        filtered_df = read_csv_chunked(
+            sentence_file,
+            args.chunk_size,
+            row_filter=lambda chunk: has_all_required_categories(chunk['w2v_sentence'])
+        )
+        print(f"  ✓ 필터링된 데이터: {len(filtered_df)}개")
+
+        # 병합과 Color/Fabric 학습에 쓰는 열만 읽음
+        category_df = read_csv_chunked(
+            category_file,
+            args.chunk_size,
+            usecols=['coord_id', 'predicted_color', 'predicted_fabric']
+        )
+        print(f"  ✓ 카테고리 데이터: {len(category_df)}개")
     
     # ===================================
     # 2. 데이터 병합
     # ===================================
     print("\n[2/6] 데이터 병합 중...")
-    merged_df = pd.merge(
-        filtered_df,
-        category_df[['coord_id', 'predicted_color', 'predicted_fabric']],
-        on='coord_id',
-        how='inner'
-    )
-    print(f"  ✓ 병합된 데이터: {len(merged_df)}개")
+    with timed_stage("데이터 병합", timings):
+        merged_df = pd.merge(filtered_df, category_df, on='coord_id', how='inner')
+        print(f"  ✓ 병합된 데이터: {len(merged_df)}개")
     
     # ===================================
     # 3. 문장 토큰화 및 Word2Vec 모델 학습
     # ===================================
     print("\n[3/6] Word2Vec 모델 학습 중...")
-    merged_df['tokens'] = merged_df['w2v_sentence'].apply(lambda x: x.split())
-    tokenized_sentences = merged_df['tokens'].tolist()
-    
-    w2v_model = Word2Vec(
-        sentences=tokenized_sentences,
-        vector_size=w2v_vector_size,
-        window=5,
-        min_count=1,
-        workers=4,
-        seed=42
-    )
-    print(f"  ✓ Word2Vec 모델 학습 완료 (vocab size: {len(w2v_model.wv)})")
+    with timed_stage("Word2Vec 학습", timings):
+        merged_df['tokens'] = merged_df['w2v_sentence'].str.split()
+        w2v_model = Word2Vec(
+            sentences=merged_df['tokens'].tolist(),
+            vector_size=w2v_vector_size,
+            window=5,
+            min_count=1,
+            workers=args.workers,
+            seed=42
+        )
+        print(f"  ✓ Word2Vec 모델 학습 완료 (vocab size: {len(w2v_model.wv)})")
     
     # ===================================
     # 4. 문장 벡터 생성
     # ===================================
     print("\n[4/6] 문장 벡터 생성 중...")
-    merged_df['w2v_vector'] = merged_df['tokens'].apply(
-        lambda tokens: sentence_to_vector(tokens, w2v_model, w2v_vector_size)
-    )
-    print("  ✓ 문장 벡터 생성 완료")
+    with timed_stage("문장 벡터 생성", timings):
+        w2v_vectors = sentence_vectors(merged_df['w2v_sentence'], w2v_model.wv)
+        print(f"  ✓ 문장 벡터 생성 완료 ({merged_df['w2v_sentence'].nunique()}개 고유 문장)")
     
     # ===================================
     # 5. Color/Fabric Word2Vec 모델 학습
     # ===================================
     print("\n[5/6] Color/Fabric Word2Vec 모델 학습 중...")
-    fabric_color_tokens = category_df[['predicted_color', 'predicted_fabric']].astype(str).values.tolist()
-    fabric_color_tokens = [[str(token).lower()] for row in fabric_color_tokens for token in row]
-    
-    color_fabric_model = Word2Vec(
-        sentences=fabric_color_tokens,
-        vector_size=cf_vector_size,
-        window=2,
-        min_count=1,
-        workers=4,
-        seed=42
-    )
-    print(f"  ✓ Color/Fabric 모델 학습 완료 (vocab size: {len(color_fabric_model.wv)})")
+    with timed_stage("Color/Fabric 학습", timings):
+        # 행 순서대로 (색상, 재질, 색상, 재질, ...) 한 단어짜리 문장 (결측값은 'nan' 토큰)
+        cf_values = category_df[['predicted_color', 'predicted_fabric']].to_numpy(dtype=object).ravel()
+        cf_tokens = pd.Series(cf_values, dtype=object).map(str).str.lower()
+        color_fabric_model = Word2Vec(
+            sentences=[[token] for token in cf_tokens.tolist()],
+            vector_size=cf_vector_size,
+            window=2,
+            min_count=1,
+            workers=args.workers,
+            seed=42
+        )
+        print(f"  ✓ Color/Fabric 모델 학습 완료 (vocab size: {len(color_fabric_model.wv)})")
     
     # ===================================
     # 6. 색상/재질 벡터 및 최종 벡터 생성
     # ===================================
     print("\n[6/6] 최종 벡터 생성 중...")
-    merged_df['color_vector'] = merged_df['predicted_color'].apply(
-        lambda color: get_color_vector(color, color_fabric_model, cf_vector_size)
-    )
-    merged_df['fabric_vector'] = merged_df['predicted_fabric'].apply(
-        lambda fabric: get_fabric_vector(fabric, color_fabric_model, cf_vector_size)
-    )
-    
-    # 최종 벡터 생성 (w2v + color + fabric)
-    final_vectors = []
-    for i in range(len(merged_df)):
-        w2v = merged_df.iloc[i]['w2v_vector']
-        color_vec = merged_df.iloc[i]['color_vector'] * color_weight
-        fabric_vec = merged_df.iloc[i]['fabric_vector'] * fabric_weight
-        final_vector = np.concatenate([w2v, color_vec, fabric_vec])
-        final_vectors.append(final_vector)
-    
-    merged_df['final_vector'] = final_vectors
-    print("  ✓ 최종 벡터 생성 완료")
+    with timed_stage("최종 벡터 생성", timings):
+        color_vectors = attribute_vectors(merged_df['predicted_color'], color_fabric_model.wv)
+        fabric_vectors = attribute_vectors(merged_df['predicted_fabric'], color_fabric_model.wv)
+
+        # 최종 벡터 (w2v + color * color_weight + fabric * fabric_weight)
+        final_vectors = np.hstack([
+            w2v_vectors,
+            color_vectors * np.float32(color_weight),
+            fabric_vectors * np.float32(fabric_weight)
+        ])
+
+        # merged_df.pkl을 읽는 코드(pickle 로더)와 호환되도록 행별 벡터 열도 저장
+        merged_df['w2v_vector'] = list(w2v_vectors)
+        merged_df['color_vector'] = list(color_vectors)
+        merged_df['fabric_vector'] = list(fabric_vectors)
+        merged_df['final_vector'] = list(final_vectors)
+        print("  ✓ 최종 벡터 생성 완료")
     
     # ===================================
     # 7. 모델 및 데이터 저장
@@ -165,39 +264,63 @@ def main():
     print("모델 및 데이터 저장 중...")
     print("=" * 50)
     
-    # Word2Vec 모델 저장
-    w2v_model_path = os.path.join(MODEL_DIR, "w2v_model.model")
-    w2v_model.save(w2v_model_path)
-    print(f"  ✓ Word2Vec 모델 저장: {w2v_model_path}")
-    
-    # Color/Fabric 모델 저장
-    color_fabric_model_path = os.path.join(MODEL_DIR, "color_fabric_model.model")
-    color_fabric_model.save(color_fabric_model_path)
-    print(f"  ✓ Color/Fabric 모델 저장: {color_fabric_model_path}")
-    
-    # 전처리된 데이터 저장 (벡터 포함)
-    merged_df_path = os.path.join(MODEL_DIR, "merged_df.pkl")
-    with open(merged_df_path, 'wb') as f:
-        pickle.dump(merged_df, f)
-    print(f"  ✓ 병합 데이터 저장: {merged_df_path}")
-    
-    # 필터링된 데이터 저장
-    filtered_df_path = os.path.join(MODEL_DIR, "filtered_df.pkl")
-    with open(filtered_df_path, 'wb') as f:
-        pickle.dump(filtered_df, f)
-    print(f"  ✓ 필터링 데이터 저장: {filtered_df_path}")
-    
-    # 파라미터 저장
-    params = {
-        'w2v_vector_size': w2v_vector_size,
-        'cf_vector_size': cf_vector_size,
-        'color_weight': color_weight,
-        'fabric_weight': fabric_weight
-    }
-    params_path = os.path.join(MODEL_DIR, "params.json")
-    with open(params_path, 'w', encoding='utf-8') as f:
-        json.dump(params, f, indent=2, ensure_ascii=False)
-    print(f"  ✓ 파라미터 저장: {params_path}")
+    with timed_stage("저장", timings):
+        # Word2Vec 모델 저장
+        w2v_model_path = os.path.join(MODEL_DIR, "w2v_model.model")
+        w2v_model.save(w2v_model_path)
+        print(f"  ✓ Word2Vec 모델 저장: {w2v_model_path}")
+
+        # Color/Fabric 모델 저장
+        color_fabric_model_path = os.path.join(MODEL_DIR, "color_fabric_model.model")
+        color_fabric_model.save(color_fabric_model_path)
+        print(f"  ✓ Color/Fabric 모델 저장: {color_fabric_model_path}")
+
+        # 전처리된 데이터 저장 (벡터 포함)
+        merged_df_path = os.path.join(MODEL_DIR, "merged_df.pkl")
+        with open(merged_df_path, 'wb') as f:
+            pickle.dump(merged_df, f)
+        print(f"  ✓ 병합 데이터 저장: {merged_df_path}")
+
+        # 필터링된 데이터 저장
+        filtered_df_path = os.path.join(MODEL_DIR, "filtered_df.pkl")
+        with open(filtered_df_path, 'wb') as f:
+            pickle.dump(filtered_df, f)
+        print(f"  ✓ 필터링 데이터 저장: {filtered_df_path}")
+
+        # 파라미터 저장 (model_version: 아이템 벡터를 결정하는 파라미터/임베딩의 해시)
+        params = {
+            'w2v_vector_size': w2v_vector_size,
+            'cf_vector_size': cf_vector_size,
+            'color_weight': color_weight,
+            'fabric_weight': fabric_weight
+        }
+        params['model_version'] = compute_model_version(
+            params,
+            list(w2v_model.wv.index_to_key),
+            w2v_model.wv.vectors,
+            list(color_fabric_model.wv.index_to_key),
+            color_fabric_model.wv.vectors
+        )
+        params_path = os.path.join(MODEL_DIR, "params.json")
+        with open(params_path, 'w', encoding='utf-8') as f:
+            json.dump(params, f, indent=2, ensure_ascii=False)
+        print(f"  ✓ 파라미터 저장: {params_path}")
+
+        # 서빙 번들 저장 (서버에서 메모리 매핑으로 로드)
+        # versions/{model_version}/에 저장하고 CURRENT를 바꾸면 실행 중인 서버가 재시작 없이 새 버전을 로드
+        # 코디 문장에서 카테고리 간 속성 궁합 테이블(상의 색상 x 하의 색상 등)도 함께 계산해 저장
+        bundle_dir = publish_serving_bundle(
+            MODEL_DIR,
+            params,
+            w2v_keys=list(w2v_model.wv.index_to_key),
+            w2v_vectors=w2v_model.wv.vectors,
+            cf_keys=list(color_fabric_model.wv.index_to_key),
+            cf_vectors=color_fabric_model.wv.vectors,
+            final_vectors=final_vectors,
+            coord_ids=merged_df['coord_id'].tolist(),
+            sentences=merged_df['w2v_sentence'].fillna('').tolist()
+        )
+        print(f"  ✓ 서빙 번들 저장: {bundle_dir} (CURRENT -> {params['model_version']})")
     
     print("\n" + "=" * 50)
     print("모델 학습 및 저장 완료!")
@@ -209,6 +332,13 @@ def main():
     print("  - merged_df.pkl")
     print("  - filtered_df.pkl")
     print("  - params.json")
+    print(f"  - {VERSIONS_DIR_NAME}/{params['model_version']}/ (서빙 번들: .npy 행렬 + bundle.json, coords.csv, 속성 궁합 테이블 compat_*.npy)")
+    print(f"  - {CURRENT_VERSION_FILE} (서버가 사용할 번들 버전)")
+
+    print("\n단계별 소요 시간:")
+    for name, elapsed in timings:
+        print(f"  - {name}: {elapsed:.2f}초")
+    print(f"  - 합계: {sum(elapsed for _, elapsed in timings):.2f}초")
 
 if __name__ == "__main__":
     main()
@@ -6,7 +6,8 @@ from .exceptions import (
     UnauthorizedException,
     NotFoundException,
     ConflictException,
-    InternalServerErrorException
+    InternalServerErrorException,
+    ServiceUnavailableException
 )
 
 __all__ = [
@@ -21,5 +22,6 @@ __all__ = [
     "NotFoundException",
     "ConflictException",
     "InternalServerErrorException",
+    "ServiceUnavailableException",
 ]
 
@@ -17,6 +17,42 @@ class Settings(BaseSettings):
     # 파일 저장 설정
     UPLOAD_DIR: str = "uploads"  # 옷 아이템 이미지 업로드 디렉토리
     
+    # AI 추천 모델 설정
+    # 관리자 API(/admin/model/reload) 토큰 (X-Admin-Token 헤더, 설정하지 않으면 관리자 API 비활성화)
+    ADMIN_TOKEN: Optional[str] = None
+    # models/CURRENT 확인 주기(초) - 새 버전이 배포되면 자동으로 재로드 (0이면 비활성화)
+    MODEL_WATCH_INTERVAL_SECONDS: int = 0
+    # 추천용 옷장 스냅샷 캐시에 보관할 최대 사용자 수 (0이면 캐시 비활성화)
+    CLOSET_SNAPSHOT_CACHE_SIZE: int = 1024
+    # 추천 결과 캐시 최대 항목 수와 유효 시간(초) (둘 중 하나가 0이면 캐시 비활성화)
+    RECOMMENDATION_CACHE_SIZE: int = 4096
+    RECOMMENDATION_CACHE_TTL_SECONDS: int = 300
+    # /outfit/recommend 추천 시간 예산(밀리초) - 넘기면 지금까지의 결과로 마무리 (0이면 제한 없음)
+    RECOMMEND_TIME_BUDGET_MS: int = 1500
+    # 추천 전용 실행기 - thread 또는 process(추천 엔진 계산을 워커 프로세스에서 실행), 워커 수, 대기 요청 수
+    # (처리 중 + 대기 중 요청이 RECOMMEND_MAX_WORKERS + RECOMMEND_MAX_QUEUE개이면 503 Retry-After)
+    RECOMMEND_EXECUTOR: str = "thread"
+    RECOMMEND_MAX_WORKERS: int = 4
+    RECOMMEND_MAX_QUEUE: int = 16
+    # 코디 조합 탐색(k 지정) 시 카테고리별 후보를 속성 궁합 상위 N개로 줄인 뒤 벡터 점수 계산 (0이면 줄이지 않음)
+    RECOMMEND_MAX_CANDIDATES: int = 0
+    
+    # 백그라운드 업로드(POST /closet/{category}?background=true) 분석 워커 수 (0이면 백그라운드 업로드 비활성화)
+    ANALYSIS_WORKERS: int = 2
+    # 분석 작업당 최대 시도 횟수와 첫 재시도까지 대기 시간(초, 재시도마다 2배)
+    ANALYSIS_MAX_ATTEMPTS: int = 3
+    ANALYSIS_RETRY_BASE_SECONDS: float = 5.0
+    # 서버 종료 시 실행 중인 분석 작업을 기다리는 최대 시간(초) - 끝나지 않은 작업은 다음 시작 시 다시 실행
+    ANALYSIS_SHUTDOWN_TIMEOUT_SECONDS: int = 30
+    # 같은 사진을 다시 올리면 저장된 Gemini 분석 결과를 재사용 (image_analysis_cache 테이블)
+    IMAGE_ANALYSIS_CACHE_ENABLED: bool = True
+    # 옷 추가 시 같은 카테고리에 dHash 해밍 거리가 이 값 이하이고 평균 색상이 비슷한 아이템이 있으면 거의 같은 사진으로 보고
+    # Gemini를 호출하지 않고 그 아이템의 feature와 이미지 파일을 재사용 (음수이면 비활성화)
+    NEAR_DUPLICATE_MAX_DISTANCE: int = 6
+    # 일괄 업로드(POST /closet/bulk) 요청당 최대 이미지 수와 동시에 분석하는 이미지 수
+    BULK_UPLOAD_MAX_ITEMS: int = 100
+    BULK_UPLOAD_CONCURRENCY: int = 4
+    
     # 프로젝트 설정
     PROJECT_NAME: str = "ClosetMate API"
     API_V1_PREFIX: str = ""
@@ -10,7 +10,8 @@ class ClosetMateException(HTTPException):
         status_code: int,
         error: str,
         message: str,
-        detail: Optional[Dict[str, Any]] = None
+        detail: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         super().__init__(
             status_code=status_code,
@@ -20,7 +21,8 @@ class ClosetMateException(HTTPException):
                 "error": error,
                 "message": message,
                 "detail": detail or {}
-            }
+            },
+            headers=headers
         )
 
 
@@ -83,3 +85,20 @@ class InternalServerErrorException(ClosetMateException):
             detail=detail
         )
 
+
+class ServiceUnavailableException(ClosetMateException):
+    """503 Service Unavailable (Retry-After 헤더 포함)"""
+    
+    def __init__(
+        self,
+        message: str = "서비스를 일시적으로 사용할 수 없습니다. 잠시 후 다시 시도하세요.",
+        detail: Optional[Dict[str, Any]] = None,
+        retry_after: int = 5
+    ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error="Service Unavailable",
+            message=message,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
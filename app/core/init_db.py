@@ -3,14 +3,48 @@
 테스트용 초기 데이터를 생성합니다.
 """
 
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 from ..models.user import User
 from ..models.closet_item import ClosetItem
 from ..models.today_outfit import TodayOutfit
 from ..models.favorite_outfit import FavoriteOutfit
+from ..models.suggested_outfit import SuggestedOutfit
+from ..models.analysis_job import AnalysisJob
 from ..utils.auth_stub import TEST_USER_ID, TEST_USERNAME
 
 
+def upgrade_schema(engine: Engine) -> None:
+    """
+    기존 테이블에 모델에 새로 추가된 컬럼을 추가합니다.
+    
+    Base.metadata.create_all은 이미 존재하는 테이블을 변경하지 않으므로,
+    nullable 컬럼만 ALTER TABLE ... ADD COLUMN으로 추가합니다.
+    (SQLite, PostgreSQL 모두 지원)
+    
+    Args:
+        engine: DB 엔진
+    """
+    from ..core.database import Base
+    
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+
 def _delete_test_data(db: Session) -> None:
     """
     테스트 유저 데이터 삭제
@@ -22,6 +56,8 @@ def _delete_test_data(db: Session) -> None:
     if user:
         # 관련 데이터 삭제 (cascade로 자동 삭제되지만 명시적으로)
         db.query(FavoriteOutfit).filter(FavoriteOutfit.user_id == user.id).delete()
+        db.query(SuggestedOutfit).filter(SuggestedOutfit.user_id == user.id).delete()
+        db.query(AnalysisJob).filter(AnalysisJob.user_id == user.id).delete()
         db.query(TodayOutfit).filter(TodayOutfit.user_id == user.id).delete()
         db.query(ClosetItem).filter(ClosetItem.user_id == user.id).delete()
         db.query(User).filter(User.id == TEST_USER_ID).delete()
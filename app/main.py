@@ -3,28 +3,38 @@ ClosetMate API 메인 진입점
 """
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from .core.config import settings
 from .core.database import engine, Base, SessionLocal
-from .core.init_db import init_test_data
+from .core.init_db import init_test_data, upgrade_schema
 from .core.firebase import initialize_firebase
+from .services.recommend_executor import shutdown_recommend_executor
+from .services.analysis_queue import start_analysis_queue, shutdown_analysis_queue
 from .utils.logger import logger
 from .routers import (
     auth_router,
     closet_router,
     outfit_router,
-    favorite_router
+    favorite_router,
+    admin_router
 )
-from .models import User, ClosetItem, TodayOutfit, FavoriteOutfit  # 테이블 생성용 import
+from .models import User, ClosetItem, TodayOutfit, FavoriteOutfit, SuggestedOutfit, AnalysisJob, ImageAnalysisCache  # 테이블 생성용 import
 
-# AI 추천 모델 로더 (서버 시작 시 로드)
+# AI 추천 모델 로더 (서버 시작 시 백그라운드에서 로드)
 try:
-    from ai_recommendation.model_loader import get_model_loader
-    model_loader = None
+    from ai_recommendation.model_loader import (
+        start_model_loading,
+        start_model_watcher,
+        get_model_load_status,
+        MODEL_STATE_READY
+    )
 except ImportError:
     print("⚠️ ai_recommendation 모듈을 찾을 수 없습니다. AI 추천 기능이 비활성화됩니다.")
-    model_loader = None
+    start_model_loading = None
+    start_model_watcher = None
+    get_model_load_status = None
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -48,12 +58,12 @@ def on_startup():
     """
     앱 시작 시 초기화 작업 수행:
     1. Firebase Admin SDK 초기화
-    2. 데이터베이스 테이블 생성
+    2. 데이터베이스 테이블 생성 (기존 테이블에는 새 컬럼 추가)
     3. 테스트용 초기 데이터 생성
-    4. AI 추천 모델 로드
+    4. AI 추천 모델 로드 시작 (백그라운드, 완료 여부는 /ready로 확인)
+    5. 새 모델 버전 감시 시작 (MODEL_WATCH_INTERVAL_SECONDS > 0인 경우)
+    6. 백그라운드 업로드 분석 큐 시작 (이전 실행에서 끝나지 않은 작업 복구)
     """
-    global model_loader
-    
     # 1. Firebase Admin SDK 초기화
     try:
         initialize_firebase()
@@ -63,8 +73,9 @@ def on_startup():
         logger.error("앱을 시작할 수 없습니다. Firebase 설정을 확인해주세요.")
         raise  # 앱 시작 중단
     
-    # 2. 테이블 생성
+    # 2. 테이블 생성 및 새로 추가된 컬럼 반영
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     
     # 3. 테스트용 초기 데이터 생성 (이미 존재하면 스킵)
     db = SessionLocal()
@@ -73,14 +84,34 @@ def on_startup():
     finally:
         db.close()
     
-    # 4. AI 추천 모델 로드
-    if get_model_loader is not None:
-        try:
-            model_loader = get_model_loader()
-            logger.info("AI 추천 모델 로드 완료")
-        except Exception as e:
-            logger.warning(f"AI 추천 모델 로드 실패: {e}")
-            model_loader = None
+    # 4. AI 추천 모델 로드 (서버 시작을 막지 않도록 백그라운드 스레드에서 한 번만 로드)
+    if start_model_loading is not None:
+        if start_model_loading():
+            logger.info("AI 추천 모델 로드 시작 (백그라운드)")
+    
+    # 5. models/CURRENT가 바뀌면 재시작 없이 새 모델로 교체
+    if start_model_watcher is not None and settings.MODEL_WATCH_INTERVAL_SECONDS > 0:
+        if start_model_watcher(settings.MODEL_WATCH_INTERVAL_SECONDS):
+            logger.info(f"AI 추천 모델 버전 감시 시작 ({settings.MODEL_WATCH_INTERVAL_SECONDS}초 주기)")
+    
+    # 6. 백그라운드 업로드 분석 워커 시작 (ANALYSIS_WORKERS > 0인 경우)
+    start_analysis_queue()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """
+    앱 종료 시 정리 작업 수행:
+    1. 추천 전용 실행기 종료 (처리 중인 추천 요청이 끝날 때까지 대기)
+    2. 분석 큐 종료 (실행 중인 분석 작업이 끝날 때까지 대기, 대기 중인 작업은 DB에 남아 다음 시작 시 실행)
+    """
+    shutdown_recommend_executor()
+    logger.info("추천 실행기 종료")
+    
+    if shutdown_analysis_queue():
+        logger.info("분석 큐 종료")
+    else:
+        logger.warning("분석 큐 종료 대기 시간 초과 (실행 중이던 작업은 다음 시작 시 다시 실행)")
 
 
 # 정적 파일 서빙 (이미지 파일 제공)
@@ -97,6 +128,7 @@ app.include_router(auth_router, prefix="/api/v1")
 app.include_router(closet_router, prefix="/api/v1")
 app.include_router(outfit_router, prefix="/api/v1")
 app.include_router(favorite_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -119,6 +151,27 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+def readiness_check():
+    """
+    준비 상태 체크 엔드포인트
+    
+    AI 추천 모델 로드가 끝나면 200, 로드 중이거나 실패했으면 503을 반환합니다.
+    (ai_recommendation 모듈이 없으면 AI 추천 없이 서비스하므로 200)
+    """
+    if get_model_load_status is None:
+        return {"status": "ready", "model": {"state": "disabled"}}
+    
+    model_status = get_model_load_status()
+    if model_status["state"] == MODEL_STATE_READY:
+        return {"status": "ready", "model": model_status}
+    
+    return JSONResponse(
+        status_code=503,
+        content={"status": "not_ready", "model": model_status}
+    )
+
+
 # 서버 직접 실행 (개발용)
 # 프로덕션에서는 uvicorn 명령어 사용 권장
 if __name__ == "__main__":
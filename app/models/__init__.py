@@ -2,11 +2,17 @@ from .user import User
 from .closet_item import ClosetItem
 from .today_outfit import TodayOutfit
 from .favorite_outfit import FavoriteOutfit
+from .suggested_outfit import SuggestedOutfit
+from .analysis_job import AnalysisJob
+from .image_analysis_cache import ImageAnalysisCache
 
 __all__ = [
     "User",
     "ClosetItem",
     "TodayOutfit",
     "FavoriteOutfit",
+    "SuggestedOutfit",
+    "AnalysisJob",
+    "ImageAnalysisCache",
 ]
 
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from datetime import datetime
+from ..core.database import Base
+
+# 분석 작업 상태
+JOB_STATUS_QUEUED = "queued"    # 실행 대기 (재시도 대기 포함, next_run_at 이후 실행)
+JOB_STATUS_RUNNING = "running"  # 워커가 실행 중 (서버가 비정상 종료되면 다음 시작 시 queued로 복구)
+JOB_STATUS_DONE = "done"
+JOB_STATUS_FAILED = "failed"    # 최대 시도 횟수를 넘겨 실패
+
+
+class AnalysisJob(Base):
+    """백그라운드 업로드(POST /closet/{category}?background=true)의 Gemini 분석 작업"""
+    __tablename__ = "analysis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(Integer, ForeignKey("closet_items.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    status = Column(String, nullable=False, default=JOB_STATUS_QUEUED, index=True)
+    attempts = Column(Integer, nullable=False, default=0)  # 지금까지 실행한 횟수
+    last_error = Column(String, nullable=True)
+    next_run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
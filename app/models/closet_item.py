@@ -1,7 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, LargeBinary, or_
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 
+# 분석 상태 (status가 NULL인 기존 아이템은 분석 완료로 취급)
+ITEM_STATUS_PENDING = "pending"  # 백그라운드 분석 대기/진행 중 (feature는 빈 문자열)
+ITEM_STATUS_READY = "ready"
+ITEM_STATUS_FAILED = "failed"    # 분석 실패 (사용자가 삭제 후 다시 업로드)
+
 
 class ClosetItem(Base):
     __tablename__ = "closet_items"
@@ -11,6 +16,15 @@ class ClosetItem(Base):
     category = Column(String)  # top, bottom, shoes, outer
     feature = Column(String, nullable=False)  # Gemini API로 추출한 피쳐 정보 (예: '하의_gray_cotton_숏 팬츠_남성_여름_casual')
     image_url = Column(String, nullable=True)
+    embedding = Column(LargeBinary, nullable=True)  # AI 추천용 feature 벡터 (float32 bytes)
+    embedding_version = Column(String, nullable=True)  # embedding을 만든 모델 버전 (모델이 바뀌면 다시 계산)
+    status = Column(String, nullable=True, default=ITEM_STATUS_READY)  # 분석 상태 (pending, ready, failed)
+    image_hash = Column(String, nullable=True)  # 이미지 dHash + 평균 색상 hex (거의 같은 사진 찾기용)
     
     # 관계 정의
-    user = relationship("User", back_populates="closet_items")
\ No newline at end of file
+    user = relationship("User", back_populates="closet_items")
+
+    @classmethod
+    def is_ready(cls):
+        """분석이 끝난 아이템만 조회하는 필터 조건 (목록/추천/코디 선택에서 사용)"""
+        return or_(cls.status.is_(None), cls.status == ITEM_STATUS_READY)
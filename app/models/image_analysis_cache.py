@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..core.database import Base
+
+
+class ImageAnalysisCache(Base):
+    """
+    Gemini 이미지 분석 결과 캐시 (같은 사진을 다시 올리면 Gemini를 호출하지 않음)
+    성별은 사용자 정보에서 붙이므로 저장하지 않고, 조회 시 feature 문자열을 다시 만듦
+    """
+    __tablename__ = "image_analysis_cache"
+
+    # SHA-256(정규화한 이미지 픽셀, 카테고리, 프롬프트 버전)
+    cache_key = Column(String, primary_key=True)
+    category = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    attributes = Column(String, nullable=False)  # 파싱한 응답 JSON (category_detail, season, color, material, style)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_hit_at = Column(DateTime, nullable=True)
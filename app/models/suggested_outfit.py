@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from ..core.database import Base
+
+
+class SuggestedOutfit(Base):
+    """야간 배치(scripts/precompute_outfits.py)로 미리 계산한 사용자별 추천 코디"""
+    __tablename__ = "suggested_outfit"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # 아이템이 삭제되면 옷장 버전이 올라가 사용되지 않으므로 closet_items 외래 키는 두지 않음
+    top_id = Column(Integer, nullable=True)
+    bottom_id = Column(Integer, nullable=True)
+    shoes_id = Column(Integer, nullable=True)
+    outer_id = Column(Integer, nullable=True)
+    input_key = Column(String, nullable=False)  # 계산에 사용한 선택 아이템/모델 버전/옷장 버전의 해시
+    model_version = Column(String, nullable=True)
+    closet_version = Column(Integer, nullable=True)  # 계산 시점의 옷장 버전 (User.closet_version)
+    created_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # 관계 정의
+    user = relationship("User", back_populates="suggested_outfit")
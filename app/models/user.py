@@ -18,7 +18,11 @@ class User(Base):
     
     # password 필드는 Firebase에서 관리
     
+    # 옷장 아이템이 추가/삭제될 때마다 증가 (추천용 옷장 스냅샷 캐시 무효화에 사용)
+    closet_version = Column(Integer, nullable=True, default=0)
+    
     # 관계 정의
     closet_items = relationship("ClosetItem", back_populates="user", cascade="all, delete-orphan")
     today_outfit = relationship("TodayOutfit", back_populates="user", uselist=False, cascade="all, delete-orphan")
-    favorite_outfits = relationship("FavoriteOutfit", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    favorite_outfits = relationship("FavoriteOutfit", back_populates="user", cascade="all, delete-orphan")
+    suggested_outfit = relationship("SuggestedOutfit", back_populates="user", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
@@ -2,11 +2,13 @@ from .auth_router import router as auth_router
 from .closet_router import router as closet_router
 from .outfit_router import router as outfit_router
 from .favorite_router import router as favorite_router
+from .admin_router import router as admin_router
 
 __all__ = [
     "auth_router",
     "closet_router",
     "outfit_router",
     "favorite_router",
+    "admin_router",
 ]
 
@@ -0,0 +1,65 @@
+"""
+관리자 라우터
+- AI 추천 모델 상태 조회, 재시작 없는 모델 교체
+- 추천 캐시 통계 조회
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, status
+from ..utils.dependencies import verify_admin_token
+from ..schemas.admin_schema import ModelStatusResponse, ModelReloadResponse, CacheStatsResponse
+from ..services.ai_service import get_ai_model_status, reload_ai_model, get_recommendation_cache_stats
+from ..services.image_analysis_cache import image_analysis_cache
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(verify_admin_token)]
+)
+
+
+@router.get("/model", response_model=ModelStatusResponse)
+def get_model_status_endpoint():
+    """
+    AI 추천 모델 상태 조회
+    
+    Returns:
+        ModelStatusResponse: 사용 중인 모델 버전, 배포된 버전(CURRENT), 재로드 진행 여부
+    """
+    return ModelStatusResponse(**get_ai_model_status())
+
+
+@router.post(
+    "/model/reload",
+    response_model=ModelReloadResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+def reload_model_endpoint(version: Optional[str] = None):
+    """
+    AI 추천 모델 재로드 (서버 재시작 없이 새 버전으로 교체)
+    
+    새 모델을 백그라운드에서 로드하고, 로드가 끝나면 사용 중인 모델을 교체합니다.
+    교체 전까지의 요청은 기존 모델로 처리되며, 진행 상황은 GET /admin/model로 확인합니다.
+    
+    Args:
+        version: 로드할 모델 버전 (생략하면 models/CURRENT가 가리키는 버전)
+    
+    Returns:
+        ModelReloadResponse: 재로드 시작 메시지와 모델 상태
+    """
+    model_status = reload_ai_model(version)
+    return ModelReloadResponse(
+        message=f"모델 재로드 시작: {version or model_status.get('available_version') or 'CURRENT'}",
+        model=ModelStatusResponse(**model_status)
+    )
+
+
+@router.get("/cache", response_model=CacheStatsResponse)
+def get_cache_stats_endpoint():
+    """
+    캐시 통계 조회 (요청을 처리한 워커 프로세스 기준, 분석 결과 캐시의 저장 항목 수는 DB 기준)
+    
+    Returns:
+        CacheStatsResponse: 옷장 스냅샷 캐시, 추천 결과 캐시, Gemini 분석 결과 캐시의 크기와 적중/미스 횟수
+    """
+    return CacheStatsResponse(**get_recommendation_cache_stats(), image_analysis=image_analysis_cache.stats())
@@ -1,28 +1,57 @@
 """
 옷장 라우터
 - 옷장 아이템 CRUD
+- 백그라운드 업로드 (202 응답 후 분석) 및 분석 상태 조회
+- 거의 같은 사진(dHash)을 다시 올리면 기존 아이템의 feature와 이미지 파일 재사용
+- 일괄 업로드 (여러 이미지를 제한된 동시성으로 분석, 이미지별 결과 반환)
 """
 
-from fastapi import APIRouter, Depends, Path, File, UploadFile
+import asyncio
+import time
+from fastapi import APIRouter, Depends, Path, File, UploadFile, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from starlette.datastructures import UploadFile as StarletteUploadFile
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+from ..core.config import settings
 from ..utils.dependencies import get_current_user, get_db
 from ..models.user import User
-from ..models.closet_item import ClosetItem
+from ..models.closet_item import ClosetItem, ITEM_STATUS_PENDING, ITEM_STATUS_READY
+from ..models.analysis_job import AnalysisJob
 from ..schemas.closet_schema import (
     ClosetItemResponse,
     # ClosetItemCreate,  # 혹시 모를 사용 가능성을 위해 주석 처리하여 유지
+    ClosetItemCreatedResponse,
+    ClosetItemAcceptedResponse,
+    ClosetItemStatusResponse,
+    BulkUploadItemResult,
+    BulkUploadResponse,
     MessageResponse
 )
 from ..services import (
-    analyze_clothing_image_from_bytes,
+    analyze_clothing_image_from_bytes_async,
+    compute_item_embedding,
+    bump_closet_version,
+    enqueue_analysis,
+    get_analysis_status,
+    notify_analysis_queue,
+    compute_image_hash,
+    find_near_duplicate,
+    is_near_duplicate,
     save_image,
     delete_image
 )
 from ..core.exceptions import NotFoundException, BadRequestException
+from ..utils.logger import logger
 
 router = APIRouter(prefix="/closet", tags=["Closet"])
 
+# 분석 상태 long-poll 최대 대기 시간과 DB 확인 주기 (초)
+ANALYSIS_STATUS_MAX_WAIT_SECONDS = 30
+ANALYSIS_STATUS_POLL_INTERVAL_SECONDS = 0.5
+
 
 @router.get("/{category}", response_model=List[ClosetItemResponse])
 def get_closet_items(
@@ -52,12 +81,13 @@ def get_closet_items(
         )
     
     # feature와 image_url이 모두 있는 완전한 아이템만 조회
-    # (불완전한 데이터는 제외)
+    # (불완전한 데이터와 백그라운드 분석이 끝나지 않은 아이템은 제외)
     items = db.query(ClosetItem).filter(
         ClosetItem.user_id == current_user.id,
         ClosetItem.category == category,
         ClosetItem.feature.isnot(None),
-        ClosetItem.image_url.isnot(None)
+        ClosetItem.image_url.isnot(None),
+        ClosetItem.is_ready()
     ).all()
     
     return [
@@ -69,24 +99,518 @@ def get_closet_items(
     ]
 
 
-@router.post("/{category}", response_model=MessageResponse)
+def _compute_image_hash(image_bytes: bytes) -> Optional[str]:
+    """
+    업로드 이미지의 dHash 계산 (이미지 디코딩/리사이즈가 있으므로 스레드풀로 실행)
+    
+    Args:
+        image_bytes: 이미지 바이너리 데이터
+    
+    Returns:
+        Optional[str]: 이미지 해시 (계산하지 못하면 None)
+    """
+    try:
+        return compute_image_hash(image_bytes)
+    except Exception as e:
+        # 해시를 계산하지 못해도 업로드는 계속 진행 (이미지 오류는 분석 단계에서 처리)
+        logger.warning(f"이미지 해시 계산 실패 (중복 확인 생략): {e}")
+        return None
+
+
+def _find_duplicate_item(
+    db: Session,
+    user_id: int,
+    category: str,
+    image_hash: Optional[str]
+) -> Optional[ClosetItem]:
+    """
+    사용자 옷장에서 거의 같은 사진 찾기
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        category: 카테고리
+        image_hash: 업로드 이미지의 dHash (None이면 중복 확인 생략)
+    
+    Returns:
+        Optional[ClosetItem]: 거의 같은 사진인 기존 아이템 (없으면 None)
+    """
+    if image_hash is None or settings.NEAR_DUPLICATE_MAX_DISTANCE < 0:
+        return None
+    
+    match = find_near_duplicate(db, user_id, category, image_hash, settings.NEAR_DUPLICATE_MAX_DISTANCE)
+    if match is None:
+        return None
+    
+    duplicate, distance = match
+    logger.info(f"거의 같은 사진 업로드: user_id={user_id}, duplicate_of={duplicate.id}, distance={distance}")
+    return duplicate
+
+
+def _store_closet_item(
+    db: Session,
+    user_id: int,
+    category: str,
+    feature: str,
+    image_bytes: bytes,
+    file_extension: str,
+    image_hash: Optional[str] = None,
+    image_url: Optional[str] = None
+) -> int:
+    """
+    분석이 끝난 옷을 저장 (embedding 계산, DB 커밋, 이미지 리사이즈/파일 쓰기)
+    블로킹 작업이므로 create_closet_item에서 스레드풀로 실행합니다.
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        category: 카테고리
+        feature: Gemini로 추출한 feature 문자열 (거의 같은 사진이면 기존 아이템의 feature)
+        image_bytes: 이미지 바이너리 데이터
+        file_extension: 파일 확장자
+        image_hash: 이미지 dHash
+        image_url: 재사용할 기존 이미지 경로 (지정하면 이미지를 새로 저장하지 않음)
+    
+    Returns:
+        int: 저장된 아이템 ID
+    """
+    # AI 추천용 embedding 계산 (모델이 로드되지 않았으면 추천 시 계산)
+    embedding, embedding_version = compute_item_embedding(feature)
+    
+    saved_image_url = None
+    try:
+        # DB에 아이템 생성 (이미지 저장 전에 ID를 얻기 위해)
+        new_item = ClosetItem(
+            user_id=user_id,
+            category=category,
+            feature=feature,
+            image_url=image_url,  # 재사용하지 않으면 아직 저장 전
+            embedding=embedding,
+            embedding_version=embedding_version,
+            image_hash=image_hash
+        )
+        
+        db.add(new_item)
+        bump_closet_version(db, user_id)
+        db.commit()
+        db.refresh(new_item)
+        
+        if image_url is None:
+            # 이미지 저장
+            saved_image_url = save_image(
+                image_bytes=image_bytes,
+                user_id=user_id,
+                item_id=new_item.id,
+                file_extension=file_extension
+            )
+            new_item.image_url = saved_image_url
+            db.commit()
+        return new_item.id
+    except Exception:
+        # 같은 세션을 쓰는 다음 작업(일괄 업로드의 다른 이미지)이 계속 진행할 수 있도록
+        db.rollback()
+        # 경로가 커밋되지 않은 이미지 파일은 참조하는 아이템이 없음 (재사용한 기존 파일은 지우지 않음)
+        if saved_image_url is not None:
+            delete_image(saved_image_url)
+        raise
+
+
+def _store_if_near_duplicate(
+    db: Session,
+    user_id: int,
+    category: str,
+    image_hash: Optional[str],
+    image_bytes: bytes,
+    file_extension: str
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    거의 같은 사진이 있으면 Gemini 분석 없이 기존 아이템의 feature와 이미지 파일로 바로 저장
+    블로킹 작업이므로 스레드풀로 실행합니다.
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        category: 카테고리
+        image_hash: 업로드 이미지의 dHash (_compute_image_hash)
+        image_bytes: 이미지 바이너리 데이터
+        file_extension: 파일 확장자
+    
+    Returns:
+        Tuple[Optional[int], Optional[int]]: (저장된 아이템 ID, 기존 아이템 ID)
+        - 거의 같은 사진이 없으면 (None, None)
+    """
+    duplicate = _find_duplicate_item(db, user_id, category, image_hash)
+    if duplicate is None:
+        return None, None
+    
+    duplicate_id = duplicate.id
+    item_id = _store_closet_item(
+        db, user_id, category, duplicate.feature, image_bytes, file_extension, image_hash, duplicate.image_url
+    )
+    return item_id, duplicate_id
+
+
+def _store_duplicate_item(
+    db: Session,
+    user_id: int,
+    category: str,
+    duplicate_id: int,
+    image_bytes: bytes,
+    file_extension: str,
+    image_hash: Optional[str]
+) -> Optional[int]:
+    """
+    같은 일괄 업로드 요청에서 먼저 분석한 거의 같은 사진의 feature와 이미지 파일로 저장
+    블로킹 작업이므로 스레드풀로 실행합니다.
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        category: 카테고리
+        duplicate_id: 먼저 저장된 아이템 ID
+        image_bytes: 이미지 바이너리 데이터
+        file_extension: 파일 확장자
+        image_hash: 이미지 dHash
+    
+    Returns:
+        Optional[int]: 저장된 아이템 ID (먼저 저장된 아이템이 없으면 None)
+    """
+    duplicate = db.get(ClosetItem, duplicate_id)
+    if duplicate is None or duplicate.image_url is None:
+        return None
+    return _store_closet_item(
+        db, user_id, category, duplicate.feature, image_bytes, file_extension, image_hash, duplicate.image_url
+    )
+
+
+def _find_pending_duplicate(
+    pending: Dict[str, Tuple[str, "asyncio.Future[Optional[int]]"]],
+    category: str,
+    image_hash: str
+) -> Optional["asyncio.Future[Optional[int]]"]:
+    """
+    같은 일괄 업로드 요청에서 분석 중인 거의 같은 사진 찾기
+    
+    Args:
+        pending: 이미지 해시 -> (카테고리, 저장될 아이템 ID를 받을 Future)
+        category: 카테고리
+        image_hash: 업로드 이미지의 dHash
+    
+    Returns:
+        Optional[asyncio.Future[Optional[int]]]: 먼저 분석 중인 이미지의 Future (없으면 None)
+    """
+    for pending_hash, (pending_category, future) in pending.items():
+        if pending_category == category and is_near_duplicate(
+            pending_hash, image_hash, settings.NEAR_DUPLICATE_MAX_DISTANCE
+        ):
+            return future
+    return None
+
+
+def _store_pending_closet_item(
+    db: Session,
+    user_id: int,
+    category: str,
+    image_bytes: bytes,
+    file_extension: str,
+    image_hash: Optional[str] = None
+) -> int:
+    """
+    분석 전 아이템(status=pending)과 이미지를 저장하고 분석 작업을 추가 (백그라운드 업로드)
+    블로킹 작업이므로 create_closet_item에서 스레드풀로 실행합니다.
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        category: 카테고리
+        image_bytes: 이미지 바이너리 데이터
+        file_extension: 파일 확장자
+        image_hash: 이미지 dHash (분석이 끝나면 이후 업로드의 중복 확인에 사용)
+    
+    Returns:
+        int: 저장된 아이템 ID
+    """
+    saved_image_url = None
+    try:
+        # feature는 분석이 끝나면 채움 (그 전까지 목록/추천에서 제외)
+        new_item = ClosetItem(
+            user_id=user_id,
+            category=category,
+            feature="",
+            image_url=None,
+            status=ITEM_STATUS_PENDING,
+            image_hash=image_hash
+        )
+        db.add(new_item)
+        db.flush()  # 이미지 파일 이름에 쓸 ID
+        
+        saved_image_url = save_image(
+            image_bytes=image_bytes,
+            user_id=user_id,
+            item_id=new_item.id,
+            file_extension=file_extension
+        )
+        new_item.image_url = saved_image_url
+        enqueue_analysis(db, new_item)
+        db.commit()
+        return new_item.id
+    except Exception:
+        db.rollback()
+        # 아이템이 저장되지 않았으므로 이미 쓴 이미지 파일은 참조하는 아이템이 없음
+        if saved_image_url is not None:
+            delete_image(saved_image_url)
+        raise
+
+
+async def _add_bulk_item(
+    index: int,
+    image: UploadFile,
+    category: str,
+    user_id: int,
+    user_gender: str,
+    db: Session,
+    db_lock: asyncio.Lock,
+    semaphore: asyncio.Semaphore,
+    pending: Dict[str, Tuple[str, "asyncio.Future[Optional[int]]"]]
+) -> BulkUploadItemResult:
+    """
+    일괄 업로드의 이미지 하나를 추가 (실패해도 예외 대신 failed 결과를 반환)
+    
+    이미지 읽기부터 저장까지 semaphore 안에서 실행하므로 동시에 메모리에 올라가고 Gemini로 분석하는 이미지 수가 제한됩니다.
+    요청의 DB 세션 하나를 함께 쓰므로 DB 작업은 db_lock으로 한 번에 하나씩 실행합니다.
+    같은 요청 안의 거의 같은 사진은 아직 옷장에 없으므로 pending에 등록된 먼저 온 이미지의 저장 결과를 기다려 재사용합니다.
+    
+    Args:
+        index: 요청한 이미지 순서
+        image: 업로드된 이미지 파일
+        category: 카테고리
+        user_id: 사용자 ID
+        user_gender: 사용자 성별
+        db: DB 세션
+        db_lock: DB 세션 사용 잠금
+        semaphore: 동시 처리 이미지 수 제한
+        pending: 요청 안에서 분석 중인 이미지 (이미지 해시 -> (카테고리, 저장될 아이템 ID를 받을 Future))
+    
+    Returns:
+        BulkUploadItemResult: 이미지별 결과
+    """
+    result = BulkUploadItemResult(index=index, filename=image.filename, category=category, status="failed")
+    valid_categories = ["top", "bottom", "shoes", "outer"]
+    
+    # 이 이미지를 먼저 분석하는 경우 뒤따르는 거의 같은 사진에 저장 결과를 알려줄 Future
+    own_future = None
+    item_id = None
+    
+    async with semaphore:
+        try:
+            if category not in valid_categories:
+                raise BadRequestException(
+                    message=f"잘못된 카테고리입니다. 가능한 값: {', '.join(valid_categories)}",
+                    detail={"category": category}
+                )
+            if not image.content_type or not image.content_type.startswith("image/"):
+                raise BadRequestException(
+                    message="이미지 파일만 업로드 가능합니다.",
+                    detail={"content_type": image.content_type}
+                )
+            
+            # 업로드 파일은 임시 파일에 있으므로 처리할 차례가 된 이미지만 읽음
+            image_bytes = await image.read()
+            if len(image_bytes) == 0:
+                raise BadRequestException(message="이미지 파일이 비어있습니다.", detail={})
+            
+            filename = image.filename or "image"
+            file_extension = filename.split(".")[-1].lower() if "." in filename else "jpg"
+            
+            # 해시 계산(이미지 디코딩/리사이즈)은 DB 세션을 쓰지 않으므로 잠금 밖에서 동시에 실행
+            image_hash = await run_in_threadpool(_compute_image_hash, image_bytes)
+            
+            # 거의 같은 사진이 이미 있으면 Gemini 호출 없이 저장
+            leader_future = None
+            async with db_lock:
+                item_id, duplicate_id = await run_in_threadpool(
+                    _store_if_near_duplicate, db, user_id, category, image_hash, image_bytes, file_extension
+                )
+                if item_id is None and image_hash is not None and settings.NEAR_DUPLICATE_MAX_DISTANCE >= 0:
+                    leader_future = _find_pending_duplicate(pending, category, image_hash)
+                    if leader_future is None:
+                        own_future = asyncio.get_running_loop().create_future()
+                        pending[image_hash] = (category, own_future)
+            
+            if leader_future is not None:
+                # 먼저 온 이미지가 실패하면 직접 분석
+                leader_id = await leader_future
+                if leader_id is not None:
+                    async with db_lock:
+                        item_id = await run_in_threadpool(
+                            _store_duplicate_item, db, user_id, category, leader_id, image_bytes, file_extension, image_hash
+                        )
+                    if item_id is not None:
+                        duplicate_id = leader_id
+            
+            if item_id is None:
+                feature = await analyze_clothing_image_from_bytes_async(
+                    image_bytes=image_bytes,
+                    category=category,
+                    user_gender=user_gender
+                )
+                async with db_lock:
+                    item_id = await run_in_threadpool(
+                        _store_closet_item, db, user_id, category, feature, image_bytes, file_extension, image_hash
+                    )
+            
+            result.status = "created"
+            result.item_id = item_id
+            result.duplicate_of = duplicate_id
+        except BadRequestException as e:
+            result.error = e.detail["message"]
+        except Exception as e:
+            logger.error(f"일괄 업로드 이미지 추가 실패: user_id={user_id}, index={index}, 오류: {e}")
+            result.error = f"옷 추가 중 오류가 발생했습니다: {str(e)}"
+        finally:
+            if own_future is not None:
+                own_future.set_result(item_id)
+            await image.close()
+    
+    return result
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkUploadResponse,
+    # 본문은 핸들러에서 직접 파싱하므로 문서용 스키마만 지정
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["images", "categories"],
+                        "properties": {
+                            "images": {
+                                "type": "array",
+                                "items": {"type": "string", "format": "binary"},
+                                "description": "옷 이미지 파일 목록"
+                            },
+                            "categories": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "이미지별 카테고리 (images와 같은 순서, 쉼표로 구분한 문자열도 가능)"
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def create_closet_items_bulk(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    옷 일괄 추가 (온보딩 시 여러 장을 한 번에 업로드)
+    
+    이미지를 BULK_UPLOAD_CONCURRENCY개씩 동시에 Gemini로 분석하고 저장합니다.
+    일부 이미지가 실패해도 나머지는 추가되며, 이미지별 결과(아이템 ID 또는 오류)를 요청 순서대로 반환합니다.
+    같은 요청에 거의 같은 사진이 여러 장 있으면 한 장만 분석하고 나머지는 그 결과를 재사용합니다.
+    
+    본문(images, categories)은 파일 수를 BULK_UPLOAD_MAX_ITEMS개로 제한해 직접 파싱하므로,
+    최대 이미지 수를 넘는 요청은 나머지 본문을 읽기 전에 거절합니다.
+    
+    Args:
+        request: 요청 (multipart/form-data 본문)
+        current_user: 현재 사용자
+        db: DB 세션
+    
+    Returns:
+        BulkUploadResponse: 추가/실패 수와 이미지별 결과
+    
+    Raises:
+        BadRequestException: 이미지가 없거나, 이미지 수와 카테고리 수가 다르거나, 최대 이미지 수를 넘은 경우
+    """
+    max_items = settings.BULK_UPLOAD_MAX_ITEMS
+    try:
+        # 카테고리는 이미지별로 하나씩 보내므로 필드 수도 같은 값으로 제한
+        form = await request.form(max_files=max_items, max_fields=max_items)
+    except StarletteHTTPException as e:
+        # 파일/필드 수 초과는 Starlette 파서가 "Too many files/fields" 메시지로 알림
+        if str(e.detail).startswith("Too many"):
+            raise BadRequestException(
+                message=f"한 번에 최대 {max_items}개까지 업로드할 수 있습니다.",
+                detail={"error": e.detail, "config": "BULK_UPLOAD_MAX_ITEMS"}
+            )
+        raise BadRequestException(message="요청 본문을 읽을 수 없습니다.", detail={"error": e.detail})
+    
+    images = [value for value in form.getlist("images") if isinstance(value, StarletteUploadFile)]
+    # 쉼표로 구분한 하나의 문자열로 보낸 경우도 허용 (Swagger UI 등)
+    categories = [
+        category.strip()
+        for value in form.getlist("categories") if isinstance(value, str)
+        for category in value.split(",") if category.strip()
+    ]
+    
+    if not images:
+        raise BadRequestException(message="이미지 파일이 필요합니다.", detail={"field": "images"})
+    if len(images) != len(categories):
+        raise BadRequestException(
+            message="이미지 수와 카테고리 수가 같아야 합니다.",
+            detail={"images": len(images), "categories": len(categories)}
+        )
+    
+    # 사용자 정보는 스레드로 넘기기 전에 읽어 둠
+    user_id = current_user.id
+    user_gender = current_user.gender
+    
+    db_lock = asyncio.Lock()
+    semaphore = asyncio.Semaphore(max(1, settings.BULK_UPLOAD_CONCURRENCY))
+    pending = {}
+    results = await asyncio.gather(*[
+        _add_bulk_item(index, image, category, user_id, user_gender, db, db_lock, semaphore, pending)
+        for index, (image, category) in enumerate(zip(images, categories))
+    ])
+    
+    created = sum(1 for result in results if result.status == "created")
+    return BulkUploadResponse(
+        message="추가 완료" if created == len(results) else "일부 추가 완료",
+        created=created,
+        failed=len(results) - created,
+        items=list(results)
+    )
+
+
+@router.post(
+    "/{category}",
+    response_model=ClosetItemCreatedResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": ClosetItemAcceptedResponse}}
+)
 async def create_closet_item(
     category: str = Path(..., description="카테고리 (top, bottom, shoes, outer)"),
     image: UploadFile = File(..., description="옷 이미지 파일"),
+    background: bool = Query(False, description="true이면 이미지만 저장하고 202로 응답한 뒤 백그라운드에서 분석"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     옷 추가 (이미지 업로드 및 Gemini API로 feature 추출)
     
+    background=true이면 이미지와 분석 전 아이템(pending)을 저장하고 바로 202와 아이템 ID를 반환합니다.
+    분석은 분석 큐 워커가 실행하며(실패 시 재시도), 결과는 GET /closet/items/{item_id}/status로 확인합니다.
+    
+    같은 카테고리에 거의 같은 사진(dHash 해밍 거리 NEAR_DUPLICATE_MAX_DISTANCE 이하)이 있으면
+    Gemini를 호출하지 않고 그 아이템의 feature와 이미지 파일을 재사용하며, 응답의 duplicate_of로 알려줍니다.
+    
     Args:
         category: 카테고리 (top, bottom, shoes, outer)
         image: 업로드된 이미지 파일
+        background: 백그라운드 분석 여부
         current_user: 현재 사용자
         db: DB 세션
     
     Returns:
-        MessageResponse: 추가 완료 메시지
+        ClosetItemCreatedResponse: 추가 완료 메시지와 아이템 ID (background=true이면 202 ClosetItemAcceptedResponse)
     
     Raises:
         BadRequestException: 잘못된 카테고리 또는 이미지 처리 실패 시
@@ -120,41 +644,53 @@ async def create_closet_item(
         filename = image.filename or "image"
         file_extension = filename.split(".")[-1].lower() if "." in filename else "jpg"
         
-        # 사용자 성별 가져오기
+        # 사용자 정보는 스레드로 넘기기 전에 읽어 둠
+        user_id = current_user.id
         user_gender = current_user.gender
         
-        # 1. Gemini API로 feature 추출
-        feature = analyze_clothing_image_from_bytes(
-            image_bytes=image_bytes,
-            category=category,
-            user_gender=user_gender
+        # 거의 같은 사진이 이미 있으면 Gemini 호출 없이 기존 아이템의 feature와 이미지 파일로 저장
+        # (해시 계산과 DB 작업은 스레드풀에서)
+        image_hash = await run_in_threadpool(_compute_image_hash, image_bytes)
+        item_id, duplicate_id = await run_in_threadpool(
+            _store_if_near_duplicate, db, user_id, category, image_hash, image_bytes, file_extension
         )
         
-        # 2. DB에 아이템 생성 (이미지 저장 전에 ID를 얻기 위해)
-        new_item = ClosetItem(
-            user_id=current_user.id,
-            category=category,
-            feature=feature,
-            image_url=None  # 아직 저장 전
-        )
+        if item_id is not None:
+            if background:
+                accepted = ClosetItemAcceptedResponse(
+                    message="추가 완료", item_id=item_id, status=ITEM_STATUS_READY, duplicate_of=duplicate_id
+                )
+                return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted.model_dump())
+            return ClosetItemCreatedResponse(message="추가 완료", item_id=item_id, duplicate_of=duplicate_id)
         
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
+        if background:
+            if settings.ANALYSIS_WORKERS <= 0:
+                raise BadRequestException(
+                    message="백그라운드 업로드가 비활성화되어 있습니다.",
+                    detail={"config": "ANALYSIS_WORKERS"}
+                )
+            
+            item_id = await run_in_threadpool(
+                _store_pending_closet_item, db, user_id, category, image_bytes, file_extension, image_hash
+            )
+            notify_analysis_queue()
+            
+            accepted = ClosetItemAcceptedResponse(message="분석 대기 중", item_id=item_id, status=ITEM_STATUS_PENDING)
+            return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted.model_dump())
         
-        # 3. 이미지 저장
-        image_url = save_image(
+        # 1. Gemini API로 feature 추출 (비동기 호출, 이미지 디코딩/리사이즈는 스레드에서)
+        feature = await analyze_clothing_image_from_bytes_async(
             image_bytes=image_bytes,
-            user_id=current_user.id,
-            item_id=new_item.id,
-            file_extension=file_extension
+            category=category,
+            user_gender=user_gender
         )
         
-        # 4. image_url 업데이트
-        new_item.image_url = image_url
-        db.commit()
+        # 2. embedding 계산, DB 저장, 이미지 파일 저장 (블로킹 작업이므로 스레드풀에서)
+        item_id = await run_in_threadpool(
+            _store_closet_item, db, user_id, category, feature, image_bytes, file_extension, image_hash
+        )
         
-        return MessageResponse(message="추가 완료")
+        return ClosetItemCreatedResponse(message="추가 완료", item_id=item_id)
         
     except BadRequestException:
         # BadRequestException은 그대로 전달
@@ -167,6 +703,49 @@ async def create_closet_item(
         )
 
 
+def _read_analysis_status(db: Session, user_id: int, item_id: int) -> Dict[str, Any]:
+    """분석 상태를 조회하고 읽기 트랜잭션을 끝냄 (long-poll 중 분석 워커의 커밋을 막지 않고, 다음 조회에서 최신 상태를 읽도록)"""
+    try:
+        return get_analysis_status(db, user_id, item_id)
+    finally:
+        db.rollback()
+
+
+@router.get("/items/{item_id}/status", response_model=ClosetItemStatusResponse)
+async def get_closet_item_status(
+    item_id: int = Path(..., description="아이템 ID"),
+    wait: float = Query(
+        0, ge=0, le=ANALYSIS_STATUS_MAX_WAIT_SECONDS,
+        description="분석 중(pending)이면 끝날 때까지 최대 몇 초 기다릴지 (long-poll, 0이면 바로 응답)"
+    ),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    옷장 아이템 분석 상태 조회 (백그라운드 업로드 결과 확인)
+    
+    Args:
+        item_id: 아이템 ID
+        wait: long-poll 최대 대기 시간 (초)
+        current_user: 현재 사용자
+        db: DB 세션
+    
+    Returns:
+        ClosetItemStatusResponse: 분석 상태 (pending, ready, failed)와 feature
+    
+    Raises:
+        NotFoundException: 아이템을 찾을 수 없는 경우
+    """
+    user_id = current_user.id
+    deadline = time.monotonic() + wait
+    while True:
+        result = await run_in_threadpool(_read_analysis_status, db, user_id, item_id)
+        remaining = deadline - time.monotonic()
+        if result["status"] != ITEM_STATUS_PENDING or remaining <= 0:
+            return ClosetItemStatusResponse(**result)
+        await asyncio.sleep(min(ANALYSIS_STATUS_POLL_INTERVAL_SECONDS, remaining))
+
+
 @router.delete("/{item_id}", response_model=MessageResponse)
 def delete_closet_item(
     item_id: int = Path(..., description="아이템 ID"),
@@ -198,15 +777,24 @@ def delete_closet_item(
             detail={"resource": "closet_item", "id": item_id}
         )
     
+    # 거의 같은 사진으로 이미지 파일을 함께 쓰는 다른 아이템이 있으면 파일은 남겨 둠
+    shared_image = item.image_url and db.query(ClosetItem.id).filter(
+        ClosetItem.image_url == item.image_url,
+        ClosetItem.id != item.id
+    ).first() is not None
+    
     # 이미지 파일 삭제 (있는 경우)
-    if item.image_url:
+    if item.image_url and not shared_image:
         try:
             delete_image(item.image_url)
         except Exception as e:
             # 이미지 삭제 실패는 로그만 남기고 계속 진행
             print(f"이미지 삭제 실패 (계속 진행): {item.image_url}, 오류: {str(e)}")
     
+    # 분석 작업도 함께 삭제 (분석 중이면 워커가 결과를 기록하지 않고 넘어감)
+    db.query(AnalysisJob).filter(AnalysisJob.item_id == item.id).delete(synchronize_session=False)
     db.delete(item)
+    bump_closet_version(db, current_user.id)
     db.commit()
     
     return MessageResponse(message="삭제 완료")
@@ -3,7 +3,9 @@
 - 코디 조회, 업데이트, 초기화, AI 추천
 """
 
-from fastapi import APIRouter, Depends
+import time
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from ..utils.dependencies import get_current_user, get_db
 from ..models.user import User
@@ -13,6 +15,7 @@ from ..schemas.outfit_schema import (
     OutfitUpdateRequest,
     OutfitClearRequest,
     OutfitRecommendResponse,
+    OutfitCandidate,
     ItemInfo
 )
 from ..schemas.closet_schema import MessageResponse
@@ -21,11 +24,20 @@ from ..services.outfit_service import (
     update_outfit_item,
     clear_outfit_category
 )
-from ..services.ai_service import recommend_outfit
+from ..services.ai_service import (
+    recommend_with_fallback,
+    get_precomputed_outfit,
+    RECOMMEND_STRATEGY_MODEL
+)
+from ..services.recommend_executor import get_recommend_executor
+from ..core.config import settings
 from ..core.exceptions import NotFoundException
 
 router = APIRouter(prefix="/outfit", tags=["Outfit"])
 
+# 한 번에 추천할 수 있는 최대 코디 수 (/outfit/recommend?k=N)
+MAX_RECOMMEND_K = 20
+
 
 def _convert_to_today_outfit_response(today_outfit, db: Session) -> TodayOutfitResponse:
     """
@@ -118,23 +130,77 @@ def clear_outfit_category_endpoint(
     return MessageResponse(message=f"{request.category} 비우기 완료")
 
 
+def _get_item_infos(item_ids: List[int], db: Session) -> Dict[int, ItemInfo]:
+    """
+    아이템 ID 목록의 ItemInfo를 한 번의 쿼리로 조회
+    
+    Args:
+        item_ids: 아이템 ID 목록
+        db: DB 세션
+    
+    Returns:
+        Dict[int, ItemInfo]: 아이템 ID -> ItemInfo (없는 아이템은 제외)
+    """
+    if not item_ids:
+        return {}
+    items = db.query(ClosetItem).filter(ClosetItem.id.in_(set(item_ids))).all()
+    return {item.id: ItemInfo(id=item.id, image_url=item.image_url) for item in items}
+
+
 @router.post("/recommend", response_model=OutfitRecommendResponse)
-def recommend_outfit_endpoint(
+async def recommend_outfit_endpoint(
+    k: Optional[int] = Query(None, ge=1, le=MAX_RECOMMEND_K, description="추천할 코디 수 (지정하면 코디 조합 탐색)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     AI 추천 실행 (Word2Vec 기반 AI 모델 사용)
     
+    k를 지정하면 아이템끼리의 궁합까지 평가하는 코디 조합 탐색으로 점수 상위 k개의 서로 다른 코디를
+    outfits에 담아 반환하고, 그중 첫 번째 코디를 오늘의 코디에 반영합니다.
+    
+    추천은 요청 도착 후 RECOMMEND_TIME_BUDGET_MS 안에서 실행되며(실행기 대기 시간 포함),
+    모델을 사용할 수 없으면 속성 기반 추천으로 대체합니다.
+    사용한 추천 방식은 strategy로 반환합니다. (model, partial, fallback)
+    
+    추천은 다른 API와 분리된 추천 전용 실행기에서 실행되며, 처리 중인 추천 요청이 가득 차면
+    기다리지 않고 503 (Retry-After)을 반환합니다.
+    
     Args:
+        k: 추천할 코디 수 (생략하면 카테고리별 추천 1개)
         current_user: 현재 사용자
         db: DB 세션
     
+    Returns:
+        OutfitRecommendResponse: 추천된 코디 정보
+    """
+    budget_ms = settings.RECOMMEND_TIME_BUDGET_MS
+    deadline = time.monotonic() + budget_ms / 1000 if budget_ms else None
+    return await get_recommend_executor().run(
+        _recommend_today_outfit, db, current_user.id, k, deadline
+    )
+
+
+def _recommend_today_outfit(
+    db: Session,
+    user_id: int,
+    k: Optional[int],
+    deadline: Optional[float]
+) -> OutfitRecommendResponse:
+    """
+    코디를 추천해 오늘의 코디에 반영하고 응답을 만드는 함수 (추천 전용 실행기에서 실행)
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        k: 추천할 코디 수 (None이면 카테고리별 추천 1개)
+        deadline: time.monotonic() 기준 마감 시각 (None이면 제한 없음)
+    
     Returns:
         OutfitRecommendResponse: 추천된 코디 정보
     """
     # 현재 오늘의 코디 가져오기
-    today_outfit = get_today_outfit(db, current_user.id)
+    today_outfit = get_today_outfit(db, user_id)
     
     # 이미 선택된 아이템 추출
     existing_items = {}
@@ -147,8 +213,18 @@ def recommend_outfit_endpoint(
     if today_outfit.outer_id:
         existing_items["outer"] = today_outfit.outer_id
     
-    # AI 추천 실행 (현재는 랜덤)
-    recommended_ids = recommend_outfit(db, current_user.id, existing_items)
+    # AI 추천 실행
+    outfits = None
+    recommended_ids = None
+    strategy = RECOMMEND_STRATEGY_MODEL
+    if k is None:
+        # 야간 배치로 미리 계산한 결과가 현재 옷장/선택 아이템/모델 기준이면 그대로 사용
+        recommended_ids = get_precomputed_outfit(db, user_id, existing_items)
+    if recommended_ids is None:
+        candidates, strategy = recommend_with_fallback(db, user_id, existing_items, k, deadline)
+        recommended_ids = candidates[0]
+        if k is not None:
+            outfits = candidates
     
     # 추천 결과를 오늘의 코디에 반영
     today_outfit.top_id = recommended_ids.get("top")
@@ -160,19 +236,26 @@ def recommend_outfit_endpoint(
     db.refresh(today_outfit)
     
     # 응답 형식으로 변환
-    response_data = {}
     categories = ["top", "bottom", "shoes", "outer"]
+    candidates = outfits or [recommended_ids]
+    item_infos = _get_item_infos(
+        [outfit[category] for outfit in candidates for category in categories if outfit.get(category)],
+        db
+    )
     
-    for category in categories:
-        item_id = recommended_ids.get(category)
-        if item_id:
-            item = db.query(ClosetItem).filter(ClosetItem.id == item_id).first()
-            if item:
-                response_data[category] = ItemInfo(id=item.id, image_url=item.image_url)
-            else:
-                response_data[category] = None
-        else:
-            response_data[category] = None
+    response_data = {
+        category: item_infos.get(recommended_ids.get(category))
+        for category in categories
+    }
+    response_data["strategy"] = strategy
+    if outfits is not None:
+        response_data["outfits"] = [
+            OutfitCandidate(
+                **{category: item_infos.get(outfit.get(category)) for category in categories},
+                score=outfit["score"]
+            )
+            for outfit in outfits
+        ]
     
     return OutfitRecommendResponse(**response_data)
 
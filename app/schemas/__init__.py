@@ -2,6 +2,11 @@ from .user_schema import TokenResponse, UserResponse, UserSyncRequest
 from .closet_schema import (
     ClosetItemResponse,
     ClosetItemCreate,
+    ClosetItemCreatedResponse,
+    ClosetItemAcceptedResponse,
+    BulkUploadItemResult,
+    BulkUploadResponse,
+    ClosetItemStatusResponse,
     MessageResponse
 )
 from .outfit_schema import (
@@ -9,7 +14,8 @@ from .outfit_schema import (
     TodayOutfitResponse,
     OutfitUpdateRequest,
     OutfitClearRequest,
-    OutfitRecommendResponse
+    OutfitRecommendResponse,
+    OutfitCandidate
 )
 from .favorite_schema import (
     FavoriteOutfitListItem,
@@ -17,6 +23,7 @@ from .favorite_schema import (
     FavoriteOutfitCreate,
     FavoriteOutfitUpdate
 )
+from .admin_schema import ModelStatusResponse, ModelReloadResponse, CacheStatsResponse
 
 __all__ = [
     "TokenResponse",
@@ -24,15 +31,24 @@ __all__ = [
     "UserSyncRequest",
     "ClosetItemResponse",
     "ClosetItemCreate",
+    "ClosetItemCreatedResponse",
+    "ClosetItemAcceptedResponse",
+    "BulkUploadItemResult",
+    "BulkUploadResponse",
+    "ClosetItemStatusResponse",
     "MessageResponse",
     "ItemInfo",
     "TodayOutfitResponse",
     "OutfitUpdateRequest",
     "OutfitClearRequest",
     "OutfitRecommendResponse",
+    "OutfitCandidate",
     "FavoriteOutfitListItem",
     "FavoriteOutfitDetail",
     "FavoriteOutfitCreate",
     "FavoriteOutfitUpdate",
+    "ModelStatusResponse",
+    "ModelReloadResponse",
+    "CacheStatsResponse",
 ]
 
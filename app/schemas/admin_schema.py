@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+
+
+class ModelStatusResponse(BaseModel):
+    """AI 추천 모델 상태 응답 스키마"""
+    state: str  # not_loaded, loading, ready, failed, disabled
+    model_version: Optional[str] = None  # 사용 중인 모델 버전
+    source: Optional[str] = None  # bundle 또는 pickle
+    error: Optional[str] = None
+    available_version: Optional[str] = None  # models/CURRENT가 가리키는 버전
+    reloading: bool = False  # 새 버전을 백그라운드에서 로드하는 중인지 여부
+    reload_error: Optional[str] = None
+
+
+class ModelReloadResponse(BaseModel):
+    """AI 추천 모델 재로드 응답 스키마"""
+    message: str
+    model: ModelStatusResponse
+
+
+class CacheStatsResponse(BaseModel):
+    """추천 캐시 통계 응답 스키마 (프로세스별)"""
+    closet_snapshot: Dict[str, Any]  # 옷장 스냅샷 캐시 (size, max_size, hits, misses)
+    recommendation: Dict[str, Any]  # 추천 결과 캐시 (size, max_size, ttl_seconds, hits, misses, evictions, expirations)
+    image_analysis: Dict[str, Any]  # Gemini 분석 결과 캐시 (enabled, hits, misses, hit_rate, DB 기준 entries, stored_hits)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class ClosetItemResponse(BaseModel):
@@ -21,6 +21,51 @@ class ClosetItemCreate(BaseModel):
     pass  # 이미지에서 feature를 추출하므로 별도 필드 불필요
 
 
+class ClosetItemCreatedResponse(BaseModel):
+    """옷 추가 응답 스키마"""
+    message: str
+    item_id: int
+    duplicate_of: Optional[int] = None  # 거의 같은 사진으로 판단해 feature와 이미지를 재사용한 기존 아이템 ID
+
+
+class BulkUploadItemResult(BaseModel):
+    """일괄 업로드 이미지별 결과 스키마"""
+    index: int  # 요청한 이미지 순서 (0부터)
+    filename: Optional[str] = None
+    category: Optional[str] = None
+    status: str  # created, failed
+    item_id: Optional[int] = None  # 추가된 아이템 ID (created인 경우)
+    duplicate_of: Optional[int] = None  # 거의 같은 사진으로 판단해 feature와 이미지를 재사용한 기존 아이템 ID
+    error: Optional[str] = None  # 실패한 경우 오류 메시지
+
+
+class BulkUploadResponse(BaseModel):
+    """일괄 업로드 응답 스키마 (일부 이미지가 실패해도 200)"""
+    message: str
+    created: int  # 추가된 이미지 수
+    failed: int  # 실패한 이미지 수
+    items: List[BulkUploadItemResult]  # 요청 순서대로
+
+
+class ClosetItemAcceptedResponse(BaseModel):
+    """백그라운드 업로드 응답 스키마 (202 Accepted)"""
+    message: str
+    item_id: int
+    status: str  # pending (분석 결과는 GET /closet/items/{item_id}/status로 확인), 거의 같은 사진이면 ready
+    duplicate_of: Optional[int] = None  # 거의 같은 사진으로 판단해 feature와 이미지를 재사용한 기존 아이템 ID
+
+
+class ClosetItemStatusResponse(BaseModel):
+    """옷장 아이템 분석 상태 응답 스키마"""
+    id: int
+    category: str
+    status: str  # pending, ready, failed
+    feature: Optional[str] = None  # 분석이 끝난 경우에만 값 있음
+    image_url: Optional[str] = None
+    attempts: int  # 분석 시도 횟수
+    error: Optional[str] = None  # 분석에 실패한 경우 마지막 오류 메시지
+
+
 class MessageResponse(BaseModel):
     """일반 메시지 응답 스키마"""
     message: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class ItemInfo(BaseModel):
@@ -33,12 +33,23 @@ class OutfitClearRequest(BaseModel):
     category: str  # top, bottom, shoes, outer
 
 
+class OutfitCandidate(BaseModel):
+    """AI 추천 코디 후보 스키마 (k개 추천 시)"""
+    top: Optional[ItemInfo] = None
+    bottom: Optional[ItemInfo] = None
+    shoes: Optional[ItemInfo] = None
+    outer: Optional[ItemInfo] = None
+    score: float  # 코디 점수 (아이템 점수 + 아이템 간 궁합, 높을수록 추천)
+
+
 class OutfitRecommendResponse(BaseModel):
     """AI 추천 코디 응답 스키마"""
     top: Optional[ItemInfo] = None
     bottom: Optional[ItemInfo] = None
     shoes: Optional[ItemInfo] = None
     outer: Optional[ItemInfo] = None
+    outfits: Optional[List[OutfitCandidate]] = None  # k를 지정한 경우 점수 순 코디 목록 (첫 번째가 오늘의 코디에 반영됨)
+    strategy: Optional[str] = None  # 추천 방식: model, partial(시간 예산 초과로 일부만 모델 사용), fallback(속성 기반)
 
     class Config:
         from_attributes = True
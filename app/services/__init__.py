@@ -1,7 +1,34 @@
-from .ai_service import recommend_outfit
+from .ai_service import (
+    recommend_outfit,
+    compute_item_embedding,
+    get_ai_model_status,
+    reload_ai_model
+)
+from .closet_cache import (
+    bump_closet_version,
+    closet_snapshot_cache
+)
+from .recommend_executor import (
+    get_recommend_executor,
+    shutdown_recommend_executor
+)
+from .analysis_queue import (
+    enqueue_analysis,
+    get_analysis_status,
+    notify_analysis_queue,
+    start_analysis_queue,
+    shutdown_analysis_queue
+)
+from .image_analysis_cache import image_analysis_cache
 from .gemini_service import (
     analyze_clothing_image,
-    analyze_clothing_image_from_bytes
+    analyze_clothing_image_from_bytes,
+    analyze_clothing_image_from_bytes_async
+)
+from .image_hash_service import (
+    compute_image_hash,
+    find_near_duplicate,
+    is_near_duplicate
 )
 from .storage_service import (
     save_image,
@@ -24,8 +51,25 @@ from .favorite_service import (
 
 __all__ = [
     "recommend_outfit",
+    "compute_item_embedding",
+    "get_ai_model_status",
+    "reload_ai_model",
+    "bump_closet_version",
+    "closet_snapshot_cache",
+    "get_recommend_executor",
+    "shutdown_recommend_executor",
+    "enqueue_analysis",
+    "get_analysis_status",
+    "notify_analysis_queue",
+    "start_analysis_queue",
+    "shutdown_analysis_queue",
+    "image_analysis_cache",
     "analyze_clothing_image",
     "analyze_clothing_image_from_bytes",
+    "analyze_clothing_image_from_bytes_async",
+    "compute_image_hash",
+    "find_near_duplicate",
+    "is_near_duplicate",
     "save_image",
     "delete_image",
     "get_storage_service",
@@ -3,49 +3,211 @@ AI 추천 서비스
 - ai_recommendation 모듈을 사용하여 코디 추천
 """
 
-from typing import Dict, Optional, List, Any
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Optional, List, Any, Tuple
 from sqlalchemy.orm import Session
 from ..models.closet_item import ClosetItem
-from ..core.exceptions import NotFoundException, BadRequestException
+from ..models.today_outfit import TodayOutfit
+from ..models.suggested_outfit import SuggestedOutfit
+from .closet_cache import (
+    CATEGORY_CODES,
+    ClosetSnapshot,
+    closet_snapshot_cache,
+    get_closet_version
+)
+from .recommendation_cache import ResultCacheKey, RecommendationResultCache, recommendation_cache
+from .recommend_executor import get_recommend_executor
+from ..core.config import settings
+from ..core.exceptions import (
+    NotFoundException,
+    BadRequestException,
+    ConflictException,
+    ServiceUnavailableException
+)
+from ..utils.logger import logger
 
 # AI 추천 모듈 import
 try:
-    from ai_recommendation.model_loader import get_model_loader
-    from ai_recommendation.recommendation_engine import recommend_outfit as ai_recommend_outfit
+    import numpy as np
+    from ai_recommendation.model_loader import (
+        get_model_loader,
+        get_loaded_model_loader,
+        get_available_model_version,
+        get_model_load_state,
+        get_model_load_status,
+        has_model_version,
+        is_model_loading,
+        start_model_reload,
+        MODEL_STATE_FAILED,
+        MODEL_STATE_READY
+    )
+    from ai_recommendation.recommendation_engine import (
+        recommend_outfit as ai_recommend_outfit,
+        recommend_outfits as ai_recommend_outfits,
+        recommend_outfit_batch as ai_recommend_outfit_batch,
+        recommend_outfit_by_attributes as ai_recommend_outfit_by_attributes,
+        item_to_vector
+    )
     AI_RECOMMENDATION_AVAILABLE = True
 except ImportError:
     AI_RECOMMENDATION_AVAILABLE = False
     print("⚠️ ai_recommendation 모듈을 찾을 수 없습니다.")
 
+# 모델 로드 중 응답의 Retry-After (초)
+MODEL_WARMING_UP_RETRY_AFTER = 5
 
-def recommend_outfit(
+# 추천 코디 미리 계산 시 한 번에 추천 엔진에 넘기는 사용자 수
+PRECOMPUTE_BATCH_SIZE = 256
+
+# 추천 방식 (응답의 strategy)
+RECOMMEND_STRATEGY_MODEL = "model"  # AI 추천 모델 (캐시, 미리 계산한 결과 포함)
+RECOMMEND_STRATEGY_PARTIAL = "partial"  # 시간 예산을 넘겨 일부만 모델로 계산
+RECOMMEND_STRATEGY_FALLBACK = "fallback"  # 모델 없이 속성 기반 추천
+
+
+def compute_item_embedding(feature: str) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    현재 로드된 모델로 아이템 feature의 embedding을 계산하는 함수
+    (옷 추가 시 feature와 함께 저장하기 위해 사용)
+    
+    모델이 아직 로드되지 않았거나 계산에 실패하면 (None, None)을 반환하며,
+    이 경우 추천 시점에 다시 계산됩니다.
+    
+    Args:
+        feature: Feature 문자열
+    
+    Returns:
+        Tuple[Optional[bytes], Optional[str]]: (float32 bytes, 모델 버전)
+    """
+    if not AI_RECOMMENDATION_AVAILABLE or not feature:
+        return None, None
+    
+    model_loader = get_loaded_model_loader()
+    if model_loader is None:
+        return None, None
+    
+    try:
+        vector = item_to_vector(feature, model_loader)
+        return np.asarray(vector, dtype=np.float32).tobytes(), model_loader.get_model_version()
+    except Exception as e:
+        logger.warning(f"아이템 embedding 계산 실패 (추천 시 다시 계산): {e}")
+        return None, None
+
+
+def get_ai_model_status() -> Dict[str, Any]:
+    """
+    AI 추천 모델 로드 상태를 반환하는 함수
+    
+    Returns:
+        Dict[str, Any]: 모델 상태 (state, model_version, available_version, reloading 등)
+    """
+    if not AI_RECOMMENDATION_AVAILABLE:
+        return {"state": "disabled"}
+    return get_model_load_status()
+
+
+def get_recommendation_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    추천 캐시 통계를 반환하는 함수 (이 워커 프로세스 기준)
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: {"closet_snapshot": 옷장 스냅샷 캐시 통계, "recommendation": 추천 결과 캐시 통계}
+    """
+    return {
+        "closet_snapshot": closet_snapshot_cache.stats(),
+        "recommendation": recommendation_cache.stats()
+    }
+
+
+def reload_ai_model(version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    서버 재시작 없이 AI 추천 모델을 새 버전으로 교체하는 함수
+    
+    새 모델은 백그라운드에서 로드되고, 로드가 끝나면 사용 중인 모델 참조를 교체합니다.
+    로드하는 동안의 요청과 진행 중인 요청은 기존 모델로 처리됩니다.
+    
+    Args:
+        version: 로드할 모델 버전 (None이면 models/CURRENT가 가리키는 버전)
+    
+    Returns:
+        Dict[str, Any]: 재로드 시작 후 모델 상태
+    
+    Raises:
+        BadRequestException: ai_recommendation 모듈이 없는 경우
+        NotFoundException: 지정한 모델 버전이 없는 경우
+        ConflictException: 이미 재로드 중인 경우
+    """
+    if not AI_RECOMMENDATION_AVAILABLE:
+        raise BadRequestException(
+            message="AI 추천 모델을 사용할 수 없습니다. ai_recommendation 모듈이 설치되지 않았습니다.",
+            detail={"error": "AI_RECOMMENDATION_AVAILABLE is False"}
+        )
+    
+    if version is not None and not has_model_version(version):
+        raise NotFoundException(
+            message="모델 버전을 찾을 수 없습니다.",
+            detail={"resource": "model_version", "version": version}
+        )
+    
+    if not start_model_reload(version):
+        raise ConflictException(
+            message="이미 모델을 다시 로드하는 중입니다.",
+            detail={"model": get_model_load_status()}
+        )
+    
+    logger.info(f"AI 추천 모델 재로드 시작: {version or 'CURRENT'}")
+    return get_model_load_status()
+
+
+def _get_item_vector(item: ClosetItem, model_loader) -> Tuple["np.ndarray", bool]:
+    """
+    아이템의 저장된 embedding을 읽고, 없거나 모델 버전이 다르면 다시 계산하여 아이템에 반영
+    
+    Args:
+        item: 옷장 아이템
+        model_loader: 로드된 모델 로더
+    
+    Returns:
+        Tuple[np.ndarray, bool]: (아이템 벡터, embedding을 새로 계산했는지 여부)
+    """
+    model_version = model_loader.get_model_version()
+    if item.embedding is not None and item.embedding_version == model_version:
+        return np.frombuffer(item.embedding, dtype=np.float32), False
+    
+    vector = np.asarray(item_to_vector(item.feature, model_loader), dtype=np.float32)
+    item.embedding = vector.tobytes()
+    item.embedding_version = model_version
+    return vector, True
+
+
+def _build_closet_snapshot(
     db: Session,
     user_id: int,
-    existing_items: Optional[Dict[str, int]] = None
-) -> Dict[str, Optional[int]]:
+    closet_version: int
+) -> Tuple[Any, ClosetSnapshot]:
     """
-    AI 추천 모델을 사용하여 코디를 추천하는 함수
+    DB의 옷장 아이템으로 옷장 스냅샷을 만들어 캐시에 저장하는 함수
     
     Args:
         db: DB 세션
         user_id: 사용자 ID
-        existing_items: 이미 선택된 아이템 (예: {"bottom": 2})
+        closet_version: 아이템을 조회하기 전에 읽은 옷장 버전
     
     Returns:
-        Dict[str, Optional[int]]: 추천된 아이템 ID 딕셔너리
-        예: {"top": 1, "bottom": 2, "shoes": 3, "outer": 4}
+        Tuple: (모델 로더, 옷장 스냅샷)
     
     Raises:
         NotFoundException: 옷장에 아이템이 없는 경우
-        BadRequestException: AI 추천 모델이 로드되지 않았거나 추천 실패 시
+        BadRequestException: AI 추천 모델이 로드되지 않은 경우
+        ServiceUnavailableException: 서버 시작 후 AI 추천 모델을 로드하는 중이거나 로드에 실패한 경우
     """
-    if existing_items is None:
-        existing_items = {}
-    
     # 사용자의 옷장에서 아이템 조회
     user_items = db.query(ClosetItem).filter(
-        ClosetItem.user_id == user_id
-    ).all()
+        ClosetItem.user_id == user_id,
+        ClosetItem.is_ready()
+    ).order_by(ClosetItem.id).all()
     
     if not user_items:
         raise NotFoundException(
@@ -60,26 +222,137 @@ def recommend_outfit(
             detail={"error": "AI_RECOMMENDATION_AVAILABLE is False"}
         )
     
-    # 모델 로더 가져오기
+    # 모델 로더 가져오기 (백그라운드 로드 중이면 기다리지 않고 바로 503 응답)
+    model_loader = get_loaded_model_loader()
+    if model_loader is None and is_model_loading():
+        raise ServiceUnavailableException(
+            message="AI 추천 모델을 준비 중입니다. 잠시 후 다시 시도하세요.",
+            detail={"model_state": "loading"},
+            retry_after=MODEL_WARMING_UP_RETRY_AFTER
+        )
+    
+    # 로드에 실패한 경우도 요청 스레드에서 다시 로드하지 않고 바로 503 응답
+    # (재시도는 start_model_loading, 모델 버전 감시, /admin/model/reload에서)
+    if model_loader is None and get_model_load_state() == MODEL_STATE_FAILED:
+        raise ServiceUnavailableException(
+            message="AI 추천 모델을 사용할 수 없습니다. 잠시 후 다시 시도하세요.",
+            detail={"model_state": MODEL_STATE_FAILED},
+            retry_after=MODEL_WARMING_UP_RETRY_AFTER
+        )
+    
     try:
-        model_loader = get_model_loader()
+        if model_loader is None:
+            model_loader = get_model_loader()
     except Exception as e:
         raise BadRequestException(
             message="AI 추천 모델을 로드할 수 없습니다.",
             detail={"error": str(e)}
         )
     
-    # 카테고리별로 아이템 분류 및 feature 정보 포함
-    items_by_category: Dict[str, List[ClosetItem]] = {
-        "top": [],
-        "bottom": [],
-        "shoes": [],
-        "outer": []
-    }
-    
+    # 아이템 벡터 준비 (저장된 embedding 사용, 없거나 모델 버전이 다르면 다시 계산)
+    # feature가 없거나 벡터 계산에 실패한 아이템은 스냅샷에서 제외
+    item_ids: List[int] = []
+    category_codes: List[int] = []
+    features: List[str] = []
+    vectors: List["np.ndarray"] = []
+    embeddings_updated = False
     for item in user_items:
-        if item.category in items_by_category:
-            items_by_category[item.category].append(item)
+        if item.category in CATEGORY_CODES and item.feature:
+            try:
+                vector, updated = _get_item_vector(item, model_loader)
+            except Exception as e:
+                logger.warning(f"아이템 벡터 계산 실패 (item_id={item.id}): {e}")
+                continue
+            embeddings_updated = embeddings_updated or updated
+            item_ids.append(item.id)
+            category_codes.append(CATEGORY_CODES[item.category])
+            features.append(item.feature)
+            vectors.append(vector)
+    
+    if embeddings_updated:
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"아이템 embedding 저장 실패 (다음 추천 시 다시 계산): {e}")
+    
+    snapshot = ClosetSnapshot(
+        closet_version=closet_version,
+        model_version=model_loader.get_model_version(),
+        item_ids=np.asarray(item_ids, dtype=np.int64),
+        category_codes=np.asarray(category_codes, dtype=np.int8),
+        features=features,
+        embeddings=np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+    )
+    closet_snapshot_cache.put(user_id, snapshot)
+    return model_loader, snapshot
+
+
+def _result_cache_key(
+    user_id: int,
+    closet_version: int,
+    existing_items: Dict[str, int],
+    k: Optional[int] = None,
+    model_loader=None
+) -> Optional[ResultCacheKey]:
+    """
+    추천 결과 캐시 키를 만드는 함수
+    
+    Args:
+        user_id: 사용자 ID
+        closet_version: 추천 입력을 읽기 전에 조회한 옷장 버전
+        existing_items: 이미 선택된 아이템
+        k: 코디 조합 탐색의 코디 수 (카테고리별 추천이면 None)
+        model_loader: 추천에 사용한 모델 로더 (None이면 현재 로드된 모델)
+    
+    Returns:
+        Optional[ResultCacheKey]: 캐시 키 (모델이 아직 로드되지 않았으면 None)
+    """
+    if model_loader is None:
+        model_loader = get_loaded_model_loader() if AI_RECOMMENDATION_AVAILABLE else None
+        if model_loader is None:
+            return None
+    return RecommendationResultCache.make_key(
+        user_id, closet_version, existing_items, model_loader.get_model_version(), k
+    )
+
+
+def _prepare_recommendation(
+    db: Session,
+    user_id: int,
+    existing_items: Dict[str, int],
+    closet_version: Optional[int] = None
+) -> Tuple[Any, Dict[str, Optional[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    추천 엔진 입력을 준비하는 함수 (모델 로더, 선택된 아이템, 선택 가능한 아이템)
+    
+    옷장 버전과 모델 버전이 그대로이면 캐시된 옷장 스냅샷을 사용하여
+    옷장 아이템 조회와 벡터 계산을 건너뜁니다.
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        existing_items: 이미 선택된 아이템 (예: {"bottom": 2})
+        closet_version: 호출하는 쪽에서 먼저 조회한 옷장 버전 (None이면 조회)
+    
+    Returns:
+        Tuple: (모델 로더, selected_items, available_items)
+    
+    Raises:
+        NotFoundException: 옷장에 아이템이 없는 경우
+        BadRequestException: AI 추천 모델이 로드되지 않은 경우
+        ServiceUnavailableException: 서버 시작 후 AI 추천 모델을 로드하는 중이거나 로드에 실패한 경우
+    """
+    # 아이템보다 버전을 먼저 읽어야 조회 도중 추가된 아이템이 이전 버전 스냅샷에 섞이지 않음
+    if closet_version is None:
+        closet_version = get_closet_version(db, user_id)
+    
+    model_loader = get_loaded_model_loader() if AI_RECOMMENDATION_AVAILABLE else None
+    snapshot = None
+    if model_loader is not None:
+        snapshot = closet_snapshot_cache.get(user_id, closet_version, model_loader.get_model_version())
+    if snapshot is None:
+        model_loader, snapshot = _build_closet_snapshot(db, user_id, closet_version)
     
     # selected_items 형식으로 변환 (이미 선택된 아이템)
     selected_items: Dict[str, Optional[Dict[str, Any]]] = {
@@ -90,14 +363,11 @@ def recommend_outfit(
     }
     
     for category, item_id in existing_items.items():
-        if item_id and category in items_by_category:
-            # 해당 아이템 찾기
-            item = next((i for i in items_by_category[category] if i.id == item_id), None)
-            if item and item.feature:
-                selected_items[category] = {
-                    "id": item.id,
-                    "feature": item.feature
-                }
+        if item_id and category in CATEGORY_CODES:
+            rows = snapshot.rows_for(category)
+            matched = rows[snapshot.item_ids[rows] == item_id]
+            if len(matched):
+                selected_items[category] = snapshot.item_dict(int(matched[0]))
     
     # available_items 형식으로 변환 (선택 가능한 아이템)
     available_items: Dict[str, List[Dict[str, Any]]] = {
@@ -110,19 +380,42 @@ def recommend_outfit(
     for category in ["top", "bottom", "shoes", "outer"]:
         # 이미 선택된 카테고리는 available_items에 포함하지 않음
         if category not in existing_items or existing_items[category] is None:
-            for item in items_by_category.get(category, []):
-                if item.feature:  # feature가 있는 아이템만 포함
-                    available_items[category].append({
-                        "id": item.id,
-                        "feature": item.feature
-                    })
+            available_items[category] = [snapshot.item_dict(int(row)) for row in snapshot.rows_for(category)]
+    
+    return model_loader, selected_items, available_items
+
+
+def _recommend_outfit(
+    db: Session,
+    user_id: int,
+    existing_items: Dict[str, int],
+    deadline: Optional[float] = None
+) -> Tuple[Dict[str, Optional[int]], str]:
+    """
+    AI 추천 모델로 코디를 추천하고 사용한 추천 방식을 함께 반환하는 함수 (recommend_outfit 참고)
+    
+    Returns:
+        Tuple: (추천된 아이템 ID 딕셔너리, 추천 방식 RECOMMEND_STRATEGY_*)
+    """
+    closet_version = get_closet_version(db, user_id)
+    cache_key = _result_cache_key(user_id, closet_version, existing_items)
+    if cache_key is not None:
+        cached = recommendation_cache.get(cache_key)
+        if cached is not None:
+            return cached, RECOMMEND_STRATEGY_MODEL
+    
+    model_loader, selected_items, available_items = _prepare_recommendation(
+        db, user_id, existing_items, closet_version
+    )
     
     # AI 추천 실행
     try:
-        result = ai_recommend_outfit(
+        result = get_recommend_executor().call_engine(
+            ai_recommend_outfit,
+            model_loader,
             selected_items=selected_items,
             available_items=available_items,
-            model_loader=model_loader
+            deadline=deadline
         )
         
         # 추천 결과 추출
@@ -136,11 +429,485 @@ def recommend_outfit(
             "outer": recommended_outfit.get("outer")
         }
         
-        return recommended
-        
     except Exception as e:
         raise BadRequestException(
             message="AI 추천 중 오류가 발생했습니다.",
             detail={"error": str(e)}
         )
+    
+    # 시간 예산을 넘겨 일부(또는 전부) 카테고리를 속성 기반으로 채운 결과는 캐시하지 않음
+    fallback_categories = result.get("fallback_categories")
+    if fallback_categories:
+        recommended_categories = [
+            category for category in ["top", "bottom", "shoes", "outer"]
+            if selected_items.get(category) is None and available_items.get(category)
+        ]
+        if len(fallback_categories) == len(recommended_categories):
+            return recommended, RECOMMEND_STRATEGY_FALLBACK
+        return recommended, RECOMMEND_STRATEGY_PARTIAL
+    
+    recommendation_cache.put(
+        _result_cache_key(user_id, closet_version, existing_items, model_loader=model_loader),
+        recommended
+    )
+    return recommended, RECOMMEND_STRATEGY_MODEL
+
+
+def recommend_outfit(
+    db: Session,
+    user_id: int,
+    existing_items: Optional[Dict[str, int]] = None,
+    deadline: Optional[float] = None
+) -> Dict[str, Optional[int]]:
+    """
+    AI 추천 모델을 사용하여 코디를 추천하는 함수
+    
+    같은 옷장 버전, 선택된 아이템, 모델 버전으로 추천한 결과가 캐시에 있으면 그대로 반환합니다.
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        existing_items: 이미 선택된 아이템 (예: {"bottom": 2})
+        deadline: time.monotonic() 기준 마감 시각 (지나면 남은 카테고리는 속성 기반 추천으로 채움)
+    
+    Returns:
+        Dict[str, Optional[int]]: 추천된 아이템 ID 딕셔너리
+        예: {"top": 1, "bottom": 2, "shoes": 3, "outer": 4}
+    
+    Raises:
+        NotFoundException: 옷장에 아이템이 없는 경우
+        BadRequestException: AI 추천 모델이 로드되지 않았거나 추천 실패 시
+        ServiceUnavailableException: 서버 시작 후 AI 추천 모델을 로드하는 중이거나 로드에 실패한 경우
+    """
+    recommended, _ = _recommend_outfit(db, user_id, existing_items or {}, deadline)
+    return recommended
+
+
+def _recommend_outfits(
+    db: Session,
+    user_id: int,
+    existing_items: Dict[str, int],
+    k: int,
+    deadline: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    상위 k개 코디를 추천하고 사용한 추천 방식을 함께 반환하는 함수 (recommend_outfits 참고)
+    
+    Returns:
+        Tuple: (점수 내림차순 코디 리스트, 추천 방식 RECOMMEND_STRATEGY_*)
+    """
+    closet_version = get_closet_version(db, user_id)
+    cache_key = _result_cache_key(user_id, closet_version, existing_items, k)
+    if cache_key is not None:
+        cached = recommendation_cache.get(cache_key)
+        if cached is not None:
+            return cached, RECOMMEND_STRATEGY_MODEL
+    
+    model_loader, selected_items, available_items = _prepare_recommendation(
+        db, user_id, existing_items, closet_version
+    )
+    
+    # AI 추천 실행
+    try:
+        result = get_recommend_executor().call_engine(
+            ai_recommend_outfits,
+            model_loader,
+            selected_items=selected_items,
+            available_items=available_items,
+            k=k,
+            deadline=deadline,
+            max_candidates=settings.RECOMMEND_MAX_CANDIDATES or None
+        )
+    except Exception as e:
+        raise BadRequestException(
+            message="AI 추천 중 오류가 발생했습니다.",
+            detail={"error": str(e)}
+        )
+    
+    outfits = [
+        {
+            "top": outfit["recommended_outfit"].get("top"),
+            "bottom": outfit["recommended_outfit"].get("bottom"),
+            "shoes": outfit["recommended_outfit"].get("shoes"),
+            "outer": outfit["recommended_outfit"].get("outer"),
+            "score": outfit["score"]
+        }
+        for outfit in result.get("outfits", [])
+    ]
+    
+    # 시간 예산을 넘겨 빔 폭을 줄인 결과는 캐시하지 않음
+    if result.get("timed_out"):
+        return outfits, RECOMMEND_STRATEGY_PARTIAL
+    
+    recommendation_cache.put(
+        _result_cache_key(user_id, closet_version, existing_items, k, model_loader=model_loader),
+        outfits
+    )
+    return outfits, RECOMMEND_STRATEGY_MODEL
+
+
+def recommend_outfits(
+    db: Session,
+    user_id: int,
+    existing_items: Optional[Dict[str, int]] = None,
+    k: int = 1,
+    deadline: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    코디 조합 전체를 평가해 점수가 높은 상위 k개의 서로 다른 코디를 추천하는 함수
+    
+    카테고리별로 따로 고르는 recommend_outfit과 달리 아이템끼리의 궁합을 함께 평가하며,
+    대안 코디를 얻기 위해 추천을 여러 번 호출하지 않도록 한 번에 k개를 반환합니다.
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        existing_items: 이미 선택된 아이템 (예: {"bottom": 2})
+        k: 추천할 코디 수
+        deadline: time.monotonic() 기준 마감 시각 (지나면 빔 폭을 k로 줄여 탐색을 마무리)
+    
+    Returns:
+        List[Dict[str, Any]]: 점수 내림차순 코디 리스트 (가능한 조합이 k개보다 적으면 그만큼만)
+        예: [{"top": 1, "bottom": 2, "shoes": 3, "outer": None, "score": 1.23}, ...]
+    
+    Raises:
+        NotFoundException: 옷장에 아이템이 없는 경우
+        BadRequestException: AI 추천 모델이 로드되지 않았거나 추천 실패 시
+        ServiceUnavailableException: 서버 시작 후 AI 추천 모델을 로드하는 중이거나 로드에 실패한 경우
+    """
+    outfits, _ = _recommend_outfits(db, user_id, existing_items or {}, k, deadline)
+    return outfits
+
+
+def _recommend_by_attributes(
+    db: Session,
+    user_id: int,
+    existing_items: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    모델 없이 feature 속성(색상/계절/스타일)만으로 코디를 추천하는 함수 (embedding을 읽지 않음)
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        existing_items: 이미 선택된 아이템
+    
+    Returns:
+        Dict[str, Any]: 추천된 아이템 ID와 속성 점수 (예: {"top": 1, ..., "score": 5.5})
+    
+    Raises:
+        NotFoundException: 옷장에 아이템이 없는 경우
+        BadRequestException: 필수 카테고리를 채울 수 없는 경우
+    """
+    rows = db.query(ClosetItem.id, ClosetItem.category, ClosetItem.feature).filter(
+        ClosetItem.user_id == user_id,
+        ClosetItem.is_ready()
+    ).order_by(ClosetItem.id).all()
+    
+    if not rows:
+        raise NotFoundException(
+            message="옷장에 아이템이 없습니다.",
+            detail={"resource": "closet_items", "user_id": user_id}
+        )
+    
+    categories = ["top", "bottom", "shoes", "outer"]
+    selected_items: Dict[str, Optional[Dict[str, Any]]] = {category: None for category in categories}
+    available_items: Dict[str, List[Dict[str, Any]]] = {category: [] for category in categories}
+    for row in rows:
+        if row.category not in selected_items or not row.feature:
+            continue
+        item = {"id": row.id, "feature": row.feature}
+        if existing_items.get(row.category):
+            if existing_items[row.category] == row.id:
+                selected_items[row.category] = item
+        else:
+            available_items[row.category].append(item)
+    
+    try:
+        result = ai_recommend_outfit_by_attributes(selected_items, available_items)
+    except Exception as e:
+        raise BadRequestException(
+            message="AI 추천 중 오류가 발생했습니다.",
+            detail={"error": str(e)}
+        )
+    
+    recommended = {category: result["recommended_outfit"].get(category) for category in categories}
+    recommended["score"] = result["score"]
+    return recommended
+
+
+def recommend_with_fallback(
+    db: Session,
+    user_id: int,
+    existing_items: Optional[Dict[str, int]] = None,
+    k: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    시간 예산 안에서 코디를 추천하고, 모델을 사용할 수 없으면 속성 기반 추천으로 대체하는 함수
+    
+    - 시간 예산이 끝나면 추천 엔진이 지금까지의 결과로 마무리 (RECOMMEND_STRATEGY_PARTIAL)
+    - 모델이 준비되지 않았으면(로드 중, 로드 실패 등) 모델 추천을 시도하지 않고 바로 속성 기반 추천 (RECOMMEND_STRATEGY_FALLBACK)
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        existing_items: 이미 선택된 아이템 (예: {"bottom": 2})
+        k: 추천할 코디 수 (None이면 카테고리별 추천 1개)
+        deadline: time.monotonic() 기준 마감 시각 (요청 도착 시각 + 시간 예산, None이면 제한 없음)
+    
+    Returns:
+        Tuple: (코디 리스트, 추천 방식)
+        k가 None이면 코디 1개 (score 없음), 아니면 점수 내림차순 코디 최대 k개
+        (속성 기반 추천은 k와 관계없이 코디 1개)
+    
+    Raises:
+        NotFoundException: 옷장에 아이템이 없는 경우
+        BadRequestException: 모델로 추천하다 실패했거나 대체 추천도 할 수 없는 경우
+    """
+    if existing_items is None:
+        existing_items = {}
+    
+    # 모델이 준비되지 않았으면 로드를 기다리거나 다시 시도하지 않고 바로 대체 (시간 예산 안에 응답)
+    model_state = get_model_load_state() if AI_RECOMMENDATION_AVAILABLE else None
+    if model_state is not None and model_state != MODEL_STATE_READY:
+        logger.warning(f"AI 추천 모델이 준비되지 않아 속성 기반 추천으로 대체 (user_id={user_id}, state={model_state})")
+        return _recommend_by_attributes_as_outfits(db, user_id, existing_items, k)
+    
+    try:
+        if k is None:
+            recommended, strategy = _recommend_outfit(db, user_id, existing_items, deadline)
+            return [recommended], strategy
+        return _recommend_outfits(db, user_id, existing_items, k, deadline)
+    except (ServiceUnavailableException, BadRequestException) as e:
+        # 모델 없이 추천할 수 없거나, 모델은 있는데 추천이 실패한 경우는 그대로 전달
+        if not AI_RECOMMENDATION_AVAILABLE or get_loaded_model_loader() is not None:
+            raise
+        logger.warning(f"AI 추천 모델을 사용할 수 없어 속성 기반 추천으로 대체 (user_id={user_id}): {e.detail['message']}")
+    
+    return _recommend_by_attributes_as_outfits(db, user_id, existing_items, k)
+
+
+def _recommend_by_attributes_as_outfits(
+    db: Session,
+    user_id: int,
+    existing_items: Dict[str, int],
+    k: Optional[int]
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    속성 기반 추천 결과를 recommend_with_fallback 반환 형식으로 변환하는 함수
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        existing_items: 이미 선택된 아이템
+        k: 추천할 코디 수 (None이면 score를 빼고 반환)
+    
+    Returns:
+        Tuple: ([코디 1개], RECOMMEND_STRATEGY_FALLBACK)
+    """
+    recommended = _recommend_by_attributes(db, user_id, existing_items)
+    if k is None:
+        recommended.pop("score")
+    return [recommended], RECOMMEND_STRATEGY_FALLBACK
+
+
+def _existing_items_from(today_outfit: Optional[TodayOutfit]) -> Dict[str, int]:
+    """
+    오늘의 코디에서 이미 선택된 아이템을 추출하는 함수 (추천 API와 같은 규칙)
+    
+    Args:
+        today_outfit: 오늘의 코디 (없으면 None)
+    
+    Returns:
+        Dict[str, int]: 이미 선택된 아이템 (예: {"bottom": 2})
+    """
+    if today_outfit is None:
+        return {}
+    
+    existing_items = {}
+    for category in ["top", "bottom", "shoes", "outer"]:
+        item_id = getattr(today_outfit, f"{category}_id")
+        if item_id:
+            existing_items[category] = item_id
+    return existing_items
+
+
+def _recommendation_input_key(
+    existing_items: Dict[str, int],
+    model_version: Optional[str],
+    closet_version: int
+) -> str:
+    """
+    추천 결과를 결정하는 입력(선택된 아이템, 모델 버전, 옷장 버전)의 해시를 계산하는 함수
+    
+    미리 계산한 추천 코디가 현재 상태로 계산한 것과 같은지 확인하는 데 사용합니다.
+    옷장 아이템이 바뀌면 옷장 버전이 올라가므로 아이템 행은 읽지 않습니다.
+    
+    Args:
+        existing_items: 이미 선택된 아이템
+        model_version: 추천 모델 버전
+        closet_version: 옷장 버전 (get_closet_version)
+    
+    Returns:
+        str: SHA-256 hex 문자열
+    """
+    payload = {
+        "model_version": model_version,
+        "closet_version": closet_version,
+        "existing_items": sorted((category, item_id) for category, item_id in existing_items.items() if item_id)
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def get_precomputed_outfit(
+    db: Session,
+    user_id: int,
+    existing_items: Optional[Dict[str, int]] = None
+) -> Optional[Dict[str, Optional[int]]]:
+    """
+    야간 배치로 미리 계산한 추천 코디를 반환하는 함수
+    
+    계산 이후 옷장 버전, 선택된 아이템, 모델 버전 중 하나라도 바뀌었으면 None을 반환하며,
+    이 경우 recommend_outfit으로 다시 계산해야 합니다.
+    (모델을 로드하는 중이면 로드될 버전(models/CURRENT) 기준으로 확인)
+    
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        existing_items: 이미 선택된 아이템 (예: {"bottom": 2})
+    
+    Returns:
+        Optional[Dict[str, Optional[int]]]: 추천된 아이템 ID 딕셔너리 (사용할 수 없으면 None)
+    """
+    if not AI_RECOMMENDATION_AVAILABLE:
+        return None
+    
+    suggested = db.query(SuggestedOutfit).filter(SuggestedOutfit.user_id == user_id).first()
+    if suggested is None:
+        return None
+    
+    # 로드된 모델이 있으면 파일을 읽지 않고 그 버전으로 확인 (아직 없을 때만 models/CURRENT를 읽음)
+    model_loader = get_loaded_model_loader()
+    model_version = model_loader.get_model_version() if model_loader is not None else get_available_model_version()
+    if model_version is None or suggested.model_version != model_version:
+        return None
+    
+    closet_version = get_closet_version(db, user_id)
+    if suggested.closet_version is None or suggested.closet_version != closet_version:
+        return None
+    
+    if suggested.input_key != _recommendation_input_key(existing_items or {}, model_version, closet_version):
+        return None
+    
+    return {
+        "top": suggested.top_id,
+        "bottom": suggested.bottom_id,
+        "shoes": suggested.shoes_id,
+        "outer": suggested.outer_id
+    }
+
+
+def get_active_user_ids(db: Session, active_days: Optional[int] = None) -> List[int]:
+    """
+    추천 코디를 미리 계산할 사용자 ID 목록을 반환하는 함수
+    
+    Args:
+        db: DB 세션
+        active_days: 최근 N일 안에 오늘의 코디가 바뀐 사용자만 포함 (None이면 옷장에 아이템이 있는 모든 사용자)
+    
+    Returns:
+        List[int]: 사용자 ID 목록 (오름차순)
+    """
+    query = db.query(ClosetItem.user_id).filter(ClosetItem.is_ready()).distinct()
+    if active_days is not None:
+        cutoff = datetime.utcnow() - timedelta(days=active_days)
+        query = query.join(TodayOutfit, TodayOutfit.user_id == ClosetItem.user_id).filter(
+            TodayOutfit.updated_at >= cutoff
+        )
+    return sorted(user_id for (user_id,) in query.all())
+
+
+def precompute_suggested_outfits(
+    db: Session,
+    user_ids: List[int],
+    batch_size: int = PRECOMPUTE_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    사용자별 추천 코디를 미리 계산해 저장하는 함수 (야간 배치용)
+    
+    batch_size명씩 추천 엔진의 일괄 추천(recommend_outfit_batch)으로 한 번에 계산하고,
+    계산에 사용한 옷장 버전, 입력 해시와 함께 suggested_outfit 테이블에 저장합니다.
+    아침 요청은 입력이 그대로이면 저장된 결과를 바로 사용합니다. (get_precomputed_outfit)
+    
+    Args:
+        db: DB 세션
+        user_ids: 계산할 사용자 ID 목록
+        batch_size: 한 번에 계산할 사용자 수
+    
+    Returns:
+        Dict[str, int]: {"computed": 저장한 사용자 수, "skipped": 옷장이 비어 건너뛴 수, "failed": 실패한 수}
+    
+    Raises:
+        BadRequestException: AI 추천 모델을 사용할 수 없거나 로드할 수 없는 경우
+    """
+    if not AI_RECOMMENDATION_AVAILABLE:
+        raise BadRequestException(
+            message="AI 추천 모델을 사용할 수 없습니다. ai_recommendation 모듈이 설치되지 않았습니다.",
+            detail={"error": "AI_RECOMMENDATION_AVAILABLE is False"}
+        )
+    
+    try:
+        model_loader = get_model_loader()
+    except Exception as e:
+        raise BadRequestException(
+            message="AI 추천 모델을 로드할 수 없습니다.",
+            detail={"error": str(e)}
+        )
+    model_version = model_loader.get_model_version()
+    
+    stats = {"computed": 0, "skipped": 0, "failed": 0}
+    for start in range(0, len(user_ids), batch_size):
+        batch_users = []
+        requests = []
+        for user_id in user_ids[start:start + batch_size]:
+            today_outfit = db.query(TodayOutfit).filter(TodayOutfit.user_id == user_id).first()
+            existing_items = _existing_items_from(today_outfit)
+            # 계산 중에 옷장이 바뀌면 저장한 결과가 사용되지 않도록 아이템을 읽기 전의 버전을 기록
+            closet_version = get_closet_version(db, user_id)
+            try:
+                _, selected_items, available_items = _prepare_recommendation(db, user_id, existing_items)
+            except NotFoundException:
+                stats["skipped"] += 1
+                continue
+            
+            batch_users.append((user_id, existing_items, closet_version))
+            requests.append({"selected_items": selected_items, "available_items": available_items})
+        
+        results = ai_recommend_outfit_batch(requests, model_loader) if requests else []
+        
+        for (user_id, existing_items, closet_version), result in zip(batch_users, results):
+            if "error" in result:
+                stats["failed"] += 1
+                logger.warning(f"추천 코디 미리 계산 실패 (user_id={user_id}): {result['error']}")
+                continue
+            
+            recommended_outfit = result["recommended_outfit"]
+            suggested = db.query(SuggestedOutfit).filter(SuggestedOutfit.user_id == user_id).first()
+            if suggested is None:
+                suggested = SuggestedOutfit(user_id=user_id)
+                db.add(suggested)
+            
+            suggested.top_id = recommended_outfit.get("top")
+            suggested.bottom_id = recommended_outfit.get("bottom")
+            suggested.shoes_id = recommended_outfit.get("shoes")
+            suggested.outer_id = recommended_outfit.get("outer")
+            suggested.model_version = model_version
+            suggested.closet_version = closet_version
+            suggested.input_key = _recommendation_input_key(existing_items, model_version, closet_version)
+            stats["computed"] += 1
+        
+        db.commit()
+    
+    return stats
 
@@ -0,0 +1,381 @@
+"""
+백그라운드 분석 큐
+- 백그라운드 업로드로 저장된 아이템(status=pending)의 Gemini 분석을 워커 스레드에서 실행
+- 작업은 DB의 analysis_jobs 테이블에 저장 (외부 브로커 없음, 서버를 재시작해도 대기 중인 작업 유지)
+- 실패하면 지수 백오프로 재시도하고, 최대 시도 횟수를 넘기면 아이템을 failed로 표시
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.exceptions import ClosetMateException, NotFoundException
+from ..models.analysis_job import (
+    AnalysisJob,
+    JOB_STATUS_QUEUED,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_DONE,
+    JOB_STATUS_FAILED
+)
+from ..models.closet_item import ClosetItem, ITEM_STATUS_READY, ITEM_STATUS_FAILED
+from ..models.user import User
+from ..utils.logger import logger
+from .ai_service import compute_item_embedding
+from .closet_cache import bump_closet_version
+from .gemini_service import analyze_clothing_image
+from .storage_service import get_storage_service
+
+# 새 작업 알림이 없을 때 재시도 시각이 된 작업을 확인하는 주기 (초)
+ANALYSIS_POLL_INTERVAL_SECONDS = 1.0
+
+
+def enqueue_analysis(db: Session, item: ClosetItem) -> AnalysisJob:
+    """
+    아이템의 분석 작업을 추가 (아이템 저장과 같은 트랜잭션에서 호출, 커밋은 호출하는 쪽에서 함)
+
+    커밋 후 notify_analysis_queue()를 호출하면 대기 중인 워커가 바로 작업을 가져갑니다.
+
+    Args:
+        db: DB 세션
+        item: 분석할 아이템 (ID가 있어야 함, flush 후 호출)
+
+    Returns:
+        AnalysisJob: 추가된 작업
+    """
+    job = AnalysisJob(
+        item_id=item.id,
+        user_id=item.user_id,
+        status=JOB_STATUS_QUEUED,
+        attempts=0,
+        next_run_at=datetime.utcnow()
+    )
+    db.add(job)
+    return job
+
+
+def get_analysis_status(db: Session, user_id: int, item_id: int) -> Dict[str, Any]:
+    """
+    아이템의 분석 상태를 조회
+
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        item_id: 아이템 ID
+
+    Returns:
+        Dict[str, Any]: {"id", "category", "status", "feature", "image_url", "attempts", "error"}
+            (feature는 분석이 끝난 경우에만 값이 있음, 백그라운드 업로드가 아닌 아이템은 attempts 0)
+
+    Raises:
+        NotFoundException: 아이템을 찾을 수 없는 경우
+    """
+    item = db.query(
+        ClosetItem.id, ClosetItem.category, ClosetItem.status, ClosetItem.feature, ClosetItem.image_url
+    ).filter(
+        ClosetItem.id == item_id,
+        ClosetItem.user_id == user_id
+    ).first()
+
+    if not item:
+        raise NotFoundException(
+            message="옷장 아이템을 찾을 수 없습니다.",
+            detail={"resource": "closet_item", "id": item_id}
+        )
+
+    job = db.query(AnalysisJob.attempts, AnalysisJob.last_error).filter(
+        AnalysisJob.item_id == item_id
+    ).order_by(AnalysisJob.id.desc()).first()
+
+    item_status = item.status or ITEM_STATUS_READY
+    return {
+        "id": item.id,
+        "category": item.category,
+        "status": item_status,
+        "feature": item.feature if item_status == ITEM_STATUS_READY else None,
+        "image_url": item.image_url,
+        "attempts": job.attempts if job else 0,
+        "error": job.last_error if job and item_status == ITEM_STATUS_FAILED else None
+    }
+
+
+def _error_message(error: Exception) -> str:
+    """예외를 작업에 기록할 메시지로 변환 (ClosetMateException은 message 필드)"""
+    if isinstance(error, ClosetMateException) and isinstance(error.detail, dict):
+        return str(error.detail.get("message") or error.detail)
+    return str(error) or error.__class__.__name__
+
+
+class AnalysisQueue:
+    """
+    DB 작업 테이블 기반 분석 워커 풀
+
+    워커 스레드는 실행 시각이 된 queued 작업을 조건부 UPDATE로 하나씩 가져가므로(running으로 변경)
+    여러 워커가 같은 작업을 중복 실행하지 않습니다. Gemini 호출 중에는 DB 트랜잭션을 열어 두지 않습니다.
+    start()가 running 작업을 모두 복구하므로 DB 하나에 분석 큐를 실행하는 서버 프로세스는 하나여야 합니다.
+    (나머지 프로세스는 ANALYSIS_WORKERS=0, 작업 추가는 어느 프로세스에서나 가능)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        workers: int,
+        max_attempts: int,
+        retry_base_seconds: float,
+        analyze: Optional[Callable[[str, str, str], str]] = None,
+        poll_interval: float = ANALYSIS_POLL_INTERVAL_SECONDS
+    ):
+        """
+        Args:
+            session_factory: DB 세션 생성 함수
+            workers: 워커 스레드 수
+            max_attempts: 작업당 최대 실행 횟수 (넘기면 failed)
+            retry_base_seconds: 첫 재시도까지 대기 시간 (재시도마다 2배)
+            analyze: (이미지 경로, 카테고리, 성별) -> feature 함수 (기본값: analyze_clothing_image)
+            poll_interval: 새 작업 알림이 없을 때 작업 테이블을 확인하는 주기 (초)
+        """
+        if workers < 1 or max_attempts < 1:
+            raise ValueError("workers와 max_attempts는 1 이상이어야 합니다.")
+
+        self.session_factory = session_factory
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_interval = poll_interval
+        self._analyze = analyze or analyze_clothing_image
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> int:
+        """
+        이전 실행에서 끝나지 않은 작업(running)을 queued로 되돌리고 워커 스레드를 시작
+
+        Returns:
+            int: 다시 대기열에 넣은 작업 수
+        """
+        db = self.session_factory()
+        try:
+            recovered = db.query(AnalysisJob).filter(AnalysisJob.status == JOB_STATUS_RUNNING).update(
+                {AnalysisJob.status: JOB_STATUS_QUEUED, AnalysisJob.next_run_at: datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"analysis-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return recovered
+
+    def notify(self) -> None:
+        """새 작업이 추가되었음을 대기 중인 워커에 알림"""
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def _worker(self) -> None:
+        while not self._stopping:
+            try:
+                job_id = self._claim_next()
+            except Exception as e:
+                logger.error(f"분석 작업 조회 실패: {e}")
+                job_id = None
+
+            if job_id is None:
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(self.poll_interval)
+                continue
+
+            try:
+                self._run_job(job_id)
+            except Exception as e:
+                # 결과 기록 실패 등 (작업은 running으로 남아 다음 시작 시 다시 실행)
+                logger.error(f"분석 작업 처리 실패: job_id={job_id}, 오류: {e}")
+
+    def _claim_next(self) -> Optional[int]:
+        """
+        실행 시각이 된 queued 작업 하나를 running으로 바꾸고 ID를 반환 (없으면 None)
+        """
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            candidates = db.query(AnalysisJob.id).filter(
+                AnalysisJob.status == JOB_STATUS_QUEUED,
+                AnalysisJob.next_run_at <= now
+            ).order_by(AnalysisJob.next_run_at, AnalysisJob.id).limit(self.workers).all()
+
+            for (job_id,) in candidates:
+                # 다른 워커가 먼저 가져간 작업이면 0행이 바뀜
+                claimed = db.query(AnalysisJob).filter(
+                    AnalysisJob.id == job_id,
+                    AnalysisJob.status == JOB_STATUS_QUEUED
+                ).update(
+                    {
+                        AnalysisJob.status: JOB_STATUS_RUNNING,
+                        AnalysisJob.attempts: AnalysisJob.attempts + 1,
+                        AnalysisJob.updated_at: now
+                    },
+                    synchronize_session=False
+                )
+                db.commit()
+                if claimed:
+                    return job_id
+            return None
+        finally:
+            db.close()
+
+    def _run_job(self, job_id: int) -> None:
+        """작업 하나를 실행하고 결과(성공/재시도/실패)를 기록"""
+        db = self.session_factory()
+        try:
+            row = db.query(
+                AnalysisJob.attempts, ClosetItem.id, ClosetItem.category, ClosetItem.image_url, User.gender
+            ).join(
+                ClosetItem, ClosetItem.id == AnalysisJob.item_id
+            ).join(
+                User, User.id == ClosetItem.user_id
+            ).filter(AnalysisJob.id == job_id).first()
+        finally:
+            db.close()
+
+        if row is None:
+            # 분석 중에 아이템이 삭제됨 (작업도 함께 삭제됨)
+            return
+
+        attempts, item_id, category, image_url, user_gender = row
+        try:
+            image_path = get_storage_service().get_image_path(image_url)
+            feature = self._analyze(image_path, category, user_gender)
+        except Exception as e:
+            self._record_failure(job_id, attempts, e)
+            return
+        self._record_success(job_id, item_id, feature)
+
+    def _record_success(self, job_id: int, item_id: int, feature: str) -> None:
+        """아이템에 feature와 embedding을 저장하고 ready로 변경 (옷장 버전 증가)"""
+        embedding, embedding_version = compute_item_embedding(feature)
+
+        db = self.session_factory()
+        try:
+            job = db.get(AnalysisJob, job_id)
+            item = db.get(ClosetItem, item_id)
+            if job is None or item is None:
+                return
+
+            item.feature = feature
+            item.embedding = embedding
+            item.embedding_version = embedding_version
+            item.status = ITEM_STATUS_READY
+            job.status = JOB_STATUS_DONE
+            job.last_error = None
+            bump_closet_version(db, item.user_id)
+            db.commit()
+            logger.info(f"백그라운드 분석 완료: item_id={item_id}, feature={feature}")
+        finally:
+            db.close()
+
+    def _record_failure(self, job_id: int, attempts: int, error: Exception) -> None:
+        """재시도 시각을 기록하거나, 최대 시도 횟수를 넘겼으면 작업과 아이템을 failed로 변경"""
+        message = _error_message(error)
+
+        db = self.session_factory()
+        try:
+            job = db.get(AnalysisJob, job_id)
+            if job is None:
+                return
+
+            job.last_error = message
+            if attempts >= self.max_attempts:
+                job.status = JOB_STATUS_FAILED
+                db.query(ClosetItem).filter(ClosetItem.id == job.item_id).update(
+                    {ClosetItem.status: ITEM_STATUS_FAILED},
+                    synchronize_session=False
+                )
+                logger.warning(f"백그라운드 분석 실패 (재시도 중단): item_id={job.item_id}, 시도 {attempts}회, 오류: {message}")
+            else:
+                job.status = JOB_STATUS_QUEUED
+                job.next_run_at = datetime.utcnow() + timedelta(seconds=self.retry_base_seconds * 2 ** (attempts - 1))
+                logger.warning(f"백그라운드 분석 실패 (재시도 예정): item_id={job.item_id}, 시도 {attempts}회, 오류: {message}")
+            db.commit()
+        finally:
+            db.close()
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        새 작업을 더 가져가지 않고, 실행 중인 작업이 끝날 때까지 기다린 뒤 워커를 종료
+
+        대기 중인 작업은 DB에 남아 다음 시작 시 실행되고, timeout 안에 끝나지 않은 작업은
+        running으로 남아 다음 시작 시 queued로 복구됩니다.
+
+        Args:
+            timeout: 전체 대기 시간 (초, None이면 끝날 때까지)
+
+        Returns:
+            bool: 모든 워커가 종료되었는지 여부
+        """
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        return not any(thread.is_alive() for thread in self._threads)
+
+
+_analysis_queue: Optional[AnalysisQueue] = None
+_analysis_queue_lock = threading.Lock()
+
+
+def start_analysis_queue() -> Optional[AnalysisQueue]:
+    """
+    Settings(ANALYSIS_WORKERS, ANALYSIS_MAX_ATTEMPTS, ANALYSIS_RETRY_BASE_SECONDS)로 분석 큐를 만들고 시작
+    (서버 시작 시 호출, 이미 시작했으면 기존 큐 반환, ANALYSIS_WORKERS가 0이면 None)
+
+    Returns:
+        Optional[AnalysisQueue]: 분석 큐
+    """
+    global _analysis_queue
+    if settings.ANALYSIS_WORKERS <= 0:
+        return None
+
+    with _analysis_queue_lock:
+        if _analysis_queue is None:
+            queue = AnalysisQueue(
+                SessionLocal,
+                settings.ANALYSIS_WORKERS,
+                settings.ANALYSIS_MAX_ATTEMPTS,
+                settings.ANALYSIS_RETRY_BASE_SECONDS
+            )
+            recovered = queue.start()
+            _analysis_queue = queue
+            logger.info(f"분석 큐 시작: 워커 {settings.ANALYSIS_WORKERS}개 (복구한 작업 {recovered}개)")
+        return _analysis_queue
+
+
+def notify_analysis_queue() -> None:
+    """분석 작업을 커밋한 뒤 호출 (큐가 시작되지 않았으면 작업은 다음 시작 시 실행)"""
+    queue = _analysis_queue
+    if queue is not None:
+        queue.notify()
+
+
+def shutdown_analysis_queue() -> bool:
+    """
+    분석 큐를 종료 (서버 종료 시 호출, 실행 중인 작업은 ANALYSIS_SHUTDOWN_TIMEOUT_SECONDS까지 기다림)
+
+    Returns:
+        bool: 실행 중인 작업이 모두 끝났는지 여부 (큐가 없으면 True)
+    """
+    global _analysis_queue
+    with _analysis_queue_lock:
+        queue, _analysis_queue = _analysis_queue, None
+    if queue is None:
+        return True
+    return queue.shutdown(timeout=settings.ANALYSIS_SHUTDOWN_TIMEOUT_SECONDS)
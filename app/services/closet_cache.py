@@ -0,0 +1,213 @@
+"""
+옷장 스냅샷 캐시
+- 추천에 필요한 사용자 옷장 데이터(아이템 ID, 카테고리 코드, embedding 행렬)를 메모리에 보관
+- 옷장 버전(User.closet_version)으로 무효화
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..models.user import User
+from ..core.config import settings
+from .recommendation_cache import recommendation_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 카테고리 코드 (스냅샷의 category_codes 값)
+CATEGORY_CODES: Dict[str, int] = {"top": 0, "bottom": 1, "shoes": 2, "outer": 3}
+
+
+class ClosetSnapshot:
+    """
+    추천에 사용하는 사용자 옷장 스냅샷 (읽기 전용)
+
+    Attributes:
+        closet_version: 스냅샷을 만든 시점의 옷장 버전
+        model_version: embedding을 계산한 모델 버전
+        item_ids: (n,) int64 아이템 ID 배열
+        category_codes: (n,) int8 카테고리 코드 배열 (CATEGORY_CODES)
+        features: 아이템 feature 문자열 리스트
+        embeddings: (n, dim) float32 embedding 행렬
+    """
+
+    __slots__ = ("closet_version", "model_version", "item_ids", "category_codes", "features", "embeddings")
+
+    def __init__(
+        self,
+        closet_version: int,
+        model_version: Optional[str],
+        item_ids: "np.ndarray",
+        category_codes: "np.ndarray",
+        features: List[str],
+        embeddings: "np.ndarray"
+    ):
+        self.closet_version = closet_version
+        self.model_version = model_version
+        self.item_ids = item_ids
+        self.category_codes = category_codes
+        self.features = features
+        self.embeddings = embeddings
+        # 캐시에 보관하는 동안 요청 간에 공유되므로 쓰기 금지
+        for array in (item_ids, category_codes, embeddings):
+            array.flags.writeable = False
+
+    def rows_for(self, category: str) -> "np.ndarray":
+        """
+        카테고리에 속한 행 번호 배열을 반환
+
+        Args:
+            category: 카테고리 (top, bottom, shoes, outer)
+
+        Returns:
+            np.ndarray: 행 번호 배열 (아이템 ID 오름차순)
+        """
+        return np.flatnonzero(self.category_codes == CATEGORY_CODES[category])
+
+    def item_dict(self, row: int) -> Dict[str, Any]:
+        """
+        행을 추천 엔진 입력 형식의 아이템 딕셔너리로 변환 (vector는 embedding 행렬의 행)
+
+        Args:
+            row: 행 번호
+
+        Returns:
+            Dict[str, Any]: {"id": ..., "feature": ..., "vector": ...}
+        """
+        return {
+            "id": int(self.item_ids[row]),
+            "feature": self.features[row],
+            "vector": self.embeddings[row]
+        }
+
+
+class ClosetSnapshotCache:
+    """
+    사용자별 옷장 스냅샷 LRU 캐시 (스레드 안전)
+
+    옷장 버전이나 모델 버전이 다르면 캐시 미스로 처리합니다.
+    옷장 버전은 DB에 저장되므로 여러 워커 프로세스에서도 다른 워커의 변경을 감지할 수 있습니다.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._snapshots: "OrderedDict[int, ClosetSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, closet_version: int, model_version: Optional[str]) -> Optional[ClosetSnapshot]:
+        """
+        현재 옷장 버전과 모델 버전에 맞는 스냅샷을 반환
+
+        Args:
+            user_id: 사용자 ID
+            closet_version: 현재 옷장 버전
+            model_version: 현재 모델 버전
+
+        Returns:
+            Optional[ClosetSnapshot]: 스냅샷 (없거나 버전이 다르면 None)
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(user_id)
+            if (
+                snapshot is None
+                or snapshot.closet_version != closet_version
+                or snapshot.model_version != model_version
+            ):
+                self.misses += 1
+                return None
+            self._snapshots.move_to_end(user_id)
+            self.hits += 1
+            return snapshot
+
+    def put(self, user_id: int, snapshot: ClosetSnapshot) -> None:
+        """
+        스냅샷을 저장 (max_size를 넘으면 가장 오래 사용하지 않은 사용자부터 제거)
+
+        Args:
+            user_id: 사용자 ID
+            snapshot: 옷장 스냅샷
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._snapshots[user_id] = snapshot
+            self._snapshots.move_to_end(user_id)
+            while len(self._snapshots) > self.max_size:
+                self._snapshots.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        사용자의 스냅샷을 제거
+
+        Args:
+            user_id: 사용자 ID
+        """
+        with self._lock:
+            self._snapshots.pop(user_id, None)
+
+    def clear(self) -> None:
+        """모든 스냅샷과 통계를 제거"""
+        with self._lock:
+            self._snapshots.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        캐시 통계를 반환
+
+        Returns:
+            Dict[str, int]: {"size": ..., "max_size": ..., "hits": ..., "misses": ...}
+        """
+        with self._lock:
+            return {
+                "size": len(self._snapshots),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# 프로세스 전역 옷장 스냅샷 캐시
+closet_snapshot_cache = ClosetSnapshotCache(settings.CLOSET_SNAPSHOT_CACHE_SIZE)
+
+
+def get_closet_version(db: Session, user_id: int) -> int:
+    """
+    사용자의 현재 옷장 버전을 조회하는 함수
+
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+
+    Returns:
+        int: 옷장 버전 (값이 없으면 0)
+    """
+    version = db.query(User.closet_version).filter(User.id == user_id).scalar()
+    return version or 0
+
+
+def bump_closet_version(db: Session, user_id: int) -> None:
+    """
+    옷장 아이템이 추가/삭제되었을 때 사용자의 옷장 버전을 올리는 함수
+
+    아이템 변경과 같은 트랜잭션에서 호출해야 하며, 커밋은 호출하는 쪽에서 합니다.
+    동시 요청에서 증가가 누락되지 않도록 DB에서 원자적으로 증가시킵니다.
+    (이 프로세스의 옷장 스냅샷과 추천 결과 캐시도 함께 제거)
+
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+    """
+    db.query(User).filter(User.id == user_id).update(
+        {User.closet_version: func.coalesce(User.closet_version, 0) + 1},
+        synchronize_session=False
+    )
+    closet_snapshot_cache.invalidate(user_id)
+    recommendation_cache.invalidate_user(user_id)
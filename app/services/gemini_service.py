@@ -1,17 +1,23 @@
 """
 Gemini API 서비스
 - 이미지에서 옷의 피쳐 정보 추출 (category_detail, 계절, 색상, 재질, 스타일)
+- 같은 사진의 분석 결과는 image_analysis_cache에 저장해 두고 재사용 (성별만 요청마다 반영)
 """
 
 import os
 import re
-from typing import Optional
+import asyncio
+import hashlib
+from typing import Optional, Tuple
 from pathlib import Path
 from io import BytesIO
 import google.generativeai as genai
+from google.generativeai import protos
+from google.generativeai.types import content_types
 from PIL import Image
 from ..core.config import settings
 from ..core.exceptions import BadRequestException
+from .image_analysis_cache import image_analysis_cache, make_cache_key
 
 # PIL 이미지 크기 제한 늘리기 (DecompressionBombWarning 방지)
 # 기본값: 89,478,485 픽셀 -> 200,000,000 픽셀로 증가
@@ -48,6 +54,9 @@ category_detail은 다음 중 하나로:
 예시: 'category_detail: 숏 팬츠, 계절: 여름, 색상: gray, 재질: cotton, 스타일: casual'
 """
 
+# 프롬프트 버전 (프롬프트가 바뀌면 이전 분석 결과 캐시를 쓰지 않도록 캐시 키에 포함)
+GEMINI_PROMPT_VERSION = hashlib.sha256(GEMINI_PROMPT.encode("utf-8")).hexdigest()[:16]
+
 
 def _initialize_gemini() -> None:
     """
@@ -169,6 +178,175 @@ def _resize_image_for_gemini(image: Image.Image, max_size: int = GEMINI_IMAGE_MA
     return resized_image
 
 
+def _parse_response_attributes(response, error_detail: dict) -> dict:
+    """
+    Gemini API 응답을 검증하고 속성 딕셔너리로 파싱
+    
+    Args:
+        response: generate_content(_async) 응답
+        error_detail: 오류 detail에 함께 넣을 정보 (예: {"image_path": ...})
+    
+    Returns:
+        dict: 파싱된 피쳐 정보 (성별 제외, _parse_gemini_response 참고)
+    
+    Raises:
+        BadRequestException: 응답이 없거나 비어 있거나 파싱에 실패한 경우
+    """
+    # 응답 텍스트 추출 및 검증
+    if not hasattr(response, 'text') or response.text is None:
+        raise BadRequestException(
+            message="Gemini API가 응답을 반환하지 않았습니다.",
+            detail={"error": "response.text is None", **error_detail}
+        )
+    
+    response_text = response.text.strip()
+    
+    if not response_text:
+        raise BadRequestException(
+            message="Gemini API 응답이 비어있습니다.",
+            detail={"error": "response.text is empty", **error_detail}
+        )
+    
+    return _parse_gemini_response(response_text)
+
+
+def _render_feature(parsed_data: dict, category: str, user_gender: str, error_detail: dict) -> str:
+    """
+    파싱된 속성을 사용자 성별에 맞는 feature 문자열로 변환하고 검증
+    (캐시에서 가져온 속성도 같은 방식으로 변환)
+    
+    Args:
+        parsed_data: 파싱된 피쳐 정보 (성별 제외)
+        category: 카테고리 (top, bottom, shoes, outer)
+        user_gender: 사용자 성별 (남성, 여성)
+        error_detail: 오류 detail에 함께 넣을 정보
+    
+    Returns:
+        str: feature 문자열
+    
+    Raises:
+        BadRequestException: feature 문자열이 비어 있는 경우
+    """
+    feature = _format_feature_string(parsed_data, category, user_gender)
+    
+    # 최종 feature 검증
+    if not feature or not feature.strip():
+        raise BadRequestException(
+            message="Feature 정보를 추출할 수 없습니다.",
+            detail={"error": "feature is empty", "parsed_data": parsed_data, **error_detail}
+        )
+    
+    return feature
+
+
+def _prompt_version() -> str:
+    """
+    분석 결과 캐시 키에 사용할 프롬프트 버전 (모델이 바뀌어도 다시 분석하도록 모델 이름 포함)
+    
+    Returns:
+        str: '<모델 이름>:<프롬프트 해시>'
+    """
+    model_name = getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
+    return f"{model_name}:{GEMINI_PROMPT_VERSION}"
+
+
+def _image_content_hash(image: Image.Image) -> str:
+    """
+    리사이즈한 이미지의 픽셀 데이터 해시
+    (파일 메타데이터나 무손실 인코딩 방식이 달라도 픽셀이 같으면 같은 값)
+    
+    Args:
+        image: Gemini 전송용으로 리사이즈한 PIL Image 객체
+    
+    Returns:
+        str: SHA-256 hex 문자열
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode("utf-8"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _lookup_cached_attributes(image: Image.Image, category: str) -> Tuple[str, Optional[dict]]:
+    """
+    분석 결과 캐시 조회
+    
+    Args:
+        image: Gemini 전송용으로 리사이즈한 PIL Image 객체
+        category: 카테고리 (top, bottom, shoes, outer)
+    
+    Returns:
+        Tuple[str, Optional[dict]]: (캐시 키, 저장된 속성 - 없으면 None)
+    """
+    cache_key = make_cache_key(_image_content_hash(image), category, _prompt_version())
+    return cache_key, image_analysis_cache.get(cache_key)
+
+
+def _store_cached_attributes(cache_key: str, category: str, parsed_data: dict) -> None:
+    """
+    분석 결과를 캐시에 저장
+    
+    Args:
+        cache_key: _lookup_cached_attributes에서 받은 캐시 키
+        category: 카테고리 (top, bottom, shoes, outer)
+        parsed_data: 파싱된 피쳐 정보 (성별 제외)
+    """
+    image_analysis_cache.put(cache_key, category, _prompt_version(), parsed_data)
+
+
+def _gemini_error(error: Exception, error_detail: dict) -> BadRequestException:
+    """
+    Gemini API 호출 중 발생한 예외를 BadRequestException으로 변환
+    
+    Args:
+        error: 발생한 예외
+        error_detail: 오류 detail에 함께 넣을 정보
+    
+    Returns:
+        BadRequestException: 인증 실패 / 사용량 초과 / 기타 오류
+    """
+    error_message = str(error)
+    if "API key" in error_message or "authentication" in error_message.lower():
+        message = "Gemini API 인증에 실패했습니다. API 키를 확인해주세요."
+    elif "quota" in error_message.lower() or "limit" in error_message.lower():
+        message = "Gemini API 사용량 한도를 초과했습니다."
+    else:
+        message = f"이미지 분석 중 오류가 발생했습니다: {error_message}"
+    return BadRequestException(message=message, detail={"error": error_message, **error_detail})
+
+
+def _prepare_image(image_bytes: bytes, category: str) -> Tuple[Image.Image, str, Optional[dict]]:
+    """
+    이미지 디코딩, 리사이즈, 분석 결과 캐시 조회
+    (CPU 작업과 DB 조회이므로 비동기 경로에서는 스레드에서 실행)
+    
+    Args:
+        image_bytes: 이미지 바이너리 데이터
+        category: 카테고리 (top, bottom, shoes, outer)
+    
+    Returns:
+        Tuple[Image.Image, str, Optional[dict]]: (리사이즈한 이미지, 캐시 키, 저장된 속성 - 없으면 None)
+    """
+    image = Image.open(BytesIO(image_bytes))
+    image = _resize_image_for_gemini(image)
+    cache_key, cached = _lookup_cached_attributes(image, category)
+    return image, cache_key, cached
+
+
+def _encode_image_blob(image: Image.Image) -> protos.Blob:
+    """
+    리사이즈한 이미지를 Gemini 전송 형식(Blob)으로 인코딩
+    (CPU 작업이므로 비동기 경로에서는 스레드에서 실행)
+    
+    Args:
+        image: 리사이즈한 PIL Image 객체
+    
+    Returns:
+        protos.Blob: generate_content에 PIL 이미지를 넘길 때와 같은 형식으로 인코딩된 이미지
+    """
+    return content_types.to_blob(image)
+
+
 def analyze_clothing_image(image_path: str, category: str, user_gender: str = "남성") -> str:
     """
     이미지에서 옷의 피쳐 정보를 추출하는 함수
@@ -203,64 +381,27 @@ def analyze_clothing_image(image_path: str, category: str, user_gender: str = "
         # Gemini API에 전송하기 위해 이미지 리사이즈 (속도 향상)
         image = _resize_image_for_gemini(image)
         
-        # Gemini 모델 선택 (설정에서 모델 선택 가능)
-        model_name = getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
-        model = genai.GenerativeModel(model_name)
+        # 같은 사진을 분석한 적이 있으면 저장된 결과 사용
+        cache_key, parsed_data = _lookup_cached_attributes(image, category)
         
-        # 이미지와 프롬프트를 함께 전달하여 분석
-        response = model.generate_content([GEMINI_PROMPT, image])
+        if parsed_data is None:
+            # Gemini 모델 선택 (설정에서 모델 선택 가능)
+            model_name = getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
+            model = genai.GenerativeModel(model_name)
+            
+            # 이미지와 프롬프트를 함께 전달하여 분석
+            response = model.generate_content([GEMINI_PROMPT, image])
+            parsed_data = _parse_response_attributes(response, {"image_path": image_path})
+            _store_cached_attributes(cache_key, category, parsed_data)
         
-        # 응답 텍스트 추출 및 검증
-        if not hasattr(response, 'text') or response.text is None:
-            raise BadRequestException(
-                message="Gemini API가 응답을 반환하지 않았습니다.",
-                detail={"error": "response.text is None", "image_path": image_path}
-            )
-        
-        response_text = response.text.strip()
-        
-        if not response_text:
-            raise BadRequestException(
-                message="Gemini API 응답이 비어있습니다.",
-                detail={"error": "response.text is empty", "image_path": image_path}
-            )
-        
-        # 응답 파싱
-        parsed_data = _parse_gemini_response(response_text)
-        
-        # feature 문자열 형식으로 변환 (사용자 성별 사용)
-        feature = _format_feature_string(parsed_data, category, user_gender)
-        
-        # 최종 feature 검증
-        if not feature or not feature.strip():
-            raise BadRequestException(
-                message="Feature 정보를 추출할 수 없습니다.",
-                detail={"error": "feature is empty", "parsed_data": parsed_data, "image_path": image_path}
-            )
-        
-        return feature
+        return _render_feature(parsed_data, category, user_gender, {"image_path": image_path})
         
     except BadRequestException:
         # BadRequestException은 그대로 전달
         raise
     except Exception as e:
         # Gemini API 오류 처리
-        error_message = str(e)
-        if "API key" in error_message or "authentication" in error_message.lower():
-            raise BadRequestException(
-                message="Gemini API 인증에 실패했습니다. API 키를 확인해주세요.",
-                detail={"error": error_message, "image_path": image_path}
-            )
-        elif "quota" in error_message.lower() or "limit" in error_message.lower():
-            raise BadRequestException(
-                message="Gemini API 사용량 한도를 초과했습니다.",
-                detail={"error": error_message, "image_path": image_path}
-            )
-        else:
-            raise BadRequestException(
-                message=f"이미지 분석 중 오류가 발생했습니다: {error_message}",
-                detail={"error": error_message, "image_path": image_path}
-            )
+        raise _gemini_error(e, {"image_path": image_path})
 
 
 def analyze_clothing_image_from_bytes(image_bytes: bytes, category: str, user_gender: str = "남성") -> str:
@@ -290,62 +431,73 @@ def analyze_clothing_image_from_bytes(image_bytes: bytes, category: str, user_ge
         # Gemini API에 전송하기 위해 이미지 리사이즈 (속도 향상)
         image = _resize_image_for_gemini(image)
         
-        # Gemini 모델 선택 (설정에서 모델 선택 가능)
-        model_name = getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
-        model = genai.GenerativeModel(model_name)
-        
-        # 이미지와 프롬프트를 함께 전달하여 분석
-        response = model.generate_content([GEMINI_PROMPT, image])
-        
-        # 응답 텍스트 추출 및 검증
-        if not hasattr(response, 'text') or response.text is None:
-            raise BadRequestException(
-                message="Gemini API가 응답을 반환하지 않았습니다.",
-                detail={"error": "response.text is None"}
-            )
-        
-        response_text = response.text.strip()
+        # 같은 사진을 분석한 적이 있으면 저장된 결과 사용
+        cache_key, parsed_data = _lookup_cached_attributes(image, category)
         
-        if not response_text:
-            raise BadRequestException(
-                message="Gemini API 응답이 비어있습니다.",
-                detail={"error": "response.text is empty"}
-            )
+        if parsed_data is None:
+            # Gemini 모델 선택 (설정에서 모델 선택 가능)
+            model_name = getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
+            model = genai.GenerativeModel(model_name)
+            
+            # 이미지와 프롬프트를 함께 전달하여 분석
+            response = model.generate_content([GEMINI_PROMPT, image])
+            parsed_data = _parse_response_attributes(response, {})
+            _store_cached_attributes(cache_key, category, parsed_data)
         
-        # 응답 파싱
-        parsed_data = _parse_gemini_response(response_text)
+        return _render_feature(parsed_data, category, user_gender, {})
         
-        # feature 문자열 형식으로 변환 (사용자 성별 사용)
-        feature = _format_feature_string(parsed_data, category, user_gender)
+    except BadRequestException:
+        # BadRequestException은 그대로 전달
+        raise
+    except Exception as e:
+        # Gemini API 오류 처리
+        raise _gemini_error(e, {})
+
+
+async def analyze_clothing_image_from_bytes_async(image_bytes: bytes, category: str, user_gender: str = "남성") -> str:
+    """
+    analyze_clothing_image_from_bytes의 비동기 버전 (업로드 요청 처리용)
+    
+    이미지 디코딩/리사이즈/인코딩과 캐시 조회는 스레드에서 실행하고 Gemini API는 비동기 클라이언트로 호출하므로
+    분석을 기다리는 동안 이벤트 루프가 다른 요청을 처리할 수 있습니다.
+    
+    Args:
+        image_bytes: 이미지 바이너리 데이터
+        category: 카테고리 (top, bottom, shoes, outer)
+        user_gender: 사용자 성별 (남성, 여성) - 기본값: "남성"
+    
+    Returns:
+        str: 추출된 feature 문자열
+        예: '하의_gray_cotton_숏 팬츠_남성_여름_casual'
+    
+    Raises:
+        BadRequestException: 이미지 처리 실패 또는 API 호출 실패 시
+    """
+    # Gemini API 초기화
+    _initialize_gemini()
+    
+    try:
+        # 이미지 디코딩 + 리사이즈 + 캐시 조회 (CPU 작업과 DB 조회는 스레드에서)
+        image, cache_key, parsed_data = await asyncio.to_thread(_prepare_image, image_bytes, category)
         
-        # 최종 feature 검증
-        if not feature or not feature.strip():
-            raise BadRequestException(
-                message="Feature 정보를 추출할 수 없습니다.",
-                detail={"error": "feature is empty", "parsed_data": parsed_data}
-            )
+        if parsed_data is None:
+            # Gemini 전송 형식으로 인코딩 (캐시에 없을 때만)
+            image_blob = await asyncio.to_thread(_encode_image_blob, image)
+            
+            # Gemini 모델 선택 (설정에서 모델 선택 가능)
+            model_name = getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
+            model = genai.GenerativeModel(model_name)
+            
+            # 이미지와 프롬프트를 함께 전달하여 분석 (비동기 호출)
+            response = await model.generate_content_async([GEMINI_PROMPT, image_blob])
+            parsed_data = _parse_response_attributes(response, {})
+            await asyncio.to_thread(_store_cached_attributes, cache_key, category, parsed_data)
         
-        return feature
+        return _render_feature(parsed_data, category, user_gender, {})
         
     except BadRequestException:
         # BadRequestException은 그대로 전달
         raise
     except Exception as e:
         # Gemini API 오류 처리
-        error_message = str(e)
-        if "API key" in error_message or "authentication" in error_message.lower():
-            raise BadRequestException(
-                message="Gemini API 인증에 실패했습니다. API 키를 확인해주세요.",
-                detail={"error": error_message}
-            )
-        elif "quota" in error_message.lower() or "limit" in error_message.lower():
-            raise BadRequestException(
-                message="Gemini API 사용량 한도를 초과했습니다.",
-                detail={"error": error_message}
-            )
-        else:
-            raise BadRequestException(
-                message=f"이미지 분석 중 오류가 발생했습니다: {error_message}",
-                detail={"error": error_message}
-            )
-
+        raise _gemini_error(e, {})
@@ -0,0 +1,158 @@
+"""
+Gemini 이미지 분석 결과 캐시
+- 정규화한 이미지 픽셀 + 카테고리 + 프롬프트 버전의 SHA-256을 키로 파싱한 속성을 DB(image_analysis_cache)에 저장
+- 같은 사진을 다시 올리면(삭제 후 재업로드, 네트워크 오류로 재시도 등) Gemini를 호출하지 않음
+- 적중/미스 횟수는 프로세스별로, 저장된 항목 수와 누적 적중 횟수는 DB 기준으로 집계
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.image_analysis_cache import ImageAnalysisCache
+from ..utils.logger import logger
+
+
+def make_cache_key(image_hash: str, category: str, prompt_version: str) -> str:
+    """
+    캐시 키 생성
+
+    Args:
+        image_hash: 정규화한 이미지의 SHA-256 hex
+        category: 카테고리 (top, bottom, shoes, outer)
+        prompt_version: Gemini 프롬프트/모델 버전
+
+    Returns:
+        str: SHA-256 hex 문자열
+    """
+    payload = json.dumps([image_hash, category, prompt_version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisResultCache:
+    """
+    DB 기반 분석 결과 캐시
+
+    DB 오류는 로그만 남기고 미스로 처리합니다. (캐시 때문에 업로드가 실패하지 않도록)
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], enabled: bool = True):
+        """
+        Args:
+            session_factory: DB 세션 생성 함수
+            enabled: False이면 항상 미스 (저장도 하지 않음)
+        """
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cache_key: str) -> Optional[Dict[str, str]]:
+        """
+        저장된 분석 결과를 조회 (적중하면 항목의 적중 횟수 증가)
+
+        Args:
+            cache_key: make_cache_key 결과
+
+        Returns:
+            Optional[Dict[str, str]]: 파싱한 속성 (없으면 None)
+        """
+        if not self.enabled:
+            return None
+
+        attributes = None
+        db = self.session_factory()
+        try:
+            entry = db.get(ImageAnalysisCache, cache_key)
+            if entry is not None:
+                attributes = json.loads(entry.attributes)
+                entry.hit_count = (entry.hit_count or 0) + 1
+                entry.last_hit_at = datetime.utcnow()
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"이미지 분석 캐시 조회 실패 (Gemini 호출): {e}")
+        finally:
+            db.close()
+
+        with self._lock:
+            if attributes is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return attributes
+
+    def put(self, cache_key: str, category: str, prompt_version: str, attributes: Dict[str, str]) -> None:
+        """
+        분석 결과를 저장 (같은 키가 이미 있으면 그대로 둠)
+
+        Args:
+            cache_key: make_cache_key 결과
+            category: 카테고리
+            prompt_version: Gemini 프롬프트/모델 버전
+            attributes: 파싱한 속성 (성별 제외)
+        """
+        if not self.enabled:
+            return
+
+        db = self.session_factory()
+        try:
+            db.add(ImageAnalysisCache(
+                cache_key=cache_key,
+                category=category,
+                prompt_version=prompt_version,
+                attributes=json.dumps(attributes, ensure_ascii=False),
+                hit_count=0
+            ))
+            db.commit()
+        except IntegrityError:
+            # 같은 사진을 동시에 분석한 다른 요청이 먼저 저장함
+            db.rollback()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"이미지 분석 캐시 저장 실패: {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계를 반환
+
+        Returns:
+            Dict[str, Any]: {"enabled", "hits", "misses", "hit_rate"(이 프로세스),
+                             "entries", "stored_hits"(DB에 저장된 항목 수와 누적 적중 횟수)}
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+
+        entries = stored_hits = None
+        db = self.session_factory()
+        try:
+            entries, stored_hits = db.query(
+                func.count(ImageAnalysisCache.cache_key),
+                func.coalesce(func.sum(ImageAnalysisCache.hit_count), 0)
+            ).one()
+        except Exception as e:
+            logger.warning(f"이미지 분석 캐시 통계 조회 실패: {e}")
+        finally:
+            db.close()
+
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": entries,
+            "stored_hits": stored_hits
+        }
+
+
+# 서버 전체에서 공유하는 분석 결과 캐시
+image_analysis_cache = AnalysisResultCache(SessionLocal, enabled=settings.IMAGE_ANALYSIS_CACHE_ENABLED)
@@ -0,0 +1,129 @@
+"""
+이미지 지각 해시(dHash) 서비스
+- 업로드 이미지의 64비트 dHash와 평균 색상 계산 (다시 인코딩하거나 크기를 바꾼 사진도 비슷한 값)
+- 사용자 옷장에서 해밍 거리로 거의 같은 사진(near-duplicate) 찾기
+"""
+
+from io import BytesIO
+from typing import Optional, Tuple
+import numpy as np
+from PIL import Image, ImageOps
+from sqlalchemy.orm import Session
+from ..models.closet_item import ClosetItem
+
+# dHash 크기 (HASH_SIZE x HASH_SIZE 비트 = 64비트, hex 16자리)
+HASH_SIZE = 8
+DHASH_HEX_LENGTH = HASH_SIZE * HASH_SIZE // 4
+
+# dHash는 밝기 변화만 보므로 같은 디자인의 다른 색 옷을 구분하기 위해 평균 색상(RGB 각 0~255)도 비교
+# 채널별 차이가 이 값을 넘으면 다른 옷으로 판단
+COLOR_TOLERANCE = 32
+
+
+def compute_image_hash(image_bytes: bytes) -> str:
+    """
+    이미지 해시 계산
+    - dHash: 흑백으로 바꿔 (HASH_SIZE+1) x HASH_SIZE로 줄인 뒤, 가로로 이웃한 픽셀의 밝기 비교 결과를 비트로 사용
+    - 평균 색상: RGB 채널별 평균
+
+    Args:
+        image_bytes: 이미지 바이너리 데이터
+
+    Returns:
+        str: dHash hex 16자리 + 평균 색상 hex 6자리 (예: '3c7e7e3c1c1c3e7f' + 'f0e8d2')
+    """
+    image = Image.open(BytesIO(image_bytes))
+    # 휴대폰 사진은 EXIF 회전 정보를 반영해야 같은 사진끼리 비교 가능
+    image = ImageOps.exif_transpose(image).convert("RGB")
+
+    gray = np.asarray(image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS), dtype=np.int16)
+    bits = (gray[:, 1:] > gray[:, :-1]).flatten()
+
+    mean_color = np.asarray(image.resize((HASH_SIZE, HASH_SIZE), Image.Resampling.BOX), dtype=np.float32).mean(axis=(0, 1))
+    return np.packbits(bits).tobytes().hex() + bytes(np.round(mean_color).astype(np.uint8)).hex()
+
+
+def _split_hash(image_hash: str) -> Tuple[int, np.ndarray]:
+    """해시 문자열을 (dHash 정수, 평균 색상 배열)로 분리"""
+    color = np.frombuffer(bytes.fromhex(image_hash[DHASH_HEX_LENGTH:]), dtype=np.uint8)
+    return int(image_hash[:DHASH_HEX_LENGTH], 16), color.astype(np.int16)
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    """
+    두 해시의 dHash 해밍 거리 (다른 비트 수)
+
+    Args:
+        hash_a: compute_image_hash 결과
+        hash_b: compute_image_hash 결과
+
+    Returns:
+        int: 0(같은 사진) ~ 64
+    """
+    return bin(_split_hash(hash_a)[0] ^ _split_hash(hash_b)[0]).count("1")
+
+
+def is_near_duplicate(hash_a: str, hash_b: str, max_distance: int) -> bool:
+    """
+    두 해시가 거의 같은 사진인지 확인 (해밍 거리가 max_distance 이내이고 평균 색상이 비슷함)
+
+    Args:
+        hash_a: compute_image_hash 결과
+        hash_b: compute_image_hash 결과
+        max_distance: 거의 같은 사진으로 볼 최대 해밍 거리
+
+    Returns:
+        bool: 거의 같은 사진이면 True
+    """
+    dhash_a, color_a = _split_hash(hash_a)
+    dhash_b, color_b = _split_hash(hash_b)
+    return bin(dhash_a ^ dhash_b).count("1") <= max_distance and int(np.abs(color_a - color_b).max()) <= COLOR_TOLERANCE
+
+
+def find_near_duplicate(
+    db: Session,
+    user_id: int,
+    category: str,
+    image_hash: str,
+    max_distance: int
+) -> Optional[Tuple[ClosetItem, int]]:
+    """
+    사용자 옷장(같은 카테고리, 분석이 끝난 아이템)에서 거의 같은 사진 중 해시가 가장 가까운 아이템 찾기
+
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        category: 카테고리
+        image_hash: 업로드 이미지의 compute_image_hash 결과
+        max_distance: 거의 같은 사진으로 볼 최대 해밍 거리
+
+    Returns:
+        Optional[Tuple[ClosetItem, int]]: (가장 가까운 아이템, 해밍 거리)
+        - 해밍 거리가 max_distance 이내이고 평균 색상이 비슷한 아이템이 없으면 None
+    """
+    rows = db.query(ClosetItem.id, ClosetItem.image_hash).filter(
+        ClosetItem.user_id == user_id,
+        ClosetItem.category == category,
+        ClosetItem.image_hash.isnot(None),
+        ClosetItem.image_url.isnot(None),
+        ClosetItem.is_ready()
+    ).all()
+    if not rows:
+        return None
+
+    # 옷장 전체와 한 번에 비교 (dHash는 XOR 후 1인 비트 수, 색상은 채널별 최대 차이)
+    parsed = [_split_hash(row.image_hash) for row in rows]
+    hashes = np.array([dhash for dhash, _ in parsed], dtype=np.uint64)
+    colors = np.stack([color for _, color in parsed])
+    target_hash, target_color = _split_hash(image_hash)
+
+    xor = np.bitwise_xor(hashes, np.uint64(target_hash))
+    distances = np.unpackbits(xor.view(np.uint8)).reshape(len(rows), -1).sum(axis=1)
+    color_diffs = np.abs(colors - target_color).max(axis=1)
+
+    candidates = np.flatnonzero((distances <= max_distance) & (color_diffs <= COLOR_TOLERANCE))
+    if len(candidates) == 0:
+        return None
+
+    best = int(candidates[np.argmin(distances[candidates])])
+    return db.get(ClosetItem, rows[best].id), int(distances[best])
@@ -75,7 +75,8 @@ def update_outfit_item(
     item = db.query(ClosetItem).filter(
         ClosetItem.id == item_id,
         ClosetItem.user_id == user_id,
-        ClosetItem.category == category
+        ClosetItem.category == category,
+        ClosetItem.is_ready()
     ).first()
     
     if not item:
@@ -0,0 +1,188 @@
+"""
+추천 전용 실행기
+- 추천 요청을 FastAPI 기본 스레드풀과 분리된 전용 워커 풀에서 실행
+- 처리 중 + 대기 중인 요청 수를 제한하여 과부하 시 즉시 503 (Retry-After) 응답
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from ..core.config import settings
+from ..core.exceptions import ServiceUnavailableException
+from ..utils.logger import logger
+
+# 대기열이 가득 찼을 때 응답의 Retry-After (초)
+RECOMMEND_OVERLOADED_RETRY_AFTER = 2
+
+RECOMMEND_EXECUTOR_MODES = ("thread", "process")
+
+
+class RecommendExecutor:
+    """
+    추천 전용 bounded 실행기
+
+    요청은 전용 스레드 풀(max_workers개)에서 실행되고, 처리 중인 요청이 max_workers + max_queue개이면
+    새 요청은 기다리지 않고 ServiceUnavailableException(503)으로 거절합니다.
+    process 모드에서는 추천 엔진 계산(call_engine)만 워커 프로세스에서 실행하여 GIL을 피합니다.
+    (DB 조회 등 나머지는 전용 스레드에서 실행)
+    """
+
+    def __init__(self, mode: str, max_workers: int, max_queue: int):
+        if mode not in RECOMMEND_EXECUTOR_MODES:
+            raise ValueError(f"지원하지 않는 추천 실행 방식입니다: {mode} (가능한 값: {', '.join(RECOMMEND_EXECUTOR_MODES)})")
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("max_workers는 1 이상, max_queue는 0 이상이어야 합니다.")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="recommend")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+    def _acquire(self) -> None:
+        """처리 중 + 대기 중 요청 수를 하나 늘림 (가득 차면 503)"""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ServiceUnavailableException(
+                    message="추천 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도하세요.",
+                    detail={"pending": self._pending, "max_workers": self.max_workers, "max_queue": self.max_queue},
+                    retry_after=RECOMMEND_OVERLOADED_RETRY_AFTER
+                )
+            self._pending += 1
+
+    def _release(self, _future: Optional[Future] = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        함수를 전용 스레드 풀에서 실행하고 결과를 기다림
+
+        Args:
+            func: 실행할 함수
+            *args: 함수 인자
+
+        Returns:
+            Any: 함수의 반환값 (함수에서 발생한 예외는 그대로 전달)
+
+        Raises:
+            ServiceUnavailableException: 처리 중 + 대기 중 요청이 가득 찬 경우
+        """
+        self._acquire()
+        try:
+            future = self._threads.submit(func, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def call_engine(self, func: Callable[..., Any], model_loader, **kwargs: Any) -> Any:
+        """
+        추천 엔진 함수를 실행 (process 모드이면 워커 프로세스에서 같은 모델 버전으로 실행)
+
+        pickle로 로드한 모델(서빙 번들 없음)은 워커 프로세스에서 같은 모델을 열 수 없으므로 현재 스레드에서 실행합니다.
+
+        Args:
+            func: ai_recommendation.recommendation_engine의 추천 함수 (model_loader 인자를 받음)
+            model_loader: 현재 모델 로더
+            **kwargs: model_loader를 제외한 함수 인자
+
+        Returns:
+            Any: 추천 함수의 반환값
+        """
+        if self.mode != "process" or model_loader.source != "bundle" or model_loader.bundle_dir is None:
+            return func(model_loader=model_loader, **kwargs)
+
+        # 워커는 버전 이름으로 찾지 않고 현재 로더가 연 번들 디렉토리를 그대로 로드 (CURRENT가 없는 models/serving/ 포함)
+        from ai_recommendation.recommendation_engine import run_with_model_version
+        future = self._get_process_pool().submit(
+            run_with_model_version,
+            func,
+            model_loader.bundle_dir,
+            model_loader.get_model_version(),
+            kwargs
+        )
+        return future.result()
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """워커 프로세스 풀을 처음 사용할 때 생성 (스레드가 있는 프로세스를 fork하지 않도록 spawn 사용)"""
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._processes
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        실행기 상태를 반환
+
+        Returns:
+            Dict[str, Any]: {"mode", "max_workers", "max_queue", "pending", "rejected"}
+        """
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        워커 스레드와 프로세스를 종료
+
+        Args:
+            wait: 실행 중인 요청이 끝날 때까지 기다릴지 여부
+        """
+        self._threads.shutdown(wait=wait)
+        with self._lock:
+            processes, self._processes = self._processes, None
+        if processes is not None:
+            processes.shutdown(wait=wait)
+
+
+_recommend_executor: Optional[RecommendExecutor] = None
+_recommend_executor_lock = threading.Lock()
+
+
+def get_recommend_executor() -> RecommendExecutor:
+    """
+    Settings(RECOMMEND_EXECUTOR, RECOMMEND_MAX_WORKERS, RECOMMEND_MAX_QUEUE)로 만든 추천 실행기를 반환
+    (처음 호출할 때 생성)
+
+    Returns:
+        RecommendExecutor: 추천 실행기
+    """
+    global _recommend_executor
+    if _recommend_executor is None:
+        with _recommend_executor_lock:
+            if _recommend_executor is None:
+                _recommend_executor = RecommendExecutor(
+                    settings.RECOMMEND_EXECUTOR,
+                    settings.RECOMMEND_MAX_WORKERS,
+                    settings.RECOMMEND_MAX_QUEUE
+                )
+                logger.info(
+                    f"추천 실행기 생성: {settings.RECOMMEND_EXECUTOR} "
+                    f"(워커 {settings.RECOMMEND_MAX_WORKERS}개, 대기 {settings.RECOMMEND_MAX_QUEUE}개)"
+                )
+    return _recommend_executor
+
+
+def shutdown_recommend_executor() -> None:
+    """추천 실행기를 종료 (서버 종료 시 호출, 다음 get_recommend_executor 호출 시 다시 생성)"""
+    global _recommend_executor
+    with _recommend_executor_lock:
+        executor, _recommend_executor = _recommend_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -0,0 +1,160 @@
+"""
+추천 결과 캐시
+- (사용자, 옷장 버전, 선택된 아이템, 모델 버전, k)별 추천 결과를 TTL과 함께 메모리에 보관
+- 옷장 변경(옷장 버전 증가)과 모델 교체(모델 버전 변경) 시 무효화
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from ..core.config import settings
+
+# 캐시 키: (user_id, closet_version, 선택된 아이템, model_version, k)
+ResultCacheKey = Tuple[int, int, Tuple[Tuple[str, int], ...], Optional[str], Optional[int]]
+
+
+class RecommendationResultCache:
+    """
+    추천 결과 LRU + TTL 캐시 (스레드 안전)
+
+    모델 버전이 바뀐 키로 조회하면 이전 모델 버전의 결과를 모두 제거하고,
+    현재 모델 버전과 다른 결과(교체 전 모델로 계산 중이던 요청)는 저장하지 않습니다.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[ResultCacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._model_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(
+        user_id: int,
+        closet_version: int,
+        existing_items: Dict[str, int],
+        model_version: Optional[str],
+        k: Optional[int] = None
+    ) -> ResultCacheKey:
+        """
+        캐시 키를 만드는 함수
+
+        Args:
+            user_id: 사용자 ID
+            closet_version: 추천 입력을 읽기 전에 조회한 옷장 버전
+            existing_items: 이미 선택된 아이템 (예: {"bottom": 2})
+            model_version: 추천 모델 버전
+            k: 코디 조합 탐색의 코디 수 (카테고리별 추천이면 None)
+
+        Returns:
+            ResultCacheKey: 캐시 키
+        """
+        pinned = tuple(sorted((category, item_id) for category, item_id in existing_items.items() if item_id))
+        return (user_id, closet_version, pinned, model_version, k)
+
+    def get(self, key: ResultCacheKey) -> Optional[Any]:
+        """
+        캐시된 추천 결과를 반환
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            Optional[Any]: 추천 결과 사본 (없거나 만료되었으면 None)
+        """
+        with self._lock:
+            self._purge_other_models(key[3])
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+        return copy.deepcopy(value)
+
+    def put(self, key: ResultCacheKey, value: Any) -> None:
+        """
+        추천 결과를 저장 (max_size를 넘으면 가장 오래 사용하지 않은 결과부터 제거)
+
+        Args:
+            key: 캐시 키
+            value: 추천 결과
+        """
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            if self._model_version is not None and key[3] != self._model_version:
+                return
+            self._model_version = key[3]
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        사용자의 추천 결과를 모두 제거
+
+        Args:
+            user_id: 사용자 ID
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """모든 결과와 통계를 제거"""
+        with self._lock:
+            self._entries.clear()
+            self._model_version = None
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계를 반환
+
+        Returns:
+            Dict[str, Any]: {"size", "max_size", "ttl_seconds", "hits", "misses", "evictions", "expirations"}
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def _purge_other_models(self, model_version: Optional[str]) -> None:
+        """모델이 교체되었으면 이전 모델 버전의 결과를 모두 제거 (lock을 잡은 상태에서 호출)"""
+        if model_version == self._model_version:
+            return
+        if self._model_version is not None:
+            self._entries.clear()
+        self._model_version = model_version
+
+
+# 프로세스 전역 추천 결과 캐시
+recommendation_cache = RecommendationResultCache(
+    settings.RECOMMENDATION_CACHE_SIZE,
+    settings.RECOMMENDATION_CACHE_TTL_SECONDS
+)
@@ -1,10 +1,12 @@
-from fastapi import Depends
+import hmac
+from fastapi import Depends, Header
 from sqlalchemy.orm import Session
-from typing import Dict
+from typing import Dict, Optional
+from ..core.config import settings
 from ..core.database import get_db
 from ..utils.auth_firebase import verify_firebase_auth
 from ..models.user import User
-from ..core.exceptions import NotFoundException
+from ..core.exceptions import NotFoundException, UnauthorizedException
 from ..utils.logger import logger
 
 
@@ -81,3 +83,29 @@ def get_current_user(
             )
     
     return user
+
+
+def verify_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    관리자 API 토큰 검증 의존성 함수
+    
+    X-Admin-Token 헤더가 설정의 ADMIN_TOKEN과 같아야 합니다.
+    ADMIN_TOKEN이 설정되지 않았으면 관리자 API를 사용할 수 없습니다.
+    
+    Args:
+        x_admin_token: X-Admin-Token 헤더 값
+    
+    Raises:
+        UnauthorizedException: 관리자 API가 비활성화되었거나 토큰이 올바르지 않은 경우
+    """
+    if not settings.ADMIN_TOKEN:
+        raise UnauthorizedException(
+            message="관리자 API가 비활성화되어 있습니다.",
+            detail={"setting": "ADMIN_TOKEN"}
+        )
+    
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise UnauthorizedException(
+            message="유효하지 않은 관리자 토큰입니다.",
+            detail={"header": "X-Admin-Token"}
+        )
@@ -0,0 +1,113 @@
+"""
+코디 검색 IVF 인덱스 벤치마크
+전체 스캔(find_best_match의 기존 방식)과 IVF 인덱스의 recall@k, 지연 시간(p50/p99)을 비교합니다.
+
+코디 데이터가 늘어난 상황을 보기 위해 --scale N으로 학습된 코디 벡터에 잡음을 더해 N배로 늘릴 수 있습니다.
+
+사용법:
+    python scripts/benchmark_ann_index.py [--scale 10] [--queries 500] [--k 10] [--nprobe 1 4 16 64]
+
+사전 조건: ai_recommendation/train_model.py로 모델을 학습해 두어야 합니다.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_recommendation.model_loader import ModelLoader
+from ai_recommendation.ann_index import build_ivf_index, default_nlist
+from ai_recommendation.recommendation_engine import normalize_rows
+
+
+def add_noise(vectors: np.ndarray, relative_norm: float, rng: np.random.Generator) -> np.ndarray:
+    """단위 벡터에 norm이 약 relative_norm인 잡음을 더합니다."""
+    sigma = relative_norm / np.sqrt(vectors.shape[1])
+    return vectors + rng.normal(scale=sigma, size=vectors.shape).astype(np.float32)
+
+
+def scaled_corpus(coord_matrix: np.ndarray, scale: int, rng: np.random.Generator) -> np.ndarray:
+    """코디 벡터에 잡음을 더해 scale배로 늘린 정규화 행렬을 만듭니다."""
+    if scale <= 1:
+        return np.ascontiguousarray(coord_matrix, dtype=np.float32)
+    copies = [coord_matrix]
+    for _ in range(scale - 1):
+        copies.append(add_noise(coord_matrix, 0.2, rng))
+    return np.ascontiguousarray(normalize_rows(np.concatenate(copies)))
+
+
+def percentile_ms(latencies: list, q: float) -> float:
+    return float(np.percentile(latencies, q) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="코디 검색 IVF 인덱스 벤치마크")
+    parser.add_argument("--scale", type=int, default=1, help="코디 데이터 배수 (잡음을 더해 복제)")
+    parser.add_argument("--queries", type=int, default=500, help="쿼리 수")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--nlist", type=int, default=None, help="클러스터 수 (기본: 약 4 * sqrt(n))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64], help="비교할 nprobe 값")
+    args = parser.parse_args()
+
+    loader = ModelLoader()
+    if not loader.load():
+        print("모델을 로드할 수 없습니다. train_model.py를 먼저 실행하세요.")
+        return
+
+    rng = np.random.default_rng(0)
+    corpus = scaled_corpus(np.asarray(loader.get_coord_matrix()), args.scale, rng)
+    nlist = args.nlist or default_nlist(len(corpus))
+
+    start = time.perf_counter()
+    index = build_ivf_index(corpus, nlist=nlist)
+    build_s = time.perf_counter() - start
+
+    # 쿼리: 코디 벡터 근처의 벡터 (실제 추천의 타겟 벡터처럼 데이터 분포 안쪽)
+    queries = corpus[rng.choice(len(corpus), args.queries)]
+    queries = add_noise(queries, 0.3, rng)
+
+    # 전체 스캔 (정답)
+    exact_top = []
+    exact_latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        scores = corpus @ (query / np.linalg.norm(query))
+        top = np.argpartition(-scores, args.k - 1)[:args.k]
+        top = top[np.lexsort((top, -scores[top]))]
+        exact_latencies.append(time.perf_counter() - start)
+        exact_top.append(top)
+
+    print("=" * 78)
+    print(f"코디 {len(corpus):,}개 (x{args.scale}), dim {corpus.shape[1]}, nlist {index.nlist}, "
+          f"인덱스 생성 {build_s:.2f}s, 쿼리 {args.queries}개")
+    print("-" * 78)
+    print(f"{'방식':<16} {'recall@1':>10} {f'recall@{args.k}':>10} {'p50(ms)':>10} {'p99(ms)':>10} {'스캔 비율':>10}")
+    print("-" * 78)
+    print(f"{'exact scan':<16} {1.0:>10.3f} {1.0:>10.3f} "
+          f"{percentile_ms(exact_latencies, 50):>10.3f} {percentile_ms(exact_latencies, 99):>10.3f} {1.0:>10.3f}")
+
+    for nprobe in args.nprobe:
+        if nprobe > index.nlist:
+            continue
+        hits_1 = 0
+        hits_k = 0
+        latencies = []
+        for query, expected in zip(queries, exact_top):
+            start = time.perf_counter()
+            ids, _ = index.search(query, k=args.k, nprobe=nprobe)
+            latencies.append(time.perf_counter() - start)
+            hits_1 += int(len(ids) > 0 and ids[0] == expected[0])
+            hits_k += len(np.intersect1d(ids, expected))
+        scanned = nprobe / index.nlist
+        print(f"{f'ivf nprobe={nprobe}':<16} {hits_1 / args.queries:>10.3f} {hits_k / (args.queries * args.k):>10.3f} "
+              f"{percentile_ms(latencies, 50):>10.3f} {percentile_ms(latencies, 99):>10.3f} {scanned:>10.3f}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+AI 추천 서빙 시작 시간 벤치마크
+새 Python 프로세스에서 추천 엔진 import + 모델 로드에 걸리는 시간과 메모리를 비교합니다.
+
+- bundle: NumPy만 사용하는 서빙 경로 (models/serving/ 번들을 메모리 매핑으로 로드)
+- pickle: 기존 경로 (gensim/pandas/scikit-learn import + pickle 로드)
+
+사용법:
+    python scripts/benchmark_serving_startup.py [--repeat 5]
+
+사전 조건: ai_recommendation/train_model.py로 모델과 서빙 번들을 학습해 두어야 합니다.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# 프로젝트 루트
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("gensim", "pandas", "sklearn", "scipy")
+
+# 각 경로를 새 프로세스에서 한 번 실행하는 코드 (결과는 JSON 한 줄로 출력)
+RUNNER = """
+import json, resource, sys, time
+start = time.perf_counter()
+if {legacy}:
+    import pandas, gensim, sklearn
+from ai_recommendation.model_loader import ModelLoader
+import ai_recommendation.recommendation_engine
+imported = time.perf_counter()
+loader = ModelLoader()
+if {legacy}:
+    loader._load_pickle_artifacts()
+    loader._build_feature_tables()
+    loader._build_centroids()
+    ok = True
+else:
+    ok = loader.load()
+loaded = time.perf_counter()
+print(json.dumps({{
+    "ok": ok,
+    "source": loader.source,
+    "import_s": imported - start,
+    "load_s": loaded - imported,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": [m for m in {heavy} if m in sys.modules],
+}}))
+"""
+
+
+def run_once(legacy: bool) -> dict:
+    """
+    새 프로세스에서 import + 로드를 한 번 실행합니다.
+
+    Args:
+        legacy: True면 기존 pickle 경로, False면 서빙 번들 경로
+
+    Returns:
+        dict: 측정 결과
+    """
+    code = RUNNER.format(legacy=legacy, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 추천 서빙 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="경로별 반복 횟수 (중앙값 출력)")
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"{'경로':<8} {'import(s)':>10} {'load(s)':>10} {'합계(s)':>10} {'RSS(MB)':>10}  무거운 모듈")
+    print("-" * 72)
+    for name, legacy in (("bundle", False), ("pickle", True)):
+        results = [run_once(legacy) for _ in range(args.repeat)]
+        if not all(result["ok"] for result in results) or results[0]["source"] != name:
+            print(f"{name:<8} 실패: 모델/서빙 번들이 없습니다. train_model.py를 먼저 실행하세요.")
+            continue
+        import_s = statistics.median(result["import_s"] for result in results)
+        load_s = statistics.median(result["load_s"] for result in results)
+        rss = statistics.median(result["max_rss_mb"] for result in results)
+        heavy = ", ".join(results[0]["heavy_modules"]) or "-"
+        print(f"{name:<8} {import_s:>10.3f} {load_s:>10.3f} {import_s + load_s:>10.3f} {rss:>10.1f}  {heavy}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
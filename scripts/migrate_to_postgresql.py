@@ -10,7 +10,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.database import engine, Base
-from app.models import User, ClosetItem, TodayOutfit, FavoriteOutfit
+from app.models import User, ClosetItem, TodayOutfit, FavoriteOutfit, SuggestedOutfit
 from app.core.config import settings
 from app.utils.logger import logger
 
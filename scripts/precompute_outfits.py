@@ -0,0 +1,61 @@
+"""
+추천 코디 미리 계산 스크립트 (야간 배치)
+활성 사용자의 추천 코디를 일괄 계산해 suggested_outfit 테이블에 저장합니다.
+아침 추천 요청(POST /api/v1/outfit/recommend)은 옷장/선택 아이템/모델이 그대로이면 저장된 결과를 바로 반환합니다.
+
+사용법:
+    python scripts/precompute_outfits.py [--active-days 7] [--all] [--batch-size 256]
+
+cron 예시 (매일 새벽 4시):
+    0 4 * * * cd /path/to/closetmate && python scripts/precompute_outfits.py >> logs/precompute.log 2>&1
+
+사전 조건: ai_recommendation/train_model.py로 모델을 학습해 두어야 합니다.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import engine, Base, SessionLocal
+from app.core.init_db import upgrade_schema
+from app.models import User, ClosetItem, TodayOutfit, FavoriteOutfit, SuggestedOutfit  # 테이블 생성용 import
+from app.services.ai_service import (
+    get_active_user_ids,
+    precompute_suggested_outfits,
+    PRECOMPUTE_BATCH_SIZE
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추천 코디 미리 계산 (야간 배치)")
+    parser.add_argument("--active-days", type=int, default=7, help="최근 N일 안에 오늘의 코디가 바뀐 사용자만 계산")
+    parser.add_argument("--all", action="store_true", help="옷장에 아이템이 있는 모든 사용자 계산")
+    parser.add_argument("--batch-size", type=int, default=PRECOMPUTE_BATCH_SIZE, help="한 번에 계산할 사용자 수")
+    args = parser.parse_args()
+
+    # suggested_outfit 테이블이 없으면 생성
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        user_ids = get_active_user_ids(db, None if args.all else args.active_days)
+        print(f"대상 사용자: {len(user_ids)}명")
+
+        stats = precompute_suggested_outfits(db, user_ids, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(
+            f"완료: 저장 {stats['computed']}명, 건너뜀 {stats['skipped']}명, "
+            f"실패 {stats['failed']}명 ({elapsed:.1f}s)"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@ from app.models.user import User
 from app.models.closet_item import ClosetItem
 from app.models.today_outfit import TodayOutfit
 from app.models.favorite_outfit import FavoriteOutfit
+from app.services.closet_cache import closet_snapshot_cache
+from app.services.recommendation_cache import recommendation_cache
 
 
 # 테스트용 데이터베이스 URL (메모리 DB 사용)
@@ -53,6 +55,19 @@ def test_db() -> Generator[Session, None, None]:
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_recommendation_caches() -> Generator[None, None, None]:
+    """
+    테스트마다 DB를 새로 만들어 같은 사용자 ID·옷장 버전이 재사용되므로
+    이전 테스트의 옷장 스냅샷과 추천 결과가 남지 않도록 캐시를 비우는 fixture
+    """
+    closet_snapshot_cache.clear()
+    recommendation_cache.clear()
+    yield
+    closet_snapshot_cache.clear()
+    recommendation_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def client(test_db: Session) -> Generator[TestClient, None, None]:
     """
@@ -82,6 +97,12 @@ def client(test_db: Session) -> Generator[TestClient, None, None]:
     app.dependency_overrides[get_db] = override_get_db
     
     with TestClient(app) as test_client:
+        # 서버 시작 시 백그라운드에서 시작된 AI 모델 로드가 끝날 때까지 대기
+        try:
+            from ai_recommendation.model_loader import wait_for_model_loader
+            wait_for_model_loader(timeout=120)
+        except ImportError:
+            pass
         yield test_client
     
     # 정리
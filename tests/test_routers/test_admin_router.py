@@ -0,0 +1,92 @@
+"""
+관리자 라우터 테스트
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+ADMIN_TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+def admin_headers(monkeypatch) -> dict:
+    """
+    관리자 토큰을 설정하고 관리자 헤더를 반환하는 fixture
+    
+    Returns:
+        dict: X-Admin-Token 헤더
+    """
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", ADMIN_TOKEN)
+    return {"X-Admin-Token": ADMIN_TOKEN}
+
+
+class TestAdminAuth:
+    """관리자 API 인증 테스트"""
+    
+    def test_admin_disabled_without_token_setting(self, client: TestClient, monkeypatch):
+        """
+        ADMIN_TOKEN이 설정되지 않으면 관리자 API를 사용할 수 없어야 함
+        """
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+        
+        response = client.get("/api/v1/admin/model", headers={"X-Admin-Token": "anything"})
+        
+        assert response.status_code == 401
+    
+    def test_admin_wrong_token(self, client: TestClient, admin_headers: dict):
+        """
+        관리자 토큰이 다르면 401 에러를 반환해야 함
+        """
+        response = client.get("/api/v1/admin/model", headers={"X-Admin-Token": "wrong"})
+        
+        assert response.status_code == 401
+
+
+class TestModelAdmin:
+    """AI 추천 모델 관리 테스트"""
+    
+    def test_get_model_status(self, client: TestClient, admin_headers: dict):
+        """
+        모델 상태 조회 테스트
+        
+        시나리오:
+        1. 관리자 토큰으로 모델 상태 조회
+        2. 200 OK 응답과 상태 필드 확인
+        """
+        response = client.get("/api/v1/admin/model", headers=admin_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["state"] in ("ready", "failed", "not_loaded", "disabled")
+        assert "reloading" in data
+    
+    def test_reload_unknown_version(self, client: TestClient, admin_headers: dict):
+        """
+        존재하지 않는 모델 버전으로 재로드하면 404 에러를 반환해야 함
+        """
+        response = client.post(
+            "/api/v1/admin/model/reload",
+            params={"version": "../not-a-version"},
+            headers=admin_headers
+        )
+        
+        assert response.status_code in (400, 404)
+
+
+class TestCacheAdmin:
+    """추천 캐시 통계 테스트"""
+    
+    def test_get_cache_stats(self, client: TestClient, admin_headers: dict):
+        """
+        옷장 스냅샷 캐시, 추천 결과 캐시, Gemini 분석 결과 캐시의 통계를 반환해야 함
+        """
+        response = client.get("/api/v1/admin/cache", headers=admin_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert {"size", "max_size", "hits", "misses"} <= set(data["closet_snapshot"])
+        assert {"size", "ttl_seconds", "hits", "misses", "evictions", "expirations"} <= set(data["recommendation"])
+        assert {"enabled", "hits", "misses", "hit_rate", "entries", "stored_hits"} <= set(data["image_analysis"])
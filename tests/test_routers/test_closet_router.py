@@ -4,11 +4,30 @@
 
 import pytest
 import os
+import sys
+import threading
+import time
+import asyncio
+from io import BytesIO
 from pathlib import Path
+from types import SimpleNamespace
+import httpx
+import numpy as np
+from PIL import Image
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from starlette.requests import Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.database import Base, get_db
+from app.core.config import settings
+from app.main import app
 from app.models import User, ClosetItem
+from app.services import analysis_queue, gemini_service, storage_service
+from app.services.image_analysis_cache import image_analysis_cache
+from app.services.analysis_queue import AnalysisQueue
+from app.services.storage_service import LocalFileStorage
+from app.utils.auth_firebase import verify_firebase_auth
 
 # 테스트용 이미지 디렉터리 경로
 TEST_IMAGES_DIR = Path(__file__).parent.parent / "fixtures" / "images"
@@ -602,3 +621,529 @@ class TestCreateClosetItemWithRealImage:
             print(f"\n⚠️ 다음 카테고리의 이미지 파일이 없어 스킵되었습니다: {', '.join(skipped_categories)}")
             print(f"   tests/fixtures/images/ 디렉터리에 이미지 파일을 추가하면 테스트가 실행됩니다.")
 
+
+# 동시 업로드 테스트에서 Gemini API 응답 지연 (초)
+GEMINI_DELAY = 0.5
+
+
+class _SlowGeminiModel:
+    """응답까지 GEMINI_DELAY초 걸리는 Gemini 모델 대역 (비동기 호출만 지원)"""
+    
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+    
+    async def generate_content_async(self, contents):
+        await asyncio.sleep(GEMINI_DELAY)
+        return SimpleNamespace(text="category_detail: 반소매 티셔츠, 계절: 여름, 색상: white, 재질: cotton, 스타일: casual")
+
+
+@pytest.fixture
+def upload_session_factory(tmp_path, monkeypatch):
+    """
+    동시 업로드 테스트용 앱 설정 fixture
+    - 요청마다 세션을 여는 파일 SQLite DB (스레드풀에서 여러 요청이 동시에 커밋)
+    - Firebase 인증, Gemini API, 업로드 디렉터리, 분석 결과 캐시 DB를 테스트용으로 교체
+    
+    Yields:
+        sessionmaker: 테스트 DB 세션 팩토리
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'upload.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    # 동시 요청이 사용자를 각자 자동 생성하지 않도록 미리 생성
+    db = SessionLocal()
+    db.add(User(firebase_uid="upload_uid", email="upload@example.com", username="upload_user", gender="남성"))
+    db.commit()
+    db.close()
+    
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[verify_firebase_auth] = lambda: {"firebase_uid": "upload_uid", "email": "upload@example.com"}
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(gemini_service.genai, "GenerativeModel", _SlowGeminiModel)
+    monkeypatch.setattr(storage_service, "_default_storage", LocalFileStorage(str(tmp_path / "uploads")))
+    monkeypatch.setattr(image_analysis_cache, "session_factory", SessionLocal)
+    
+    yield SessionLocal
+    
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+class TestCreateClosetItemConcurrency:
+    """옷 추가 중 이벤트 루프 응답성 테스트"""
+    
+    def test_health_stays_responsive_during_uploads(self, upload_session_factory):
+        """
+        Gemini 분석을 기다리는 업로드가 여러 개 진행 중이어도 가벼운 엔드포인트는 바로 응답해야 하고,
+        업로드끼리도 순서대로가 아니라 동시에 처리되어야 함
+        
+        시나리오:
+        1. Gemini 응답이 GEMINI_DELAY초 걸리는 업로드 4개를 동시에 요청
+        2. 업로드가 끝날 때까지 /health를 반복 요청하여 응답 시간 측정
+        3. /health 응답 시간과 전체 업로드 시간 확인, DB에 4개가 저장되었는지 확인
+        """
+        uploads_count = 4
+        image = Image.new('RGB', (100, 100), color='white')
+        buffer = BytesIO()
+        image.save(buffer, format='JPEG')
+        image_bytes = buffer.getvalue()
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                start = time.perf_counter()
+                uploads = [
+                    asyncio.ensure_future(async_client.post(
+                        "/api/v1/closet/top",
+                        files={"image": ("top.jpg", image_bytes, "image/jpeg")},
+                        headers={"Authorization": "Bearer test-token"}
+                    ))
+                    for _ in range(uploads_count)
+                ]
+                health_latencies = []
+                while not all(upload.done() for upload in uploads):
+                    request_start = time.perf_counter()
+                    response = await async_client.get("/health")
+                    health_latencies.append(time.perf_counter() - request_start)
+                    assert response.status_code == 200
+                    await asyncio.sleep(0.02)
+                upload_elapsed = time.perf_counter() - start
+                return [upload.result() for upload in uploads], health_latencies, upload_elapsed
+        
+        responses, health_latencies, upload_elapsed = asyncio.run(scenario())
+        
+        # Then: 업로드 성공
+        for response in responses:
+            assert response.status_code == 200, response.text
+            assert response.json()["message"] == "추가 완료"
+        
+        # /health는 업로드가 진행되는 동안 여러 번, 빠르게 응답
+        assert len(health_latencies) >= 5
+        assert max(health_latencies) < GEMINI_DELAY / 2
+        
+        # 업로드는 동시에 처리 (순서대로 처리하면 uploads_count * GEMINI_DELAY초 이상)
+        assert upload_elapsed < uploads_count * GEMINI_DELAY / 2
+        
+        db = upload_session_factory()
+        try:
+            items = db.query(ClosetItem).filter(ClosetItem.category == "top").all()
+            assert len(items) == uploads_count
+            assert all(item.image_url is not None for item in items)
+            assert all(item.feature == "상의_white_cotton_반소매 티셔츠_남성_여름_casual" for item in items)
+        finally:
+            db.close()
+
+
+class TestBackgroundUpload:
+    """백그라운드 업로드 및 분석 상태 조회 테스트"""
+    
+    def test_background_upload_returns_202_and_status_long_polls(self, upload_session_factory, monkeypatch):
+        """
+        background=true 업로드는 분석을 기다리지 않고 202와 아이템 ID를 반환하고,
+        상태 조회(wait)는 분석이 끝날 때까지 기다렸다가 feature를 반환해야 함
+        
+        시나리오:
+        1. 분석에 GEMINI_DELAY초 걸리는 분석 큐 시작
+        2. background=true로 업로드 -> 202, status=pending (분석 시간보다 빨리 응답)
+        3. 분석 중에는 목록 조회에 나타나지 않음
+        4. wait로 상태 조회 -> ready와 feature 반환, 목록 조회에 나타남
+        """
+        def analyze(image_path, category, user_gender):
+            time.sleep(GEMINI_DELAY)
+            assert os.path.exists(image_path)
+            return f"상의_white_cotton_반소매 티셔츠_{user_gender}_여름_casual"
+        
+        queue = AnalysisQueue(upload_session_factory, workers=1, max_attempts=1, retry_base_seconds=0, analyze=analyze)
+        queue.start()
+        monkeypatch.setattr(analysis_queue, "_analysis_queue", queue)
+        
+        image = Image.new('RGB', (100, 100), color='white')
+        buffer = BytesIO()
+        image.save(buffer, format='JPEG')
+        headers = {"Authorization": "Bearer test-token"}
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                start = time.perf_counter()
+                accepted = await async_client.post(
+                    "/api/v1/closet/top",
+                    params={"background": "true"},
+                    files={"image": ("top.jpg", buffer.getvalue(), "image/jpeg")},
+                    headers=headers
+                )
+                accepted_elapsed = time.perf_counter() - start
+                listed_while_pending = await async_client.get("/api/v1/closet/top", headers=headers)
+                status_response = await async_client.get(
+                    f"/api/v1/closet/items/{accepted.json()['item_id']}/status",
+                    params={"wait": 5},
+                    headers=headers
+                )
+                listed_after = await async_client.get("/api/v1/closet/top", headers=headers)
+                return accepted, accepted_elapsed, listed_while_pending, status_response, listed_after
+        
+        try:
+            accepted, accepted_elapsed, listed_while_pending, status_response, listed_after = asyncio.run(scenario())
+        finally:
+            assert queue.shutdown(timeout=5)
+        
+        # Then: 분석을 기다리지 않고 202
+        assert accepted.status_code == 202, accepted.text
+        assert accepted.json()["status"] == "pending"
+        assert accepted_elapsed < GEMINI_DELAY
+        assert listed_while_pending.json() == []
+        
+        # long-poll로 분석 결과 확인
+        assert status_response.status_code == 200
+        data = status_response.json()
+        assert data["status"] == "ready"
+        assert data["feature"] == "상의_white_cotton_반소매 티셔츠_남성_여름_casual"
+        assert data["attempts"] == 1
+        assert [item["id"] for item in listed_after.json()] == [accepted.json()["item_id"]]
+    
+    def test_background_upload_failure_removes_saved_image(self, upload_session_factory, monkeypatch, tmp_path):
+        """
+        이미지를 저장한 뒤 분석 작업 추가(또는 커밋)가 실패하면 아이템과 함께 저장한 이미지 파일도 남지 않아야 함
+        """
+        def failing_enqueue(db, item):
+            raise RuntimeError("queue unavailable")
+        
+        # app.routers의 closet_router는 APIRouter 객체이므로 모듈은 sys.modules에서 가져옴
+        monkeypatch.setattr(sys.modules["app.routers.closet_router"], "enqueue_analysis", failing_enqueue)
+        
+        image = Image.new('RGB', (100, 100), color='white')
+        buffer = BytesIO()
+        image.save(buffer, format='JPEG')
+        
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/closet/top",
+            params={"background": "true"},
+            files={"image": ("top.jpg", buffer.getvalue(), "image/jpeg")},
+            headers={"Authorization": "Bearer test-token"}
+        )
+        
+        assert response.status_code == 400
+        assert "queue unavailable" in response.json()["detail"]["message"]
+        assert [path for path in (tmp_path / "uploads").rglob("*") if path.is_file()] == []
+        
+        db = upload_session_factory()
+        try:
+            assert db.query(ClosetItem).count() == 0
+        finally:
+            db.close()
+
+
+class TestNearDuplicateUpload:
+    """거의 같은 사진 업로드 테스트"""
+    
+    def test_near_duplicate_reuses_feature_and_image(self, upload_session_factory, monkeypatch, tmp_path):
+        """
+        크기를 줄여 다시 저장한 같은 사진을 올리면 Gemini를 호출하지 않고 기존 아이템의 feature와 이미지 파일을 재사용해야 하고,
+        이미지 파일은 그 파일을 쓰는 마지막 아이템이 삭제될 때 지워져야 함
+        
+        시나리오:
+        1. 무늬가 있는 사진 업로드 -> Gemini 호출, duplicate_of 없음
+        2. 같은 사진을 줄여 JPEG으로 업로드 -> Gemini 호출 없음, duplicate_of가 첫 아이템
+        3. 첫 아이템 삭제 -> 이미지 파일 유지, 두 번째 아이템 삭제 -> 이미지 파일 삭제
+        """
+        calls = []
+        
+        class _CountingGeminiModel(_SlowGeminiModel):
+            async def generate_content_async(self, contents):
+                calls.append(1)
+                return await super().generate_content_async(contents)
+        
+        monkeypatch.setattr(gemini_service.genai, "GenerativeModel", _CountingGeminiModel)
+        
+        # 무늬가 있는 사진 (단색 사진은 dHash가 모두 0)
+        rng = np.random.default_rng(0)
+        image = Image.fromarray((rng.random((8, 8, 3)) * 255).astype(np.uint8)).resize((400, 300), Image.Resampling.BICUBIC)
+        original, copy = BytesIO(), BytesIO()
+        image.save(original, format="PNG")
+        image.resize((200, 150)).save(copy, format="JPEG", quality=60)
+        headers = {"Authorization": "Bearer test-token"}
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                first = await async_client.post(
+                    "/api/v1/closet/top", files={"image": ("top.png", original.getvalue(), "image/png")}, headers=headers
+                )
+                second = await async_client.post(
+                    "/api/v1/closet/top", files={"image": ("top.jpg", copy.getvalue(), "image/jpeg")}, headers=headers
+                )
+                return first, second
+        
+        first, second = asyncio.run(scenario())
+        
+        assert first.status_code == 200, first.text
+        assert first.json()["duplicate_of"] is None
+        assert second.status_code == 200, second.text
+        assert second.json()["duplicate_of"] == first.json()["item_id"]
+        assert len(calls) == 1
+        
+        db = upload_session_factory()
+        try:
+            first_item = db.get(ClosetItem, first.json()["item_id"])
+            second_item = db.get(ClosetItem, second.json()["item_id"])
+            assert second_item.feature == first_item.feature
+            assert second_item.image_url == first_item.image_url
+            assert second_item.image_hash is not None
+        finally:
+            db.close()
+        
+        client = TestClient(app)
+        assert client.delete(f"/api/v1/closet/{first.json()['item_id']}", headers=headers).status_code == 200
+        assert len(list((tmp_path / "uploads").rglob("*.*"))) == 1
+        assert client.delete(f"/api/v1/closet/{second.json()['item_id']}", headers=headers).status_code == 200
+        assert len(list((tmp_path / "uploads").rglob("*.*"))) == 0
+
+
+class TestBulkUpload:
+    """옷 일괄 추가 테스트"""
+    
+    def test_bulk_upload_analyzes_concurrently_with_limit(self, upload_session_factory, monkeypatch):
+        """
+        여러 이미지를 BULK_UPLOAD_CONCURRENCY개씩 동시에 분석하고, 일부가 실패해도 나머지는 추가하며
+        이미지별 결과를 요청 순서대로 반환해야 함
+        
+        시나리오:
+        1. 동시 분석 수를 2로 제한하고, 서로 다른 이미지 4개 + 이미지가 아닌 파일 + 잘못된 카테고리 이미지를 업로드
+        2. 이미지 4개는 created, 나머지 2개는 failed (오류 메시지 포함)
+        3. 동시에 실행된 Gemini 호출은 최대 2개, 순서대로 처리한 경우보다 빠름
+        """
+        active = []
+        max_active = []
+        
+        class _TrackingGeminiModel(_SlowGeminiModel):
+            async def generate_content_async(self, contents):
+                active.append(1)
+                max_active.append(len(active))
+                try:
+                    return await super().generate_content_async(contents)
+                finally:
+                    active.pop()
+        
+        monkeypatch.setattr(gemini_service.genai, "GenerativeModel", _TrackingGeminiModel)
+        monkeypatch.setattr(settings, "BULK_UPLOAD_CONCURRENCY", 2)
+        
+        def image_bytes(color: str) -> bytes:
+            buffer = BytesIO()
+            Image.new("RGB", (100, 100), color=color).save(buffer, format="PNG")
+            return buffer.getvalue()
+        
+        files = [
+            ("images", ("white.png", image_bytes("white"), "image/png")),
+            ("images", ("black.png", image_bytes("black"), "image/png")),
+            ("images", ("notes.txt", b"not an image", "text/plain")),
+            ("images", ("red.png", image_bytes("red"), "image/png")),
+            ("images", ("blue.png", image_bytes("blue"), "image/png")),
+            ("images", ("green.png", image_bytes("green"), "image/png")),
+        ]
+        categories = ["top", "bottom", "top", "shoes", "outer", "hat"]
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                start = time.perf_counter()
+                response = await async_client.post(
+                    "/api/v1/closet/bulk",
+                    files=files,
+                    data={"categories": categories},
+                    headers={"Authorization": "Bearer test-token"}
+                )
+                return response, time.perf_counter() - start
+        
+        response, elapsed = asyncio.run(scenario())
+        
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["created"] == 4
+        assert data["failed"] == 2
+        assert [item["index"] for item in data["items"]] == list(range(6))
+        assert [item["status"] for item in data["items"]] == ["created", "created", "failed", "created", "created", "failed"]
+        assert data["items"][2]["error"] == "이미지 파일만 업로드 가능합니다."
+        assert data["items"][5]["error"].startswith("잘못된 카테고리입니다.")
+        
+        # 동시 분석 수 제한 (2개씩 2번 = GEMINI_DELAY * 2)
+        assert max(max_active) == 2
+        assert GEMINI_DELAY * 2 <= elapsed < GEMINI_DELAY * 4
+        
+        db = upload_session_factory()
+        try:
+            items = db.query(ClosetItem).order_by(ClosetItem.id).all()
+            assert sorted(item.id for item in items) == sorted(item["item_id"] for item in data["items"] if item["item_id"])
+            assert {item.category for item in items} == {"top", "bottom", "shoes", "outer"}
+            assert all(item.image_url is not None for item in items)
+        finally:
+            db.close()
+    
+    def test_bulk_upload_analyzes_near_duplicates_once(self, upload_session_factory, monkeypatch):
+        """
+        같은 요청 안의 거의 같은 사진은 한 번만 분석하고, 나머지는 먼저 온 사진의 feature와 이미지 파일을 재사용해야 함
+        
+        시나리오:
+        1. 같은 사진 원본, 줄여서 JPEG으로 다시 저장한 사본, 다른 사진을 한 요청으로 동시에 업로드
+        2. Gemini 호출은 2번 (같은 사진 중 한 장, 다른 사진), 나머지 한 장의 duplicate_of는 분석한 아이템
+        """
+        calls = []
+        
+        class _CountingGeminiModel(_SlowGeminiModel):
+            async def generate_content_async(self, contents):
+                calls.append(1)
+                return await super().generate_content_async(contents)
+        
+        monkeypatch.setattr(gemini_service.genai, "GenerativeModel", _CountingGeminiModel)
+        
+        def encode(image: Image.Image, image_format: str, **kwargs) -> bytes:
+            buffer = BytesIO()
+            image.save(buffer, format=image_format, **kwargs)
+            return buffer.getvalue()
+        
+        # 무늬가 있는 사진 (단색 사진은 dHash가 모두 0)
+        images = [
+            Image.fromarray((np.random.default_rng(seed).random((8, 8, 3)) * 255).astype(np.uint8)).resize(
+                (400, 300), Image.Resampling.BICUBIC
+            )
+            for seed in (0, 1)
+        ]
+        files = [
+            ("images", ("top.png", encode(images[0], "PNG"), "image/png")),
+            ("images", ("top_copy.jpg", encode(images[0].resize((200, 150)), "JPEG", quality=60), "image/jpeg")),
+            ("images", ("other.png", encode(images[1], "PNG"), "image/png")),
+        ]
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                return await async_client.post(
+                    "/api/v1/closet/bulk",
+                    files=files,
+                    data={"categories": ["top", "top", "top"]},
+                    headers={"Authorization": "Bearer test-token"}
+                )
+        
+        response = asyncio.run(scenario())
+        
+        assert response.status_code == 200, response.text
+        items = response.json()["items"]
+        assert [item["status"] for item in items] == ["created", "created", "created"]
+        assert len(calls) == 2
+        # 해시는 동시에 계산하므로 둘 중 먼저 잠금을 얻은 사진이 분석되고 나머지가 재사용
+        analyzed, reused = sorted(items[:2], key=lambda item: item["duplicate_of"] is not None)
+        assert analyzed["duplicate_of"] is None
+        assert reused["duplicate_of"] == analyzed["item_id"]
+        assert items[2]["duplicate_of"] is None
+        
+        db = upload_session_factory()
+        try:
+            original = db.get(ClosetItem, analyzed["item_id"])
+            copy = db.get(ClosetItem, reused["item_id"])
+            assert copy.feature == original.feature
+            assert copy.image_url == original.image_url
+        finally:
+            db.close()
+    
+    def test_bulk_upload_hashes_images_outside_db_lock(self, upload_session_factory, monkeypatch):
+        """
+        이미지 해시 계산(디코딩/리사이즈)은 DB 세션 잠금 밖에서 동시 처리 수만큼 함께 실행되어야 함
+        """
+        router_module = sys.modules["app.routers.closet_router"]
+        original_hash = router_module.compute_image_hash
+        active = []
+        max_active = []
+        lock = threading.Lock()
+        
+        def slow_hash(image_bytes):
+            with lock:
+                active.append(1)
+                max_active.append(len(active))
+            try:
+                time.sleep(0.2)
+                return original_hash(image_bytes)
+            finally:
+                with lock:
+                    active.pop()
+        
+        monkeypatch.setattr(router_module, "compute_image_hash", slow_hash)
+        monkeypatch.setattr(settings, "BULK_UPLOAD_CONCURRENCY", 3)
+        
+        def image_bytes(color: str) -> bytes:
+            buffer = BytesIO()
+            Image.new("RGB", (100, 100), color=color).save(buffer, format="PNG")
+            return buffer.getvalue()
+        
+        files = [("images", (f"{color}.png", image_bytes(color), "image/png")) for color in ("white", "black", "red")]
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                return await async_client.post(
+                    "/api/v1/closet/bulk",
+                    files=files,
+                    data={"categories": ["top", "top", "top"]},
+                    headers={"Authorization": "Bearer test-token"}
+                )
+        
+        response = asyncio.run(scenario())
+        
+        assert response.status_code == 200, response.text
+        assert response.json()["created"] == 3
+        assert max(max_active) == 3
+    
+    def test_bulk_upload_rejects_mismatched_categories(self, upload_session_factory):
+        """
+        이미지 수와 카테고리 수가 다르면 400이어야 함
+        """
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/closet/bulk",
+            files=[("images", ("top.png", b"x", "image/png")), ("images", ("bottom.png", b"y", "image/png"))],
+            data={"categories": "top"},
+            headers={"Authorization": "Bearer test-token"}
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["detail"]["message"] == "이미지 수와 카테고리 수가 같아야 합니다."
+    
+    def test_bulk_upload_rejects_too_many_images_while_parsing(self, upload_session_factory, monkeypatch):
+        """
+        BULK_UPLOAD_MAX_ITEMS개를 넘는 이미지는 본문을 모두 파싱하기 전에 400으로 거절하고, 아무것도 저장하지 않아야 함
+        """
+        monkeypatch.setattr(settings, "BULK_UPLOAD_MAX_ITEMS", 2)
+        parsed_files = []
+        
+        original_form = Request.form
+        
+        def tracking_form(self, **kwargs):
+            parsed_files.append(kwargs.get("max_files"))
+            return original_form(self, **kwargs)
+        
+        monkeypatch.setattr(Request, "form", tracking_form)
+        
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/closet/bulk",
+            files=[("images", (f"top{index}.png", b"x", "image/png")) for index in range(3)],
+            data={"categories": "top,top,top"},
+            headers={"Authorization": "Bearer test-token"}
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["detail"]["message"] == "한 번에 최대 2개까지 업로드할 수 있습니다."
+        assert parsed_files == [2]
+        
+        db = upload_session_factory()
+        try:
+            assert db.query(ClosetItem).count() == 0
+        finally:
+            db.close()
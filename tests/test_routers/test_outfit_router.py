@@ -570,6 +570,81 @@ class TestRecommendOutfit:
         # Then: 401 에러 응답
         assert response.status_code == 401
     
+    def test_recommend_outfit_top_k(self, client: TestClient, auth_headers: dict,
+                                    test_user: User, test_closet_items: list[ClosetItem],
+                                    test_db: Session):
+        """
+        상위 k개 코디 추천 테스트
+        
+        시나리오:
+        1. feature 정보가 있는 아이템이 카테고리마다 2개씩 있는 상태
+        2. k=3으로 AI 추천 요청
+        3. 점수 내림차순의 서로 다른 코디 3개 반환 확인
+        4. 첫 번째 코디가 오늘의 코디에 반영되었는지 확인
+        """
+        # When: k=3으로 AI 추천 요청
+        response = client.post("/api/v1/outfit/recommend?k=3", headers=auth_headers)
+        
+        # Then: 서로 다른 코디 3개가 점수 순으로 반환됨
+        assert response.status_code == 200
+        data = response.json()
+        outfits = data["outfits"]
+        assert len(outfits) == 3
+        scores = [outfit["score"] for outfit in outfits]
+        assert scores == sorted(scores, reverse=True)
+        
+        combinations = {
+            tuple((outfit[c] or {}).get("id") for c in ["top", "bottom", "shoes", "outer"])
+            for outfit in outfits
+        }
+        assert len(combinations) == 3
+        
+        # 첫 번째 코디가 응답 본문과 오늘의 코디에 반영됨
+        today_outfit = test_db.query(TodayOutfit).filter(
+            TodayOutfit.user_id == test_user.id
+        ).first()
+        for category in ["top", "bottom", "shoes"]:
+            assert data[category]["id"] == outfits[0][category]["id"]
+            assert getattr(today_outfit, f"{category}_id") == outfits[0][category]["id"]
+    
+    def test_recommend_outfit_fallback_when_model_unavailable(self, client: TestClient, auth_headers: dict,
+                                                             test_user: User, test_closet_items: list[ClosetItem],
+                                                             monkeypatch):
+        """
+        AI 추천 모델을 사용할 수 없으면 속성 기반 추천으로 대체하고 strategy로 알려야 함
+        
+        시나리오:
+        1. 모델 로드 중(503) 상태
+        2. AI 추천 요청
+        3. 200 응답과 strategy == "fallback" 확인
+        """
+        # Given: 모델 로드 중
+        import app.services.ai_service as ai_service
+        from app.core.exceptions import ServiceUnavailableException
+        def warming_up(*args, **kwargs):
+            raise ServiceUnavailableException(message="AI 추천 모델을 준비 중입니다.")
+        monkeypatch.setattr(ai_service, "get_loaded_model_loader", lambda: None)
+        monkeypatch.setattr(ai_service, "_prepare_recommendation", warming_up)
+        
+        # When: AI 추천 요청
+        response = client.post("/api/v1/outfit/recommend", headers=auth_headers)
+        
+        # Then: 속성 기반으로 필수 카테고리가 채워짐
+        assert response.status_code == 200
+        data = response.json()
+        assert data["strategy"] == "fallback"
+        for category in ["top", "bottom", "shoes"]:
+            assert data[category] is not None
+    
+    def test_recommend_outfit_invalid_k(self, client: TestClient, auth_headers: dict,
+                                        test_closet_items: list[ClosetItem]):
+        """
+        잘못된 k 값은 422 에러를 반환해야 함
+        """
+        for k in (0, 1000):
+            response = client.post(f"/api/v1/outfit/recommend?k={k}", headers=auth_headers)
+            assert response.status_code == 422
+    
     def test_recommend_outfit_multiple_times(self, client: TestClient, auth_headers: dict,
                                             test_user: User, test_closet_items: list[ClosetItem],
                                             test_db: Session):
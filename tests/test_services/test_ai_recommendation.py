@@ -5,10 +5,34 @@ AI 추천 서비스 테스트
 
 import pytest
 import os
+import time
+import numpy as np
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from app.models import User, ClosetItem, TodayOutfit
+from app.models import User, ClosetItem, TodayOutfit, SuggestedOutfit
+from app.services.ai_service import (
+    recommend_outfit,
+    recommend_outfits,
+    compute_item_embedding,
+    get_active_user_ids,
+    get_precomputed_outfit,
+    precompute_suggested_outfits,
+    recommend_with_fallback,
+    RECOMMEND_STRATEGY_MODEL,
+    RECOMMEND_STRATEGY_PARTIAL,
+    RECOMMEND_STRATEGY_FALLBACK
+)
+from app.core.exceptions import BadRequestException, ServiceUnavailableException
+from app.services.closet_cache import (
+    ClosetSnapshot,
+    ClosetSnapshotCache,
+    bump_closet_version,
+    closet_snapshot_cache,
+    get_closet_version
+)
+from app.services.recommendation_cache import RecommendationResultCache, recommendation_cache
 
 
 @pytest.fixture(scope="function")
@@ -471,3 +495,628 @@ class TestAIModelAvailability:
         else:
             # 예상치 못한 상태 코드
             pytest.fail(f"예상치 못한 상태 코드: {response.status_code}, 응답: {response.text}")
+
+
+@pytest.mark.skipif(
+    not os.path.exists("ai_recommendation/models/w2v_model.model"),
+    reason="AI 모델 파일이 없습니다. 모델을 학습해야 합니다."
+)
+class TestItemEmbedding:
+    """아이템 embedding 저장 및 재사용 테스트"""
+    
+    @pytest.fixture(autouse=True)
+    def model_loader(self):
+        """추천 서비스가 사용하는 모델 로더를 미리 로드"""
+        from ai_recommendation.model_loader import get_model_loader
+        return get_model_loader()
+    
+    def test_recommend_stores_embeddings(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem],
+        model_loader
+    ):
+        """
+        embedding이 없는 아이템은 추천 시 계산되어 현재 모델 버전과 함께 저장되어야 함
+        """
+        # Given: embedding이 없는 아이템들
+        assert all(item.embedding is None for item in test_closet_items_with_features)
+        
+        # When: 추천 실행
+        recommend_outfit(test_db, test_user.id)
+        
+        # Then: 모든 아이템에 embedding이 저장됨
+        for item in test_closet_items_with_features:
+            test_db.refresh(item)
+            assert item.embedding is not None
+            assert item.embedding_version == model_loader.get_model_version()
+    
+    def test_recommend_recomputes_stale_embedding(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem],
+        model_loader
+    ):
+        """
+        다른 모델 버전으로 만든 embedding은 추천 시 다시 계산되어야 함
+        """
+        # Given: 이전 모델 버전의 잘못된 embedding
+        stale_item = test_closet_items_with_features[0]
+        stale_item.embedding = np.zeros(4, dtype=np.float32).tobytes()
+        stale_item.embedding_version = "old-version"
+        test_db.commit()
+        
+        # When: 추천 실행
+        recommend_outfit(test_db, test_user.id)
+        
+        # Then: 현재 모델로 다시 계산됨
+        test_db.refresh(stale_item)
+        expected, version = compute_item_embedding(stale_item.feature)
+        assert stale_item.embedding_version == model_loader.get_model_version() == version
+        assert stale_item.embedding == expected
+    
+    def test_compute_item_embedding(self, model_loader):
+        """
+        로드된 모델로 float32 bytes embedding과 모델 버전을 반환해야 함
+        """
+        embedding, version = compute_item_embedding("상의_white_cotton_반소매 티셔츠_남성_여름_casual")
+        
+        params = model_loader.get_params()
+        dim = params["w2v_vector_size"] + 2 * params["cf_vector_size"]
+        assert len(embedding) == dim * 4
+        assert version == model_loader.get_model_version()
+
+
+class TestRecommendOutfits:
+    """상위 k개 코디 추천 서비스 테스트"""
+    
+    @pytest.fixture(autouse=True)
+    def model_loader(self):
+        """추천 서비스가 사용하는 모델 로더를 미리 로드"""
+        from ai_recommendation.model_loader import get_model_loader
+        return get_model_loader()
+    
+    def test_recommend_top_k_outfits(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem]
+    ):
+        """
+        점수 내림차순의 서로 다른 코디 k개를 반환하고, 선택된 아이템은 모든 코디에 유지되어야 함
+        """
+        bottom = next(item for item in test_closet_items_with_features if item.category == "bottom")
+        
+        outfits = recommend_outfits(test_db, test_user.id, {"bottom": bottom.id}, k=5)
+        
+        # top 2 x shoes 2 x outer 2 = 8개 조합 중 상위 5개
+        assert len(outfits) == 5
+        assert [o["score"] for o in outfits] == sorted((o["score"] for o in outfits), reverse=True)
+        assert len({(o["top"], o["shoes"], o["outer"]) for o in outfits}) == 5
+        assert all(o["bottom"] == bottom.id for o in outfits)
+        
+        items_by_id = {item.id: item for item in test_closet_items_with_features}
+        for outfit in outfits:
+            for category in ("top", "shoes", "outer"):
+                assert items_by_id[outfit[category]].category == category
+
+
+class TestPrecomputedOutfit:
+    """추천 코디 미리 계산 (야간 배치) 테스트"""
+    
+    @pytest.fixture(autouse=True)
+    def model_loader(self):
+        """추천 서비스가 사용하는 모델 로더를 미리 로드"""
+        from ai_recommendation.model_loader import get_model_loader
+        return get_model_loader()
+    
+    def test_precompute_matches_recommendation(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem]
+    ):
+        """
+        미리 계산한 코디가 저장되고, 요청 시 recommend_outfit과 같은 결과를 반환해야 함
+        """
+        stats = precompute_suggested_outfits(test_db, [test_user.id])
+        
+        assert stats == {"computed": 1, "skipped": 0, "failed": 0}
+        assert test_db.query(SuggestedOutfit).filter(SuggestedOutfit.user_id == test_user.id).count() == 1
+        assert get_precomputed_outfit(test_db, test_user.id, {}) == recommend_outfit(test_db, test_user.id, {})
+    
+    def test_precomputed_outfit_is_invalidated(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem]
+    ):
+        """
+        계산 이후 선택된 아이템이나 옷장 아이템이 바뀌면 저장된 결과를 사용하지 않아야 함
+        """
+        precompute_suggested_outfits(test_db, [test_user.id])
+        bottom = next(item for item in test_closet_items_with_features if item.category == "bottom")
+        
+        # 선택된 아이템이 다르면 사용하지 않음
+        assert get_precomputed_outfit(test_db, test_user.id, {"bottom": bottom.id}) is None
+        
+        # 옷장 아이템이 추가되면(옷장 버전이 올라가면) 사용하지 않음
+        test_db.add(ClosetItem(
+            user_id=test_user.id,
+            category="top",
+            feature="상의_gray_wool_니트/스웨터_남성_겨울_casual"
+        ))
+        bump_closet_version(test_db, test_user.id)
+        test_db.commit()
+        assert get_precomputed_outfit(test_db, test_user.id, {}) is None
+    
+    def test_precomputed_outfit_is_validated_without_item_scan(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem],
+        monkeypatch
+    ):
+        """
+        저장된 코디는 옷장 버전과 로드된 모델 버전으로 확인하고, 옷장 아이템 행이나 models/CURRENT는 다시 읽지 않아야 함
+        """
+        import ai_recommendation.model_loader as model_loader_module
+        
+        precompute_suggested_outfits(test_db, [test_user.id])
+        
+        def fail_read_current_version(model_dir):
+            raise AssertionError("모델이 로드되어 있으면 CURRENT를 읽지 않아야 함")
+        
+        monkeypatch.setattr(model_loader_module, "read_current_version", fail_read_current_version)
+        suggested = test_db.query(SuggestedOutfit).filter(SuggestedOutfit.user_id == test_user.id).one()
+        assert suggested.closet_version == get_closet_version(test_db, test_user.id)
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = test_db.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert get_precomputed_outfit(test_db, test_user.id, {}) is not None
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert not any("FROM closet_items" in statement for statement in statements)
+    
+    def test_precompute_skips_empty_closet_and_selects_active_users(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem]
+    ):
+        """
+        옷장이 빈 사용자는 건너뛰고, 활성 사용자는 최근 오늘의 코디 변경 기준으로 선택되어야 함
+        """
+        assert precompute_suggested_outfits(test_db, [test_user.id + 1000]) == {
+            "computed": 0, "skipped": 1, "failed": 0
+        }
+        
+        assert get_active_user_ids(test_db) == [test_user.id]
+        assert get_active_user_ids(test_db, active_days=7) == []
+        
+        test_db.add(TodayOutfit(user_id=test_user.id))
+        test_db.commit()
+        assert get_active_user_ids(test_db, active_days=7) == [test_user.id]
+
+
+@pytest.mark.skipif(
+    not os.path.exists("ai_recommendation/models/w2v_model.model"),
+    reason="AI 모델 파일이 없습니다. 모델을 학습해야 합니다."
+)
+class TestClosetSnapshotCache:
+    """사용자별 옷장 스냅샷 캐시 테스트"""
+    
+    @pytest.fixture(autouse=True)
+    def model_loader(self):
+        """추천 서비스가 사용하는 모델 로더를 미리 로드"""
+        from ai_recommendation.model_loader import get_model_loader
+        return get_model_loader()
+    
+    def test_repeat_recommendation_uses_snapshot(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem],
+        monkeypatch
+    ):
+        """
+        옷장이 그대로이면 두 번째 추천은 아이템 조회와 벡터 계산 없이 같은 결과를 반환해야 함
+        """
+        first = recommend_outfit(test_db, test_user.id)
+        assert closet_snapshot_cache.stats()["misses"] == 1
+        
+        # 스냅샷을 사용하면 아이템 벡터를 다시 계산하지 않음
+        import app.services.ai_service as ai_service
+        def fail(*args, **kwargs):
+            raise AssertionError("캐시된 스냅샷이 있으면 호출되지 않아야 함")
+        monkeypatch.setattr(ai_service, "_build_closet_snapshot", fail)
+        recommendation_cache.clear()
+        
+        second = recommend_outfit(test_db, test_user.id)
+        
+        assert second == first
+        assert closet_snapshot_cache.stats()["hits"] == 1
+    
+    def test_snapshot_contents(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem],
+        model_loader
+    ):
+        """
+        스냅샷은 아이템 ID, 카테고리 코드, embedding 행렬을 읽기 전용 NumPy 배열로 가져야 함
+        """
+        recommend_outfit(test_db, test_user.id)
+        
+        snapshot = closet_snapshot_cache.get(test_user.id, 0, model_loader.get_model_version())
+        assert snapshot is not None
+        assert snapshot.item_ids.tolist() == sorted(item.id for item in test_closet_items_with_features)
+        assert snapshot.embeddings.shape == (len(test_closet_items_with_features), model_loader.get_params()["w2v_vector_size"] + 2 * model_loader.get_params()["cf_vector_size"])
+        assert snapshot.embeddings.dtype == np.float32
+        top_ids = {item.id for item in test_closet_items_with_features if item.category == "top"}
+        assert set(snapshot.item_ids[snapshot.rows_for("top")].tolist()) == top_ids
+        with pytest.raises(ValueError):
+            snapshot.embeddings[0, 0] = 1.0
+    
+    def test_bump_closet_version_invalidates_snapshot(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem]
+    ):
+        """
+        아이템 추가 시 옷장 버전이 올라가면 새 아이템이 포함된 스냅샷을 다시 만들어야 함
+        """
+        bottom = next(item for item in test_closet_items_with_features if item.category == "bottom")
+        recommend_outfit(test_db, test_user.id, {"bottom": bottom.id})
+        
+        # Given: 옷장 라우터와 같은 방식으로 아이템 추가 + 옷장 버전 증가
+        new_item = ClosetItem(
+            user_id=test_user.id,
+            category="bottom",
+            feature="하의_black_polyester_슬랙스_남성_사계절_minimal"
+        )
+        test_db.add(new_item)
+        bump_closet_version(test_db, test_user.id)
+        test_db.commit()
+        test_db.refresh(test_user)
+        assert test_user.closet_version == 1
+        
+        # When: 새 아이템을 선택한 상태로 추천
+        result = recommend_outfit(test_db, test_user.id, {"bottom": new_item.id})
+        
+        # Then: 새 스냅샷에서 선택한 아이템을 찾음
+        assert result["bottom"] == new_item.id
+        assert closet_snapshot_cache.stats()["misses"] == 2
+    
+    def test_model_version_change_misses(self, model_loader):
+        """
+        모델 버전이나 옷장 버전이 다르면 캐시 미스여야 함
+        """
+        cache = ClosetSnapshotCache(max_size=4)
+        snapshot = ClosetSnapshot(
+            closet_version=3,
+            model_version="v1",
+            item_ids=np.array([1], dtype=np.int64),
+            category_codes=np.array([0], dtype=np.int8),
+            features=["상의_white_cotton_반소매 티셔츠_남성_여름_casual"],
+            embeddings=np.zeros((1, 4), dtype=np.float32)
+        )
+        cache.put(7, snapshot)
+        
+        assert cache.get(7, 3, "v1") is snapshot
+        assert cache.get(7, 3, "v2") is None
+        assert cache.get(7, 4, "v1") is None
+        assert cache.stats() == {"size": 1, "max_size": 4, "hits": 1, "misses": 2}
+    
+    def test_lru_eviction(self):
+        """
+        max_size를 넘으면 가장 오래 사용하지 않은 사용자의 스냅샷부터 제거해야 함
+        """
+        cache = ClosetSnapshotCache(max_size=2)
+        def make_snapshot():
+            return ClosetSnapshot(
+                closet_version=0,
+                model_version="v1",
+                item_ids=np.zeros(0, dtype=np.int64),
+                category_codes=np.zeros(0, dtype=np.int8),
+                features=[],
+                embeddings=np.zeros((0, 4), dtype=np.float32)
+            )
+        
+        cache.put(1, make_snapshot())
+        cache.put(2, make_snapshot())
+        cache.get(1, 0, "v1")  # 1을 최근 사용으로 갱신
+        cache.put(3, make_snapshot())
+        
+        assert cache.get(2, 0, "v1") is None
+        assert cache.get(1, 0, "v1") is not None
+        assert cache.get(3, 0, "v1") is not None
+
+
+@pytest.mark.skipif(
+    not os.path.exists("ai_recommendation/models/w2v_model.model"),
+    reason="AI 모델 파일이 없습니다. 모델을 학습해야 합니다."
+)
+class TestRecommendationResultCache:
+    """추천 결과 캐시 테스트"""
+    
+    @pytest.fixture(autouse=True)
+    def model_loader(self):
+        """추천 서비스가 사용하는 모델 로더를 미리 로드"""
+        from ai_recommendation.model_loader import get_model_loader
+        return get_model_loader()
+    
+    def test_repeat_recommendation_is_cached(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem],
+        monkeypatch
+    ):
+        """
+        같은 옷장과 선택 아이템으로 다시 추천하면 추천 엔진을 실행하지 않고 같은 결과를 반환해야 함
+        """
+        bottom = next(item for item in test_closet_items_with_features if item.category == "bottom")
+        first = recommend_outfit(test_db, test_user.id, {"bottom": bottom.id})
+        first_outfits = recommend_outfits(test_db, test_user.id, {"bottom": bottom.id}, k=3)
+        
+        import app.services.ai_service as ai_service
+        def fail(*args, **kwargs):
+            raise AssertionError("캐시된 결과가 있으면 호출되지 않아야 함")
+        monkeypatch.setattr(ai_service, "_prepare_recommendation", fail)
+        
+        assert recommend_outfit(test_db, test_user.id, {"bottom": bottom.id}) == first
+        assert recommend_outfits(test_db, test_user.id, {"bottom": bottom.id}, k=3) == first_outfits
+        stats = recommendation_cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 2
+    
+    def test_different_pinned_items_miss(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem]
+    ):
+        """
+        선택된 아이템이 다르면 캐시 미스여야 함
+        """
+        bottoms = [item for item in test_closet_items_with_features if item.category == "bottom"]
+        
+        recommend_outfit(test_db, test_user.id, {"bottom": bottoms[0].id})
+        result = recommend_outfit(test_db, test_user.id, {"bottom": bottoms[1].id})
+        
+        assert result["bottom"] == bottoms[1].id
+        assert recommendation_cache.stats()["hits"] == 0
+    
+    def test_closet_mutation_invalidates(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem]
+    ):
+        """
+        옷장 버전이 올라가면 이전 추천 결과를 사용하지 않아야 함
+        """
+        recommend_outfit(test_db, test_user.id)
+        assert recommendation_cache.stats()["size"] == 1
+        
+        # 옷장 라우터와 같은 방식으로 아이템 삭제 + 옷장 버전 증가
+        removed = next(item for item in test_closet_items_with_features if item.category == "top")
+        test_db.delete(removed)
+        bump_closet_version(test_db, test_user.id)
+        test_db.commit()
+        assert recommendation_cache.stats()["size"] == 0
+        
+        result = recommend_outfit(test_db, test_user.id)
+        
+        assert result["top"] != removed.id
+        assert recommendation_cache.stats()["hits"] == 0
+    
+    def test_model_swap_purges_old_results(self):
+        """
+        새 모델 버전으로 조회하면 이전 모델의 결과를 제거하고, 이전 모델로 계산한 결과는 저장하지 않아야 함
+        """
+        cache = RecommendationResultCache(max_size=8, ttl_seconds=60)
+        old_key = cache.make_key(1, 0, {"bottom": 2}, "v1")
+        cache.put(old_key, {"top": 1})
+        assert cache.get(old_key) == {"top": 1}
+        
+        new_key = cache.make_key(1, 0, {"bottom": 2}, "v2")
+        assert cache.get(new_key) is None
+        assert cache.stats()["size"] == 0
+        
+        # 교체 전 모델로 계산 중이던 요청의 결과는 무시
+        cache.put(old_key, {"top": 1})
+        assert cache.stats()["size"] == 0
+        cache.put(new_key, {"top": 5})
+        assert cache.get(new_key) == {"top": 5}
+    
+    def test_ttl_and_size_bound(self):
+        """
+        TTL이 지난 결과는 만료되고, max_size를 넘으면 가장 오래 사용하지 않은 결과부터 제거되어야 함
+        """
+        now = [0.0]
+        cache = RecommendationResultCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+        keys = [cache.make_key(user_id, 0, {}, "v1") for user_id in (1, 2, 3)]
+        
+        cache.put(keys[0], {"top": 1})
+        cache.put(keys[1], {"top": 2})
+        cache.get(keys[0])  # 1번을 최근 사용으로 갱신
+        cache.put(keys[2], {"top": 3})
+        
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == {"top": 1}
+        assert cache.stats()["evictions"] == 1
+        
+        now[0] = 11.0
+        assert cache.get(keys[2]) is None
+        assert cache.stats()["expirations"] == 1
+    
+    def test_cached_result_is_a_copy(self):
+        """
+        반환된 결과를 수정해도 캐시된 결과는 바뀌지 않아야 함
+        """
+        cache = RecommendationResultCache(max_size=2, ttl_seconds=60)
+        key = cache.make_key(1, 0, {}, "v1")
+        cache.put(key, [{"top": 1, "score": 1.0}])
+        
+        cache.get(key)[0]["top"] = 99
+        
+        assert cache.get(key) == [{"top": 1, "score": 1.0}]
+
+
+@pytest.mark.skipif(
+    not os.path.exists("ai_recommendation/models/w2v_model.model"),
+    reason="AI 모델 파일이 없습니다. 모델을 학습해야 합니다."
+)
+class TestRecommendWithFallback:
+    """시간 예산과 대체 추천 테스트"""
+    
+    @pytest.fixture(autouse=True)
+    def model_loader(self):
+        """추천 서비스가 사용하는 모델 로더를 미리 로드"""
+        from ai_recommendation.model_loader import get_model_loader
+        return get_model_loader()
+    
+    @pytest.fixture
+    def expired_budget(self, monkeypatch):
+        """추천 엔진이 항상 시간 예산을 넘긴 것으로 판단하도록 하는 fixture"""
+        import ai_recommendation.recommendation_engine as engine
+        monkeypatch.setattr(engine, "deadline_passed", lambda deadline: deadline is not None)
+    
+    def test_within_budget_uses_model(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem]
+    ):
+        """
+        시간 예산 안에 끝나면 모델 추천 결과를 그대로 반환해야 함
+        """
+        outfits, strategy = recommend_with_fallback(test_db, test_user.id, deadline=time.monotonic() + 60)
+        
+        assert strategy == RECOMMEND_STRATEGY_MODEL
+        assert outfits == [recommend_outfit(test_db, test_user.id)]
+    
+    def test_expired_budget_is_not_cached(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem],
+        expired_budget
+    ):
+        """
+        시간 예산을 넘긴 결과는 추천 방식을 표시하고 결과 캐시에 저장하지 않아야 함
+        """
+        bottom = next(item for item in test_closet_items_with_features if item.category == "bottom")
+        
+        outfits, strategy = recommend_with_fallback(test_db, test_user.id, {"bottom": bottom.id}, deadline=time.monotonic())
+        assert strategy == RECOMMEND_STRATEGY_FALLBACK
+        assert outfits[0]["bottom"] == bottom.id
+        
+        outfits, strategy = recommend_with_fallback(test_db, test_user.id, {"bottom": bottom.id}, k=3, deadline=time.monotonic())
+        assert strategy == RECOMMEND_STRATEGY_PARTIAL
+        assert len(outfits) == 3
+        
+        assert recommendation_cache.stats()["size"] == 0
+    
+    def test_model_loading_falls_back_to_attributes(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem],
+        monkeypatch
+    ):
+        """
+        모델을 로드하는 중(503)이면 속성 기반 추천으로 대체해야 함
+        """
+        import app.services.ai_service as ai_service
+        def warming_up(*args, **kwargs):
+            raise ServiceUnavailableException(message="AI 추천 모델을 준비 중입니다.", retry_after=5)
+        monkeypatch.setattr(ai_service, "get_loaded_model_loader", lambda: None)
+        monkeypatch.setattr(ai_service, "_prepare_recommendation", warming_up)
+        top = next(item for item in test_closet_items_with_features if item.category == "top")
+        
+        outfits, strategy = recommend_with_fallback(test_db, test_user.id, {"top": top.id})
+        
+        assert strategy == RECOMMEND_STRATEGY_FALLBACK
+        assert outfits[0]["top"] == top.id
+        items_by_id = {item.id: item for item in test_closet_items_with_features}
+        for category in ("bottom", "shoes", "outer"):
+            assert items_by_id[outfits[0][category]].category == category
+        assert "score" not in outfits[0]
+        
+        outfits, strategy = recommend_with_fallback(test_db, test_user.id, {"top": top.id}, k=5)
+        assert strategy == RECOMMEND_STRATEGY_FALLBACK
+        assert len(outfits) == 1 and "score" in outfits[0]
+    
+    def test_failed_startup_load_falls_back_without_reload(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_closet_items_with_features: list[ClosetItem],
+        monkeypatch
+    ):
+        """
+        서버 시작 시 모델 로드에 실패했으면 모델 로드를 다시 시도하지 않고 바로 속성 기반 추천으로 대체해야 함
+        """
+        from ai_recommendation import model_loader as model_loader_module
+        from ai_recommendation.model_loader import ModelLoader, MODEL_STATE_FAILED
+        
+        for name, value in [("_model_loader_instance", None), ("_model_loading", False), ("_model_load_error", None),
+                            ("_model_load_thread", None), ("_model_dir", None)]:
+            monkeypatch.setattr(model_loader_module, name, value)
+        load_calls = []
+        def failing_load(self):
+            load_calls.append(self)
+            return False
+        monkeypatch.setattr(ModelLoader, "load", failing_load)
+        
+        # 모델 추천 경로(옷장 스냅샷 준비)는 시도하지 않아야 함
+        import app.services.ai_service as ai_service
+        def unexpected_prepare(*args, **kwargs):
+            raise AssertionError("모델이 준비되지 않았는데 모델 추천을 시도함")
+        monkeypatch.setattr(ai_service, "_prepare_recommendation", unexpected_prepare)
+        
+        # 서버 시작 시 백그라운드 로드 실패
+        model_loader_module.start_model_loading()
+        assert model_loader_module.wait_for_model_loader(timeout=5) is None
+        assert model_loader_module.get_model_load_status()["state"] == MODEL_STATE_FAILED
+        
+        outfits, strategy = recommend_with_fallback(test_db, test_user.id, deadline=time.monotonic() + 60)
+        assert strategy == RECOMMEND_STRATEGY_FALLBACK
+        assert "score" not in outfits[0]
+        
+        outfits, strategy = recommend_with_fallback(test_db, test_user.id, k=3, deadline=time.monotonic() + 60)
+        assert strategy == RECOMMEND_STRATEGY_FALLBACK
+        assert len(outfits) == 1 and "score" in outfits[0]
+        
+        assert len(load_calls) == 1
+    
+    def test_engine_error_with_loaded_model_is_raised(
+        self,
+        test_db: Session,
+        test_user: User,
+        monkeypatch
+    ):
+        """
+        모델이 로드된 상태에서 추천이 실패하면 대체하지 않고 에러를 전달해야 함
+        """
+        # 필수 카테고리(shoes)가 없는 옷장
+        test_db.add(ClosetItem(user_id=test_user.id, category="top", feature="상의_white_cotton_반소매 티셔츠_남성_여름_casual"))
+        test_db.add(ClosetItem(user_id=test_user.id, category="bottom", feature="하의_blue_denim_청바지_남성_사계절_casual"))
+        test_db.commit()
+        
+        with pytest.raises(BadRequestException):
+            recommend_with_fallback(test_db, test_user.id)
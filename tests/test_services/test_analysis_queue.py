@@ -0,0 +1,250 @@
+"""
+백그라운드 분석 큐 테스트
+- 작업 성공/재시도/실패 기록, 이전 실행에서 끝나지 않은 작업 복구, 종료 시 실행 중인 작업 마무리 검증
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.exceptions import BadRequestException
+from app.models import User, ClosetItem, AnalysisJob
+from app.models.analysis_job import JOB_STATUS_QUEUED, JOB_STATUS_RUNNING, JOB_STATUS_DONE, JOB_STATUS_FAILED
+from app.models.closet_item import ITEM_STATUS_PENDING, ITEM_STATUS_READY, ITEM_STATUS_FAILED
+from app.services.analysis_queue import AnalysisQueue, enqueue_analysis, get_analysis_status
+
+
+FEATURE = "상의_white_cotton_반소매 티셔츠_남성_여름_casual"
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    워커 스레드와 테스트가 같은 DB를 보도록 파일 SQLite DB를 사용하는 세션 팩토리 fixture
+    (사용자 1명 생성)
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = SessionLocal()
+    db.add(User(id=1, firebase_uid="queue_uid", email="queue@example.com", username="queue_user", gender="남성", closet_version=0))
+    db.commit()
+    db.close()
+
+    yield SessionLocal
+    engine.dispose()
+
+
+def _add_pending_item(session_factory, job_status: str = JOB_STATUS_QUEUED) -> int:
+    """분석 전 아이템과 분석 작업을 저장하고 아이템 ID를 반환"""
+    db = session_factory()
+    try:
+        item = ClosetItem(user_id=1, category="top", feature="", image_url="uploads/user_1/item.jpg", status=ITEM_STATUS_PENDING)
+        db.add(item)
+        db.flush()
+        job = enqueue_analysis(db, item)
+        job.status = job_status
+        db.commit()
+        return item.id
+    finally:
+        db.close()
+
+
+def _wait_for_status(session_factory, item_id: int, expected: str, timeout: float = 5.0) -> dict:
+    """아이템 분석 상태가 expected가 될 때까지 기다린 뒤 상태를 반환"""
+    deadline = time.monotonic() + timeout
+    while True:
+        db = session_factory()
+        try:
+            result = get_analysis_status(db, 1, item_id)
+        finally:
+            db.close()
+        if result["status"] == expected or time.monotonic() > deadline:
+            return result
+        time.sleep(0.02)
+
+
+def _make_queue(session_factory, analyze, max_attempts: int = 3) -> AnalysisQueue:
+    return AnalysisQueue(
+        session_factory, workers=2, max_attempts=max_attempts, retry_base_seconds=0,
+        analyze=analyze, poll_interval=0.05
+    )
+
+
+class TestAnalysisQueue:
+    """분석 큐 테스트"""
+
+    def test_successful_analysis_marks_item_ready(self, session_factory):
+        """
+        분석이 끝나면 아이템에 feature가 저장되고 ready가 되며 옷장 버전이 올라가야 함
+        """
+        calls = []
+
+        def analyze(image_path, category, user_gender):
+            calls.append((image_path, category, user_gender))
+            return FEATURE
+
+        item_id = _add_pending_item(session_factory)
+        queue = _make_queue(session_factory, analyze)
+        queue.start()
+        try:
+            queue.notify()
+            result = _wait_for_status(session_factory, item_id, ITEM_STATUS_READY)
+        finally:
+            assert queue.shutdown(timeout=5)
+
+        assert result["status"] == ITEM_STATUS_READY
+        assert result["feature"] == FEATURE
+        assert result["attempts"] == 1
+        assert calls == [("uploads/user_1/item.jpg", "top", "남성")]
+
+        db = session_factory()
+        try:
+            assert db.get(User, 1).closet_version == 1
+            assert db.query(AnalysisJob).one().status == JOB_STATUS_DONE
+            assert db.query(ClosetItem).filter(ClosetItem.is_ready()).count() == 1
+        finally:
+            db.close()
+
+    def test_failed_attempt_is_retried(self, session_factory):
+        """
+        분석이 실패하면 재시도하여 성공해야 함
+        """
+        attempts = []
+
+        def analyze(image_path, category, user_gender):
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise BadRequestException(message="Gemini API 사용량 한도를 초과했습니다.")
+            return FEATURE
+
+        item_id = _add_pending_item(session_factory)
+        queue = _make_queue(session_factory, analyze)
+        queue.start()
+        try:
+            result = _wait_for_status(session_factory, item_id, ITEM_STATUS_READY)
+        finally:
+            assert queue.shutdown(timeout=5)
+
+        assert result["status"] == ITEM_STATUS_READY
+        assert result["attempts"] == 2
+
+    def test_item_fails_after_max_attempts(self, session_factory):
+        """
+        최대 시도 횟수를 넘기면 아이템이 failed가 되고 마지막 오류가 기록되어야 하며, 목록/추천에서 제외되어야 함
+        """
+        def analyze(image_path, category, user_gender):
+            raise BadRequestException(message="Gemini API 응답에서 color를 찾을 수 없습니다.")
+
+        item_id = _add_pending_item(session_factory)
+        queue = _make_queue(session_factory, analyze, max_attempts=2)
+        queue.start()
+        try:
+            result = _wait_for_status(session_factory, item_id, ITEM_STATUS_FAILED)
+        finally:
+            assert queue.shutdown(timeout=5)
+
+        assert result["status"] == ITEM_STATUS_FAILED
+        assert result["attempts"] == 2
+        assert result["feature"] is None
+        assert result["error"] == "Gemini API 응답에서 color를 찾을 수 없습니다."
+
+        db = session_factory()
+        try:
+            assert db.query(AnalysisJob).one().status == JOB_STATUS_FAILED
+            assert db.query(ClosetItem).filter(ClosetItem.is_ready()).count() == 0
+            assert db.get(User, 1).closet_version == 0
+        finally:
+            db.close()
+
+    def test_running_jobs_are_recovered_on_start(self, session_factory):
+        """
+        이전 실행에서 running으로 남은 작업은 시작 시 다시 실행되어야 함
+        """
+        item_id = _add_pending_item(session_factory, job_status=JOB_STATUS_RUNNING)
+        queue = _make_queue(session_factory, lambda *args: FEATURE)
+        try:
+            assert queue.start() == 1
+            result = _wait_for_status(session_factory, item_id, ITEM_STATUS_READY)
+        finally:
+            assert queue.shutdown(timeout=5)
+
+        assert result["status"] == ITEM_STATUS_READY
+
+    def test_shutdown_drains_running_job_and_keeps_queued_jobs(self, session_factory):
+        """
+        종료 시 실행 중인 작업은 끝까지 처리하고, 아직 시작하지 않은 작업은 queued로 남아야 함
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def analyze(image_path, category, user_gender):
+            started.set()
+            release.wait(5)
+            return FEATURE
+
+        running_item_id = _add_pending_item(session_factory)
+        queue = AnalysisQueue(session_factory, workers=1, max_attempts=3, retry_base_seconds=0, analyze=analyze, poll_interval=0.05)
+        queue.start()
+        assert started.wait(5)
+
+        # 실행 중에 추가된 작업 (종료 요청 후에는 가져가지 않아야 함)
+        queued_item_id = _add_pending_item(session_factory)
+
+        shutdown_result = {}
+        shutdown_thread = threading.Thread(target=lambda: shutdown_result.setdefault("done", queue.shutdown(timeout=5)))
+        shutdown_thread.start()
+        time.sleep(0.1)
+        release.set()
+        shutdown_thread.join(5)
+
+        assert shutdown_result["done"] is True
+        assert _wait_for_status(session_factory, running_item_id, ITEM_STATUS_READY, timeout=0)["status"] == ITEM_STATUS_READY
+
+        db = session_factory()
+        try:
+            queued_job = db.query(AnalysisJob).filter(AnalysisJob.item_id == queued_item_id).one()
+            assert queued_job.status == JOB_STATUS_QUEUED
+            assert queued_job.attempts == 0
+        finally:
+            db.close()
+
+    def test_deleted_item_is_skipped(self, session_factory):
+        """
+        분석 중에 아이템과 작업이 삭제되면 결과를 기록하지 않고 넘어가야 함
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def analyze(image_path, category, user_gender):
+            started.set()
+            release.wait(5)
+            return FEATURE
+
+        item_id = _add_pending_item(session_factory)
+        queue = _make_queue(session_factory, analyze)
+        queue.start()
+        try:
+            assert started.wait(5)
+            db = session_factory()
+            try:
+                db.query(AnalysisJob).filter(AnalysisJob.item_id == item_id).delete()
+                db.query(ClosetItem).filter(ClosetItem.id == item_id).delete()
+                db.commit()
+            finally:
+                db.close()
+            release.set()
+        finally:
+            assert queue.shutdown(timeout=5)
+
+        db = session_factory()
+        try:
+            assert db.query(ClosetItem).count() == 0
+            assert db.get(User, 1).closet_version == 0
+        finally:
+            db.close()
@@ -0,0 +1,155 @@
+"""
+Gemini 이미지 분석 결과 캐시 테스트
+- 같은 사진 재업로드 시 Gemini 재호출 없음, 성별별 feature 재생성, 카테고리/프롬프트별 키 구분, 적중률 집계 검증
+"""
+
+import asyncio
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import ImageAnalysisCache
+from app.services import gemini_service
+from app.services.image_analysis_cache import AnalysisResultCache
+
+
+RESPONSE_TEXT = "category_detail: 반소매 티셔츠, 계절: 여름, 색상: white, 재질: cotton, 스타일: casual"
+
+
+class _CountingGeminiModel:
+    """호출 횟수를 세는 Gemini 모델 대역 (동기/비동기 호출 지원)"""
+
+    calls = 0
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def generate_content(self, contents):
+        type(self).calls += 1
+        return SimpleNamespace(text=RESPONSE_TEXT)
+
+    async def generate_content_async(self, contents):
+        return self.generate_content(contents)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """파일 SQLite DB 세션 팩토리 fixture"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def cache(session_factory, monkeypatch):
+    """테스트 DB를 쓰는 분석 결과 캐시로 교체하고, Gemini API를 호출 횟수를 세는 대역으로 교체"""
+    cache = AnalysisResultCache(session_factory)
+    monkeypatch.setattr(gemini_service, "image_analysis_cache", cache)
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(gemini_service.genai, "GenerativeModel", _CountingGeminiModel)
+    monkeypatch.setattr(_CountingGeminiModel, "calls", 0)
+    return cache
+
+
+def _image_bytes(image_format: str = "PNG", color: str = "white") -> bytes:
+    image = Image.new("RGB", (64, 64), color=color)
+    buffer = BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class TestImageAnalysisCache:
+    """분석 결과 캐시 테스트"""
+
+    def test_reupload_reuses_analysis_with_user_gender(self, cache):
+        """
+        같은 사진을 다시 올리면 Gemini를 다시 호출하지 않고, feature는 요청한 사용자 성별로 만들어야 함
+        """
+        first = gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "top", "남성")
+        second = gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "top", "여성")
+
+        assert _CountingGeminiModel.calls == 1
+        assert first == "상의_white_cotton_반소매 티셔츠_남성_여름_casual"
+        assert second == "상의_white_cotton_반소매 티셔츠_여성_여름_casual"
+
+    def test_key_depends_on_category_image_and_prompt_version(self, cache, monkeypatch):
+        """
+        카테고리, 이미지 픽셀, Gemini 모델(프롬프트 버전)이 다르면 다시 분석해야 함
+        """
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "top")
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "outer")
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes(color="black"), "top")
+        assert _CountingGeminiModel.calls == 3
+
+        monkeypatch.setattr(settings, "GEMINI_MODEL", "gemini-2.5-flash-lite")
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "top")
+        assert _CountingGeminiModel.calls == 4
+
+    def test_same_pixels_in_different_format_hit(self, cache):
+        """
+        픽셀이 같으면 파일 형식(인코딩)이 달라도 같은 사진으로 보아야 함
+        """
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes("PNG"), "top")
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes("BMP"), "top")
+
+        assert _CountingGeminiModel.calls == 1
+
+    def test_async_and_path_analyzers_share_cache(self, cache, tmp_path):
+        """
+        업로드(비동기), 저장된 이미지 재분석(파일 경로) 경로가 같은 캐시를 사용해야 함
+        """
+        feature = asyncio.run(gemini_service.analyze_clothing_image_from_bytes_async(_image_bytes(), "top", "남성"))
+
+        image_path = tmp_path / "item.png"
+        image_path.write_bytes(_image_bytes())
+        reanalyzed = gemini_service.analyze_clothing_image(str(image_path), "top", "여성")
+
+        assert _CountingGeminiModel.calls == 1
+        assert feature == "상의_white_cotton_반소매 티셔츠_남성_여름_casual"
+        assert reanalyzed == "상의_white_cotton_반소매 티셔츠_여성_여름_casual"
+
+    def test_cache_persists_and_reports_hit_rate(self, cache, session_factory, monkeypatch):
+        """
+        저장된 결과는 다른 캐시 인스턴스(서버 재시작)에서도 사용되어야 하고, 통계에 적중률과 누적 적중 횟수가 나와야 함
+        """
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "top")
+        assert cache.stats()["hit_rate"] == 0.0
+
+        restarted = AnalysisResultCache(session_factory)
+        monkeypatch.setattr(gemini_service, "image_analysis_cache", restarted)
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "top")
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "top")
+
+        assert _CountingGeminiModel.calls == 1
+        stats = restarted.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 0
+        assert stats["hit_rate"] == 1.0
+        assert stats["entries"] == 1
+        assert stats["stored_hits"] == 2
+
+        db = session_factory()
+        try:
+            entry = db.query(ImageAnalysisCache).one()
+            assert entry.category == "top"
+            assert entry.last_hit_at is not None
+        finally:
+            db.close()
+
+    def test_disabled_cache_always_calls_gemini(self, cache):
+        """
+        캐시를 끄면 매번 Gemini를 호출하고 아무것도 저장하지 않아야 함
+        """
+        cache.enabled = False
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "top")
+        gemini_service.analyze_clothing_image_from_bytes(_image_bytes(), "top")
+
+        assert _CountingGeminiModel.calls == 2
+        assert cache.stats()["entries"] == 0
@@ -0,0 +1,142 @@
+"""
+이미지 지각 해시 서비스 테스트
+- 다시 인코딩/리사이즈한 사진의 해시 거리, 다른 색 옷 구분, 사용자 옷장에서 거의 같은 사진 찾기 검증
+"""
+
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import User, ClosetItem
+from app.models.closet_item import ITEM_STATUS_PENDING
+from app.services.image_hash_service import compute_image_hash, hamming_distance, find_near_duplicate, is_near_duplicate
+
+
+MAX_DISTANCE = 6
+
+
+def _garment_image(seed: int, size=(400, 300)) -> Image.Image:
+    """무늬가 있는 테스트 이미지 (단색 이미지는 dHash가 모두 0이므로 사용하지 않음)"""
+    rng = np.random.default_rng(seed)
+    pattern = (rng.random((8, 8, 3)) * 255).astype(np.uint8)
+    return Image.fromarray(pattern).resize(size, Image.Resampling.BICUBIC)
+
+
+def _encode(image: Image.Image, image_format: str = "PNG", **kwargs) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **kwargs)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def db():
+    """메모리 SQLite DB 세션 fixture (사용자 2명 생성)"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        User(id=1, firebase_uid="hash_uid_1", email="hash1@example.com", username="hash_user_1", gender="남성"),
+        User(id=2, firebase_uid="hash_uid_2", email="hash2@example.com", username="hash_user_2", gender="여성"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _add_item(db, image_hash: str, user_id: int = 1, category: str = "top", **kwargs) -> ClosetItem:
+    item = ClosetItem(
+        user_id=user_id, category=category, feature="상의_white_cotton_반소매 티셔츠_남성_여름_casual",
+        image_url=f"uploads/user_{user_id}/item.jpg", image_hash=image_hash, **kwargs
+    )
+    db.add(item)
+    db.commit()
+    return item
+
+
+class TestImageHash:
+    """이미지 해시 계산 테스트"""
+
+    def test_reencoded_and_resized_copy_is_near(self):
+        """
+        JPEG으로 다시 저장하거나 크기를 줄인 사진은 해밍 거리가 작아야 함
+        """
+        image = _garment_image(0)
+        original = compute_image_hash(_encode(image))
+        copy = compute_image_hash(_encode(image.resize((200, 150)), "JPEG", quality=60))
+
+        assert len(original) == 22
+        assert hamming_distance(original, copy) <= MAX_DISTANCE
+
+    def test_different_garment_is_far(self):
+        """
+        다른 사진은 해밍 거리가 커야 함
+        """
+        assert hamming_distance(
+            compute_image_hash(_encode(_garment_image(0))),
+            compute_image_hash(_encode(_garment_image(1)))
+        ) > MAX_DISTANCE
+
+    def test_is_near_duplicate_checks_distance_and_color(self):
+        """
+        다시 인코딩한 같은 사진은 거의 같은 사진, 다른 사진이나 같은 무늬의 다른 색 사진은 아니어야 함
+        """
+        image = _garment_image(0)
+        original = compute_image_hash(_encode(image))
+        pattern = np.asarray(image.convert("L"), dtype=np.float32)[:, :, None] / 255
+
+        assert is_near_duplicate(original, compute_image_hash(_encode(image, "JPEG", quality=60)), MAX_DISTANCE)
+        assert not is_near_duplicate(original, compute_image_hash(_encode(_garment_image(1))), MAX_DISTANCE)
+        assert not is_near_duplicate(
+            compute_image_hash(_encode(Image.fromarray((pattern * [255, 40, 40]).astype(np.uint8)))),
+            compute_image_hash(_encode(Image.fromarray((pattern * [40, 40, 255]).astype(np.uint8)))),
+            MAX_DISTANCE
+        )
+
+
+class TestFindNearDuplicate:
+    """거의 같은 사진 찾기 테스트"""
+
+    def test_finds_closest_item_in_same_user_category(self, db):
+        """
+        같은 사용자, 같은 카테고리, 분석이 끝난 아이템 중 가장 가까운 아이템을 찾아야 함
+        """
+        image = _garment_image(0)
+        upload_hash = compute_image_hash(_encode(image.resize((200, 150)), "JPEG", quality=60))
+
+        _add_item(db, compute_image_hash(_encode(_garment_image(1))))
+        match = _add_item(db, compute_image_hash(_encode(image)))
+        _add_item(db, compute_image_hash(_encode(image)), user_id=2)
+        _add_item(db, compute_image_hash(_encode(image)), category="outer")
+        _add_item(db, compute_image_hash(_encode(image)), status=ITEM_STATUS_PENDING)
+
+        item, distance = find_near_duplicate(db, 1, "top", upload_hash, MAX_DISTANCE)
+
+        assert item.id == match.id
+        assert distance <= MAX_DISTANCE
+
+    def test_no_match_for_different_garment(self, db):
+        """
+        해밍 거리가 max_distance보다 크면 None이어야 함
+        """
+        _add_item(db, compute_image_hash(_encode(_garment_image(1))))
+
+        assert find_near_duplicate(db, 1, "top", compute_image_hash(_encode(_garment_image(0))), MAX_DISTANCE) is None
+
+    def test_same_design_in_different_color_is_not_duplicate(self, db):
+        """
+        밝기 패턴이 같아도 색이 다르면(같은 디자인의 다른 색 옷) 거의 같은 사진으로 보지 않아야 함
+        """
+        pattern = np.asarray(_garment_image(0).convert("L"), dtype=np.float32)[:, :, None] / 255
+        red = Image.fromarray((pattern * [255, 40, 40]).astype(np.uint8))
+        blue = Image.fromarray((pattern * [40, 40, 255]).astype(np.uint8))
+        _add_item(db, compute_image_hash(_encode(red)))
+
+        upload_hash = compute_image_hash(_encode(blue))
+        assert hamming_distance(upload_hash, compute_image_hash(_encode(red))) <= MAX_DISTANCE
+        assert find_near_duplicate(db, 1, "top", upload_hash, MAX_DISTANCE) is None
@@ -0,0 +1,279 @@
+"""
+AI 모델 로드 테스트
+- 동시에 호출해도 모델은 한 번만 로드 (single-flight)
+- 백그라운드 로드 상태 보고 및 로드 중 추천 요청 처리
+- 버전별 번들 재로드 (재시작 없는 모델 교체)
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from ai_recommendation import model_loader as model_loader_module
+from ai_recommendation.model_loader import (
+    ModelLoader,
+    check_for_model_update,
+    get_loaded_model_loader,
+    get_model_loader,
+    get_model_load_status,
+    start_model_loading,
+    start_model_reload,
+    wait_for_model_loader,
+    wait_for_model_reload,
+    MODEL_STATE_FAILED,
+    MODEL_STATE_LOADING,
+    MODEL_STATE_NOT_LOADED,
+    MODEL_STATE_READY,
+)
+from ai_recommendation.serving_bundle import publish_serving_bundle, read_current_version
+from app.core.exceptions import ServiceUnavailableException
+from app.models.closet_item import ClosetItem
+from app.models.user import User
+from app.services.ai_service import recommend_outfit
+
+
+@pytest.fixture
+def fresh_model_state(monkeypatch):
+    """
+    모델 로더 싱글톤 상태를 비운 상태로 테스트하고, 끝나면 원래 상태로 되돌리는 fixture
+    """
+    monkeypatch.setattr(model_loader_module, "_model_loader_instance", None)
+    monkeypatch.setattr(model_loader_module, "_model_loading", False)
+    monkeypatch.setattr(model_loader_module, "_model_load_error", None)
+    monkeypatch.setattr(model_loader_module, "_model_load_thread", None)
+    monkeypatch.setattr(model_loader_module, "_model_dir", None)
+    monkeypatch.setattr(model_loader_module, "_model_reloading", False)
+    monkeypatch.setattr(model_loader_module, "_model_reload_error", None)
+    monkeypatch.setattr(model_loader_module, "_model_reload_failed_version", None)
+    monkeypatch.setattr(model_loader_module, "_model_reload_thread", None)
+
+
+def _patch_load(monkeypatch, result: bool = True, delay: float = 0.0, gate: threading.Event = None) -> list:
+    """
+    ModelLoader.load를 실제 파일을 읽지 않는 가짜 함수로 바꿉니다.
+
+    Returns:
+        list: load가 호출될 때마다 ModelLoader 인스턴스가 추가되는 리스트
+    """
+    calls = []
+
+    def fake_load(self):
+        calls.append(self)
+        if gate is not None:
+            gate.wait(5)
+        time.sleep(delay)
+        self._is_loaded = result
+        return result
+
+    monkeypatch.setattr(ModelLoader, "load", fake_load)
+    return calls
+
+
+@pytest.mark.usefixtures("fresh_model_state")
+class TestSingleFlightLoading:
+    """single-flight 모델 로드 테스트"""
+
+    def test_concurrent_calls_load_once(self, monkeypatch):
+        """여러 스레드가 동시에 호출해도 load는 한 번만 실행되고 같은 인스턴스를 받아야 함"""
+        calls = _patch_load(monkeypatch, delay=0.2)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(get_model_loader())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert len(results) == 8
+        assert all(result is results[0] for result in results)
+
+    def test_failed_load_is_not_cached(self, monkeypatch):
+        """로드에 실패하면 인스턴스를 저장하지 않고 다음 호출에서 다시 로드해야 함"""
+        _patch_load(monkeypatch, result=False)
+
+        with pytest.raises(RuntimeError):
+            get_model_loader()
+        assert get_model_load_status()["state"] == MODEL_STATE_FAILED
+
+        _patch_load(monkeypatch, result=True)
+        assert get_model_loader().is_loaded()
+        assert get_model_load_status()["state"] == MODEL_STATE_READY
+
+    def test_background_loading_status(self, monkeypatch):
+        """백그라운드 로드 중에는 loading, 끝나면 ready 상태여야 함"""
+        gate = threading.Event()
+        calls = _patch_load(monkeypatch, gate=gate)
+        assert get_model_load_status()["state"] == MODEL_STATE_NOT_LOADED
+
+        assert start_model_loading() is True
+        assert get_model_load_status()["state"] == MODEL_STATE_LOADING
+        assert start_model_loading() is False  # 로드 중에는 다시 시작하지 않음
+
+        gate.set()
+        loader = wait_for_model_loader(timeout=5)
+
+        assert loader is not None
+        assert len(calls) == 1
+        assert get_model_load_status()["state"] == MODEL_STATE_READY
+        assert start_model_loading() is False  # 로드 완료 후에도 다시 시작하지 않음
+
+    def test_recommend_while_loading_returns_503(
+        self,
+        monkeypatch,
+        test_db: Session,
+        test_user: User,
+        test_closet_items: list[ClosetItem]
+    ):
+        """모델 로드 중에는 기다리지 않고 Retry-After가 포함된 503 에러를 반환해야 함"""
+        gate = threading.Event()
+        _patch_load(monkeypatch, gate=gate)
+        start_model_loading()
+
+        try:
+            with pytest.raises(ServiceUnavailableException) as exc_info:
+                recommend_outfit(test_db, test_user.id)
+        finally:
+            gate.set()
+            wait_for_model_loader(timeout=5)
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"].isdigit()
+        assert exc_info.value.detail["detail"]["model_state"] == MODEL_STATE_LOADING
+
+    def test_recommend_after_failed_load_returns_503_without_reload(
+        self,
+        monkeypatch,
+        test_db: Session,
+        test_user: User,
+        test_closet_items: list[ClosetItem]
+    ):
+        """백그라운드 로드에 실패한 뒤에는 요청 스레드에서 다시 로드하지 않고 바로 503 에러를 반환해야 함"""
+        calls = _patch_load(monkeypatch, result=False)
+        start_model_loading()
+        assert wait_for_model_loader(timeout=5) is None
+        assert get_model_load_status()["state"] == MODEL_STATE_FAILED
+
+        for _ in range(3):
+            with pytest.raises(ServiceUnavailableException) as exc_info:
+                recommend_outfit(test_db, test_user.id)
+            assert exc_info.value.detail["detail"]["model_state"] == MODEL_STATE_FAILED
+
+        assert len(calls) == 1
+
+    def test_load_exception_is_reported_as_failed(self, monkeypatch):
+        """load()가 예외를 던져도 failed 상태가 되어야 함"""
+        def broken_load(self):
+            raise OSError("params.json을 읽을 수 없습니다.")
+        monkeypatch.setattr(ModelLoader, "load", broken_load)
+
+        with pytest.raises(OSError):
+            get_model_loader()
+
+        status = get_model_load_status()
+        assert status["state"] == MODEL_STATE_FAILED
+        assert status["error"] == "params.json을 읽을 수 없습니다."
+
+
+def _publish_bundle(model_dir: str, version: str, seed: int) -> None:
+    """작은 가짜 서빙 번들을 models/versions/{version}에 저장하고 CURRENT를 바꿉니다."""
+    rng = np.random.default_rng(seed)
+    params = {
+        'w2v_vector_size': 4,
+        'cf_vector_size': 2,
+        'color_weight': 0.8,
+        'fabric_weight': 0.2,
+        'model_version': version,
+    }
+    publish_serving_bundle(
+        model_dir,
+        params,
+        w2v_keys=["상의", "하의", "신발"],
+        w2v_vectors=rng.normal(size=(3, 4)),
+        cf_keys=["white", "cotton"],
+        cf_vectors=rng.normal(size=(2, 2)),
+        final_vectors=rng.normal(size=(3, 6)),
+        coord_ids=[1, 1, 1],
+        sentences=["상의_a", "하의_b", "신발_c"],
+    )
+
+
+@pytest.mark.usefixtures("fresh_model_state")
+class TestModelReload:
+    """재시작 없는 모델 교체 테스트"""
+
+    def test_reload_swaps_to_current_version(self, tmp_path):
+        """CURRENT가 바뀌면 새 버전을 로드해 교체하고, 이전 로더는 계속 사용할 수 있어야 함"""
+        model_dir = str(tmp_path)
+        _publish_bundle(model_dir, "v1", seed=1)
+        old_loader = get_model_loader(model_dir)
+        assert old_loader.get_model_version() == "v1"
+
+        _publish_bundle(model_dir, "v2", seed=2)
+        assert read_current_version(model_dir) == "v2"
+        assert get_model_load_status()["available_version"] == "v2"
+
+        assert check_for_model_update() is True
+        new_loader = wait_for_model_reload(timeout=5)
+
+        assert new_loader is not old_loader
+        assert new_loader.get_model_version() == "v2"
+        assert get_loaded_model_loader() is new_loader
+        # 진행 중이던 요청이 들고 있는 이전 로더는 이전 버전 그대로 동작
+        assert old_loader.get_model_version() == "v1"
+        assert old_loader.get_coord_matrix().shape == (3, 6)
+        assert check_for_model_update() is False
+
+    def test_reload_specific_version(self, tmp_path):
+        """버전을 지정하면 CURRENT와 관계없이 그 버전으로 교체해야 함 (롤백)"""
+        model_dir = str(tmp_path)
+        _publish_bundle(model_dir, "v1", seed=1)
+        _publish_bundle(model_dir, "v2", seed=2)
+        assert get_model_loader(model_dir).get_model_version() == "v2"
+
+        assert start_model_reload("v1") is True
+        assert wait_for_model_reload(timeout=5).get_model_version() == "v1"
+
+    def test_failed_reload_keeps_current_model(self, tmp_path):
+        """새 버전 로드에 실패하면 기존 모델을 그대로 사용해야 함"""
+        model_dir = str(tmp_path)
+        _publish_bundle(model_dir, "v1", seed=1)
+        loader = get_model_loader(model_dir)
+
+        assert start_model_reload("missing") is True
+        assert wait_for_model_reload(timeout=5) is loader
+
+        status = get_model_load_status()
+        assert status["state"] == MODEL_STATE_READY
+        assert status["model_version"] == "v1"
+        assert status["reloading"] is False
+        assert status["reload_error"] is not None
+
+    def test_reload_is_single_flight(self, monkeypatch, tmp_path):
+        """재로드 중에는 새 재로드를 시작하지 않아야 함"""
+        model_dir = str(tmp_path)
+        _publish_bundle(model_dir, "v1", seed=1)
+        get_model_loader(model_dir)
+
+        gate = threading.Event()
+        _patch_load(monkeypatch, gate=gate)
+        assert start_model_reload() is True
+        assert start_model_reload() is False
+        gate.set()
+        wait_for_model_reload(timeout=5)
+        assert start_model_reload() is True
+        wait_for_model_reload(timeout=5)
+
+
+def test_ready_endpoint(client: TestClient):
+    """/ready는 모델 로드 상태를 /health와 별도로 보고해야 함"""
+    response = client.get("/ready")
+
+    assert response.status_code in (200, 503)
+    data = response.json()
+    assert data["model"]["state"] in (MODEL_STATE_READY, MODEL_STATE_FAILED, "disabled")
+    assert (response.status_code == 200) == (data["status"] == "ready")
@@ -0,0 +1,170 @@
+"""
+추천 전용 실행기 테스트
+- 워커/대기열 제한, 과부하 시 503 (Retry-After), 워커 프로세스 실행 결과 검증
+"""
+
+import asyncio
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from app.core.exceptions import ServiceUnavailableException
+from app.services.recommend_executor import RecommendExecutor, RECOMMEND_OVERLOADED_RETRY_AFTER
+
+
+MODEL_DIR = "ai_recommendation/models"
+
+
+def _loaded_bundle(model_loader):
+    """워커 프로세스에서 실행할 엔진 함수 대역 (로드한 번들 디렉토리, 모델 버전, 코디 행렬 반환)"""
+    return model_loader.bundle_dir, model_loader.get_model_version(), model_loader.get_coord_matrix().tolist()
+
+
+@pytest.fixture
+def executor():
+    """워커 1개, 대기열 1개인 스레드 실행기 fixture"""
+    executor = RecommendExecutor("thread", max_workers=1, max_queue=1)
+    yield executor
+    executor.shutdown()
+
+
+class TestRecommendExecutor:
+    """추천 전용 실행기 테스트"""
+
+    def test_runs_on_recommend_worker_thread(self, executor: RecommendExecutor):
+        """
+        요청은 FastAPI 기본 스레드풀이 아닌 추천 전용 스레드에서 실행되어야 함
+        """
+        thread_name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+
+        assert thread_name.startswith("recommend")
+
+    def test_rejects_when_queue_is_full(self, executor: RecommendExecutor):
+        """
+        처리 중 + 대기 중 요청이 가득 차면 기다리지 않고 503 (Retry-After)으로 거절해야 함
+        """
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+            await asyncio.sleep(0)
+            try:
+                with pytest.raises(ServiceUnavailableException) as exc_info:
+                    await executor.run(lambda: "rejected")
+            finally:
+                release.set()
+            return await running, await queued, exc_info.value
+
+        running_result, queued_result, error = asyncio.run(scenario())
+
+        assert running_result is True
+        assert queued_result == "queued"
+        assert error.status_code == 503
+        assert error.headers["Retry-After"] == str(RECOMMEND_OVERLOADED_RETRY_AFTER)
+        assert executor.stats()["rejected"] == 1
+
+    def test_capacity_is_released_after_completion(self, executor: RecommendExecutor):
+        """
+        요청이 끝나면(예외 포함) 자리를 반환해 다음 요청을 받을 수 있어야 함
+        """
+        def fail():
+            raise ValueError("추천 실패")
+
+        async def scenario():
+            for _ in range(5):
+                with pytest.raises(ValueError):
+                    await executor.run(fail)
+            return await asyncio.gather(*(executor.run(lambda: "ok") for _ in range(2)))
+
+        assert asyncio.run(scenario()) == ["ok", "ok"]
+        assert executor.stats()["pending"] == 0
+
+    def test_invalid_mode(self):
+        """
+        지원하지 않는 실행 방식은 생성 시 거절해야 함
+        """
+        with pytest.raises(ValueError):
+            RecommendExecutor("greenlet", max_workers=1, max_queue=1)
+
+    @pytest.mark.skipif(
+        not os.path.exists(os.path.join(MODEL_DIR, "CURRENT")),
+        reason="서빙 번들이 없습니다. 모델을 학습해야 합니다."
+    )
+    def test_process_mode_matches_thread_mode(self):
+        """
+        process 모드의 추천 엔진 실행 결과는 현재 스레드에서 실행한 결과와 같아야 함
+        """
+        from ai_recommendation.model_loader import ModelLoader
+        from ai_recommendation.recommendation_engine import recommend_outfit, recommend_outfits
+
+        model_loader = ModelLoader(MODEL_DIR)
+        assert model_loader.load()
+        assert model_loader.source == "bundle"
+
+        features = {
+            "top": ["상의_white_cotton_반소매 티셔츠_남성_여름_casual", "상의_black_cotton_후드 티셔츠_남성_가을_street"],
+            "bottom": ["하의_blue_denim_데님 팬츠_남성_사계절_casual", "하의_gray_cotton_숏 팬츠_남성_여름_casual"],
+            "shoes": ["신발_white_canvas_스니커즈_남성_사계절_casual"],
+            "outer": ["아우터_navy_polyester_블루종/MA-1_남성_가을_casual"],
+        }
+        item_id = iter(range(1, 100))
+        available_items = {
+            category: [{"id": next(item_id), "feature": feature} for feature in category_features]
+            for category, category_features in features.items()
+        }
+        selected_items = {category: None for category in features}
+
+        thread_executor = RecommendExecutor("thread", max_workers=1, max_queue=0)
+        process_executor = RecommendExecutor("process", max_workers=1, max_queue=0)
+        try:
+            for func, kwargs in [(recommend_outfit, {}), (recommend_outfits, {"k": 3})]:
+                expected = thread_executor.call_engine(
+                    func, model_loader, selected_items=selected_items, available_items=available_items, **kwargs
+                )
+                actual = process_executor.call_engine(
+                    func, model_loader, selected_items=selected_items, available_items=available_items, **kwargs
+                )
+                assert actual == expected
+        finally:
+            thread_executor.shutdown()
+            process_executor.shutdown()
+
+    def test_process_mode_loads_legacy_serving_bundle(self, tmp_path):
+        """
+        CURRENT 없이 models/serving/에 있는 서빙 번들도 워커 프로세스가 같은 번들을 로드해 실행해야 함
+        (번들의 model_version과 디렉토리 이름이 달라도 versions/{버전}을 찾지 않음)
+        """
+        from ai_recommendation.model_loader import ModelLoader
+        from ai_recommendation.serving_bundle import BUNDLE_DIR_NAME, export_serving_bundle
+
+        rng = np.random.default_rng(0)
+        export_serving_bundle(
+            bundle_dir=str(tmp_path / BUNDLE_DIR_NAME),
+            params={
+                'w2v_vector_size': 4,
+                'cf_vector_size': 2,
+                'color_weight': 0.8,
+                'fabric_weight': 0.2,
+                'model_version': 'legacy-v1',
+            },
+            w2v_keys=["상의", "하의", "신발"],
+            w2v_vectors=rng.normal(size=(3, 4)),
+            cf_keys=["white", "cotton"],
+            cf_vectors=rng.normal(size=(2, 2)),
+            final_vectors=rng.normal(size=(3, 6)),
+            coord_ids=[1, 1, 1],
+            sentences=["상의_a", "하의_b", "신발_c"],
+        )
+        model_loader = ModelLoader(str(tmp_path))
+        assert model_loader.load()
+        assert model_loader.source == "bundle"
+        assert model_loader.bundle_dir == str(tmp_path / BUNDLE_DIR_NAME)
+
+        process_executor = RecommendExecutor("process", max_workers=1, max_queue=0)
+        try:
+            assert process_executor.call_engine(_loaded_bundle, model_loader) == _loaded_bundle(model_loader)
+        finally:
+            process_executor.shutdown()
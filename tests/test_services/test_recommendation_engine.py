@@ -0,0 +1,975 @@
+"""
+추천 엔진 테스트
+- 사전 계산된 코디 행렬 기반 스코어링이 기존 계산과 일치하는지 검증
+"""
+
+import itertools
+import os
+import subprocess
+import sys
+import time
+from functools import lru_cache
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from ai_recommendation.model_loader import ModelLoader
+from ai_recommendation import feature_space
+from ai_recommendation import recommendation_engine
+from ai_recommendation.ann_index import IVFIndex, build_ivf_index
+from ai_recommendation.compatibility import CompatibilityTables, build_compatibility_tables, split_sentence
+from ai_recommendation.serving_bundle import (
+    bundle_exists,
+    export_serving_bundle,
+    load_serving_bundle,
+    resolve_bundle_dir,
+)
+from ai_recommendation.recommendation_engine import (
+    attribute_match_score,
+    compatibility_score,
+    feature_to_tokens,
+    parse_feature,
+    prune_candidates,
+    find_best_match,
+    find_candidate_coords,
+    intersect_sorted,
+    item_to_vector,
+    normalize_rows,
+    normalize_vector,
+    recommend_category,
+    recommend_outfit,
+    recommend_outfit_batch,
+    recommend_outfit_by_attributes,
+    recommend_outfits,
+    recommend_outfits_by_compatibility,
+    items_to_matrix,
+    score_items,
+    top_k_indices,
+    unique_rows_by_bytes,
+)
+
+
+MODEL_DIR = "ai_recommendation/models"
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists(os.path.join(MODEL_DIR, "w2v_model.model")),
+    reason="AI 모델 파일이 없습니다. 모델을 학습해야 합니다."
+)
+
+
+SAMPLE_FEATURES = [
+    "상의_white_cotton_반소매 티셔츠_남성_여름_casual",
+    "하의_blue_denim_데님 팬츠_남성_사계절_casual",
+    "신발_black_leather_구두_남성_사계절_minimal",
+    "아우터_navy_polyester_블루종/MA-1_남성_가을_casual",
+]
+
+CATEGORY_KR = [("top", "상의"), ("bottom", "하의"), ("shoes", "신발"), ("outer", "아우터")]
+
+CANDIDATE_FEATURES = {
+    "top": [
+        "상의_white_cotton_반소매 티셔츠_남성_여름_casual",
+        "상의_black_cotton_후드 티셔츠_남성_가을_street",
+        "상의_blue_cotton_셔츠/블라우스_여성_봄_minimal",
+        "상의_gray_wool_니트/스웨터_여성_겨울_casual",
+    ],
+    "bottom": [
+        "하의_gray_cotton_숏 팬츠_남성_여름_casual",
+        "하의_blue_denim_데님 팬츠_남성_사계절_casual",
+        "하의_black_polyester_트레이닝/조거 팬츠_여성_가을_sporty",
+    ],
+    "shoes": [
+        "신발_white_canvas_스니커즈_남성_사계절_casual",
+        "신발_black_leather_구두_남성_사계절_minimal",
+        "신발_brown_leather_부츠/워크_여성_겨울_street",
+    ],
+    "outer": [
+        "아우터_black_wool_후드 집업_남성_가을_street",
+        "아우터_navy_polyester_블루종/MA-1_남성_가을_casual",
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def model_loader() -> ModelLoader:
+    """
+    학습된 모델을 한 번만 로드하는 fixture
+
+    Returns:
+        ModelLoader: 로드된 모델 로더
+    """
+    loader = ModelLoader(MODEL_DIR)
+    assert loader.load()
+    return loader
+
+
+@lru_cache(maxsize=1)
+def _merged_df() -> pd.DataFrame:
+    """
+    학습 결과 merged_df.pkl을 직접 읽습니다. (기준 계산용)
+
+    서빙 번들로 로드한 ModelLoader는 merged_df를 갖고 있지 않으므로 pickle 파일을 사용합니다.
+    """
+    return pd.read_pickle(os.path.join(MODEL_DIR, "merged_df.pkl"))
+
+
+def _raw_coord_vectors(model_loader: ModelLoader) -> np.ndarray:
+    """merged_df에서 정규화 전 코디 벡터를 직접 만듭니다. (기존 계산 방식)"""
+    return np.array(_merged_df()['final_vector'].tolist())
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """기준 코사인 유사도 계산 (float64)"""
+    a_norm = np.linalg.norm(a, axis=-1, keepdims=True)
+    b_norm = np.linalg.norm(b, axis=-1, keepdims=True)
+    a_norm[a_norm == 0] = 1.0
+    b_norm[b_norm == 0] = 1.0
+    return (a / a_norm) @ (b / b_norm).T
+
+
+def _gensim_item_vector(feature: str, model_loader: ModelLoader) -> np.ndarray:
+    """Word2Vec 어휘를 직접 조회해 아이템 벡터를 만듭니다. (테이블을 쓰지 않는 기존 계산)"""
+    parsed = parse_feature(feature)
+    params = model_loader.get_params()
+    return np.concatenate([
+        model_loader.sentence_to_vector(feature_to_tokens(feature)),
+        model_loader.get_color_vector(parsed['color']) * params['color_weight'],
+        model_loader.get_fabric_vector(parsed['fabric']) * params['fabric_weight'],
+    ])
+
+
+class TestFeatureTable:
+    """속성 값 임베딩 테이블 테스트"""
+
+    @pytest.mark.parametrize("category", feature_space.CATEGORIES)
+    def test_table_vector_matches_gensim_vector(self, model_loader: ModelLoader, category: str):
+        """테이블로 만든 벡터가 Word2Vec 직접 조회 결과와 같아야 함"""
+        for i, detail in enumerate(feature_space.CATEGORY_DETAILS):
+            feature = "_".join([
+                category,
+                feature_space.COLORS[i % len(feature_space.COLORS)],
+                feature_space.MATERIALS[i % len(feature_space.MATERIALS)],
+                detail,
+                feature_space.GENDERS[i % len(feature_space.GENDERS)],
+                feature_space.SEASONS[i % len(feature_space.SEASONS)],
+                feature_space.STYLES[i % len(feature_space.STYLES)],
+            ])
+
+            table_vector = model_loader.lookup_feature_vector(feature)
+
+            assert table_vector is not None
+            assert np.allclose(table_vector, _gensim_item_vector(feature, model_loader), atol=1e-5)
+
+    @pytest.mark.parametrize("feature", [
+        "신발_white_canvas_스니커즈_남성_사계절_casual",
+        "상의_white_cotton",
+        "하의_gray_cotton_숏 팬츠_남성_여름_casual_extra",
+    ])
+    def test_unknown_feature_falls_back(self, model_loader: ModelLoader, feature: str):
+        """테이블에 없는 값이 있으면 None을 반환하고 item_to_vector는 기존 방식으로 계산해야 함"""
+        assert model_loader.lookup_feature_vector(feature) is None
+        assert np.allclose(
+            item_to_vector(feature, model_loader),
+            _gensim_item_vector(feature, model_loader),
+            atol=1e-6
+        )
+
+
+class TestCoordMatrix:
+    """로드 시 사전 계산되는 코디 행렬 테스트"""
+
+    def test_coord_matrix_is_normalized_float32(self, model_loader: ModelLoader):
+        """코디 행렬은 merged_df와 행 수가 같고, float32 연속 배열이며, 각 행은 단위 벡터여야 함"""
+        coord_matrix = model_loader.get_coord_matrix()
+
+        assert coord_matrix.dtype == np.float32
+        assert coord_matrix.flags["C_CONTIGUOUS"]
+        assert coord_matrix.shape[0] == len(_merged_df())
+
+        norms = np.linalg.norm(coord_matrix, axis=1)
+        nonzero = norms > 0
+        assert np.allclose(norms[nonzero], 1.0, atol=1e-5)
+
+    def test_coord_mean_vector_matches_raw_mean(self, model_loader: ModelLoader):
+        """평균 벡터는 정규화 전 코디 벡터의 평균과 같아야 함"""
+        expected = _raw_coord_vectors(model_loader).mean(axis=0)
+
+        assert np.allclose(model_loader.get_coord_mean_vector(), expected, atol=1e-5)
+
+    @pytest.mark.parametrize("category,category_kr", CATEGORY_KR)
+    def test_category_coord_matrix_matches_sentence_filter(
+        self,
+        model_loader: ModelLoader,
+        category: str,
+        category_kr: str
+    ):
+        """카테고리별 부분 행렬은 w2v_sentence 문자열 필터링 결과와 같은 행이어야 함"""
+        merged_df = _merged_df()
+        mask = merged_df['w2v_sentence'].str.contains(category_kr, na=False).to_numpy()
+
+        assert np.array_equal(model_loader.get_category_row_indices(category), np.flatnonzero(mask))
+        assert np.array_equal(
+            model_loader.get_category_coord_matrix(category),
+            model_loader.get_coord_matrix()[mask]
+        )
+
+
+def _legacy_category_scores(
+    category_kr: str,
+    features: list,
+    target_vector: np.ndarray,
+    model_loader: ModelLoader
+) -> np.ndarray:
+    """
+    기존 recommend_category 스코어링을 그대로 재현합니다.
+    (카테고리 코디 전체와의 코사인 유사도 평균 * 0.7 + 타겟 유사도 * 0.3)
+    """
+    merged_df = _merged_df()
+    filtered_df = merged_df[merged_df['w2v_sentence'].str.contains(category_kr, na=False)]
+    coord_vectors = np.array(filtered_df['final_vector'].tolist())
+
+    scores = []
+    for feature in features:
+        item_vector = item_to_vector(feature, model_loader)[np.newaxis, :]
+        coord_avg_sim = _cosine(item_vector, coord_vectors)[0].mean()
+        target_sim = _cosine(item_vector, target_vector[np.newaxis, :])[0][0]
+        scores.append(coord_avg_sim * 0.7 + target_sim * 0.3)
+    return np.array(scores)
+
+
+class TestCentroidScoring:
+    """centroid 내적 기반 스코어링이 기존 코사인 평균 스코어링과 같은지 검증"""
+
+    @pytest.mark.parametrize("category,category_kr", CATEGORY_KR)
+    def test_centroid_dot_equals_mean_cosine(
+        self,
+        model_loader: ModelLoader,
+        category: str,
+        category_kr: str
+    ):
+        """centroid와의 내적은 카테고리 코디 전체와의 코사인 유사도 평균과 같아야 함"""
+        merged_df = _merged_df()
+        filtered_df = merged_df[merged_df['w2v_sentence'].str.contains(category_kr, na=False)]
+        coord_vectors = np.array(filtered_df['final_vector'].tolist())
+        centroid = model_loader.get_category_centroid(category)
+
+        for feature in CANDIDATE_FEATURES[category]:
+            item_vector = item_to_vector(feature, model_loader)
+            expected = _cosine(item_vector[np.newaxis, :], coord_vectors)[0].mean()
+
+            assert float(centroid @ normalize_vector(item_vector)) == pytest.approx(expected, abs=1e-5)
+
+    @pytest.mark.parametrize("category,category_kr", CATEGORY_KR)
+    @pytest.mark.parametrize("target_feature", SAMPLE_FEATURES)
+    def test_recommend_category_matches_legacy_scoring(
+        self,
+        model_loader: ModelLoader,
+        category: str,
+        category_kr: str,
+        target_feature: str
+    ):
+        """recommend_category의 선택 결과가 기존 스코어링의 최고점 아이템과 같아야 함"""
+        features = CANDIDATE_FEATURES[category]
+        target_vector = item_to_vector(target_feature, model_loader)
+        available_items = [{"id": i, "feature": f} for i, f in enumerate(features)]
+
+        legacy_scores = _legacy_category_scores(category_kr, features, target_vector, model_loader)
+        recommended_id = recommend_category(
+            category=category,
+            available_items=available_items,
+            target_vector=target_vector,
+            merged_df=_merged_df(),
+            model_loader=model_loader
+        )
+
+        # 동점에 가까운 경우 float 오차로 순서가 바뀔 수 있으므로 점수로 비교
+        assert legacy_scores[recommended_id] == pytest.approx(legacy_scores.max(), abs=1e-5)
+
+
+class TestBatchScoring:
+    """후보 아이템 일괄 스코어링 테스트"""
+
+    @pytest.mark.parametrize("category,category_kr", CATEGORY_KR)
+    def test_score_items_matches_per_item_scores(
+        self,
+        model_loader: ModelLoader,
+        category: str,
+        category_kr: str
+    ):
+        """행렬 한 번으로 계산한 점수가 아이템별 기존 점수와 같아야 함"""
+        features = CANDIDATE_FEATURES[category]
+        target_vector = item_to_vector(SAMPLE_FEATURES[0], model_loader)
+        item_ids, item_matrix = items_to_matrix(
+            [{"id": i, "feature": f} for i, f in enumerate(features)],
+            model_loader
+        )
+
+        scores = score_items(category, item_matrix, target_vector, model_loader)
+        expected = _legacy_category_scores(category_kr, features, target_vector, model_loader)
+
+        assert item_ids == list(range(len(features)))
+        assert np.allclose(scores, expected, atol=1e-5)
+
+    def test_items_to_matrix_skips_items_without_feature(self, model_loader: ModelLoader):
+        """feature가 없는 아이템은 행렬에서 제외되어야 함"""
+        item_ids, item_matrix = items_to_matrix(
+            [{"id": 1, "feature": SAMPLE_FEATURES[0]}, {"id": 2, "feature": ""}, {"id": 3}],
+            model_loader
+        )
+
+        assert item_ids == [1]
+        assert item_matrix.shape[0] == 1
+
+    def test_duplicate_items_keep_first_on_tie(self, model_loader: ModelLoader):
+        """같은 feature의 아이템이 여러 개면 기존처럼 앞의 아이템이 추천되어야 함"""
+        feature = CANDIDATE_FEATURES["top"][0]
+        available_items = [{"id": 100 + i, "feature": feature} for i in range(300)]
+
+        recommended_id = recommend_category(
+            category="top",
+            available_items=available_items,
+            target_vector=item_to_vector(SAMPLE_FEATURES[1], model_loader),
+            merged_df=_merged_df(),
+            model_loader=model_loader
+        )
+
+        assert recommended_id == 100
+
+    def test_top_k_indices(self):
+        """상위 k개를 점수 내림차순으로 반환하고, 동점이면 앞 인덱스를 우선해야 함"""
+        scores = np.array([0.1, 0.5, 0.3, 0.5, 0.2])
+
+        assert top_k_indices(scores, 1).tolist() == [1]
+        assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+        assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 4, 0]
+        assert top_k_indices(scores, 0).tolist() == []
+
+
+def _available_items(offset: int = 0) -> dict:
+    """CANDIDATE_FEATURES로 카테고리별 선택 가능 아이템을 만듭니다. (카테고리마다 다른 ID)"""
+    return {
+        category: [
+            {"id": offset + category_index * 100 + i, "feature": feature}
+            for i, feature in enumerate(features)
+        ]
+        for category_index, (category, features) in enumerate(CANDIDATE_FEATURES.items())
+    }
+
+
+def _brute_force_outfits(selected_items: dict, available_items: dict, model_loader: ModelLoader) -> list:
+    """모든 코디 조합의 점수를 아이템 하나씩 직접 계산합니다. (기준 계산)"""
+    selected_vectors = [
+        item_to_vector(item["feature"], model_loader)
+        for item in selected_items.values() if item is not None
+    ]
+    if selected_vectors:
+        target_vector = np.mean(selected_vectors, axis=0)
+    else:
+        target_vector = model_loader.get_coord_mean_vector()
+    categories = [c for c in available_items if selected_items.get(c) is None and available_items[c]]
+
+    def item_score(category: str, item: dict) -> float:
+        vector = normalize_vector(item_to_vector(item["feature"], model_loader)).astype(np.float64)
+        score = 0.7 * float(model_loader.get_category_centroid(category) @ vector)
+        score += 0.3 * float(normalize_vector(target_vector) @ vector)
+        score += recommendation_engine.OUTFIT_PAIR_WEIGHT * sum(
+            float(vector @ normalize_vector(selected)) for selected in selected_vectors
+        )
+        return score
+
+    outfits = []
+    for combination in itertools.product(*(available_items[c] for c in categories)):
+        units = [normalize_vector(item_to_vector(item["feature"], model_loader)) for item in combination]
+        score = sum(item_score(c, item) for c, item in zip(categories, combination))
+        score += recommendation_engine.OUTFIT_PAIR_WEIGHT * sum(
+            float(a @ b) for a, b in itertools.combinations(units, 2)
+        )
+        ids = {c: item["id"] for c, item in zip(categories, combination)}
+        outfits.append((score, ids))
+
+    outfits.sort(key=lambda outfit: -outfit[0])
+    return outfits
+
+
+class TestRecommendOutfits:
+    """코디 조합 탐색 (상위 k개) 테스트"""
+
+    def test_matches_brute_force(self, model_loader: ModelLoader):
+        """빔 폭이 조합 수 이상이면 전체 조합을 계산한 상위 k개와 점수가 같아야 함"""
+        available_items = _available_items()
+        expected = _brute_force_outfits({}, available_items, model_loader)
+
+        result = recommend_outfits({}, available_items, model_loader, k=10, beam_width=len(expected))
+
+        scores = [outfit["score"] for outfit in result["outfits"]]
+        assert np.allclose(scores, [score for score, _ in expected[:10]], atol=1e-5)
+        assert scores == sorted(scores, reverse=True)
+        best_score, best_ids = expected[0]
+        if expected[1][0] < best_score - 1e-5:
+            for category, item_id in best_ids.items():
+                assert result["outfits"][0]["recommended_outfit"][category] == item_id
+
+    def test_outfits_are_distinct(self, model_loader: ModelLoader):
+        """반환된 코디는 서로 달라야 하고, 가능한 조합 수보다 많이 반환하지 않아야 함"""
+        available_items = _available_items()
+        total = int(np.prod([len(items) for items in available_items.values()]))
+
+        result = recommend_outfits({}, available_items, model_loader, k=total + 5, beam_width=8)
+
+        outfits = [tuple(sorted(o["recommended_outfit"].items())) for o in result["outfits"]]
+        assert len(outfits) == total
+        assert len(set(outfits)) == total
+
+    def test_selected_items_are_kept(self, model_loader: ModelLoader):
+        """선택된 아이템은 모든 코디에 그대로 들어가고, 궁합 점수에도 반영되어야 함"""
+        available_items = _available_items()
+        selected_items = {"top": {"id": 7, "feature": CANDIDATE_FEATURES["top"][1]}, "bottom": None}
+        available_items["top"] = []
+        expected = _brute_force_outfits(selected_items, available_items, model_loader)
+
+        result = recommend_outfits(selected_items, available_items, model_loader, k=3)
+
+        assert all(o["recommended_outfit"]["top"] == 7 for o in result["outfits"])
+        assert np.allclose([o["score"] for o in result["outfits"]], [s for s, _ in expected[:3]], atol=1e-5)
+
+    def test_without_pair_weight_matches_greedy(self, model_loader: ModelLoader, monkeypatch):
+        """궁합 가중치가 0이면 최고점 코디가 카테고리별 추천(recommend_outfit)과 같아야 함"""
+        monkeypatch.setattr(recommendation_engine, "OUTFIT_PAIR_WEIGHT", 0.0)
+        available_items = _available_items()
+        selected_items = {"shoes": {"id": 5, "feature": CANDIDATE_FEATURES["shoes"][0]}}
+        available_items["shoes"] = []
+
+        greedy = recommend_outfit(selected_items, available_items, model_loader)
+        joint = recommend_outfits(selected_items, available_items, model_loader, k=1)
+
+        assert joint["outfits"][0]["recommended_outfit"] == greedy["recommended_outfit"]
+
+    def test_missing_required_category(self, model_loader: ModelLoader):
+        """필수 카테고리 후보가 없으면 ValueError를 발생시켜야 함"""
+        available_items = _available_items()
+        available_items["shoes"] = []
+
+        with pytest.raises(ValueError):
+            recommend_outfits({}, available_items, model_loader, k=3)
+        with pytest.raises(ValueError):
+            recommend_outfits({}, _available_items(), model_loader, k=0)
+
+
+class TestRecommendOutfitBatch:
+    """여러 사용자 일괄 추천 테스트"""
+
+    @staticmethod
+    def _requests() -> list:
+        """선택 아이템/후보 구성이 서로 다른 사용자들의 추천 입력"""
+        requests = []
+        for user in range(6):
+            available_items = _available_items(offset=user * 1000)
+            selected_items = {}
+            if user % 3 == 1:
+                selected_items["top"] = available_items["top"][user % 4]
+                available_items["top"] = []
+            if user % 3 == 2:
+                selected_items["shoes"] = {"id": 99, "feature": CANDIDATE_FEATURES["shoes"][2]}
+                available_items["shoes"] = []
+                available_items["outer"] = []
+            available_items["bottom"] = available_items["bottom"][user % 3:]
+            requests.append({"selected_items": selected_items, "available_items": available_items})
+        return requests
+
+    def test_matches_per_user_recommendation(self, model_loader: ModelLoader):
+        """사용자마다 recommend_outfit을 호출한 결과와 같아야 함"""
+        requests = self._requests()
+
+        results = recommend_outfit_batch(requests, model_loader)
+
+        assert len(results) == len(requests)
+        for request, result in zip(requests, results):
+            expected = recommend_outfit(request["selected_items"], request["available_items"], model_loader)
+            assert result == expected
+
+    def test_failure_is_isolated(self, model_loader: ModelLoader):
+        """필수 카테고리를 채울 수 없는 사용자만 실패하고 나머지는 추천되어야 함"""
+        requests = self._requests()[:2]
+        requests.insert(1, {"selected_items": {}, "available_items": {"top": _available_items()["top"]}})
+
+        results = recommend_outfit_batch(requests, model_loader)
+
+        assert "recommended_outfit" in results[0] and "recommended_outfit" in results[2]
+        assert "필수 카테고리" in results[1]["error"]
+        assert recommend_outfit_batch([], model_loader) == []
+
+    def test_unique_rows_by_bytes(self):
+        """처음 나온 순서의 고유 행과 원래 행으로 되돌리는 번호를 반환해야 함"""
+        matrix = np.array([[1, 2], [3, 4], [1, 2], [5, 6], [3, 4]], dtype=np.float32)
+
+        unique_rows, inverse = unique_rows_by_bytes(matrix)
+
+        assert unique_rows.tolist() == [[1, 2], [3, 4], [5, 6]]
+        assert inverse.tolist() == [0, 1, 0, 2, 1]
+        assert np.array_equal(unique_rows[inverse], matrix)
+
+
+class TestDeadline:
+    """시간 예산(deadline)이 있는 추천 테스트"""
+
+    def test_generous_deadline_matches_unbounded(self, model_loader: ModelLoader):
+        """시간 예산이 충분하면 제한이 없을 때와 같은 결과여야 함"""
+        available_items = _available_items()
+
+        unbounded = recommend_outfit({}, available_items, model_loader)
+        bounded = recommend_outfit({}, available_items, model_loader, deadline=time.monotonic() + 60)
+
+        assert bounded["recommended_outfit"] == unbounded["recommended_outfit"]
+        assert bounded["fallback_categories"] == []
+
+    def test_expired_deadline_uses_attribute_scorer(self, model_loader: ModelLoader):
+        """시간 예산이 끝났으면 남은 카테고리를 속성 기반 추천으로 채워야 함"""
+        available_items = _available_items()
+        selected_items = {"top": {"id": 1, "feature": CANDIDATE_FEATURES["top"][0]}}
+
+        result = recommend_outfit(selected_items, available_items, model_loader, deadline=time.monotonic() - 1)
+
+        assert result["fallback_categories"] == ["bottom", "shoes", "outer"]
+        expected = recommend_outfit_by_attributes(selected_items, available_items)
+        assert result["recommended_outfit"] == expected["recommended_outfit"]
+
+    def test_expired_deadline_narrows_beam(self, model_loader: ModelLoader):
+        """조합 탐색은 시간 예산이 끝나면 빔 폭을 k로 줄여 k개 코디를 완성해야 함"""
+        available_items = _available_items()
+
+        result = recommend_outfits({}, available_items, model_loader, k=3, deadline=time.monotonic() - 1)
+
+        assert result["timed_out"] is True
+        assert len(result["outfits"]) == 3
+        scores = [outfit["score"] for outfit in result["outfits"]]
+        assert scores == sorted(scores, reverse=True)
+        assert "timed_out" not in recommend_outfits({}, available_items, model_loader, k=3)
+
+
+class TestAttributeScorer:
+    """모델 없이 parse_feature 속성으로 추천하는 대체 추천 테스트"""
+
+    def test_attribute_match_score(self):
+        """계절/스타일/색상이 어울릴수록 점수가 높아야 함"""
+        reference = parse_feature("상의_red_cotton_반소매 티셔츠_남성_여름_casual")
+
+        same = attribute_match_score(parse_feature("하의_white_cotton_숏 팬츠_남성_여름_casual"), reference)
+        all_season = attribute_match_score(parse_feature("하의_red_denim_데님 팬츠_남성_사계절_street"), reference)
+        clash = attribute_match_score(parse_feature("하의_green_wool_코튼 팬츠_남성_겨울_minimal"), reference)
+
+        assert same == 2.5
+        assert all_season == 1.25
+        assert clash == 0.0
+
+    def test_follows_selected_item(self):
+        """선택된 아이템과 계절/스타일이 같은 아이템을 추천하고 선택된 아이템은 유지해야 함"""
+        available_items = _available_items()
+        selected_items = {"top": {"id": 1, "feature": "상의_white_cotton_반소매 티셔츠_남성_여름_casual"}}
+
+        result = recommend_outfit_by_attributes(selected_items, available_items)
+
+        outfit = result["recommended_outfit"]
+        features = {item["id"]: item["feature"] for items in available_items.values() for item in items}
+        assert outfit["top"] == 1
+        assert parse_feature(features[outfit["bottom"]])["style"] == "casual"
+        assert parse_feature(features[outfit["shoes"]])["style"] == "casual"
+        assert result["score"] > 0
+
+    def test_without_selection_uses_closet_profile(self):
+        """선택된 아이템이 없어도 필수 카테고리를 모두 채워야 함"""
+        result = recommend_outfit_by_attributes({}, _available_items())
+
+        assert all(result["recommended_outfit"][category] is not None for category in ("top", "bottom", "shoes"))
+
+    def test_missing_required_category(self):
+        """필수 카테고리 후보가 없으면 ValueError를 발생시켜야 함"""
+        with pytest.raises(ValueError):
+            recommend_outfit_by_attributes({}, {"top": _available_items()["top"]})
+
+
+def _brute_force_compatibility(selected_items: dict, available_items: dict, model_loader: ModelLoader) -> list:
+    """모든 코디 조합의 궁합 점수를 직접 계산합니다. (선택된 아이템끼리의 쌍은 모든 조합에 같으므로 제외)"""
+    selected_features = [item["feature"] for item in selected_items.values() if item is not None]
+    categories = [c for c in available_items if selected_items.get(c) is None and available_items[c]]
+    fixed_score = compatibility_score(selected_features, model_loader) if selected_features else 0.0
+
+    outfits = []
+    for combination in itertools.product(*(available_items[c] for c in categories)):
+        features = selected_features + [item["feature"] for item in combination]
+        score = compatibility_score(features, model_loader) - fixed_score
+        outfits.append((score, {c: item["id"] for c, item in zip(categories, combination)}))
+
+    outfits.sort(key=lambda outfit: -outfit[0])
+    return outfits
+
+
+class TestCompatibilityTables:
+    """카테고리 간 속성 궁합 테이블 테스트"""
+
+    def test_split_sentence(self):
+        """코디 문장은 카테고리로 시작하는 토큰 앞에서만 나뉘어야 함 (상세정보의 공백 유지)"""
+        sentence = "상의_white_cotton_반소매 티셔츠_남성_여름_casual 하의_blue_denim_데님 팬츠_남성_여름_casual"
+
+        assert split_sentence(sentence) == [
+            "상의_white_cotton_반소매 티셔츠_남성_여름_casual",
+            "하의_blue_denim_데님 팬츠_남성_여름_casual",
+        ]
+        assert split_sentence("") == []
+
+    def test_counts_and_scores(self):
+        """함께 나온 조합은 양수, 서로 다른 카테고리 방향은 대칭, 같은 카테고리와 알 수 없는 값은 0이어야 함"""
+        sentences = [
+            "상의_white_cotton_반소매 티셔츠_남성_여름_casual 하의_blue_denim_데님 팬츠_남성_여름_casual",
+            "상의_black_wool_니트/스웨터_여성_겨울_minimal 하의_black_wool_슈트 팬츠/슬랙스_여성_겨울_minimal",
+        ] * 5
+        tables = build_compatibility_tables(sentences)
+
+        white, blue, black = (tables.vocabularies['color'].index(c) for c in ("white", "blue", "black"))
+        assert tables.counts['color'][0, 1, white, blue] == 5
+        assert tables.counts['color'][1, 0, blue, white] == 5
+        assert tables.scores['color'][0, 1, white, blue] > 0 > tables.scores['color'][0, 1, white, black]
+        scores = tables.scores['detail']
+        assert np.allclose(scores, scores.transpose(1, 0, 3, 2))
+        assert not scores[0, 0].any()
+
+        codes = tables.encode(["상의_unknown_cotton_반소매 티셔츠_남성_여름_casual", "잘못된 feature"])
+        assert codes[0, 1] == len(tables.vocabularies['color'])
+        assert (codes[1] == [len(CATEGORY_KR)] + [len(v) for v in tables.vocabularies.values()]).all()
+        assert not tables.pair_scores(codes[1:], tables.encode(SAMPLE_FEATURES)).any()
+
+    def test_save_and_load(self, tmp_path):
+        """저장한 테이블을 다시 읽으면 같은 점수가 메모리 매핑으로 열려야 함"""
+        tables = build_compatibility_tables([" ".join(CANDIDATE_FEATURES[c][0] for c in CANDIDATE_FEATURES)])
+        tables.save(str(tmp_path))
+
+        loaded = CompatibilityTables.load(str(tmp_path))
+
+        assert loaded.attributes == tables.attributes
+        assert isinstance(loaded.scores['color'], np.memmap)
+        codes = tables.encode(SAMPLE_FEATURES)
+        assert loaded.outfit_score(codes) == pytest.approx(tables.outfit_score(codes))
+
+    def test_real_outfits_score_higher_than_shuffled(self, model_loader: ModelLoader):
+        """코디 데이터의 실제 코디는 카테고리별로 섞은 코디보다 궁합 점수가 높아야 함"""
+        outfits = []
+        for sentence in dict(zip(model_loader.coord_ids, model_loader.coord_sentences)).values():
+            by_category = {}
+            for feature in split_sentence(sentence):
+                by_category.setdefault(feature.split('_')[0], feature)
+            if all(category_kr in by_category for _, category_kr in CATEGORY_KR[:3]):
+                outfits.append([by_category[category_kr] for _, category_kr in CATEGORY_KR[:3]])
+        outfits = outfits[:300]
+        rng = np.random.default_rng(0)
+        shuffled = [rng.permutation(len(outfits)) for _ in range(3)]
+
+        real = np.array([compatibility_score(outfit, model_loader) for outfit in outfits])
+        fake = np.array([
+            compatibility_score([outfits[shuffled[c][i]][c] for c in range(3)], model_loader)
+            for i in range(len(outfits))
+        ])
+
+        assert (real[:, np.newaxis] > fake[np.newaxis, :]).mean() > 0.9
+
+    def test_by_compatibility_matches_brute_force(self, model_loader: ModelLoader):
+        """빔 폭이 조합 수 이상이면 전체 조합의 궁합 점수 상위 k개와 같아야 함"""
+        available_items = _available_items()
+        selected_items = {"outer": {"id": 9, "feature": CANDIDATE_FEATURES["outer"][0]}}
+        available_items["outer"] = []
+        expected = _brute_force_compatibility(selected_items, available_items, model_loader)
+
+        result = recommend_outfits_by_compatibility(
+            selected_items, available_items, model_loader, k=5, beam_width=len(expected)
+        )
+
+        assert np.allclose([o["score"] for o in result["outfits"]], [s for s, _ in expected[:5]], atol=1e-5)
+        assert all(o["recommended_outfit"]["outer"] == 9 for o in result["outfits"])
+
+    def test_prune_candidates(self, model_loader: ModelLoader):
+        """후보가 많은 카테고리만 궁합 상위 max_candidates개로 줄이고 원래 순서를 유지해야 함"""
+        available_items = _available_items()
+        selected_items = {"bottom": {"id": 1, "feature": CANDIDATE_FEATURES["bottom"][1]}}
+        available_items["bottom"] = []
+
+        pruned = prune_candidates(selected_items, available_items, model_loader, max_candidates=2)
+
+        assert [len(pruned[c]) for c in CANDIDATE_FEATURES] == [2, 0, 2, 2]
+        for category, items in pruned.items():
+            ids = [item["id"] for item in items]
+            assert ids == sorted(ids)
+        top_scores = {
+            item["id"]: compatibility_score([item["feature"], CANDIDATE_FEATURES["bottom"][1]], model_loader)
+            for item in available_items["top"]
+        }
+        assert sorted(item["id"] for item in pruned["top"]) == sorted(sorted(top_scores, key=lambda i: -top_scores[i])[:2])
+
+        unpruned = recommend_outfits(selected_items, available_items, model_loader, k=3)
+        assert recommend_outfits(selected_items, available_items, model_loader, k=3, max_candidates=10) == unpruned
+        result = recommend_outfits(selected_items, available_items, model_loader, k=3, max_candidates=2)
+        assert {o["recommended_outfit"]["top"] for o in result["outfits"]} <= {item["id"] for item in pruned["top"]}
+
+
+class TestFindBestMatch:
+    """find_best_match 테스트"""
+
+    @pytest.mark.parametrize("feature", SAMPLE_FEATURES)
+    def test_find_best_match_matches_cosine_scan(self, model_loader: ModelLoader, feature: str):
+        """행렬 곱 기반 결과가 전체 코사인 유사도 스캔 결과와 같아야 함 (IVF 인덱스는 모든 클러스터 확인)"""
+        target_vector = item_to_vector(feature, model_loader)
+        merged_df = _merged_df()
+        ann_index = model_loader.get_ann_index()
+        nprobe = ann_index.nlist if ann_index is not None else None
+
+        expected = _cosine(target_vector[np.newaxis, :], _raw_coord_vectors(model_loader))[0]
+        result = find_best_match(target_vector, merged_df, [], model_loader, nprobe=nprobe)
+
+        if expected.max() < 0.3:
+            assert result is None
+        else:
+            assert result is not None
+            assert result["similarity"] == pytest.approx(expected.max(), abs=1e-4)
+
+    def test_normalize_vector_zero(self):
+        """0 벡터는 그대로 0 벡터를 반환해야 함"""
+        assert not normalize_vector(np.zeros(4)).any()
+
+
+
+class TestAnnIndex:
+    """IVF 근사 최근접 이웃 인덱스 테스트"""
+
+    @staticmethod
+    def _exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+        scores = vectors @ normalize_vector(query).astype(np.float32)
+        return np.lexsort((np.arange(len(scores)), -scores))[:k]
+
+    def test_index_partitions_all_rows(self):
+        """모든 행이 정확히 한 클러스터에 들어가고, 재배치된 벡터가 원래 행과 같아야 함"""
+        rng = np.random.default_rng(0)
+        vectors = normalize_rows(rng.normal(size=(500, 16)))
+
+        index = build_ivf_index(vectors, nlist=20)
+
+        assert np.array_equal(np.sort(index.ids), np.arange(500))
+        assert index.offsets[0] == 0 and index.offsets[-1] == 500
+        assert np.all(np.diff(index.offsets) >= 0)
+        assert np.array_equal(index.vectors, vectors[index.ids])
+
+    def test_full_probe_matches_exact_scan(self):
+        """모든 클러스터를 확인하면 전체 스캔과 같은 top-k를 반환해야 함"""
+        rng = np.random.default_rng(1)
+        vectors = normalize_rows(rng.normal(size=(800, 16)))
+        index = build_ivf_index(vectors, nlist=25)
+
+        for query in rng.normal(size=(30, 16)):
+            ids, scores = index.search(query, k=5, nprobe=index.nlist)
+            expected = self._exact_top_k(vectors, query, 5)
+            assert np.array_equal(ids, expected)
+            assert np.allclose(scores, vectors[expected] @ normalize_vector(query), atol=1e-5)
+
+    def test_save_and_load(self, tmp_path):
+        """저장한 인덱스를 메모리 매핑으로 읽어도 같은 결과를 반환해야 함"""
+        rng = np.random.default_rng(2)
+        vectors = normalize_rows(rng.normal(size=(300, 8)))
+        index = build_ivf_index(vectors, nlist=10, default_nprobe=3)
+        index.save(str(tmp_path))
+
+        loaded = IVFIndex.load(str(tmp_path), default_nprobe=3)
+
+        assert isinstance(loaded.vectors, np.memmap)
+        query = rng.normal(size=8)
+        assert np.array_equal(loaded.search(query, k=3)[0], index.search(query, k=3)[0])
+
+    def test_default_nprobe_recall(self, model_loader: ModelLoader):
+        """학습된 코디 인덱스는 기본 nprobe에서 recall@1이 충분히 높아야 함"""
+        ann_index = model_loader.get_ann_index()
+        if ann_index is None:
+            pytest.skip("서빙 번들에 IVF 인덱스가 없습니다.")
+
+        coord_matrix = np.asarray(model_loader.get_coord_matrix())
+        rng = np.random.default_rng(3)
+        queries = coord_matrix[rng.choice(len(coord_matrix), 200, replace=False)]
+        queries = queries + rng.normal(scale=0.05, size=queries.shape).astype(np.float32)
+
+        hits = 0
+        for query in queries:
+            ids, scores = ann_index.search(query, k=1)
+            exact = coord_matrix @ normalize_vector(query).astype(np.float32)
+            hits += bool(scores[0] >= exact.max() - 1e-6)
+
+        assert hits / len(queries) >= 0.85
+
+
+class TestTokenIndex:
+    """토큰 역색인 기반 후보 코디 검색 테스트"""
+
+    @staticmethod
+    def _rows_with_tokens(model_loader: ModelLoader, tokens: list) -> np.ndarray:
+        """모든 토큰이 들어 있는 코디 행을 문장을 직접 토큰화해 찾습니다. (기준 계산)"""
+        return np.array([
+            row for row, sentence in enumerate(model_loader.coord_sentences)
+            if set(tokens) <= set(feature_to_tokens(sentence))
+        ], dtype=np.int64)
+
+    @pytest.mark.parametrize("token", ["상의", "white", "cotton", "데님", "minimal"])
+    def test_postings_match_sentences(self, model_loader: ModelLoader, token: str):
+        """토큰별 행 번호 배열이 정렬되어 있고 문장 토큰화 결과와 같아야 함"""
+        postings = model_loader.get_token_postings(token)
+
+        assert postings is not None
+        assert np.all(np.diff(postings) > 0)
+        assert np.array_equal(postings, self._rows_with_tokens(model_loader, [token]))
+
+    def test_unknown_token(self, model_loader: ModelLoader):
+        """코디 데이터에 없는 토큰만 있으면 후보 제한 없음(None)을 반환해야 함"""
+        assert model_loader.get_token_postings("없는토큰") is None
+        assert find_candidate_coords(["없는토큰"], model_loader) is None
+
+    def test_intersect_sorted(self):
+        """이진 탐색 교집합이 np.intersect1d와 같아야 함"""
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            small = np.unique(rng.integers(0, 200, size=15))
+            large = np.unique(rng.integers(0, 200, size=120))
+            assert np.array_equal(intersect_sorted(small, large), np.intersect1d(small, large))
+        assert len(intersect_sorted(np.array([1, 2]), np.array([], dtype=np.int64))) == 0
+
+    @pytest.mark.parametrize("row", [0, 500, 3000])
+    def test_candidates_share_all_tokens(self, model_loader: ModelLoader, row: int):
+        """모든 토큰을 가진 코디가 있으면 후보는 정확히 그 코디들이어야 함"""
+        # 코디에 실제로 있는 아이템 feature (공백이 없는 첫 아이템)
+        feature = model_loader.coord_sentences[row].split(' ')[0]
+        tokens = feature_to_tokens(feature)
+        expected = self._rows_with_tokens(model_loader, tokens)
+
+        assert row in expected
+        assert np.array_equal(find_candidate_coords(tokens, model_loader), expected)
+
+    def test_min_candidates_relaxes_tokens(self, model_loader: ModelLoader):
+        """교집합이 min_candidates보다 작아지는 토큰은 건너뛰어 후보 수를 유지해야 함"""
+        tokens = feature_to_tokens(SAMPLE_FEATURES[0])
+        strict = find_candidate_coords(tokens, model_loader)
+        relaxed = find_candidate_coords(tokens, model_loader, min_candidates=len(strict) + 1)
+
+        assert len(relaxed) > len(strict)
+        assert np.array_equal(intersect_sorted(strict, relaxed), strict)
+
+    def test_find_best_match_with_candidate_tokens(self, model_loader: ModelLoader):
+        """후보 토큰을 주면 후보 코디 중 유사도가 가장 높은 코디를 반환해야 함"""
+        coord_matrix = np.asarray(model_loader.get_coord_matrix())
+        row = 100
+        sentence = model_loader.coord_sentences[row]
+        tokens = feature_to_tokens(sentence.split(' ')[0])
+        candidates = find_candidate_coords(tokens, model_loader)
+
+        result = find_best_match(coord_matrix[row], None, [], model_loader, candidate_tokens=tokens)
+
+        similarities = coord_matrix[candidates] @ normalize_vector(coord_matrix[row])
+        best = candidates[int(np.argmax(similarities))]
+        assert row in candidates
+        assert result["similarity"] == pytest.approx(float(similarities.max()), abs=1e-5)
+        assert result["w2v_sentence"] == model_loader.coord_sentences[best]
+
+
+@pytest.fixture(scope="module")
+def pickle_model_loader() -> ModelLoader:
+    """
+    서빙 번들 없이 pickle 파일로 로드한 모델 로더
+
+    Returns:
+        ModelLoader: pickle 경로로 로드된 모델 로더
+    """
+    loader = ModelLoader(MODEL_DIR)
+    loader._load_pickle_artifacts()
+    loader._build_feature_tables()
+    loader._build_centroids()
+    loader._build_token_index()
+    loader._build_compatibility_tables()
+    loader._is_loaded = True
+    return loader
+
+
+class TestServingBundle:
+    """서빙 번들(.npy 메모리 매핑) 테스트"""
+
+    def test_export_and_load_round_trip(self, tmp_path):
+        """저장한 번들을 다시 읽으면 같은 행렬/메타데이터가 메모리 매핑으로 열려야 함"""
+        rng = np.random.default_rng(0)
+        final_vectors = rng.normal(size=(5, 4))
+        sentences = ["상의_a 하의_b", "신발_c", "상의_d 아우터_e", "하의_f", "상의_g"]
+        export_serving_bundle(
+            bundle_dir=str(tmp_path),
+            params={'color_weight': 1.0, 'model_version': 'v1'},
+            w2v_keys=["상의_a", "신발_c"],
+            w2v_vectors=rng.normal(size=(2, 3)),
+            cf_keys=["white"],
+            cf_vectors=rng.normal(size=(1, 2)),
+            final_vectors=final_vectors,
+            coord_ids=[10, 10, 11, 12, 12],
+            sentences=sentences,
+        )
+
+        bundle = load_serving_bundle(str(tmp_path))
+
+        assert isinstance(bundle['coord_matrix'], np.memmap)
+        assert not bundle['coord_matrix'].flags.writeable
+        assert bundle['model_version'] == 'v1'
+        assert bundle['coord_ids'] == [10, 10, 11, 12, 12]
+        assert bundle['coord_sentences'] == sentences
+        assert np.allclose(bundle['coord_matrix'], _cosine(final_vectors, np.eye(4)), atol=1e-6)
+        assert np.array_equal(bundle['category_row_indices']['top'], [0, 2, 4])
+        assert np.array_equal(
+            bundle['category_coord_matrices']['top'],
+            bundle['coord_matrix'][[0, 2, 4]]
+        )
+        assert "신발_c" in bundle['w2v_vectors'] and "하의_b" not in bundle['w2v_vectors']
+        assert set(bundle['compatibility_tables'].attributes) == {'color', 'fabric', 'detail', 'season', 'style'}
+
+    @pytest.mark.skipif(
+        not bundle_exists(resolve_bundle_dir(MODEL_DIR)),
+        reason="서빙 번들이 없습니다. 모델을 다시 학습해야 합니다."
+    )
+    def test_bundle_matches_pickle_artifacts(
+        self, model_loader: ModelLoader, pickle_model_loader: ModelLoader
+    ):
+        """번들로 로드한 결과가 pickle 파일로 로드한 결과와 같아야 함"""
+        assert model_loader.source == 'bundle'
+        assert model_loader.get_model_version() == pickle_model_loader.get_model_version()
+        assert np.array_equal(model_loader.get_coord_matrix(), pickle_model_loader.get_coord_matrix())
+        assert model_loader.coord_ids == pickle_model_loader.coord_ids
+        assert model_loader.coord_sentences == pickle_model_loader.coord_sentences
+        for category, _ in CATEGORY_KR:
+            assert np.array_equal(
+                model_loader.get_category_row_indices(category),
+                pickle_model_loader.get_category_row_indices(category)
+            )
+        for feature in SAMPLE_FEATURES:
+            assert np.allclose(
+                item_to_vector(feature, model_loader),
+                item_to_vector(feature, pickle_model_loader),
+                atol=1e-6
+            )
+        for attribute in model_loader.get_compatibility_tables().attributes:
+            assert np.allclose(
+                model_loader.get_compatibility_tables().scores[attribute],
+                pickle_model_loader.get_compatibility_tables().scores[attribute],
+                atol=1e-6
+            )
+
+    @pytest.mark.skipif(
+        not bundle_exists(resolve_bundle_dir(MODEL_DIR)),
+        reason="서빙 번들이 없습니다. 모델을 다시 학습해야 합니다."
+    )
+    def test_serving_path_imports_numpy_only(self):
+        """번들로 로드하는 서빙 경로는 gensim/pandas/scikit-learn을 import하지 않아야 함"""
+        code = (
+            "import sys\n"
+            "from ai_recommendation.model_loader import ModelLoader\n"
+            "import ai_recommendation.recommendation_engine\n"
+            "loader = ModelLoader()\n"
+            "assert loader.load() and loader.source == 'bundle'\n"
+            "print(','.join(m for m in ('gensim', 'pandas', 'sklearn') if m in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == ""